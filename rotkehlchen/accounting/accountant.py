@@ -1,5 +1,7 @@
 import logging
+import time
 from collections.abc import Iterator
+from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 
@@ -7,16 +9,19 @@ import gevent
 
 from rotkehlchen.accounting.constants import FREE_PNL_EVENTS_LIMIT
 from rotkehlchen.accounting.export.csv import CSVExporter
+from rotkehlchen.accounting.metrics import ReportMetrics
 from rotkehlchen.accounting.mixins.event import AccountingEventMixin
 from rotkehlchen.accounting.pot import AccountingPot
 from rotkehlchen.accounting.structures.types import ActionType
 from rotkehlchen.accounting.types import MissingPrice
+from rotkehlchen.assets.resolver import AssetResolver
 from rotkehlchen.chain.evm.accounting.aggregator import EVMAccountingAggregators
 from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.db.settings import DBSettings
 from rotkehlchen.errors.asset import UnknownAsset, UnprocessableTradePair, UnsupportedAsset
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
+from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import Premium
 from rotkehlchen.types import EVM_CHAIN_IDS_WITH_TRANSACTIONS, Timestamp
@@ -99,6 +104,7 @@ class Accountant:
             start_ts: Timestamp,
             end_ts: Timestamp,
             events: list[AccountingEventMixin],
+            metrics: Optional[ReportMetrics] = None,
     ) -> int:
         """Processes the entire history of cryptoworld actions in order to determine
         the price and time at which every asset was obtained and also
@@ -110,8 +116,13 @@ class Accountant:
         taxable events into account. Not where processing starts from. Processing
         always starts from the very first event we find in the history.
 
+        The given metrics, which may already have the timings of querying the history,
+        are completed with the processing timings and saved with the report.
+
         Returns the id of the generated report
         """
+        if metrics is None:
+            metrics = ReportMetrics()
         active_premium = self.premium and self.premium.is_active()
         log.info(
             'Start of history processing',
@@ -133,7 +144,7 @@ class Accountant:
                 end_ts=end_ts,
                 settings=db_settings,
             )
-            self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id)  # noqa: E501
+            self.pots[0].reset(settings=db_settings, start_ts=start_ts, end_ts=end_ts, report_id=report_id, metrics=metrics)  # noqa: E501
             self.end_ts = end_ts
             self.csvexporter.reset(start_ts=start_ts, end_ts=end_ts)
 
@@ -146,75 +157,97 @@ class Accountant:
             prev_time = last_event_ts = Timestamp(0)
             ignored_ids_mapping = self.db.get_ignored_action_ids(cursor=cursor, action_type=None)
 
-        events_iter = iter(events)
-        while True:
-            try:
-                (
-                    processed_events_num,
-                    prev_time,
-                ) = self._process_event(
-                    events_iterator=events_iter,
-                    start_ts=start_ts,
-                    end_ts=end_ts,
-                    prev_time=prev_time,
-                    db_settings=db_settings,
+        # resolve the assets of all events at once instead of querying each one on a cache miss
+        with metrics.stage('accounting.asset_resolution'):
+            identifiers: set[str] = set()
+            for event in events:
+                # events whose assets can't be found are skipped when processing them
+                with suppress(UnknownAsset, UnsupportedAsset, UnprocessableTradePair):
+                    identifiers.update(asset.identifier for asset in event.get_assets())
+            AssetResolver.resolve_assets(identifiers)
+        # the same prices are asked many times during a report so remember them until its end
+        with PriceHistorian.memoized_prices():
+            with metrics.stage('accounting.price_prefetch'):
+                self.pots[0].prefetch_prices(
+                    events=events if events_limit == -1 else events[:events_limit],
                     ignored_ids_mapping=ignored_ids_mapping,
                 )
-            except PriceQueryUnsupportedAsset as e:
-                count = self._process_skipping_exception(
-                    exception=e,
-                    events=events,
-                    count=count,
-                    reason='not being able to find price for an unsupported asset',
-                )
-                continue
-            except NoPriceForGivenTimestamp as e:
-                self.pots[0].cost_basis.missing_prices.add(
-                    MissingPrice(
-                        from_asset=e.from_asset,
-                        to_asset=e.to_asset,
-                        time=e.time,
-                        rate_limited=e.rate_limited,
-                    ),
-                )
-                continue
-            except RemoteError as e:
-                count = self._process_skipping_exception(
-                    exception=e,
-                    events=events,
-                    count=count,
-                    reason='inability to reach an external service at that point in time',
-                )
-                continue
-
-            if processed_events_num == 0:
-                break  # we reached the period end
-
-            last_event_ts = prev_time
-            if count % 500 == 0:
-                # This loop can take a very long time depending on the amount of events
-                # to process. We need to yield to other greenlets or else calls to the
-                # API may time out
-                gevent.sleep(0.5)
-            count += processed_events_num
-            if not active_premium and count >= FREE_PNL_EVENTS_LIMIT:
-                log.debug(
-                    f'PnL reports event processing has hit the event limit of {events_limit}. '
-                    f'Processing stopped and the results will not '
-                    f'take into account subsequent events. Total events were {len(events)}',
-                )
-                break
-
+            events_iter = iter(events)
+            processing_start = time.perf_counter()
+            while True:
+                try:
+                    (
+                        processed_events_num,
+                        prev_time,
+                    ) = self._process_event(
+                        events_iterator=events_iter,
+                        start_ts=start_ts,
+                        end_ts=end_ts,
+                        prev_time=prev_time,
+                        db_settings=db_settings,
+                        ignored_ids_mapping=ignored_ids_mapping,
+                    )
+                except PriceQueryUnsupportedAsset as e:
+                    count = self._process_skipping_exception(
+                        exception=e,
+                        events=events,
+                        count=count,
+                        reason='not being able to find price for an unsupported asset',
+                    )
+                    continue
+                except NoPriceForGivenTimestamp as e:
+                    self.pots[0].cost_basis.missing_prices.add(
+                        MissingPrice(
+                            from_asset=e.from_asset,
+                            to_asset=e.to_asset,
+                            time=e.time,
+                            rate_limited=e.rate_limited,
+                        ),
+                    )
+                    continue
+                except RemoteError as e:
+                    count = self._process_skipping_exception(
+                        exception=e,
+                        events=events,
+                        count=count,
+                        reason='inability to reach an external service at that point in time',
+                    )
+                    continue
+
+                if processed_events_num == 0:
+                    break  # we reached the period end
+
+                last_event_ts = prev_time
+                if count % 500 == 0:
+                    # This loop can take a very long time depending on the amount of events
+                    # to process. We need to yield to other greenlets or else calls to the
+                    # API may time out
+                    gevent.sleep(0.5)
+                count += processed_events_num
+                if not active_premium and count >= FREE_PNL_EVENTS_LIMIT:
+                    log.debug(
+                        f'PnL reports event processing has hit the event limit of {events_limit}. '
+                        f'Processing stopped and the results will not '
+                        f'take into account subsequent events. Total events were {len(events)}',
+                    )
+                    break
+
+        metrics.stages['accounting.processing'] += time.perf_counter() - processing_start
+        metrics.increase('events_processed', count)
+        metrics.increase('events_total', actions_length)
+        metrics.finish()
         dbpnl.add_report_overview(
             report_id=report_id,
             last_processed_timestamp=last_event_ts,
             processed_actions=count,
             total_actions=actions_length,
             pnls=self.pots[0].pnls,
+            metrics=metrics,
         )
 
         for pot in self.pots:  # delete rules stored in memory since they won't be needed and can be queried again from the db  # noqa: E501
             pot.events_accountant.rules_manager.clean_rules()
+            pot.prefetched_prices = {}
 
         return report_id
 
@@ -0,0 +1,65 @@
+import time
+from collections import defaultdict
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.price import PriceHistorian
+
+
+def _price_counters() -> dict[str, int]:
+    return {
+        'price_queries': PriceHistorian.stats['queries'],
+        'price_oracle_queries': PriceHistorian.stats['oracle_queries'],
+        'price_memo_hits': PriceHistorian.stats['memo_hits'],
+        'price_memo_misses': PriceHistorian.stats['memo_misses'],
+        'price_cache_hits': GlobalDBHandler.price_cache_stats['hits'],
+        'price_cache_misses': GlobalDBHandler.price_cache_stats['misses'],
+    }
+
+
+class ReportMetrics:
+    """Time spent in each stage of a PnL report and counters of the work done
+
+    Stages can be nested, so for example the price lookups are also part of the
+    processing stage. The price counters are the increase of the global price counters
+    during the report so prices queried by other tasks at the same time are included.
+    """
+
+    def __init__(self) -> None:
+        self.stages: defaultdict[str, float] = defaultdict(float)
+        self.counters: defaultdict[str, float] = defaultdict(float)
+        self._start_price_counters = _price_counters()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Add the time spent in the context to the stage with the given name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.stages[name] += time.perf_counter() - start
+
+    def increase(self, name: str, by: float = 1) -> None:
+        self.counters[name] += by
+
+    def finish(self) -> None:
+        """Set the counters that are derived at the end of the report"""
+        for name, value in _price_counters().items():
+            self.counters[name] = float(value - self._start_price_counters[name])
+
+        if (processing_seconds := self.stages.get('accounting.processing', 0)) != 0:
+            self.counters['events_per_second'] = round(
+                self.counters['events_processed'] / processing_seconds,
+                2,
+            )
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'stages': {name: round(seconds, 3) for name, seconds in self.stages.items()},
+            'counters': {
+                name: int(value) if value.is_integer() else value
+                for name, value in self.counters.items()
+            },
+        }
@@ -26,6 +26,7 @@ class AccountingEventType(SerializableEnumNameMixin):
 
 class AccountingEventMixin(metaclass=ABCMeta):
     """Interface to be followed by all data structures that go in accounting"""
+    __slots__ = ()
 
     @abstractmethod
     def get_timestamp(self) -> Timestamp:
@@ -1,4 +1,6 @@
 import logging
+from collections import defaultdict
+from contextlib import suppress
 from typing import TYPE_CHECKING, Any, Literal, Optional
 
 from rotkehlchen.accounting.cost_basis import CostBasisCalculator
@@ -7,21 +9,27 @@ from rotkehlchen.accounting.cost_basis.prefork import (
     handle_prefork_asset_spends,
 )
 from rotkehlchen.accounting.history_base_entries import EventsAccountant
-from rotkehlchen.accounting.mixins.event import AccountingEventType
+from rotkehlchen.accounting.metrics import ReportMetrics
+from rotkehlchen.accounting.mixins.event import AccountingEventMixin, AccountingEventType
 from rotkehlchen.accounting.pnl import PNL, PnlTotals
 from rotkehlchen.accounting.structures.processed_event import ProcessedAccountingEvent
-from rotkehlchen.accounting.structures.types import EventDirection
+from rotkehlchen.accounting.structures.types import ActionType, EventDirection
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_KFEE
 from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.db.settings import DBSettings
+from rotkehlchen.errors.asset import UnknownAsset, UnprocessableTradePair, UnsupportedAsset
 from rotkehlchen.errors.misc import InputError, RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
-from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.history.price import (
+    MIN_ENTRIES_FOR_PRICE_RANGE,
+    PriceHistorian,
+    group_timestamps_by_price_range,
+)
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import Location, Price, Timestamp
 from rotkehlchen.user_messages import MessagesAggregator
@@ -63,17 +71,21 @@ class AccountingPot(CustomizableDateMixin):
         )
         self.query_start_ts = self.query_end_ts = Timestamp(0)
         self.report_id: Optional[int] = None
+        self.metrics = ReportMetrics()
+        # prices in profit currency per asset id and timestamp
+        self.prefetched_prices: dict[tuple[str, Timestamp], Price] = {}
 
     def _add_processed_event(self, event: ProcessedAccountingEvent) -> None:
         dbpnl = DBAccountingReports(self.database)
         self.processed_events.append(event)
         try:
-            dbpnl.add_report_data(
-                report_id=self.report_id,  # type: ignore # report id is initialized by now
-                time=event.timestamp,
-                ts_converter=self.timestamp_to_date,
-                event=event,
-            )
+            with self.metrics.stage('accounting.db_writes'):
+                dbpnl.add_report_data(
+                    report_id=self.report_id,  # type: ignore # report id is initialized by now
+                    time=event.timestamp,
+                    ts_converter=self.timestamp_to_date,
+                    event=event,
+                )
         except (DeserializationError, InputError) as e:
             log.error(str(e))
             return
@@ -92,22 +104,93 @@ class AccountingPot(CustomizableDateMixin):
         """
         if asset == self.profit_currency:
             rate = Price(ONE)
+        elif (prefetched := self.prefetched_prices.get((asset.identifier, timestamp))) is not None:
+            rate = prefetched
         else:
-            rate = PriceHistorian().query_historical_price(
-                from_asset=asset,
-                to_asset=self.profit_currency,
-                timestamp=timestamp,
-            )
+            with self.metrics.stage('accounting.price_lookups'):
+                rate = PriceHistorian().query_historical_price(
+                    from_asset=asset,
+                    to_asset=self.profit_currency,
+                    timestamp=timestamp,
+                )
         return rate
 
+    def prefetch_prices(
+            self,
+            events: list[AccountingEventMixin],
+            ignored_ids_mapping: dict[ActionType, set[str]],
+    ) -> None:
+        """Get the prices that processing the given events will need before processing them
+
+        The prices the oracles have already stored are read with a single DB query. For the
+        rest, the prices of each asset close in time are stored with a single range query
+        per group and read again. Prices that can't be prefetched, or that were not found,
+        are queried again when processing.
+        """
+        to_query: set[tuple[Asset, Timestamp]] = set()
+        for event in events:
+            timestamp = event.get_timestamp()
+            if timestamp > self.query_end_ts:
+                break  # events are sorted and processing stops here
+            if self.settings.calculate_past_cost_basis is False and timestamp < self.query_start_ts:  # noqa: E501
+                continue
+            try:
+                assets = event.get_assets()
+            except (UnknownAsset, UnsupportedAsset, UnprocessableTradePair):
+                continue  # skipped when processing
+            if (
+                any(asset.identifier in self.ignored_asset_ids for asset in assets) or
+                event.should_ignore(ignored_ids_mapping)
+            ):
+                continue  # skipped when processing
+            for asset in assets:
+                if asset in (self.profit_currency, A_KFEE):
+                    continue  # their prices are not queried from the oracles
+                with suppress(UnknownAsset):
+                    if asset.is_fiat() and self.profit_currency.is_fiat():
+                        continue  # fiat rates are queried as forex
+                to_query.add((asset, timestamp))
+
+        log.debug(f'Prefetching {len(to_query)} historical prices for the PnL report')
+        asset_timestamps = list(to_query)
+        prices = PriceHistorian.get_stored_historical_prices(
+            to_asset=self.profit_currency,
+            asset_timestamps=asset_timestamps,
+        )
+        timestamps_per_asset: defaultdict[Asset, list[Timestamp]] = defaultdict(list)
+        for asset, timestamp in asset_timestamps:
+            if (asset.identifier, timestamp) not in prices:
+                timestamps_per_asset[asset].append(timestamp)
+
+        stored_ranges = False
+        for asset, start_ts, end_ts, count in group_timestamps_by_price_range(timestamps_per_asset):  # noqa: E501
+            if count >= MIN_ENTRIES_FOR_PRICE_RANGE:
+                stored_ranges |= PriceHistorian.prefetch_historical_price_range(
+                    from_asset=asset,
+                    to_asset=self.profit_currency,
+                    from_timestamp=start_ts,
+                    to_timestamp=end_ts,
+                )
+
+        if stored_ranges:
+            prices.update(PriceHistorian.get_stored_historical_prices(
+                to_asset=self.profit_currency,
+                asset_timestamps=[(asset, timestamp) for asset, timestamps in timestamps_per_asset.items() for timestamp in timestamps],  # noqa: E501
+            ))
+
+        log.debug(f'Prefetched {len(prices)} of {len(to_query)} historical prices')
+        self.prefetched_prices = prices
+
     def reset(
             self,
             settings: DBSettings,
             start_ts: Timestamp,
             end_ts: Timestamp,
             report_id: int,
+            metrics: Optional[ReportMetrics] = None,
     ) -> None:
         self.settings = settings
+        self.metrics = ReportMetrics() if metrics is None else metrics
         with self.database.conn.read_ctx() as cursor:
             self.ignored_asset_ids = self.database.get_ignored_asset_ids(cursor)
         self.report_id = report_id
@@ -118,6 +201,7 @@ class AccountingPot(CustomizableDateMixin):
         self.cost_basis.reset(settings)
         self.events_accountant.reset()
         self.processed_events = []
+        self.prefetched_prices = {}
 
     def add_in_event(
             self,  # pylint: disable=unused-argument
@@ -18,7 +18,7 @@ class BalanceType(DBCharEnumMixIn):
     LIABILITY = 2
 
 
-@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
+@dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False, slots=True)
 class Balance:
     amount: FVal = ZERO
     usd_value: FVal = ZERO
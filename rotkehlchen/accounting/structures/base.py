@@ -1,9 +1,9 @@
 import logging
 from abc import ABCMeta, abstractmethod
-from collections.abc import Iterator
+from collections.abc import Callable, Iterator
 from dataclasses import dataclass
 from enum import auto
-from typing import TYPE_CHECKING, Any, Optional, TypedDict, TypeVar
+from typing import TYPE_CHECKING, Any, Optional, TypedDict, TypeVar, overload
 
 from rotkehlchen.accounting.constants import EVENT_CATEGORY_MAPPINGS
 from rotkehlchen.accounting.mixins.event import AccountingEventMixin, AccountingEventType
@@ -16,7 +16,10 @@ from rotkehlchen.accounting.structures.types import (
 from rotkehlchen.assets.asset import Asset, AssetWithOracles
 from rotkehlchen.chain.ethereum.constants import SHAPPELA_TIMESTAMP
 from rotkehlchen.constants.assets import A_ETH2
+from rotkehlchen.db.shadow_columns import to_shadow_value
+from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import (
     deserialize_fval,
@@ -50,6 +53,8 @@ HISTORY_EVENT_DB_TUPLE_WRITE = tuple[
     Optional[str],  # notes
     str,            # type
     str,            # subtype
+    Optional[int],  # amount shadow column
+    Optional[int],  # usd value shadow column
 ]
 
 
@@ -80,13 +85,99 @@ class HistoryBaseEntryData(TypedDict):
 
 
 T = TypeVar('T', bound='HistoryBaseEntry')
+V = TypeVar('V')
+
+
+class DBDeserializationCache:
+    """Deserialized values shared by the events read in a single DB query
+
+    The same assets, enums, addresses and amounts repeat a lot across the rows of a
+    query. Deserializing each distinct value once saves the time to do it for every row
+    and makes the events share the objects, which saves memory when many are loaded.
+    The existence of each asset is also checked only once per query, since the asset
+    foreign key already guarantees that all rows reference assets in the DB.
+
+    Only immutable values should be shared this way.
+    """
+    __slots__ = ('_assets', '_fvals', '_values')
+
+    def __init__(self) -> None:
+        self._assets: dict[str, Optional[Asset]] = {}
+        self._fvals: dict[str, FVal] = {}
+        self._values: dict[tuple[Callable, Any], Any] = {}
+
+    def asset(self, identifier: str) -> Asset:
+        """May raise:
+        - UnknownAsset
+        """
+        try:
+            asset = self._assets[identifier]
+        except KeyError:
+            try:
+                asset = Asset(identifier).check_existence()
+            except UnknownAsset:
+                asset = None
+            self._assets[identifier] = asset
+
+        if asset is None:
+            raise UnknownAsset(identifier)
+        return asset
+
+    def fval(self, value: str, name: str, location: str) -> FVal:
+        """May raise:
+        - DeserializationError
+        """
+        if (result := self._fvals.get(value)) is None:
+            result = self._fvals[value] = deserialize_fval(value, name, location)
+        return result
+
+    def value(self, deserialize: Callable[[Any], V], raw_value: Any) -> V:
+        """Deserialize a value, like an enum or a string, with the given function once
+
+        May raise whatever the deserialize function raises.
+        """
+        key = (deserialize, raw_value)
+        try:
+            return self._values[key]
+        except KeyError:
+            result = self._values[key] = deserialize(raw_value)
+            return result
+
+    @overload
+    def string(self, value: str) -> str:
+        ...
+
+    @overload
+    def string(self, value: None) -> None:
+        ...
+
+    def string(self, value: Optional[str]) -> Optional[str]:
+        """Share the same object for equal strings"""
+        if value is None:
+            return None
+        return self.value(str, value)
 
 
 class HistoryBaseEntry(AccountingEventMixin, metaclass=ABCMeta):
     """
     Intended to be the base class for all types of event. All trades, deposits,
     swaps etc. are going to be made up of multiple such entries.
+
+    Events use __slots__ since hundreds of thousands of them can be loaded at once.
     """
+    __slots__ = (
+        'event_identifier',
+        'sequence_index',
+        'timestamp',
+        'location',
+        'event_type',
+        'event_subtype',
+        'asset',
+        'balance',
+        'location_label',
+        'notes',
+        'identifier',
+    )
 
     def __init__(
             self,
@@ -176,11 +267,13 @@ class HistoryBaseEntry(AccountingEventMixin, metaclass=ABCMeta):
             (
                 'history_events(entry_type, event_identifier, sequence_index,'
                 'timestamp, location, location_label, asset, amount, usd_value, notes,'
-                'type, subtype) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
+                'type, subtype, amount_scaled, usd_value_scaled) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'
             ), (
                 'UPDATE history_events SET entry_type=?, event_identifier=?, '
                 'sequence_index=?, timestamp=?, location=?, location_label=?, asset=?, '
-                'amount=?, usd_value=?, notes=?, type=?, subtype=?'
+                'amount=?, usd_value=?, notes=?, type=?, subtype=?, amount_scaled=?, '
+                'usd_value_scaled=?'
             ), (
                 self.entry_type.value,
                 self.event_identifier,
@@ -194,6 +287,8 @@ class HistoryBaseEntry(AccountingEventMixin, metaclass=ABCMeta):
                 self.notes,
                 self.event_type.serialize(),
                 self.event_subtype.serialize(),
+                to_shadow_value(self.balance.amount, 'amount'),
+                to_shadow_value(self.balance.usd_value, 'usd_value'),
             ))
 
     @abstractmethod
@@ -206,10 +301,16 @@ class HistoryBaseEntry(AccountingEventMixin, metaclass=ABCMeta):
 
     @classmethod
     @abstractmethod
-    def deserialize_from_db(cls: type[T], entry: tuple) -> T:
+    def deserialize_from_db(
+            cls: type[T],
+            entry: tuple,
+            cache: Optional[DBDeserializationCache] = None,
+    ) -> T:
         """
         Deserialize a DB tuple to a proper class object.
 
+        A cache should be given when deserializing many rows of the same query.
+
         May raise:
         - DeserializationError
         - UnknownAsset
@@ -360,6 +461,7 @@ class HistoryBaseEntry(AccountingEventMixin, metaclass=ABCMeta):
 
 class HistoryEvent(HistoryBaseEntry):
     """General history events such as exchange events"""
+    __slots__ = ()
 
     def __init__(
             self,
@@ -403,26 +505,30 @@ class HistoryEvent(HistoryBaseEntry):
     def deserialize_from_db(
             cls: type['HistoryEvent'],
             entry: tuple,
+            cache: Optional[DBDeserializationCache] = None,
     ) -> 'HistoryEvent':
         """
         May raise:
         - DeserializationError
         - UnknownAsset
         """
-        amount = deserialize_fval(entry[7], 'amount', 'history event')
-        usd_value = deserialize_fval(entry[8], 'usd_value', 'history event')
+        if cache is None:
+            cache = DBDeserializationCache()
         return cls(
             identifier=entry[0],
-            event_identifier=entry[1],
+            event_identifier=cache.string(entry[1]),
             sequence_index=entry[2],
             timestamp=TimestampMS(entry[3]),
-            location=Location.deserialize_from_db(entry[4]),
-            location_label=entry[5],
-            asset=Asset(entry[6]).check_existence(),
-            balance=Balance(amount, usd_value),
+            location=cache.value(Location.deserialize_from_db, entry[4]),
+            location_label=cache.string(entry[5]),
+            asset=cache.asset(entry[6]),
+            balance=Balance(
+                amount=cache.fval(entry[7], 'amount', 'history event'),
+                usd_value=cache.fval(entry[8], 'usd_value', 'history event'),
+            ),
             notes=entry[9],
-            event_type=HistoryEventType.deserialize(entry[10]),
-            event_subtype=HistoryEventSubType.deserialize(entry[11]),
+            event_type=cache.value(HistoryEventType.deserialize, entry[10]),
+            event_subtype=cache.value(HistoryEventSubType.deserialize, entry[11]),
         )
 
     @classmethod
@@ -7,7 +7,7 @@ from rotkehlchen.accounting.structures.types import HistoryEventSubType, History
 from rotkehlchen.chain.ethereum.constants import ETH2_DEPOSIT_ADDRESS
 from rotkehlchen.chain.ethereum.modules.eth2.constants import CPT_ETH2, UNKNOWN_VALIDATOR_INDEX
 from rotkehlchen.errors.serialization import DeserializationError
-from rotkehlchen.serialization.deserialize import deserialize_evm_address, deserialize_fval
+from rotkehlchen.serialization.deserialize import deserialize_evm_address
 from rotkehlchen.types import (
     ChecksumEvmAddress,
     EVMTxHash,
@@ -24,7 +24,12 @@ if TYPE_CHECKING:
 
 from rotkehlchen.constants.assets import A_ETH
 
-from .base import HISTORY_EVENT_DB_TUPLE_WRITE, HistoryBaseEntry, HistoryBaseEntryType
+from .base import (
+    HISTORY_EVENT_DB_TUPLE_WRITE,
+    DBDeserializationCache,
+    HistoryBaseEntry,
+    HistoryBaseEntryType,
+)
 from .evm_event import EVM_EVENT_FIELDS, EvmEvent
 
 ETH_STAKING_EVENT_DB_TUPLE_READ = tuple[
@@ -57,7 +62,12 @@ STAKING_DB_UPDATE_QUERY_STR = 'UPDATE eth_staking_events_info SET validator_inde
 
 
 class EthStakingEvent(HistoryBaseEntry, metaclass=ABCMeta):  # noqa: PLW1641  # hash in superclass
-    """An ETH staking related event. Block production/withdrawal"""
+    """An ETH staking related event. Block production/withdrawal
+
+    The slots of its attributes are defined in the subclasses, since EthDepositEvent
+    also extends EvmEvent and only one of its bases can add slots.
+    """
+    __slots__ = ()
 
     def __init__(
             self,
@@ -73,8 +83,8 @@ class EthStakingEvent(HistoryBaseEntry, metaclass=ABCMeta):  # noqa: PLW1641  #
             notes: str,
             identifier: Optional[int] = None,
     ) -> None:
-        self.validator_index = validator_index
-        self.is_exit_or_blocknumber = is_exit_or_blocknumber
+        self.validator_index = validator_index  # type: ignore  # slot is in the subclasses
+        self.is_exit_or_blocknumber = is_exit_or_blocknumber  # type: ignore  # slot is in the subclasses
         super().__init__(
             identifier=identifier,
             event_identifier=event_identifier,
@@ -112,6 +122,7 @@ class EthStakingEvent(HistoryBaseEntry, metaclass=ABCMeta):  # noqa: PLW1641  #
 
 class EthWithdrawalEvent(EthStakingEvent):
     """An ETH Withdrawal event"""
+    __slots__ = ('validator_index', 'is_exit_or_blocknumber')
 
     def __init__(
             self,
@@ -166,16 +177,22 @@ class EthWithdrawalEvent(EthStakingEvent):
         return super().serialize() | {'validator_index': self.validator_index, 'is_exit': self.is_exit_or_blocknumber}  # noqa: E501
 
     @classmethod
-    def deserialize_from_db(cls: type['EthWithdrawalEvent'], entry: tuple) -> 'EthWithdrawalEvent':
+    def deserialize_from_db(
+            cls: type['EthWithdrawalEvent'],
+            entry: tuple,
+            cache: Optional[DBDeserializationCache] = None,
+    ) -> 'EthWithdrawalEvent':
         entry = cast(ETH_STAKING_EVENT_DB_TUPLE_READ, entry)
-        amount = deserialize_fval(entry[5], 'amount', 'eth withdrawal event')
-        usd_value = deserialize_fval(entry[6], 'usd_value', 'eth withdrawal event')
+        if cache is None:
+            cache = DBDeserializationCache()
+        amount = cache.fval(entry[5], 'amount', 'eth withdrawal event')
+        usd_value = cache.fval(entry[6], 'usd_value', 'eth withdrawal event')
         return cls(
             identifier=entry[0],
             event_identifier=entry[1],
             timestamp=TimestampMS(entry[3]),
             balance=Balance(amount, usd_value),
-            withdrawal_address=entry[4],  # type: ignore  # exists for these events
+            withdrawal_address=cache.string(entry[4]),  # type: ignore  # exists for these events
             validator_index=entry[8],
             is_exit=bool(entry[9]),
         )
@@ -236,6 +253,7 @@ class EthWithdrawalEvent(EthStakingEvent):
 
 class EthBlockEvent(EthStakingEvent):
     """An ETH block production/MEV event"""
+    __slots__ = ('validator_index', 'is_exit_or_blocknumber')
 
     def __init__(
             self,
@@ -293,16 +311,22 @@ class EthBlockEvent(EthStakingEvent):
         return super().serialize() | {'validator_index': self.validator_index, 'block_number': self.is_exit_or_blocknumber}  # noqa: E501
 
     @classmethod
-    def deserialize_from_db(cls: type['EthBlockEvent'], entry: tuple) -> 'EthBlockEvent':
+    def deserialize_from_db(
+            cls: type['EthBlockEvent'],
+            entry: tuple,
+            cache: Optional[DBDeserializationCache] = None,
+    ) -> 'EthBlockEvent':
         entry = cast(ETH_STAKING_EVENT_DB_TUPLE_READ, entry)
-        amount = deserialize_fval(entry[5], 'amount', 'eth block event')
-        usd_value = deserialize_fval(entry[6], 'usd_value', 'eth block event')
+        if cache is None:
+            cache = DBDeserializationCache()
+        amount = cache.fval(entry[5], 'amount', 'eth block event')
+        usd_value = cache.fval(entry[6], 'usd_value', 'eth block event')
         return cls(
             identifier=entry[0],
             event_identifier=entry[1],
             timestamp=TimestampMS(entry[3]),
             balance=Balance(amount, usd_value),
-            fee_recipient=entry[4],  # type: ignore  # exists for these events
+            fee_recipient=cache.string(entry[4]),  # type: ignore  # exists for these events
             validator_index=entry[8],
             block_number=entry[9],
             is_mev_reward=entry[7] == HistoryEventSubType.MEV_REWARD.serialize(),
@@ -370,6 +394,7 @@ class EthBlockEvent(EthStakingEvent):
 
 class EthDepositEvent(EvmEvent, EthStakingEvent):  # noqa: PLW1641  # hash in superclass
     """An ETH deposit event"""
+    __slots__ = ('validator_index', 'is_exit_or_blocknumber')
 
     def __init__(
             self,
@@ -434,17 +459,23 @@ class EthDepositEvent(EvmEvent, EthStakingEvent):  # noqa: PLW1641  # hash in su
         return super().serialize() | {'validator_index': self.validator_index}
 
     @classmethod
-    def deserialize_from_db(cls: type['EthDepositEvent'], entry: tuple) -> 'EthDepositEvent':
+    def deserialize_from_db(
+            cls: type['EthDepositEvent'],
+            entry: tuple,
+            cache: Optional[DBDeserializationCache] = None,
+    ) -> 'EthDepositEvent':
         entry = cast(EVM_DEPOSIT_EVENT_DB_TUPLE_READ, entry)
-        amount = deserialize_fval(entry[5], 'amount', 'eth deposit event')
-        usd_value = deserialize_fval(entry[6], 'usd_value', 'eth deposit event')
+        if cache is None:
+            cache = DBDeserializationCache()
+        amount = cache.fval(entry[5], 'amount', 'eth deposit event')
+        usd_value = cache.fval(entry[6], 'usd_value', 'eth deposit event')
         return cls(
-            tx_hash=deserialize_evm_tx_hash(entry[7]),
+            tx_hash=cache.value(deserialize_evm_tx_hash, entry[7]),
             validator_index=entry[8],
             sequence_index=entry[2],
             timestamp=TimestampMS(entry[3]),
             balance=Balance(amount, usd_value),
-            depositor=entry[4],  # type: ignore  # exists for these events
+            depositor=cache.string(entry[4]),  # type: ignore  # exists for these events
             identifier=entry[0],
             event_identifier=entry[1],
         )
@@ -8,6 +8,7 @@ from rotkehlchen.accounting.mixins.event import AccountingEventMixin, Accounting
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.accounting.structures.base import (
     HISTORY_EVENT_DB_TUPLE_WRITE,
+    DBDeserializationCache,
     HistoryBaseEntry,
     HistoryBaseEntryType,
     get_event_type_identifier,
@@ -23,7 +24,7 @@ from rotkehlchen.assets.asset import Asset
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.serialization.deserialize import deserialize_fval, deserialize_optional
+from rotkehlchen.serialization.deserialize import deserialize_optional
 from rotkehlchen.types import (
     ChecksumEvmAddress,
     EVMTxHash,
@@ -77,6 +78,7 @@ class EvmEvent(HistoryBaseEntry):  # noqa: PLW1641  # hash in superclass
     for events that need to keep extra information such as the CDP ID of a makerdao vault etc.
     """
 
+    __slots__ = ('address', 'tx_hash', 'counterparty', 'product', 'extra_data')
     # need explicitly define due to also changing eq: https://stackoverflow.com/a/53519136/110395
     __hash__ = HistoryBaseEntry.__hash__
 
@@ -182,8 +184,14 @@ class EvmEvent(HistoryBaseEntry):  # noqa: PLW1641  # hash in superclass
         return result
 
     @classmethod
-    def deserialize_from_db(cls: type['EvmEvent'], entry: tuple) -> 'EvmEvent':
+    def deserialize_from_db(
+            cls: type['EvmEvent'],
+            entry: tuple,
+            cache: Optional[DBDeserializationCache] = None,
+    ) -> 'EvmEvent':
         entry = cast(EVM_EVENT_DB_TUPLE_READ, entry)
+        if cache is None:
+            cache = DBDeserializationCache()
         extra_data = None
         if entry[16] is not None:
             try:
@@ -194,24 +202,25 @@ class EvmEvent(HistoryBaseEntry):  # noqa: PLW1641  # hash in superclass
                     f'{entry} from the DB due to {e!s}. Setting it to null',
                 )
 
-        amount = deserialize_fval(entry[7], 'amount', 'evm event')
-        usd_value = deserialize_fval(entry[8], 'usd_value', 'evm event')
         return cls(
             identifier=entry[0],
-            event_identifier=entry[1],
+            event_identifier=cache.string(entry[1]),
             sequence_index=entry[2],
             timestamp=TimestampMS(entry[3]),
-            location=Location.deserialize_from_db(entry[4]),
-            location_label=entry[5],
-            asset=Asset(entry[6]).check_existence(),
-            balance=Balance(amount, usd_value),
+            location=cache.value(Location.deserialize_from_db, entry[4]),
+            location_label=cache.string(entry[5]),
+            asset=cache.asset(entry[6]),
+            balance=Balance(
+                amount=cache.fval(entry[7], 'amount', 'evm event'),
+                usd_value=cache.fval(entry[8], 'usd_value', 'evm event'),
+            ),
             notes=entry[9],
-            event_type=HistoryEventType.deserialize(entry[10]),
-            event_subtype=HistoryEventSubType.deserialize(entry[11]),
-            tx_hash=deserialize_evm_tx_hash(entry[12]),
-            counterparty=entry[13],
-            product=EvmProduct.deserialize(entry[14]) if entry[14] is not None else None,
-            address=deserialize_optional(input_val=entry[15], fn=string_to_evm_address),
+            event_type=cache.value(HistoryEventType.deserialize, entry[10]),
+            event_subtype=cache.value(HistoryEventSubType.deserialize, entry[11]),
+            tx_hash=cache.value(deserialize_evm_tx_hash, entry[12]),
+            counterparty=cache.string(entry[13]),
+            product=cache.value(EvmProduct.deserialize, entry[14]) if entry[14] is not None else None,  # noqa: E501
+            address=cache.value(string_to_evm_address, entry[15]) if entry[15] is not None else None,  # noqa: E501
             extra_data=extra_data,
         )
 
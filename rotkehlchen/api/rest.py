@@ -105,8 +105,10 @@ from rotkehlchen.constants.limits import (
     FREE_USER_NOTES_LIMIT,
 )
 from rotkehlchen.constants.misc import (
+    DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
     DEFAULT_MAX_LOG_BACKUP_FILES,
     DEFAULT_MAX_LOG_SIZE_IN_MB,
+    DEFAULT_MAX_WORKER_PROCESSES,
     DEFAULT_SQL_VM_INSTRUCTIONS_CB,
     HTTP_STATUS_INTERNAL_DB_ERROR,
 )
@@ -132,6 +134,7 @@ from rotkehlchen.db.filtering import (
     AssetMovementsFilterQuery,
     AssetsFilterQuery,
     CustomAssetsFilterQuery,
+    DBFilterKeyset,
     Eth2DailyStatsFilterQuery,
     EthStakingEventFilterQuery,
     EvmEventFilterQuery,
@@ -199,7 +202,12 @@ from rotkehlchen.inquirer import CurrentPriceOracle, Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import PremiumCredentials
 from rotkehlchen.rotkehlchen import Rotkehlchen
-from rotkehlchen.serialization.serialize import process_result, process_result_list
+from rotkehlchen.serialization.serialize import (
+    STREAMING_LIST_THRESHOLD,
+    iter_json_chunks,
+    process_result,
+    process_result_list,
+)
 from rotkehlchen.tasks.utils import query_missing_prices_of_base_entries
 from rotkehlchen.types import (
     AVAILABLE_MODULES_MAP,
@@ -261,6 +269,11 @@ def _wrap_in_ok_result(result: Any) -> dict[str, Any]:
     return {'result': result, 'message': ''}
 
 
+def _serialize_next_cursor(keyset: Optional[DBFilterKeyset]) -> Optional[str]:
+    """The opaque cursor of the next page given to the API consumers"""
+    return None if keyset is None else keyset.serialize()
+
+
 def _wrap_in_result(result: Any, message: str) -> dict[str, Any]:
     return {'result': result, 'message': message}
 
@@ -297,10 +310,42 @@ def api_response(
     return response
 
 
+def streamed_api_response(
+        result: dict[str, Any],
+        status_code: HTTPStatus = HTTPStatus.OK,
+) -> Response:
+    """Like api_response but the result is processed and JSON encoded lazily while the
+    response body is being sent. Used for responses containing big lists of entries.
+
+    The result is not logged since that would require buffering the whole body.
+    """
+    return Response(
+        iter_json_chunks(result),
+        status=status_code,
+        mimetype='application/json',
+        headers={'rotki-log-result': 'False'},  # popped by after request callback
+    )
+
+
+def _has_many_entries(result: Any) -> bool:
+    """Check if a result contains an entries list big enough to be worth streaming"""
+    return (
+        isinstance(result, dict) and
+        isinstance(entries := result.get('entries'), list) and
+        len(entries) >= STREAMING_LIST_THRESHOLD
+    )
+
+
 def make_response_from_dict(response_data: dict[str, Any]) -> Response:
     result = response_data.get('result')
     message = response_data.get('message', '')
     status_code = response_data.get('status_code', HTTPStatus.OK)
+    if _has_many_entries(result):
+        return streamed_api_response(
+            result=_wrap_in_result(result=result, message=message),
+            status_code=status_code,
+        )
+
     return api_response(
         result=process_result(_wrap_in_result(result=result, message=message)),
         status_code=status_code,
@@ -452,6 +497,13 @@ class RestAPI:
             result_dict = _wrap_in_ok_result(process_result(self.rotkehlchen.get_settings(cursor)))
         return api_response(result=result_dict, status_code=HTTPStatus.OK)
 
+    def get_task_scheduler_status(self) -> Response:
+        task_manager = self.rotkehlchen.task_manager
+        assert task_manager is not None, 'task manager should exist for a logged in user'
+        with task_manager.schedule_lock:  # don't read it in the middle of a scheduling round
+            result = task_manager.get_scheduler_status()
+        return api_response(result=_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
+
     def query_tasks_outcome(self, task_id: Optional[int]) -> Response:
         if task_id is None:
             # If no task id is given return list of all pending and completed tasks
@@ -516,7 +568,7 @@ class RestAPI:
                 fiat_currencies.append(asset.resolve_to_fiat_asset())
                 continue
 
-            usd_price = Inquirer().find_usd_price(asset)
+            usd_price = Inquirer().find_usd_price(asset, allow_stale=True)
             if usd_price == ZERO_PRICE:
                 asset_rates[asset] = ZERO_PRICE
             else:
@@ -644,7 +696,10 @@ class RestAPI:
         final_balances = {}
         error_msg = ''
         for exchange_obj in self.rotkehlchen.exchange_manager.iterate_exchanges():
-            balances, msg = exchange_obj.query_balances(ignore_cache=ignore_cache)
+            balances, msg = exchange_obj.query_balances(
+                ignore_cache=ignore_cache,
+                allow_stale=True,
+            )
             if balances is None:
                 error_msg += msg
             else:
@@ -683,7 +738,7 @@ class RestAPI:
 
         balances: dict[AssetWithOracles, Balance] = {}
         for exchange in exchanges_list:
-            result, msg = exchange.query_balances(ignore_cache=ignore_cache)
+            result, msg = exchange.query_balances(ignore_cache=ignore_cache, allow_stale=True)
             if result is None:
                 return {
                     'result': result,
@@ -781,6 +836,12 @@ class RestAPI:
                     entries_table='trades',
                 ),
                 'entries_limit': FREE_TRADES_LIMIT if self.rotkehlchen.premium is None else -1,
+                'next_cursor': _serialize_next_cursor(filter_query.next_keyset(
+                    cursor=cursor,
+                    table='trades',
+                    key=trades[-1].identifier,
+                    entries_num=len(trades),
+                ) if len(trades) != 0 else None),
             }
 
         return {'result': result, 'message': '', 'status_code': HTTPStatus.OK}
@@ -901,6 +962,12 @@ class RestAPI:
                 'entries_total': self.rotkehlchen.data.db.get_entries_count(cursor, 'asset_movements'),  # noqa: E501
                 'entries_found': filter_total_found,
                 'entries_limit': limit,
+                'next_cursor': _serialize_next_cursor(filter_query.next_keyset(
+                    cursor=cursor,
+                    table='asset_movements',
+                    key=movements[-1].identifier,
+                    entries_num=len(movements),
+                ) if len(movements) != 0 else None),
             }
 
         return {'result': result, 'message': msg, 'status_code': status_code}
@@ -1337,6 +1404,13 @@ class RestAPI:
         types = [str(x) for x in AssetType if x not in ASSET_TYPES_EXCLUDED_FOR_USERS]
         return api_response(_wrap_in_ok_result(types), status_code=HTTPStatus.OK)
 
+    @staticmethod
+    def get_assets_cache_stats() -> Response:
+        return api_response(
+            _wrap_in_ok_result(AssetResolver.cache_stats()),
+            status_code=HTTPStatus.OK,
+        )
+
     def add_user_asset(self, asset: AssetWithOracles) -> Response:
         globaldb = GlobalDBHandler()
         # There is no good way to figure out if an asset already exists in the DB
@@ -2004,6 +2078,8 @@ class RestAPI:
                 'max_logfiles_num': DEFAULT_MAX_LOG_BACKUP_FILES,
                 'max_size_in_mb_all_logs': DEFAULT_MAX_LOG_SIZE_IN_MB,
                 'sqlite_instructions': DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+                'max_worker_processes': DEFAULT_MAX_WORKER_PROCESSES,
+                'max_size_in_mb_asset_cache': DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
             },
         }
         return api_response(_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
@@ -2695,6 +2771,12 @@ class RestAPI:
                     **kwargs,  # type: ignore[arg-type]
                 ),
                 'entries_limit': FREE_ETH_TX_LIMIT if self.rotkehlchen.premium is None else -1,
+                'next_cursor': _serialize_next_cursor(filter_query.next_keyset(
+                    cursor=cursor,
+                    table='evm_transactions',
+                    key=transactions[-1].db_id,
+                    entries_num=len(transactions),
+                ) if len(transactions) != 0 else None),
             }
 
         return {'result': result, 'message': message, 'status_code': status_code}
@@ -2873,6 +2955,7 @@ class RestAPI:
                         to_asset=target_asset,
                         ignore_cache=ignore_cache,
                         match_main_currency=True,
+                        allow_stale=True,
                     )
                     assets_price[asset] = [price, oracle.value, used_main_currency]
             else:
@@ -3090,6 +3173,7 @@ class RestAPI:
             price=price,
         )
         added = GlobalDBHandler().add_single_historical_price(historical_price)
+        PriceHistorian.forget_memoized_prices(from_asset=from_asset, to_asset=to_asset)
         if added:
             return api_response(OK_RESULT, status_code=HTTPStatus.OK)
         return api_response(
@@ -3112,6 +3196,7 @@ class RestAPI:
             price=price,
         )
         edited = GlobalDBHandler().edit_manual_price(historical_price)
+        PriceHistorian.forget_memoized_prices(from_asset=from_asset, to_asset=to_asset)
         if edited:
             return api_response(OK_RESULT, status_code=HTTPStatus.OK)
         return api_response(
@@ -3136,6 +3221,7 @@ class RestAPI:
             timestamp: Timestamp,
     ) -> Response:
         deleted = GlobalDBHandler().delete_manual_price(from_asset, to_asset, timestamp)
+        PriceHistorian.forget_memoized_prices(from_asset=from_asset, to_asset=to_asset)
         if deleted:
             return api_response(OK_RESULT, status_code=HTTPStatus.OK)
         return api_response(
@@ -3465,8 +3551,14 @@ class RestAPI:
             )
             entries_total = self.rotkehlchen.data.db.get_entries_count(
                 cursor=cursor,
-                entries_table='history_events',
-                group_by='event_identifier' if group_by_event_ids else None,
+                entries_table='history_events_groups' if group_by_event_ids else 'history_events',
+            )
+            next_keyset = dbevents.get_next_keyset(
+                cursor=cursor,
+                filter_query=filter_query,
+                events=events_result,
+                has_premium=has_premium,
+                group_by_event_ids=group_by_event_ids,
             )
             location = filter_query.location
             chain_id = ChainID(Location.to_chain_id(location)) if location in EVM_LOCATIONS else None  # noqa: E501
@@ -3503,10 +3595,13 @@ class RestAPI:
             'entries_found': entries_with_limit,
             'entries_limit': entries_limit,
             'entries_total': entries_total,
+            'next_cursor': _serialize_next_cursor(next_keyset),
         }
         if has_premium is False:
             result['entries_found_total'] = entries_found
 
+        if _has_many_entries(result):
+            return streamed_api_response(_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
         return api_response(_wrap_in_ok_result(result), status_code=HTTPStatus.OK)
 
     @async_api_call()
@@ -3866,6 +3961,14 @@ class RestAPI:
                 'value': self.rotkehlchen.args.sqlite_instructions,
                 'is_default': self.rotkehlchen.args.sqlite_instructions == DEFAULT_SQL_VM_INSTRUCTIONS_CB,  # noqa: E501
             },
+            'max_worker_processes': {
+                'value': self.rotkehlchen.args.max_worker_processes,
+                'is_default': self.rotkehlchen.args.max_worker_processes == DEFAULT_MAX_WORKER_PROCESSES,  # noqa: E501
+            },
+            'max_size_in_mb_asset_cache': {
+                'value': self.rotkehlchen.args.max_size_in_mb_asset_cache,
+                'is_default': self.rotkehlchen.args.max_size_in_mb_asset_cache == DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,  # noqa: E501
+            },
         }
         return api_response(_wrap_in_ok_result(config), status_code=HTTPStatus.OK)
 
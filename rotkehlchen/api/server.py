@@ -34,6 +34,7 @@ from rotkehlchen.api.v1.resources import (
     AssetIconFileResource,
     AssetIconsResource,
     AssetMovementsResource,
+    AssetsCacheResource,
     AssetsMappingResource,
     AssetsReplaceResource,
     AssetsSearchLevenshteinResource,
@@ -133,6 +134,7 @@ from rotkehlchen.api.v1.resources import (
     StatisticsValueDistributionResource,
     SupportedChainsResource,
     TagsResource,
+    TaskSchedulerResource,
     TradesResource,
     TypesMappingsResource,
     UserAssetsResource,
@@ -171,6 +173,7 @@ URLS_V1: URLS = [
     ('/settings/configuration', ConfigurationsResource),
     ('/tasks', AsyncTasksResource),
     ('/tasks/<int:task_id>', AsyncTasksResource, 'specific_async_tasks_resource'),
+    ('/tasks/scheduler', TaskSchedulerResource),
     ('/exchange_rates', ExchangeRatesResource),
     ('/external_services', ExternalServicesResource),
     ('/oracles', OraclesResource),
@@ -280,6 +283,7 @@ URLS_V1: URLS = [
     ),
     ('/assets', OwnedAssetsResource),
     ('/assets/types', AssetsTypesResource),
+    ('/assets/cache', AssetsCacheResource),
     ('/assets/replace', AssetsReplaceResource),
     ('/assets/all', AllAssetsResource),
     ('/assets/mappings', AssetsMappingResource),
@@ -491,6 +495,7 @@ class APIServer:
 
     def stop(self, timeout: int = 5) -> None:
         """Stops the API server. If handlers are running after timeout they are killed"""
+        self.rotki_notifier.flush()  # send what's pending while the websockets are open
         if self.wsgiserver is not None:
             self.wsgiserver.stop(timeout)
             self.wsgiserver = None
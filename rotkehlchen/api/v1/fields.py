@@ -25,6 +25,7 @@ from rotkehlchen.chain.bitcoin.hdkey import HDKey
 from rotkehlchen.chain.bitcoin.utils import is_valid_derivation_path
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.misc import NFT_DIRECTIVE
+from rotkehlchen.db.filtering import DBFilterKeyset
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.errors.misc import XPUBError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -945,6 +946,21 @@ class HistoricalPriceOracleField(fields.Field):
         return historical_price_oracle
 
 
+class PaginationCursorField(fields.Field):
+
+    def _deserialize(
+            self,
+            value: str,
+            attr: Optional[str],  # pylint: disable=unused-argument
+            data: Optional[Mapping[str, Any]],
+            **_kwargs: Any,
+    ) -> DBFilterKeyset:
+        try:
+            return DBFilterKeyset.deserialize(value)
+        except DeserializationError as e:
+            raise ValidationError(str(e)) from e
+
+
 class NonEmptyList(fields.List):
 
     def _deserialize(
@@ -420,6 +420,13 @@ class AsyncTasksResource(BaseMethodView):
         return self.rest_api.query_tasks_outcome(task_id=task_id)
 
 
+class TaskSchedulerResource(BaseMethodView):
+
+    @require_loggedin_user()
+    def get(self) -> Response:
+        return self.rest_api.get_task_scheduler_status()
+
+
 class ExchangeRatesResource(BaseMethodView):
 
     get_schema = ExchangeRatesSchema()
@@ -828,6 +835,12 @@ class AssetsTypesResource(BaseMethodView):
         return self.rest_api.get_asset_types()
 
 
+class AssetsCacheResource(BaseMethodView):
+
+    def get(self) -> Response:
+        return self.rest_api.get_assets_cache_stats()
+
+
 class AssetsReplaceResource(BaseMethodView):
 
     put_schema = AssetsReplaceSchema()
@@ -131,6 +131,7 @@ from .fields import (
     LocationField,
     MaybeAssetField,
     NonEmptyList,
+    PaginationCursorField,
     PositiveAmountField,
     PriceField,
     SerializableEnumField,
@@ -202,6 +203,10 @@ class DBPaginationSchema(Schema):
     offset = fields.Integer(load_default=None)
 
 
+class DBKeysetPaginationSchema(DBPaginationSchema):
+    cursor = PaginationCursorField(load_default=None)
+
+
 class DBOrderBySchema(Schema):
     order_by_attributes = DelimitedOrNormalList(fields.String(), load_default=None)
     ascending = DelimitedOrNormalList(fields.Boolean(), load_default=None)  # most recent first by default  # noqa: E501
@@ -252,7 +257,7 @@ class EvmTransactionQuerySchema(
         AsyncQueryArgumentSchema,
         TimestampRangeSchema,
         OnlyCacheQuerySchema,
-        DBPaginationSchema,
+        DBKeysetPaginationSchema,
         DBOrderBySchema,
 ):
     accounts = fields.List(
@@ -310,6 +315,7 @@ class EvmTransactionQuerySchema(
             to_ts=data['to_timestamp'],
             chain_id=data['evm_chain'],
         )
+        filter_query.keyset = data['cursor']
 
         return {
             'async_query': data['async_query'],
@@ -383,7 +389,7 @@ class TradesQuerySchema(
         AsyncQueryArgumentSchema,
         TimestampRangeSchema,
         OnlyCacheQuerySchema,
-        DBPaginationSchema,
+        DBKeysetPaginationSchema,
         DBOrderBySchema,
 ):
     base_asset = AssetField(expected_type=Asset, load_default=None)
@@ -465,6 +471,7 @@ class TradesQuerySchema(
             location=data['location'],
             trades_idx_to_ignore=trades_idx_to_ignore,
         )
+        filter_query.keyset = data['cursor']
 
         return {
             'async_query': data['async_query'],
@@ -606,7 +613,7 @@ class TypesAndCounterpatiesFiltersSchema(Schema):
 class HistoryEventSchema(
     TypesAndCounterpatiesFiltersSchema,
     TimestampRangeSchema,
-    DBPaginationSchema,
+    DBKeysetPaginationSchema,
     DBOrderBySchema,
 ):
     """Schema for quering history events"""
@@ -725,6 +732,7 @@ class HistoryEventSchema(
         else:
             filter_query = HistoryEventFilterQuery.make(**common_arguments)
 
+        filter_query.keyset = data['cursor']
         return self.generate_fields_post_validation(data) | {
             'filter_query': filter_query,
         }
@@ -892,7 +900,7 @@ class AssetMovementsQuerySchema(
         AsyncQueryArgumentSchema,
         TimestampRangeSchema,
         OnlyCacheQuerySchema,
-        DBPaginationSchema,
+        DBKeysetPaginationSchema,
         DBOrderBySchema,
 ):
     asset = AssetField(expected_type=Asset, load_default=None)
@@ -959,6 +967,7 @@ class AssetMovementsQuerySchema(
             action=[data['action']] if data['action'] is not None else None,
             location=data['location'],
         )
+        filter_query.keyset = data['cursor']
         return {
             'async_query': data['async_query'],
             'only_cache': data['only_cache'],
@@ -1,21 +1,67 @@
 import json
 import logging
+import time
 from contextlib import suppress
-from typing import TYPE_CHECKING, Any, Callable, Optional, Union
+from dataclasses import dataclass
+from typing import Any, Callable, NamedTuple, Optional, Union
 
+import gevent
 from gevent.lock import Semaphore
 from geventwebsocket import WebSocketApplication
 from geventwebsocket.exceptions import WebSocketError
 from geventwebsocket.websocket import WebSocket
 
+from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 
-if TYPE_CHECKING:
-    from rotkehlchen.api.websockets.typedefs import WSMessageType
-
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Seconds for which broadcast messages are held back so that they can be coalesced
+DEFAULT_COALESCE_INTERVAL = 0.25
+# Maximum number of messages waiting to be sent before they are flushed regardless of time
+MAX_PENDING_MESSAGES = 100
+
+
+def _status_key(*fields: str) -> Callable[[Union[dict[str, Any], list[Any]]], tuple]:
+    def key(data: Union[dict[str, Any], list[Any]]) -> tuple:
+        if isinstance(data, list):
+            return ()
+        return tuple(data.get(x) for x in fields)
+    return key
+
+
+# Progress and status message types for which only the latest message is sent per flush.
+# The function returns what identifies the progress reported by a message, so that for
+# example status updates for different addresses are not merged with each other.
+LATEST_WINS_MESSAGE_TYPES: dict[WSMessageType, Callable[[Union[dict[str, Any], list[Any]]], tuple]] = {  # noqa: E501
+    WSMessageType.EVM_TRANSACTION_STATUS: _status_key('address', 'evm_chain', 'status'),
+    WSMessageType.HISTORY_EVENTS_STATUS: _status_key('location', 'name', 'event_type', 'status'),
+    WSMessageType.DB_UPGRADE_STATUS: _status_key(),
+    WSMessageType.DATA_MIGRATION_STATUS: _status_key(),
+    WSMessageType.CSV_IMPORT_STATUS: _status_key('source'),
+}
+
+
+class PendingMessage(NamedTuple):
+    message_type: WSMessageType
+    to_send_data: Union[dict[str, Any], list[Any]]
+    success_callback: Optional[Callable]
+    success_callback_args: Optional[dict[str, Any]]
+    failure_callback: Optional[Callable]
+    failure_callback_args: Optional[dict[str, Any]]
+
+
+@dataclass
+class BroadcastCounters:
+    """Counters of what happened to the messages given to the notifier"""
+    sent: int = 0  # messages sent to at least one subscriber
+    merged: int = 0  # messages replaced by a newer message of the same progress
+    dropped: int = 0  # messages that could not be sent at all
+
+    def serialize(self) -> dict[str, int]:
+        return {'sent': self.sent, 'merged': self.merged, 'dropped': self.dropped}
+
 
 def _ws_send_impl(
         websocket: WebSocket,
@@ -43,10 +89,25 @@ def _ws_send_impl(
 
 
 class RotkiNotifier:
+    """Sends messages to all websocket subscribers
 
-    def __init__(self) -> None:
+    Messages are not sent right away but held back for up to `coalesce_interval` seconds.
+    For the progress/status types of LATEST_WINS_MESSAGE_TYPES only the latest message
+    of each progress is sent, at the position of the first one it replaced. All messages
+    are sent in order as a batch. A `coalesce_interval` of 0 sends every message immediately.
+    Pending messages need to be flushed before the notifier stops being used.
+    """
+
+    def __init__(self, coalesce_interval: float = DEFAULT_COALESCE_INTERVAL) -> None:
         self.subscribers: list[WebSocket] = []
         self.locks: dict[WebSocket, Semaphore] = {}
+        self.coalesce_interval = coalesce_interval
+        self.counters = BroadcastCounters()
+        # insertion ordered so that messages are sent in the order they were broadcast
+        self.pending: dict[tuple, PendingMessage] = {}
+        self.pending_idx = 0  # used to give a unique key to each non coalesced message
+        self.last_flush_ts = 0.0
+        self.flush_greenlet: Optional[gevent.Greenlet] = None
 
     def subscribe(self, websocket: WebSocket) -> None:
         log.info(f'Websocket with hash id {hash(websocket)} subscribed to rotki notifier')
@@ -57,11 +118,14 @@ class RotkiNotifier:
         self.locks.pop(websocket, None)
         with suppress(ValueError):
             self.subscribers.remove(websocket)
-            log.info(f'Websocket with hash id {hash(websocket)} unsubscribed from rotki notifier')
+            log.info(
+                f'Websocket with hash id {hash(websocket)} unsubscribed from rotki notifier. '
+                f'Broadcast counters: {self.counters.serialize()}',
+            )
 
     def broadcast(
             self,
-            message_type: 'WSMessageType',
+            message_type: WSMessageType,
             to_send_data: Union[dict[str, Any], list[Any]],
             success_callback: Optional[Callable] = None,
             success_callback_args: Optional[dict[str, Any]] = None,
@@ -71,13 +135,61 @@ class RotkiNotifier:
         """Broadcasts a websocket message
 
         A callback to run on message success and a callback to run on message
-        failure can be optionally provided.
+        failure can be optionally provided. Callbacks of a message that gets merged
+        into a newer one are not called.
         """
-        message_data = {'type': str(message_type), 'data': to_send_data}
+        message = PendingMessage(
+            message_type=message_type,
+            to_send_data=to_send_data,
+            success_callback=success_callback,
+            success_callback_args=success_callback_args,
+            failure_callback=failure_callback,
+            failure_callback_args=failure_callback_args,
+        )
+        if self.coalesce_interval == 0 or len(self.subscribers) == 0:
+            # nothing to coalesce with no subscribers. Fail right away so that the
+            # caller can fall back to another way of reaching the user.
+            self._send(message)
+            return
+
+        if (key_function := LATEST_WINS_MESSAGE_TYPES.get(message_type)) is not None:
+            key = (message_type, *key_function(to_send_data))
+            if key in self.pending:
+                self.counters.merged += 1  # replaced below, keeping the position of the first
+        else:
+            key = (self.pending_idx,)
+            self.pending_idx += 1
+
+        self.pending[key] = message
+        now = time.monotonic()
+        if len(self.pending) >= MAX_PENDING_MESSAGES or now - self.last_flush_ts >= self.coalesce_interval:  # noqa: E501
+            # also flush from here so that progress is reported when the producer
+            # does not yield to the timer greenlet for a long time
+            self.flush()
+        elif self.flush_greenlet is None:
+            self.flush_greenlet = gevent.spawn_later(self.coalesce_interval, self.flush)
+
+    def flush(self) -> None:
+        """Sends all pending messages"""
+        self.last_flush_ts = time.monotonic()
+        if self.flush_greenlet is not None and self.flush_greenlet != gevent.getcurrent():
+            self.flush_greenlet.kill(block=False)
+        self.flush_greenlet = None
+        pending, self.pending = self.pending, {}
+        for message in pending.values():
+            self._send(message)
+
+    def _send(self, pending_message: PendingMessage) -> None:
+        """Sends a single message to all subscribers and runs the respective callback"""
+        message_type = pending_message.message_type
+        failure_callback = pending_message.failure_callback
+        failure_callback_args = pending_message.failure_callback_args
+        message_data = {'type': str(message_type), 'data': pending_message.to_send_data}
         try:
             message = json.dumps(message_data)
         except TypeError as e:
             log.error(f'Failed to broadcast websocket {message_type} message due to {e!s}')
+            self.counters.dropped += 1
             if failure_callback is not None:
                 failure_callback_args = {} if failure_callback_args is None else failure_callback_args  # noqa: E501
                 failure_callback(**failure_callback_args)
@@ -95,8 +207,8 @@ class RotkiNotifier:
                 websocket=websocket,
                 lock=self.locks[websocket],
                 to_send_msg=message,
-                success_callback=success_callback,
-                success_callback_args=success_callback_args,
+                success_callback=pending_message.success_callback,
+                success_callback_args=pending_message.success_callback_args,
                 failure_callback=failure_callback,
                 failure_callback_args=failure_callback_args,
             )
@@ -106,9 +218,13 @@ class RotkiNotifier:
             self.subscribers = [
                 i for j, i in enumerate(self.subscribers) if j not in to_remove_indices
             ]
-        if spawned_one_broadcast is False and failure_callback is not None:
-            failure_callback_args = {} if failure_callback_args is None else failure_callback_args
-            failure_callback(**failure_callback_args)
+        if spawned_one_broadcast is False:
+            self.counters.dropped += 1
+            if failure_callback is not None:
+                failure_callback_args = {} if failure_callback_args is None else failure_callback_args  # noqa: E501
+                failure_callback(**failure_callback_args)
+        else:
+            self.counters.sent += 1
 
 
 class RotkiWSApp(WebSocketApplication):
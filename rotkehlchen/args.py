@@ -4,8 +4,10 @@ from collections.abc import Sequence
 from typing import Any, Optional, Union
 
 from rotkehlchen.constants.misc import (
+    DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
     DEFAULT_MAX_LOG_BACKUP_FILES,
     DEFAULT_MAX_LOG_SIZE_IN_MB,
+    DEFAULT_MAX_WORKER_PROCESSES,
     DEFAULT_SQL_VM_INSTRUCTIONS_CB,
 )
 from rotkehlchen.utils.misc import get_system_spec
@@ -131,6 +133,24 @@ def app_args(prog: str, description: str) -> argparse.ArgumentParser:
         default=DEFAULT_SQL_VM_INSTRUCTIONS_CB,
         type=_positive_int_or_zero,
     )
+    p.add_argument(
+        '--max-worker-processes',
+        help=(
+            'Number of worker processes used to offload CPU heavy work from the main '
+            'process. Should be a positive integer or zero to disable.'
+        ),
+        default=DEFAULT_MAX_WORKER_PROCESSES,
+        type=_positive_int_or_zero,
+    )
+    p.add_argument(
+        '--max-size-in-mb-asset-cache',
+        help=(
+            'This is the maximum size in megabytes that will be used for the in memory '
+            'cache of resolved assets. Should be a positive integer or zero to disable.'
+        ),
+        default=DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
+        type=_positive_int_or_zero,
+    )
     p.add_argument(
         'version',
         help='Shows the rotki version',
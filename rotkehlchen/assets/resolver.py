@@ -1,10 +1,13 @@
 import logging
-from typing import TYPE_CHECKING, Optional, TypeVar
+import sys
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Optional, TypeVar
 
 from rotkehlchen.assets.types import AssetType
+from rotkehlchen.constants.misc import DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.utils.data_structures import LRUCacheLowerKey
+from rotkehlchen.utils.data_structures import AdaptiveLRUCacheLowerKey
 
 if TYPE_CHECKING:
     from rotkehlchen.assets.asset import (
@@ -22,13 +25,38 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 T = TypeVar('T', 'FiatAsset', 'CryptoAsset', 'EvmToken', 'Nft', 'AssetWithNameAndType', 'AssetWithSymbol', 'AssetWithOracles')  # noqa: E501
 
+# Approximate memory taken by a cache entry on top of its key and value
+CACHE_ENTRY_OVERHEAD = 100
+# The types cache values are shared enum members so it gets a fraction of the memory
+TYPES_CACHE_MEMORY_DIVISOR = 8
+
+
+def _asset_entry_size(identifier: str, asset: Any) -> int:
+    """Estimate the memory of an asset cache entry. Field values are not followed further"""
+    return (
+        CACHE_ENTRY_OVERHEAD + sys.getsizeof(identifier) + sys.getsizeof(asset) +
+        sum(sys.getsizeof(value) for value in getattr(asset, '__dict__', {}).values())
+    )
+
+
+def _type_entry_size(identifier: str, asset_type: AssetType) -> int:  # pylint: disable=unused-argument
+    return CACHE_ENTRY_OVERHEAD + sys.getsizeof(identifier)
+
 
 class AssetResolver:
     __instance: Optional['AssetResolver'] = None
     # A cache so that the DB is not hit every time
     # the cache maps identifier -> final representation of the asset
-    assets_cache: LRUCacheLowerKey['AssetWithNameAndType'] = LRUCacheLowerKey(maxsize=512)
-    types_cache: LRUCacheLowerKey[AssetType] = LRUCacheLowerKey(maxsize=512)
+    assets_cache: AdaptiveLRUCacheLowerKey['AssetWithNameAndType'] = AdaptiveLRUCacheLowerKey(
+        maxsize=512,
+        max_memory=DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB * 1024 * 1024,
+        sizeof=_asset_entry_size,
+    )
+    types_cache: AdaptiveLRUCacheLowerKey[AssetType] = AdaptiveLRUCacheLowerKey(
+        maxsize=512,
+        max_memory=DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB * 1024 * 1024 // TYPES_CACHE_MEMORY_DIVISOR,
+        sizeof=_type_entry_size,
+    )
 
     def __new__(cls) -> 'AssetResolver':
         """Lazily initializes AssetResolver
@@ -52,6 +80,57 @@ class AssetResolver:
             AssetResolver.__instance.assets_cache.clear()
             AssetResolver.__instance.types_cache.clear()
 
+    @staticmethod
+    def set_cache_max_memory(max_memory: int) -> None:
+        """Set the memory in bytes that the caches can use, evicting entries if needed"""
+        AssetResolver.assets_cache.set_max_memory(max_memory)
+        AssetResolver.types_cache.set_max_memory(max_memory // TYPES_CACHE_MEMORY_DIVISOR)
+
+    @staticmethod
+    def cache_stats() -> dict[str, dict[str, int]]:
+        return {
+            'assets': AssetResolver.assets_cache.stats(),
+            'types': AssetResolver.types_cache.stats(),
+        }
+
+    @staticmethod
+    def resolve_assets(identifiers: Iterable[str]) -> dict[str, 'AssetWithNameAndType']:
+        """Resolve many assets querying the globaldb once for all those not in the cache
+
+        Returns a mapping of each given identifier to its asset. Identifiers of unknown
+        assets are not included in the mapping.
+        """
+        from rotkehlchen.constants.assets import CONSTANT_ASSETS  # pylint: disable=import-outside-toplevel  # isort:skip
+        from rotkehlchen.globaldb.handler import GlobalDBHandler  # pylint: disable=import-outside-toplevel  # isort:skip
+
+        instance = AssetResolver()
+        assets, missing = {}, []
+        for identifier in dict.fromkeys(identifiers):
+            if (cached_data := instance.assets_cache.get(identifier)) is not None:
+                assets[identifier] = cached_data
+            else:
+                missing.append(identifier)
+
+        if len(missing) == 0:
+            return assets
+
+        resolved_assets = GlobalDBHandler().resolve_assets(missing)
+        for identifier in missing:
+            if (asset := resolved_assets.get(identifier.lower())) is None:
+                if identifier not in CONSTANT_ASSETS:
+                    continue
+
+                log.debug(f'Attempt to resolve asset {identifier} using the packaged database')
+                try:
+                    asset = GlobalDBHandler().resolve_asset_from_packaged_and_store(identifier=identifier)  # noqa: E501
+                except UnknownAsset:
+                    continue
+
+            instance.assets_cache.add(identifier, asset)
+            assets[identifier] = asset
+
+        return assets
+
     @staticmethod
     def resolve_asset(identifier: str) -> 'AssetWithNameAndType':
         """
@@ -1,4 +1,5 @@
 import logging
+import time
 import typing
 from collections import defaultdict
 from collections.abc import Iterator, Sequence
@@ -18,6 +19,7 @@ from typing import (
 
 import requests
 from gevent.lock import Semaphore
+from gevent.pool import Pool
 from web3.exceptions import BadFunctionCallOutput
 
 from rotkehlchen.accounting.structures.balance import Balance, BalanceSheet
@@ -143,6 +145,8 @@ def _module_name_to_class(module_name: ModuleName) -> type[EthereumModule]:
 
 
 DEFI_BALANCES_REQUERY_SECONDS = 600
+# How many chains to query balances for at the same time when querying all chains
+BALANCE_QUERIES_CONCURRENCY = 6
 
 
 # Mapping to token symbols to ignore. True means all
@@ -246,6 +250,8 @@ class ChainsAggregator(CacheableMixIn, LockableQueryMixIn):
 
         # Per account balances
         self.balances = BlockchainBalances(db=database)
+        # Seconds each chain took at the last query of all chains' balances
+        self.balances_query_durations: dict[SupportedBlockchain, float] = {}
         # Per asset total balances
         self.totals: BalanceSheet = BalanceSheet()
         self.premium = premium
@@ -503,15 +509,49 @@ class ChainsAggregator(CacheableMixIn, LockableQueryMixIn):
             if ignore_cache is True and blockchain.is_bitcoin():
                 xpub_manager.check_for_new_xpub_addresses(blockchain=blockchain)  # type: ignore # is checked in the if
         else:  # all chains
-            for chain in SupportedBlockchain:
-                query_method = f'query_{chain.get_key()}_balances'
-                getattr(self, query_method)(ignore_cache=ignore_cache)
-                if ignore_cache is True and chain.is_bitcoin():
-                    xpub_manager.check_for_new_xpub_addresses(blockchain=chain)  # type: ignore # is checked in the if
+            self._query_all_chains_balances(ignore_cache=ignore_cache, xpub_manager=xpub_manager)
 
         self.totals = self.balances.recalculate_totals()
         return self.get_balances_update(blockchain)
 
+    def _query_chain_balances(
+            self,
+            chain: SupportedBlockchain,
+            ignore_cache: bool,
+            xpub_manager: XpubManager,
+    ) -> float:
+        """Queries the balances of a single chain and returns how many seconds it took"""
+        start = time.perf_counter()
+        getattr(self, f'query_{chain.get_key()}_balances')(ignore_cache=ignore_cache)
+        if ignore_cache is True and chain.is_bitcoin():
+            xpub_manager.check_for_new_xpub_addresses(blockchain=chain)  # type: ignore # is checked in the if
+        return time.perf_counter() - start
+
+    def _query_all_chains_balances(self, ignore_cache: bool, xpub_manager: XpubManager) -> None:
+        """Queries the balances of all chains concurrently, since each chain hits
+        its own backends. Each chain's query method still holds its own lock and
+        writes only to its own part of self.balances.
+
+        Raises the error of the first chain, in SupportedBlockchain order, that failed
+        after all of the queries have finished. Check query_balances for the errors.
+        """
+        pool = Pool(size=BALANCE_QUERIES_CONCURRENCY)
+        greenlets = [
+            pool.spawn(self._query_chain_balances, chain, ignore_cache, xpub_manager)
+            for chain in SupportedBlockchain
+        ]
+        pool.join()
+        self.balances_query_durations = {
+            chain: greenlet.value
+            for chain, greenlet in zip(SupportedBlockchain, greenlets, strict=True)
+            if greenlet.successful()
+        }
+        durations = ', '.join(f'{chain!s}: {duration:.2f}' for chain, duration in self.balances_query_durations.items())  # noqa: E501
+        log.debug(f'Queried the balances of all chains. Seconds per chain: {durations}')
+        for greenlet in greenlets:
+            if greenlet.exception is not None:
+                raise greenlet.exception
+
     @protect_with_lock()
     @cache_response_timewise()
     def query_btc_balances(
@@ -421,3 +421,19 @@ class HDKey:
             )
         # else
         raise AssertionError(f'Unknown hint {self.hint} ended up in an HDKey')
+
+
+def derive_children_addresses(
+        xpub: str,
+        xpub_type: Optional[XpubType],
+        indices: list[int],
+) -> list[BTCAddress]:
+    """Derive the addresses of the given children of an xpub
+
+    Works with plain types so that it can run in a worker process of the process pool.
+
+    May raise:
+    - XPUBError if there is a problem with decoding the xpub
+    """
+    root = HDKey.from_xpub(xpub=xpub, xpub_type=xpub_type)
+    return [root.derive_child(idx).address() for idx in indices]
@@ -1,17 +1,19 @@
 import logging
 from typing import TYPE_CHECKING, Any, Literal, NamedTuple, Optional
 
+import gevent
 from gevent.lock import Semaphore
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.chain.accounts import BlockchainAccountData
 from rotkehlchen.chain.bitcoin import have_bitcoin_transactions
 from rotkehlchen.chain.bitcoin.bch import have_bch_transactions
-from rotkehlchen.chain.bitcoin.hdkey import HDKey
+from rotkehlchen.chain.bitcoin.hdkey import HDKey, derive_children_addresses
 from rotkehlchen.constants.assets import A_BCH, A_BTC
 from rotkehlchen.db.utils import replace_tag_mappings
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.fval import FVal
+from rotkehlchen.greenlets.process_pool import ProcessPool
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.types import BTCAddress, SupportedBlockchain
@@ -72,29 +74,91 @@ class XpubDerivedAddressData(NamedTuple):
     balance: FVal
 
 
+# Maps (account_index, derived_index) to the address derived at that position of an xpub
+DerivedAddressesCache = dict[tuple[int, int], BTCAddress]
+
+
+def _derive_addresses_batch(
+        account_index: int,
+        start_index: int,
+        root: HDKey,
+        gap_limit: int,
+        derived_cache: DerivedAddressesCache,
+) -> list[tuple[int, BTCAddress]]:
+    """Derive the addresses of a batch, using the cache for the already derived ones.
+
+    The ones not in the cache are derived in the process pool.
+    """
+    batch_indices = range(start_index, start_index + gap_limit)
+    missing = [x for x in batch_indices if (account_index, x) not in derived_cache]
+    if len(missing) != 0:
+        assert root.xpub is not None, 'derived roots should always have an xpub'
+        derived = ProcessPool.run(
+            derive_children_addresses,
+            xpub=root.xpub,
+            xpub_type=root.xpub_type,
+            indices=missing,
+        )
+        for idx, address in zip(missing, derived, strict=True):
+            derived_cache[(account_index, idx)] = address
+
+    return [(idx, derived_cache[(account_index, idx)]) for idx in batch_indices]
+
+
+def _have_transactions(
+        blockchain: Literal[SupportedBlockchain.BITCOIN, SupportedBlockchain.BITCOIN_CASH],
+        addresses: list[BTCAddress],
+) -> dict[BTCAddress, tuple[bool, FVal]]:
+    """May raise:
+    - RemoteError: if blockstream/blockchain.info can't be reached
+    """
+    if blockchain == SupportedBlockchain.BITCOIN:
+        return have_bitcoin_transactions(addresses)
+    return have_bch_transactions(addresses)
+
+
 def _derive_addresses_loop(
         account_index: int,
         start_index: int,
         root: HDKey,
         gap_limit: int,
         blockchain: Literal[SupportedBlockchain.BITCOIN, SupportedBlockchain.BITCOIN_CASH],
+        derived_cache: DerivedAddressesCache,
 ) -> list[XpubDerivedAddressData]:
-    """May raise:
+    """Derive and check addresses in batches of gap_limit until a batch has no transactions.
+
+    While the transactions of a batch are queried the next batch is derived so that
+    the derivation happens while waiting for the network. Derived addresses are
+    taken from and added to the derived_cache.
+
+    May raise:
     - RemoteError: if blockstream/blockchain.info can't be reached
     """
     step_index = start_index
     addresses: list[XpubDerivedAddressData] = []
+    batch_addresses = _derive_addresses_batch(
+        account_index=account_index,
+        start_index=step_index,
+        root=root,
+        gap_limit=gap_limit,
+        derived_cache=derived_cache,
+    )
     should_continue = True
     while should_continue:
-        batch_addresses: list[tuple[int, BTCAddress]] = []
-        for idx in range(step_index, step_index + gap_limit):
-            child = root.derive_child(idx)
-            batch_addresses.append((idx, child.address()))
-
-        if blockchain == SupportedBlockchain.BITCOIN:
-            have_tx_mapping = have_bitcoin_transactions([x[1] for x in batch_addresses])
-        else:
-            have_tx_mapping = have_bch_transactions([x[1] for x in batch_addresses])
+        query_greenlet = gevent.spawn(
+            _have_transactions,
+            blockchain=blockchain,
+            addresses=[x[1] for x in batch_addresses],
+        )
+        gevent.sleep(0)  # let the query get sent before deriving the next batch
+        next_batch_addresses = _derive_addresses_batch(
+            account_index=account_index,
+            start_index=step_index + gap_limit,
+            root=root,
+            gap_limit=gap_limit,
+            derived_cache=derived_cache,
+        )
+        have_tx_mapping = query_greenlet.get()  # re-raises any RemoteError
         should_continue = False
         for idx, address in batch_addresses:
             have_tx, balance = have_tx_mapping[address]
@@ -122,6 +186,7 @@ def _derive_addresses_loop(
                     ))
 
         step_index += gap_limit
+        batch_addresses = next_batch_addresses
 
     return addresses
 
@@ -131,11 +196,15 @@ def _derive_addresses_from_xpub_data(
         start_receiving_index: int,
         start_change_index: int,
         gap_limit: int,
+        derived_cache: Optional[DerivedAddressesCache] = None,
 ) -> list[XpubDerivedAddressData]:
     """Derive all addresses from the xpub that have had transactions. Also includes
     any addresses until the biggest index derived addresses that have had no transactions.
     This is to make it easier to later derive and check more addresses
 
+    The receiving and change chains are checked concurrently. If a derived_cache is
+    given it is used to skip derivations and is extended with all newly derived addresses.
+
     May raise:
     - RemoteError: if blockstream/blockchain.info/haskoin and others can't be reached
     """
@@ -144,27 +213,26 @@ def _derive_addresses_from_xpub_data(
     else:
         account_xpub = xpub_data.xpub
 
-    addresses = []
-    receiving_xpub = account_xpub.derive_child(0)
-    addresses.extend(
-        _derive_addresses_loop(
-            account_index=0,
-            start_index=start_receiving_index,
-            root=receiving_xpub,
+    derived_cache = {} if derived_cache is None else derived_cache
+    greenlets = [
+        gevent.spawn(
+            _derive_addresses_loop,
+            account_index=account_index,
+            start_index=start_index,
+            root=account_xpub.derive_child(account_index),
             gap_limit=gap_limit,
             blockchain=xpub_data.blockchain,
-        ),
-    )
-    change_xpub = account_xpub.derive_child(1)
-    addresses.extend(
-        _derive_addresses_loop(
-            account_index=1,
-            start_index=start_change_index,
-            root=change_xpub,
-            gap_limit=gap_limit,
-            blockchain=xpub_data.blockchain,
-        ),
-    )
+            derived_cache=derived_cache,
+        ) for account_index, start_index in ((0, start_receiving_index), (1, start_change_index))
+    ]
+    try:
+        gevent.joinall(greenlets, raise_error=True)
+    finally:
+        gevent.killall(greenlets)  # stop the other chain's greenlet if one of them failed
+
+    addresses = []
+    for greenlet in greenlets:
+        addresses.extend(greenlet.get())
     return addresses
 
 
@@ -188,6 +256,8 @@ class XpubManager:
         May raise:
         - RemoteError: if blockstream/blockchain.info/haskoin and others can't be reached
         """
+        derived_cache = self.db.get_xpub_derived_addresses_cache(xpub_data)
+        cached_keys = set(derived_cache)
         with self.db.conn.read_ctx() as cursor:
             last_receiving_idx, last_change_idx = self.db.get_last_consecutive_xpub_derived_indices(cursor, xpub_data)  # noqa: E501
             derived_addresses_data = _derive_addresses_from_xpub_data(
@@ -195,9 +265,15 @@ class XpubManager:
                 start_receiving_index=last_receiving_idx,
                 start_change_index=last_change_idx,
                 gap_limit=self.chains_aggregator.btc_derivation_gap_limit,
+                derived_cache=derived_cache,
             )
             known_addresses = getattr(self.db.get_blockchain_accounts(cursor), xpub_data.blockchain.get_key())  # noqa: E501
 
+        self.db.add_xpub_derived_addresses_cache(
+            xpub_data=xpub_data,
+            derived_cache={k: v for k, v in derived_cache.items() if k not in cached_keys},
+        )
+
         new_addresses = []
         existing_address_data = []
         for entry in derived_addresses_data:
@@ -496,6 +496,7 @@ class Balancer(EthereumModule):
             )
             with self.database.user_write() as write_cursor:
                 add_balancer_events(write_cursor, balancer_events, self.msg_aggregator)
+            self.database.forget_owned_assets()
 
         # Calculate the balance of the events per pool at the given timestamp per address.
         # NB: take into account the current balances of each address in the protocol
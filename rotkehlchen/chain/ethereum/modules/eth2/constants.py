@@ -1,6 +1,8 @@
 VALIDATOR_STATS_QUERY_BACKOFF_EVERY_N_VALIDATORS = 30
 VALIDATOR_STATS_QUERY_BACKOFF_TIME_RANGE = 20
 VALIDATOR_STATS_QUERY_BACKOFF_TIME = 8
+# validators scraped from beaconcha.in at the same time
+BEACONCHAIN_SCRAPE_CONCURRENCY = 4
 
 LAST_PRODUCED_BLOCKS_QUERY_TS = 'last_produced_blocks_query_ts'
 LAST_WITHDRAWALS_QUERY_TS = 'last_withdrawals_query_ts'
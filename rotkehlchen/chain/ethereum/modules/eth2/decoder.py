@@ -38,6 +38,7 @@ class Eth2Decoder(DecoderInterface):
 
         validator_index = UNKNOWN_VALIDATOR_INDEX
         extra_data = None
+        self.base.save_pending_events()
         with self.base.database.conn.read_ctx() as cursor:
             result = cursor.execute(
                 'SELECT validator_index FROM eth2_validators WHERE public_key=?',
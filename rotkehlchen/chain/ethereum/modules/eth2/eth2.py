@@ -2,11 +2,12 @@ import json
 import logging
 import re
 from collections import defaultdict
-from collections.abc import Sequence
-from typing import TYPE_CHECKING, Literal, Optional, Union
+from collections.abc import Callable, Sequence
+from typing import TYPE_CHECKING, Optional, TypeVar, Union
 
 import gevent
 from gevent.lock import Semaphore
+from gevent.pool import Pool
 from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.accounting.structures.balance import Balance
@@ -20,6 +21,7 @@ from rotkehlchen.db.filtering import EvmEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.errors.api import PremiumPermissionError
 from rotkehlchen.errors.misc import InputError, RemoteError
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -30,6 +32,7 @@ from rotkehlchen.utils.interfaces import EthereumModule
 from rotkehlchen.utils.misc import from_gwei, ts_ms_to_sec, ts_now, ts_sec_to_ms
 
 from .constants import (
+    BEACONCHAIN_SCRAPE_CONCURRENCY,
     CPT_ETH2,
     FREE_VALIDATORS_LIMIT,
     LAST_WITHDRAWALS_QUERY_TS,
@@ -57,6 +60,8 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+T = TypeVar('T')
+
 
 class Eth2(EthereumModule):
     """Module representation for Eth2"""
@@ -74,10 +79,9 @@ class Eth2(EthereumModule):
         self.ethereum = ethereum_inquirer
         self.msg_aggregator = msg_aggregator
         self.beaconchain = beaconchain
-        self.last_stats_query_ts = 0
-        self.last_withdrawals_query_ts = 0
-        self.validator_stats_queried = 0
-        self.validator_withdrawals_queried = 0
+        self.last_scrape_ts = 0
+        self.validators_scraped = 0
+        self.beaconchain_backoff_lock = Semaphore()
         self.deposits_pubkey_re = re.compile(r'.*validator with pubkey (.*)\. Deposit.*')
         self.withdrawals_query_lock = Semaphore()
 
@@ -296,41 +300,89 @@ class Eth2(EthereumModule):
 
         return result  # type: ignore  # location_label is set for this event
 
-    def _maybe_backoff_beaconchain(self, now: Timestamp, name: Literal['stats', 'withdrawals']) -> None:  # noqa: E501
-        should_backoff = (
-            now - getattr(self, f'last_{name}_query_ts') < VALIDATOR_STATS_QUERY_BACKOFF_TIME_RANGE and  # noqa: E501
-            getattr(self, f'validator_{name}_queried') >= VALIDATOR_STATS_QUERY_BACKOFF_EVERY_N_VALIDATORS  # noqa: E501
-        )
-        if should_backoff:
-            log.debug(
-                f'Queried {getattr(self, f"validator_{name}_queried")} validators in the last '
-                f'{VALIDATOR_STATS_QUERY_BACKOFF_TIME_RANGE} seconds. Backing off for '
-                f'{VALIDATOR_STATS_QUERY_BACKOFF_TIME} seconds.',
+    def _maybe_backoff_beaconchain(self) -> None:
+        """Counts a validator scrape of beaconcha.in and backs off first if too many
+        validators were scraped recently. The concurrent scrapes share the limit so the
+        rest of them wait while one is backing off."""
+        with self.beaconchain_backoff_lock:
+            should_backoff = (
+                ts_now() - self.last_scrape_ts < VALIDATOR_STATS_QUERY_BACKOFF_TIME_RANGE and
+                self.validators_scraped >= VALIDATOR_STATS_QUERY_BACKOFF_EVERY_N_VALIDATORS
             )
-            setattr(self, f'validator_{name}_queried', 0)
-            gevent.sleep(VALIDATOR_STATS_QUERY_BACKOFF_TIME)
+            if should_backoff:
+                log.debug(
+                    f'Queried {self.validators_scraped} validators in the last '
+                    f'{VALIDATOR_STATS_QUERY_BACKOFF_TIME_RANGE} seconds. Backing off for '
+                    f'{VALIDATOR_STATS_QUERY_BACKOFF_TIME} seconds.',
+                )
+                self.validators_scraped = 0
+                gevent.sleep(VALIDATOR_STATS_QUERY_BACKOFF_TIME)
+
+            self.validators_scraped += 1
+            self.last_scrape_ts = ts_now()
+
+    def _scrape_validators(
+            self,
+            validator_indices: Sequence[int],
+            scrape: Callable[[int], T],
+    ) -> tuple[dict[int, T], Optional[Union[RemoteError, DeserializationError]]]:
+        """Scrapes beaconcha.in for each of the given validators with at most
+        BEACONCHAIN_SCRAPE_CONCURRENCY queries at a time.
+
+        Returns the results of the validators that were scraped and the first error.
+        No more validators are scraped after an error so that the caller can save the
+        results and then raise it.
+        """
+        results: dict[int, T] = {}
+        errors: list[Union[RemoteError, DeserializationError]] = []
+
+        def _scrape(validator_index: int) -> None:
+            if len(errors) != 0:
+                return
+
+            self._maybe_backoff_beaconchain()
+            try:
+                results[validator_index] = scrape(validator_index)
+            except (RemoteError, DeserializationError) as e:
+                log.error(f'Failed to scrape beaconcha.in for validator {validator_index}: {e!s}')
+                errors.append(e)
+
+        pool = Pool(size=BEACONCHAIN_SCRAPE_CONCURRENCY)
+        try:
+            for validator_index in validator_indices:
+                pool.spawn(_scrape, validator_index)
+            pool.join()
+        finally:
+            pool.kill()
+
+        return results, errors[0] if len(errors) != 0 else None
 
     def _query_services_for_validator_daily_stats(
             self,
             to_ts: Timestamp,
     ) -> None:
-        """Goes through all saved validators and sees which need to have their stats requeried"""
-        now = ts_now()
+        """Goes through all saved validators and sees which need to have their stats requeried
+
+        May raise:
+        - RemoteError due to problems querying beaconcha.in
+        """
         dbeth2 = DBEth2(self.database)
         result = dbeth2.get_validators_to_query_for_stats(up_to_ts=to_ts)
-
-        for validator_index, last_ts, exit_ts in result:
-            self._maybe_backoff_beaconchain(now=now, name='stats')
-            new_stats = scrape_validator_daily_stats(
+        validators = {validator_index: (last_ts, exit_ts) for validator_index, last_ts, exit_ts in result}  # noqa: E501
+        scraped, error = self._scrape_validators(
+            validator_indices=list(validators),
+            scrape=lambda validator_index: scrape_validator_daily_stats(
                 validator_index=validator_index,
-                last_known_timestamp=last_ts,
-                exit_ts=exit_ts,
-            )
-            self.validator_stats_queried += 1
-            self.last_stats_query_ts = now
+                last_known_timestamp=validators[validator_index][0],
+                exit_ts=validators[validator_index][1],
+            ),
+        )
+        new_stats = [entry for stats in scraped.values() for entry in stats]
+        if len(new_stats) != 0:
+            dbeth2.add_validator_daily_stats(stats=new_stats)
 
-            if len(new_stats) != 0:
-                dbeth2.add_validator_daily_stats(stats=new_stats)
+        if error is not None:
+            raise error
 
     def query_services_for_validator_withdrawals(
             self,
@@ -341,6 +393,7 @@ class Eth2(EthereumModule):
 
         May raise:
         - RemoteError due to problems querying beaconcha.in API
+        - DeserializationError if the withdrawals data is not in the expected format
         """
         with self.withdrawals_query_lock:
             # First check if the withdrawals were queried within the last 3 hours to
@@ -372,36 +425,41 @@ class Eth2(EthereumModule):
                     exit_epoch[validator_entry['validatorindex']] = validator_entry['exitepoch']
 
             # Then fetch latest withdrawals for each
-            for validator_index, last_ts_ms in result:
-                self._maybe_backoff_beaconchain(now=now, name='withdrawals')
-                new_data = scrape_validator_withdrawals(
+            last_known_ts = {validator_index: ts_ms_to_sec(last_ts_ms) for validator_index, last_ts_ms in result}  # noqa: E501
+            scraped, error = self._scrape_validators(
+                validator_indices=list(last_known_ts),
+                scrape=lambda validator_index: scrape_validator_withdrawals(
                     validator_index=validator_index,
-                    last_known_timestamp=ts_ms_to_sec(last_ts_ms),
-                )
+                    last_known_timestamp=last_known_ts[validator_index],
+                ),
+            )
+            withdrawals: list[EthWithdrawalEvent] = []
+            for validator_index, new_data in scraped.items():
                 log.debug(f'Got {len(new_data)} new withdrawals for validator {validator_index}')
-                now = ts_now()
-                self.validator_withdrawals_queried += 1
-                self.last_withdrawals_query_ts = now
-                for entry in new_data:
-                    withdrawal = EthWithdrawalEvent(
-                        validator_index=validator_index,
-                        timestamp=ts_sec_to_ms(entry[0]),
-                        balance=Balance(amount=entry[2]),
-                        withdrawal_address=entry[1],
-                        is_exit=entry[0] >= exit_epoch[validator_index],
-                    )
-                    try:
-                        with self.database.user_write() as write_cursor:
-                            dbevents.add_history_event(write_cursor, event=withdrawal)
-                    except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
-                        log.error(f'Could not write withdrawal: {withdrawal} to the DB due to {e!s}')  # noqa: E501
+                withdrawals.extend(EthWithdrawalEvent(
+                    validator_index=validator_index,
+                    timestamp=ts_sec_to_ms(entry[0]),
+                    balance=Balance(amount=entry[2]),
+                    withdrawal_address=entry[1],
+                    is_exit=entry[0] >= exit_epoch[validator_index],
+                ) for entry in new_data)
+
+            if len(withdrawals) != 0:
+                try:
+                    with self.database.user_write() as write_cursor:
+                        dbevents.add_history_events(write_cursor, history=withdrawals)
+                except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
+                    log.error(f'Could not write {len(withdrawals)} withdrawals to the DB due to {e!s}')  # noqa: E501
+
+            if error is not None:
+                raise error
 
             with self.database.user_write() as write_cursor:
                 self.database.update_used_query_range(  # update last withdrawal query timestamp
                     write_cursor=write_cursor,
                     name=LAST_WITHDRAWALS_QUERY_TS,
                     start_ts=Timestamp(0),
-                    end_ts=now,
+                    end_ts=ts_now(),
                 )
             log.debug(f'Finished querying for validator withdrawals up to {to_ts=}')
 
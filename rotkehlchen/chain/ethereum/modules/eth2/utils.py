@@ -1,12 +1,13 @@
 import json
 import logging
 import re
+from collections.abc import Iterator
+from html.parser import HTMLParser
 from http import HTTPStatus
 from typing import Literal, Optional
 
 import gevent
 import requests
-from bs4 import BeautifulSoup, SoupStrainer
 
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.db.settings import CachedSettings
@@ -35,6 +36,7 @@ EPOCH_PARSE_REGEX = re.compile(r'<a href="/epoch/(.*?)">.*')
 ADDRESS_PARSE_REGEX = re.compile(r'<a href="/address/(.*?)".*')
 ETH_PARSE_REGEX = re.compile(r'.*title="(.*?)">.*')
 ETH2_GENESIS_TIMESTAMP = 1606824023
+STATS_PAGE_CHUNK_SIZE = 65536
 
 
 def epoch_to_timestamp(epoch: int) -> Timestamp:
@@ -87,6 +89,62 @@ def _query_page(url: str, event: Literal['stats', 'withdrawals']) -> requests.Re
     return response
 
 
+class _StatsTableParser(HTMLParser):
+    """Streaming parser of the beaconcha.in validator stats table
+
+    Collects the text of the cells of each row inside the <tbod> of the page without
+    building the whole document tree. Rows can be popped while the page is being fed.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.in_table = False
+        self.row: Optional[list[str]] = None
+        self.cell: Optional[list[str]] = None
+        self.rows: list[list[str]] = []
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Optional[str]]]) -> None:
+        if tag == 'tbod':
+            self.in_table = True
+        elif self.in_table is False:
+            return
+        elif tag == 'tr':
+            self.row = []
+        elif tag == 'td' and self.row is not None:
+            self.cell = []
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == 'tbod':
+            self.in_table = False
+        elif tag == 'td' and self.cell is not None and self.row is not None:
+            self.row.append(''.join(self.cell).strip())
+            self.cell = None
+        elif tag == 'tr' and self.row is not None:
+            self.rows.append(self.row)
+            self.row = None
+
+    def handle_data(self, data: str) -> None:
+        if self.cell is not None:
+            self.cell.append(data)
+
+    def pop_rows(self) -> list[list[str]]:
+        """Return the rows parsed so far and forget them"""
+        rows, self.rows = self.rows, []
+        return rows
+
+
+def _iterate_stats_rows(page: str) -> Iterator[list[str]]:
+    """Iterate the rows of the stats table of the page while parsing it in chunks, so that
+    the caller can stop parsing once it got the rows it needs"""
+    parser = _StatsTableParser()
+    for chunk_start in range(0, len(page), STATS_PAGE_CHUNK_SIZE):
+        parser.feed(page[chunk_start:chunk_start + STATS_PAGE_CHUNK_SIZE])
+        yield from parser.pop_rows()
+
+    parser.close()
+    yield from parser.pop_rows()
+
+
 def scrape_validator_withdrawals(
         validator_index: int,
         last_known_timestamp: Timestamp,
@@ -190,77 +248,45 @@ def scrape_validator_daily_stats(
     url = f'{BEACONCHAIN_ROOT_URL}/validator/{validator_index}/stats'
     response = _query_page(url, 'stats')
     log.debug(f'Got beaconcha.in stats results for {validator_index=}. Processing it.')
-    soup = BeautifulSoup(response.text, 'html.parser', parse_only=SoupStrainer('tbod'))
-    if soup is None:
-        raise RemoteError('Could not find <tbod> while parsing beaconcha.in stats page')
-    try:
-        tr = soup.tbod.tr
-    except AttributeError as e:
-        raise RemoteError('Could not find first <tr> while parsing beaconcha.in stats page') from e
-
-    timestamp = Timestamp(0)
-    pnl = ZERO
-    column_pos = 1
     stats: list[ValidatorDailyStats] = []
-    while tr is not None:
-        skip_row = False
-        for column in tr.children:
-            if column.name != 'td':
-                continue
-
-            if column_pos == 1:  # date
-                date = column.string
-                try:
-                    timestamp = create_timestamp(date, formatstr='%d %b %Y')
-                except ValueError as e:
-                    raise RemoteError(f'Failed to parse {date} to timestamp') from e
-
-                if timestamp <= last_known_timestamp or (exit_ts is not None and timestamp > exit_ts):  # noqa: E501
-                    return stats  # we are done
-
-                column_pos += 1
-            elif column_pos == 2:
-                pnl = _parse_fval(column.string, 'income')
-                # if the validator makes profit in the genesis day beaconchain returns a
-                # profit of deposit + validation reward. We need to subtract the deposit value
-                # to obtain the actual pnl.
-                # Example: https://beaconcha.in/validator/999/stats
-                if pnl > ONE and timestamp == DAY_AFTER_ETH2_GENESIS:
-                    pnl -= INITIAL_ETH_DEPOSIT
-
-                column_pos += 1
-
-            elif column_pos == 3:
-                start = _parse_fval(column.string, 'start')
-                if start == ZERO:
-                    column_pos += 1  # keep checking columns for all zeros
-                else:
-                    break  # next row
-
-            elif column_pos == 4:
-                end = _parse_fval(column.string, 'end')
-                if end == ZERO:
-                    column_pos += 1  # keep checking columns for all zeros
-                else:
-                    break  # next row
-
-            elif 5 <= column_pos <= 12:
-                column_pos += 1  # skip columns
-
-            elif column_pos == 13:
-                amount = _parse_fval(column.string, 'deposit amount')
-                if amount == ZERO:
-                    skip_row = True  # This is a zero row. Validator has exited. Skip it
-                else:
-                    break  # next row
-
-        column_pos = 1
-        if skip_row is False:
-            stats.append(ValidatorDailyStats(
-                validator_index=validator_index,
-                timestamp=timestamp,
-                pnl=pnl,
-            ))
-        tr = tr.find_next_sibling()
+    found_rows = False
+    for row in _iterate_stats_rows(response.text):
+        found_rows = True
+        if len(row) < 13:
+            raise RemoteError(
+                f'Expected 13 columns in beaconcha.in stats row but found {len(row)}',
+            )
+
+        try:
+            timestamp = create_timestamp(row[0], formatstr='%d %b %Y')
+        except ValueError as e:
+            raise RemoteError(f'Failed to parse {row[0]} to timestamp') from e
+
+        if timestamp <= last_known_timestamp or (exit_ts is not None and timestamp > exit_ts):
+            return stats  # we are done
+
+        pnl = _parse_fval(row[1], 'income')
+        # if the validator makes profit in the genesis day beaconchain returns a
+        # profit of deposit + validation reward. We need to subtract the deposit value
+        # to obtain the actual pnl.
+        # Example: https://beaconcha.in/validator/999/stats
+        if pnl > ONE and timestamp == DAY_AFTER_ETH2_GENESIS:
+            pnl -= INITIAL_ETH_DEPOSIT
+
+        if (
+                _parse_fval(row[2], 'start') == ZERO and
+                _parse_fval(row[3], 'end') == ZERO and
+                _parse_fval(row[12], 'deposit amount') == ZERO
+        ):
+            continue  # This is a zero row. Validator has exited. Skip it
+
+        stats.append(ValidatorDailyStats(
+            validator_index=validator_index,
+            timestamp=timestamp,
+            pnl=pnl,
+        ))
+
+    if found_rows is False:
+        raise RemoteError('Could not find any <tr> while parsing beaconcha.in stats page')
 
     return stats
@@ -3,9 +3,9 @@ from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.accounting.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.chain.ethereum.modules.liquity.constants import CPT_LIQUITY
-from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_LQTY, A_LUSD
 from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.db.shadow_columns import execute_shadow_sums, from_shadow_sum, shadow_sum
 from rotkehlchen.fval import FVal
 from rotkehlchen.types import ChecksumEvmAddress
 
@@ -43,10 +43,26 @@ BINDINGS_STABILITY_POOL_EVENTS = [
     HistoryEventType.STAKING.serialize(),
     HistoryEventSubType.REWARD.serialize(),
 ]
-QUERY_STABILITY_POOL_DEPOSITS = (
-    'SELECT SUM(CAST(amount AS REAL)), SUM(CAST(usd_value AS REAL)) '
-    'FROM history_events WHERE asset=? AND type=? AND subtype=?'
-)
+QUERY_STABILITY_POOL_DEPOSITS = 'WHERE asset=? AND type=? AND subtype=?'
+
+
+def _query_amount_and_value_sums(
+        cursor: 'DBCursor',
+        query_filters: str,
+        bindings: list[Any],
+) -> tuple[FVal, FVal]:
+    """Sum the amounts and usd values of the history events matching the filters"""
+    execute_shadow_sums(
+        cursor=cursor,
+        query=lambda as_integer: (
+            f'SELECT {shadow_sum("amount", as_integer=as_integer)}, '
+            f'{shadow_sum("usd_value", as_integer=as_integer)} '
+            f'FROM history_events {query_filters}'
+        ),
+        bindings=bindings,
+    )
+    result = cursor.fetchone()
+    return from_shadow_sum('amount', result[0], result[1]), from_shadow_sum('usd_value', result[2], result[3])  # noqa: E501
 
 
 def _get_stats(
@@ -75,19 +91,24 @@ def _get_stats(
         bindings=bindings_stability_pool,
     )
     # get stats about LUSD deposited in the stability pool
-    cursor.execute(query_stability_pool_deposits, deposit_pool_bindings)
-    stability_pool_deposits = cursor.fetchone()
-
-    cursor.execute(query_stability_pool_deposits, withdrawal_pool_bindings)
-    stability_pool_withdrawals = cursor.fetchone()
+    deposited_amount, deposited_usd_value = _query_amount_and_value_sums(
+        cursor=cursor,
+        query_filters=query_stability_pool_deposits,
+        bindings=deposit_pool_bindings,
+    )
+    withdrawn_amount, withdrawn_usd_value = _query_amount_and_value_sums(
+        cursor=cursor,
+        query_filters=query_stability_pool_deposits,
+        bindings=withdrawal_pool_bindings,
+    )
 
     return {
         'total_usd_gains_stability_pool': total_usd_stability_rewards,
         'total_usd_gains_staking': total_usd_staking_rewards,
-        'total_deposited_stability_pool': FVal(stability_pool_deposits[0]) if stability_pool_deposits[0] is not None else ZERO,  # noqa: E501
-        'total_withdrawn_stability_pool': FVal(stability_pool_withdrawals[0]) if stability_pool_withdrawals[0] is not None else ZERO,  # noqa: E501
-        'total_deposited_stability_pool_usd_value': FVal(stability_pool_deposits[1]) if stability_pool_deposits[1] is not None else ZERO,  # noqa: E501
-        'total_withdrawn_stability_pool_usd_value': FVal(stability_pool_withdrawals[1]) if stability_pool_withdrawals[1] is not None else ZERO,  # noqa: E501
+        'total_deposited_stability_pool': deposited_amount,
+        'total_withdrawn_stability_pool': withdrawn_amount,
+        'total_deposited_stability_pool_usd_value': deposited_usd_value,
+        'total_withdrawn_stability_pool_usd_value': withdrawn_usd_value,
         'staking_gains': [
             {
                 'asset': entry[0],
@@ -693,6 +693,7 @@ class YearnVaults(EthereumModule):
             # Now update the DB with the new events
             with self.database.user_write() as write_cursor:
                 add_yearn_vaults_events(write_cursor, address, new_events)
+            self.database.forget_owned_assets()
             events.extend(new_events)
 
         # After all events have been queried then also update the query range.
@@ -253,6 +253,7 @@ class YearnVaultsV2(EthereumModule):
 
             with self.database.user_write() as write_cursor:
                 add_yearn_vaults_events(write_cursor, address, events)
+            self.database.forget_owned_assets()
 
         for address in addresses:
             with self.database.conn.read_ctx() as cursor:
@@ -49,6 +49,16 @@ class BaseDecoderTools:
         with self.database.conn.read_ctx() as cursor:
             self.tracked_accounts = self.database.get_blockchain_accounts(cursor)
         self.sequence_counter = 0
+        # Set by the transaction decoder to save the events it has decoded but not saved yet
+        self.save_pending_events_fn: Optional[Callable[[], None]] = None
+
+    def save_pending_events(self) -> None:
+        """Save the events of the transactions decoded earlier in the current batch.
+
+        Decoders that read the user DB while decoding need to call this first, since
+        the decoded events are only saved in batches of transactions."""
+        if self.save_pending_events_fn is not None:
+            self.save_pending_events_fn()
 
     def reset_sequence_counter(self) -> None:
         self.sequence_counter = 0
@@ -36,6 +36,7 @@ from rotkehlchen.errors.serialization import ConversionError, DeserializationErr
 from rotkehlchen.fval import FVal
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.tasks.scheduler import BacklogType
 from rotkehlchen.types import ChecksumEvmAddress, EvmTokenKind, EvmTransaction, EVMTxHash
 from rotkehlchen.utils.misc import from_wei, hex_or_bytes_to_address, hex_or_bytes_to_int
 from rotkehlchen.utils.mixins.customizable_date import CustomizableDateMixin
@@ -64,6 +65,9 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# How many decoded transactions to save in the DB with a single write transaction
+DECODING_WRITE_BATCH_SIZE = 50
+
 
 class EventDecoderFunction(Protocol):
 
@@ -168,6 +172,9 @@ class EVMTransactionDecoder(metaclass=ABCMeta):
         # Recursively check all submodules to get all decoder address mappings and rules
         self.rules += self._recursively_initialize_decoders(self.chain_modules_root)
         self.undecoded_tx_query_lock = Semaphore()
+        # only one greenlet decodes transactions of the chain at a time, since the decoders
+        # share state and a transaction's events are not seen by others until they are saved
+        self.decoding_lock = Semaphore()
 
     def _add_builtin_decoders(self, rules: DecodingRules) -> None:
         """Adds decoders that should be built-in for every EVM decoding run
@@ -387,6 +394,28 @@ class EVMTransactionDecoder(metaclass=ABCMeta):
         Decodes an evm transaction and its receipt and saves result in the DB.
         Returns the list of decoded events and a flag which is True if balances refresh is needed.
         """
+        events, refresh_balances = self._decode_transaction_events(
+            transaction=transaction,
+            tx_receipt=tx_receipt,
+        )
+        with self.database.user_write() as write_cursor:
+            self._save_decoded_events(
+                write_cursor=write_cursor,
+                transaction=transaction,
+                events=events,
+            )
+        return events, refresh_balances
+
+    def _decode_transaction_events(
+            self,
+            transaction: EvmTransaction,
+            tx_receipt: EvmTxReceipt,
+    ) -> tuple[list['EvmEvent'], bool]:
+        """
+        Decodes an evm transaction and its receipt without saving anything in the DB.
+        Returns the sorted list of decoded events and a flag which is True if balances
+        refresh is needed.
+        """
         self.base.reset_sequence_counter()
         # check if any eth transfer happened in the transaction, including in internal transactions
         events = self._maybe_decode_simple_transactions(transaction, tx_receipt)
@@ -459,30 +488,36 @@ class EVMTransactionDecoder(metaclass=ABCMeta):
         if len(events) == 0 and (eth_event := self._get_eth_transfer_event(transaction)) is not None:  # noqa: E501
             events = [eth_event]
 
-        with self.database.user_write() as write_cursor:
-            if len(events) > 0:
-                self.dbevents.add_history_events(
-                    write_cursor=write_cursor,
-                    history=events,
-                )
-            else:
-                # This is probably a phishing zero value token transfer tx.
-                # Details here: https://github.com/rotki/rotki/issues/5749
-                with suppress(InputError):  # We don't care if it's already in the DB
-                    self.database.add_to_ignored_action_ids(
-                        write_cursor=write_cursor,
-                        action_type=ActionType.HISTORY_EVENT,
-                        identifiers=[transaction.identifier],
-                    )
-            tx_id = transaction.get_or_query_db_id(write_cursor)
-            write_cursor.execute(
-                'INSERT OR IGNORE INTO evm_tx_mappings(tx_id, value) VALUES(?, ?)',
-                (tx_id, HISTORY_MAPPING_STATE_DECODED),
-            )
-
         events = sorted(events, key=lambda x: x.sequence_index, reverse=False)
         return events, refresh_balances  # Propagate for post processing in the caller
 
+    def _save_decoded_events(
+            self,
+            write_cursor: 'DBCursor',
+            transaction: EvmTransaction,
+            events: list['EvmEvent'],
+    ) -> None:
+        """Saves the decoded events of a transaction and marks the transaction as decoded"""
+        if len(events) > 0:
+            self.dbevents.add_history_events(
+                write_cursor=write_cursor,
+                history=events,
+            )
+        else:
+            # This is probably a phishing zero value token transfer tx.
+            # Details here: https://github.com/rotki/rotki/issues/5749
+            with suppress(InputError):  # We don't care if it's already in the DB
+                self.database.add_to_ignored_action_ids(
+                    write_cursor=write_cursor,
+                    action_type=ActionType.HISTORY_EVENT,
+                    identifiers=[transaction.identifier],
+                )
+        tx_id = transaction.get_or_query_db_id(write_cursor)
+        write_cursor.execute(
+            'INSERT OR IGNORE INTO evm_tx_mappings(tx_id, value) VALUES(?, ?)',
+            (tx_id, HISTORY_MAPPING_STATE_DECODED),
+        )
+
     def get_and_decode_undecoded_transactions(
             self,
             limit: Optional[int] = None,
@@ -508,13 +543,24 @@ class EVMTransactionDecoder(metaclass=ABCMeta):
     ) -> list['EvmEvent']:
         """Make sure that receipts are pulled + events decoded for the given transaction hashes.
 
-        The transaction hashes must exist in the DB at the time of the call
+        The transaction hashes must exist in the DB at the time of the call. The newly
+        decoded events are saved in batches of DECODING_WRITE_BATCH_SIZE transactions,
+        each in a single write transaction. Concurrent calls wait for each other.
 
         May raise:
         - DeserializationError if there is a problem with contacting a remote to get receipts
         - RemoteError if there is a problem with contacting a remote to get receipts
         - InputError if the transaction hash is not found in the DB
         """
+        with self.decoding_lock:
+            return self._decode_transaction_hashes(ignore_cache=ignore_cache, tx_hashes=tx_hashes)
+
+    def _decode_transaction_hashes(
+            self,
+            ignore_cache: bool,
+            tx_hashes: Optional[list[EVMTxHash]],
+    ) -> list['EvmEvent']:
+        """Implementation of decode_transaction_hashes. Needs the decoding lock."""
         events: list[EvmEvent] = []
         refresh_balances = False
         with self.database.conn.read_ctx() as cursor:
@@ -527,39 +573,75 @@ class EVMTransactionDecoder(metaclass=ABCMeta):
                 )
                 tx_hashes = [EVMTxHash(x[0]) for x in cursor]
 
-        for tx_hash in tx_hashes:
-            # TODO: Change this if transaction filter query can accept multiple hashes
-            with self.database.conn.read_ctx() as cursor:
-                try:
-                    tx, receipt = self.transactions.get_or_create_transaction(
-                        cursor=cursor,
-                        tx_hash=tx_hash,
-                        relevant_address=None,
+        # decoded transactions of this call whose events are not saved yet
+        pending_writes: list[tuple[EvmTransaction, list[EvmEvent]]] = []
+        self.base.save_pending_events_fn = lambda: self._save_decoded_transactions(pending_writes)
+        try:
+            for tx_hash in tx_hashes:
+                # TODO: Change this if transaction filter query can accept multiple hashes
+                with self.database.conn.read_ctx() as cursor:
+                    try:
+                        tx, receipt = self.transactions.get_or_create_transaction(
+                            cursor=cursor,
+                            tx_hash=tx_hash,
+                            relevant_address=None,
+                        )
+                    except RemoteError as e:
+                        raise InputError(f'{self.evm_inquirer.chain_name} hash {tx_hash.hex()} does not correspond to a transaction. {e}') from e  # noqa: E501
+
+                if (new_events := self._get_saved_transaction_events(transaction=tx, ignore_cache=ignore_cache)) is None:  # noqa: E501
+                    new_events, new_refresh_balances = self._decode_transaction_events(
+                        transaction=tx,
+                        tx_receipt=receipt,
                     )
-                except RemoteError as e:
-                    raise InputError(f'{self.evm_inquirer.chain_name} hash {tx_hash.hex()} does not correspond to a transaction. {e}') from e  # noqa: E501
+                    refresh_balances |= new_refresh_balances
+                    pending_writes.append((tx, new_events))
+                    if len(pending_writes) >= DECODING_WRITE_BATCH_SIZE:
+                        self._save_decoded_transactions(pending_writes)
 
-            new_events, new_refresh_balances = self._get_or_decode_transaction_events(
-                transaction=tx,
-                tx_receipt=receipt,
-                ignore_cache=ignore_cache,
-            )
-            events.extend(new_events)
-            if new_refresh_balances is True:
-                refresh_balances = True
+                events.extend(new_events)
+
+            self._save_decoded_transactions(pending_writes)
+        except BaseException:  # save what got decoded even if a later transaction failed
+            try:
+                self._save_decoded_transactions(pending_writes)
+            except Exception as e:  # pylint: disable=broad-except  # don't hide the original error
+                log.error(f'Failed to save the decoded {self.evm_inquirer.chain_name} transactions due to {e!s}')  # noqa: E501
+            raise
+        finally:
+            self.base.save_pending_events_fn = None
 
         self._post_process(refresh_balances=refresh_balances)
         return events
 
-    def _get_or_decode_transaction_events(
+    def _save_decoded_transactions(
+            self,
+            decoded: list[tuple[EvmTransaction, list['EvmEvent']]],
+    ) -> None:
+        """Saves the given decoded transactions in a single write transaction and
+        removes them from the list once it's committed"""
+        if len(decoded) == 0:
+            return
+
+        with self.database.user_write() as write_cursor:
+            for transaction, events in decoded:
+                self._save_decoded_events(
+                    write_cursor=write_cursor,
+                    transaction=transaction,
+                    events=events,
+                )
+        log.debug(f'Saved the decoded events of {len(decoded)} {self.evm_inquirer.chain_name} transactions')  # noqa: E501
+        decoded.clear()
+
+    def _get_saved_transaction_events(
             self,
             transaction: EvmTransaction,
-            tx_receipt: EvmTxReceipt,
             ignore_cache: bool,
-    ) -> tuple[list['EvmEvent'], bool]:
+    ) -> Optional[list['EvmEvent']]:
         """
-        Get a transaction's events if existing in the DB or decode them.
-        Returns the list of decoded events and a flag which is True if balances refresh is needed.
+        Get a transaction's events if they are already decoded and saved in the DB.
+        If ignore_cache is True any saved events are deleted instead.
+        Returns None if the transaction needs to be decoded.
         """
         with self.database.conn.read_ctx() as cursor:
             tx_id = transaction.get_or_query_db_id(cursor)
@@ -574,21 +656,42 @@ class EVMTransactionDecoder(metaclass=ABCMeta):
                     'DELETE from evm_tx_mappings WHERE tx_id=? AND value=?',
                     (tx_id, HISTORY_MAPPING_STATE_DECODED),
                 )
-        else:  # see if events are already decoded and return them
-            with self.database.conn.read_ctx() as cursor:
-                cursor.execute(
-                    'SELECT COUNT(*) from evm_tx_mappings WHERE tx_id=? AND value=?',
-                    (tx_id, HISTORY_MAPPING_STATE_DECODED),
-                )
-                if cursor.fetchone()[0] != 0:  # already decoded and in the DB
-                    events = self.dbevents.get_history_events(
-                        cursor=cursor,
-                        filter_query=EvmEventFilterQuery.make(
-                            tx_hashes=[transaction.tx_hash],
-                        ),
-                        has_premium=True,  # for this function we don't limit anything
-                    )
-                    return events, False
+            self.database.task_backlogs.increase(
+                backlog_type=BacklogType.EVM_TX_DECODING,
+                count=1,
+                chain_id=self.evm_inquirer.chain_id,
+            )
+            return None
+
+        # see if events are already decoded and return them
+        with self.database.conn.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT COUNT(*) from evm_tx_mappings WHERE tx_id=? AND value=?',
+                (tx_id, HISTORY_MAPPING_STATE_DECODED),
+            )
+            if cursor.fetchone()[0] == 0:
+                return None
+
+            return self.dbevents.get_history_events(
+                cursor=cursor,
+                filter_query=EvmEventFilterQuery.make(
+                    tx_hashes=[transaction.tx_hash],
+                ),
+                has_premium=True,  # for this function we don't limit anything
+            )
+
+    def _get_or_decode_transaction_events(
+            self,
+            transaction: EvmTransaction,
+            tx_receipt: EvmTxReceipt,
+            ignore_cache: bool,
+    ) -> tuple[list['EvmEvent'], bool]:
+        """
+        Get a transaction's events if existing in the DB or decode them.
+        Returns the list of decoded events and a flag which is True if balances refresh is needed.
+        """
+        if (events := self._get_saved_transaction_events(transaction=transaction, ignore_cache=ignore_cache)) is not None:  # noqa: E501
+            return events, False
 
         # else we should decode now
         return self._decode_transaction(transaction=transaction, tx_receipt=tx_receipt)
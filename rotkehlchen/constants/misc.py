@@ -19,3 +19,5 @@ KRAKEN_API_VERSION = '0'
 DEFAULT_MAX_LOG_SIZE_IN_MB = 300
 DEFAULT_MAX_LOG_BACKUP_FILES = 3
 DEFAULT_SQL_VM_INSTRUCTIONS_CB = 5000
+DEFAULT_MAX_WORKER_PROCESSES = 0
+DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB = 32
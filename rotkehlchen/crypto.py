@@ -1,7 +1,9 @@
 import os
+from collections.abc import Iterable, Iterator
+from typing import Optional
 
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+from cryptography.hazmat.primitives import hashes, padding
+from cryptography.hazmat.primitives.ciphers import Cipher, CipherContext, algorithms, modes
 
 from rotkehlchen.errors.misc import UnableToDecryptRemoteData
 
@@ -14,20 +16,68 @@ AES_BLOCK_SIZE = 16
 # cryptography library seem to suggest it's the safest options. Problem is the
 # already encrypted and saved database files and how to handle the previous encryption
 # We need to keep a versioning of encryption used for each file.
-def encrypt(key: bytes, source: bytes) -> bytes:
-    assert isinstance(key, bytes), 'key should be given in bytes'
-    assert isinstance(source, bytes), 'source should be given in bytes'
+def _aes_key(key: bytes) -> bytes:
+    """Use SHA-256 over our key to get a proper-sized AES key"""
     digest = hashes.Hash(hashes.SHA256())
     digest.update(key)
-    key = digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
+    return digest.finalize()
+
+
+def encrypt_stream(key: bytes, source: Iterable[bytes]) -> Iterator[bytes]:
+    """Encrypts the given chunks of data with the given key without holding them all in memory.
+
+    Yields the iv followed by the encrypted data. Joined together the output is in the
+    same format as the one of encrypt() for the joined source. The data is padded with
+    PKCS7, which is the padding encrypt() has always been using.
+    """
+    assert isinstance(key, bytes), 'key should be given in bytes'
     iv = os.urandom(AES_BLOCK_SIZE)
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-    encryptor = cipher.encryptor()
-    padding = AES_BLOCK_SIZE - len(source) % AES_BLOCK_SIZE  # calculate needed padding
-    source += bytes([padding]) * padding  # Python 2.x: source += chr(padding) * padding
-    # store the iv at the beginning and encrypt
-    data = iv + (encryptor.update(source) + encryptor.finalize())
-    return data
+    encryptor = Cipher(algorithms.AES(_aes_key(key)), modes.CBC(iv)).encryptor()
+    padder = padding.PKCS7(AES_BLOCK_SIZE * 8).padder()
+    yield iv  # store the iv at the beginning
+    for chunk in source:
+        yield encryptor.update(padder.update(chunk))
+
+    yield encryptor.update(padder.finalize()) + encryptor.finalize()
+
+
+def decrypt_stream(key: bytes, source: Iterable[bytes]) -> Iterator[bytes]:
+    """Decrypts the given chunks of data encrypted by encrypt() or encrypt_stream()
+    with the given key without holding them all in memory.
+
+    Yields the decrypted data. The padding is only checked at the end so if data can't
+    be decrypted then UnableToDecryptRemoteData is raised after all but the last chunk
+    have already been yielded.
+    """
+    assert isinstance(key, bytes), 'key should be given in bytes'
+    decryptor: Optional[CipherContext] = None
+    iv = b''
+    unpadder = padding.PKCS7(AES_BLOCK_SIZE * 8).unpadder()
+    try:
+        for chunk in source:
+            if decryptor is not None:
+                yield unpadder.update(decryptor.update(chunk))
+                continue
+
+            iv += chunk  # extract the iv from the beginning
+            if len(iv) >= AES_BLOCK_SIZE:
+                decryptor = Cipher(algorithms.AES(_aes_key(key)), modes.CBC(iv[:AES_BLOCK_SIZE])).decryptor()  # noqa: E501
+                yield unpadder.update(decryptor.update(iv[AES_BLOCK_SIZE:]))
+
+        if decryptor is None:
+            raise ValueError('Data is too small to contain the iv')
+        yield unpadder.update(decryptor.finalize()) + unpadder.finalize()
+    except ValueError as e:
+        raise UnableToDecryptRemoteData(
+            'Invalid padding when decrypting the DB data we received from the server. '
+            'Are you using a new user and if yes have you used the same password as before? '
+            'If you have then please open a bug report.',
+        ) from e
+
+
+def encrypt(key: bytes, source: bytes) -> bytes:
+    assert isinstance(source, bytes), 'source should be given in bytes'
+    return b''.join(encrypt_stream(key, [source]))
 
 
 def decrypt(key: bytes, source: bytes) -> bytes:
@@ -37,25 +87,8 @@ def decrypt(key: bytes, source: bytes) -> bytes:
     Returns the decrypted data.
     If data can't be decrypted then raises UnableToDecryptRemoteData
     """
-    assert isinstance(key, bytes), 'key should be given in bytes'
     assert isinstance(source, bytes), 'source should be given in bytes'
-    digest = hashes.Hash(hashes.SHA256())
-    digest.update(key)
-    key = digest.finalize()  # use SHA-256 over our key to get a proper-sized AES key
-    iv = source[:AES_BLOCK_SIZE]  # extract the iv from the beginning
-    cipher = Cipher(algorithms.AES(key), modes.CBC(iv))
-    decryptor = cipher.decryptor()
-
-    data = source[AES_BLOCK_SIZE:]  # decrypt
-    data = decryptor.update(data)
-    padding = data[-1]  # pick the padding value from the end; Python 2.x: ord(data[-1])
-    if data[-padding:] != bytes([padding]) * padding:  # Python 2.x: chr(padding) * padding
-        raise UnableToDecryptRemoteData(
-            'Invalid padding when decrypting the DB data we received from the server. '
-            'Are you using a new user and if yes have you used the same password as before? '
-            'If you have then please open a bug report.',
-        )
-    return data[:-padding]  # remove the padding
+    return b''.join(decrypt_stream(key, [source]))
 
 
 def sha3(data: bytes) -> bytes:
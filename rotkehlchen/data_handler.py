@@ -4,16 +4,19 @@ import logging
 import shutil
 import tempfile
 import zlib
+from collections.abc import Iterator
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
 
 from rotkehlchen.assets.asset import Asset
-from rotkehlchen.crypto import decrypt, encrypt
+from rotkehlchen.crypto import decrypt_stream, encrypt_stream
 from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.errors.api import AuthenticationError
-from rotkehlchen.errors.misc import SystemPermissionError
+from rotkehlchen.errors.misc import SystemPermissionError, UnableToDecryptRemoteData
+from rotkehlchen.greenlets.process_pool import ProcessPool
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.types import Timestamp
 from rotkehlchen.user_messages import MessagesAggregator
 from rotkehlchen.utils.misc import timestamp_to_date, ts_now
 
@@ -23,6 +26,67 @@ log = RotkehlchenLogsAdapter(logger)
 BUFFERSIZE = 64 * 1024
 
 
+class DBFingerprint(NamedTuple):
+    """Cheap to query markers that change whenever the user DB gets modified"""
+    connection_id: int  # the counters below are per connection
+    total_changes: int  # rows changed by our connection
+    data_version: int  # changes by other connections to the DB file
+    last_write_ts: Timestamp
+
+
+class DBExport(NamedTuple):
+    """Details of the last export of the user DB for premium sync"""
+    fingerprint: DBFingerprint  # taken right after the export
+    data_hash: str
+    db_size: int  # size in bytes of the plaintext DB
+
+
+def _compress_and_encrypt_file(path: Path, key: bytes) -> tuple[bytes, str]:
+    """Compress and encrypt the plaintext DB at the given path
+
+    The DB is read in chunks that flow through the hashing, the compression and the
+    encryption so only the encrypted result is ever held in memory as a whole. Module
+    level so that it can run in a worker process of the process pool.
+
+    Returns the encrypted data and the b64 encoded SHA-256 hash of the plaintext DB.
+    """
+    digest = hashlib.sha256()
+    compressor = zlib.compressobj(level=9)
+
+    def compressed_chunks() -> Iterator[bytes]:
+        with open(path, 'rb') as src_f:
+            while block := src_f.read(BUFFERSIZE):
+                digest.update(block)
+                yield compressor.compress(block)
+
+        yield compressor.flush()
+
+    encrypted_data = b''.join(encrypt_stream(key, compressed_chunks()))
+    return encrypted_data, base64.b64encode(digest.digest()).decode()
+
+
+def _decrypt_and_decompress_to_file(key: bytes, encrypted_data: bytes, path: Path) -> None:
+    """Decrypt and decompress the given data in chunks and write the plaintext DB to
+    the given path. Module level so that it can run in a worker process of the process pool.
+
+    May raise:
+    - UnableToDecryptRemoteData if the data can't be decrypted or decompressed
+    """
+    view = memoryview(encrypted_data)
+    encrypted_chunks = (view[i:i + BUFFERSIZE] for i in range(0, len(view), BUFFERSIZE))
+    decompressor = zlib.decompressobj()
+    try:
+        with open(path, 'wb') as dst_f:
+            for chunk in decrypt_stream(key, encrypted_chunks):
+                dst_f.write(decompressor.decompress(chunk))
+            dst_f.write(decompressor.flush())
+    except zlib.error as e:  # with a wrong password this fails before the padding check
+        raise UnableToDecryptRemoteData(
+            f'Could not decompress the DB data we received from the server due to {e!s}. '
+            'Are you using a new user and if yes have you used the same password as before?',
+        ) from e
+
+
 class DataHandler:
 
     def __init__(
@@ -36,8 +100,10 @@ class DataHandler:
         self.username = 'no_user'
         self.msg_aggregator = msg_aggregator
         self.sql_vm_instructions_cb = sql_vm_instructions_cb
+        self.last_export: Optional[DBExport] = None
 
     def logout(self) -> None:
+        self.last_export = None
         if self.logged_in:
             self.username = 'no_user'
             self.user_data_dir: Optional[Path] = None
@@ -185,38 +251,55 @@ class DataHandler:
         and then re-encrypt it
 
         Returns a b64 encoded binary blob"""
-        compressor = zlib.compressobj(level=9)
         with tempfile.NamedTemporaryFile(delete=False, suffix='.db') as tempdbfile:
             tempdbpath = Path(tempdbfile.name)
             log.info(f'Compress and encrypt DB at temporary path: {tempdbpath}')
             tempdbfile.close()  # close the file to allow re-opening by export_unencrypted in windows https://github.com/rotki/rotki/issues/5051  # noqa: E501
             self.db.export_unencrypted(tempdbpath)
-            source_data = bytearray()
-            compressed_data = bytearray()
-            with open(tempdbpath, 'rb') as src_f:
-                block = src_f.read(BUFFERSIZE)
-                while block:
-                    source_data += block
-                    compressed_data += compressor.compress(block)
-                    block = src_f.read(BUFFERSIZE)
-
-                compressed_data += compressor.flush()
-
-        original_data_hash = base64.b64encode(
-            hashlib.sha256(source_data).digest(),
-        ).decode()
-        encrypted_data = encrypt(self.db.password.encode(), bytes(compressed_data))
+            # the export itself changes rows in the attached DB so take this after it
+            fingerprint = self.db_fingerprint()
+
+        encrypted_data, original_data_hash = ProcessPool.run(
+            _compress_and_encrypt_file,
+            tempdbpath,
+            self.db.password.encode(),
+        )
+        self.last_export = DBExport(
+            fingerprint=fingerprint,
+            data_hash=original_data_hash,
+            db_size=tempdbpath.stat().st_size,
+        )
         # cleanup temp file to avoid windows problem (https://github.com/rotki/rotki/issues/5051)
         tempdbpath.unlink()
         return encrypted_data, original_data_hash
 
+    def db_fingerprint(self) -> DBFingerprint:
+        """Get the current fingerprint of the user DB without reading its data"""
+        with self.db.conn.read_ctx() as cursor:
+            data_version = cursor.execute('PRAGMA data_version').fetchone()[0]
+            last_write_ts = self.db.get_setting(cursor=cursor, name='last_write_ts')
+
+        return DBFingerprint(
+            connection_id=id(self.db.conn),
+            total_changes=self.db.conn.total_changes,
+            data_version=data_version,
+            last_write_ts=last_write_ts,
+        )
+
+    def unchanged_db_export(self) -> Optional[DBExport]:
+        """Returns the last export of the DB if the DB has not changed since then"""
+        if self.last_export is None or self.last_export.fingerprint != self.db_fingerprint():
+            return None
+
+        return self.last_export
+
     def decompress_and_decrypt_db(self, encrypted_data: bytes) -> None:
         """Decrypt and decompress the encrypted data we receive from the server
 
         If successful then replace our local Database
 
         May Raise:
-        - UnableToDecryptRemoteData due to decrypt()
+        - UnableToDecryptRemoteData if the data can't be decrypted
         - DBUpgradeError if the rotki DB version is newer than the software or
         there is a DB upgrade and there is an error or if the version is older
         than the one supported.
@@ -230,6 +313,13 @@ class DataHandler:
             self.data_directory / self.username / f'rotkehlchen_db_{date}.backup',
         )
 
-        decrypted_data = decrypt(self.db.password.encode(), encrypted_data)
-        decompressed_data = zlib.decompress(decrypted_data)
-        self.db.import_unencrypted(decompressed_data)
+        with tempfile.TemporaryDirectory() as tmpdirname:
+            tempdbpath = Path(tmpdirname) / 'temp.db'
+            ProcessPool.run(
+                _decrypt_and_decompress_to_file,
+                self.db.password.encode(),
+                encrypted_data,
+                tempdbpath,
+            )
+            self.db.import_unencrypted(tempdbpath)
+        self.last_export = None
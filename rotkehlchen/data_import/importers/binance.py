@@ -12,7 +12,6 @@ from rotkehlchen.assets.converters import asset_from_binance
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_USD
 from rotkehlchen.data_import.utils import BaseExchangeImporter, hash_csv_row
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp
@@ -76,7 +75,6 @@ class BinanceSingleEntry(BinanceEntry, metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -94,7 +92,6 @@ class BinanceMultipleEntry(BinanceEntry, metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def process_entries(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: list[BinanceCsvRow],
@@ -141,7 +138,6 @@ class BinanceTransferEntry(BinanceMultipleEntry):
 
     def process_entries(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: list[BinanceCsvRow],
@@ -153,7 +149,7 @@ class BinanceTransferEntry(BinanceMultipleEntry):
         - DeserializationError: if the event is malformed when being stored in the db
         """
         history_events = self.process_transfers(timestamp=timestamp, data=data)
-        importer.add_history_events(write_cursor=write_cursor, history_events=history_events)
+        importer.add_history_events(history_events=history_events)
         return len(history_events)
 
 
@@ -338,14 +334,13 @@ class BinanceTradeEntry(BinanceMultipleEntry):
 
     def process_entries(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: list[BinanceCsvRow],
     ) -> int:
         trades = self.process_trades(importer=importer, timestamp=timestamp, data=data)
         for trade in trades:
-            importer.add_trade(write_cursor=write_cursor, trade=trade)
+            importer.add_trade(trade=trade)
         return len(trades)
 
 
@@ -362,7 +357,6 @@ class BinanceDepositWithdrawEntry(BinanceSingleEntry):
 
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -381,7 +375,7 @@ class BinanceDepositWithdrawEntry(BinanceSingleEntry):
             fee_asset=A_USD,
             link=f'Imported from binance CSV file. Binance operation: {data["Operation"]}',
         )
-        importer.add_asset_movement(write_cursor=write_cursor, asset_movement=asset_movement)
+        importer.add_asset_movement(asset_movement=asset_movement)
 
 
 class BinanceDistributionEntry(BinanceSingleEntry):
@@ -393,7 +387,6 @@ class BinanceDistributionEntry(BinanceSingleEntry):
 
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -404,7 +397,7 @@ class BinanceDistributionEntry(BinanceSingleEntry):
         - KeyError
         - DeserializationError: if the event is malformed when being stored in the db
         """
-        importer.add_history_events(write_cursor, history_events=[
+        importer.add_history_events(history_events=[
             HistoryEvent(
                 event_identifier=f'{EVENT_IDENTIFIER_PREFIX}{hash_csv_row(data)}',
                 sequence_index=0,
@@ -434,7 +427,6 @@ class BinanceStakingRewardsEntry(BinanceSingleEntry):
 
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -450,7 +442,7 @@ class BinanceStakingRewardsEntry(BinanceSingleEntry):
             asset=data['Coin'],
             notes=f'Imported from binance CSV file. Binance operation: {data["Operation"]}',
         )
-        importer.add_history_events(write_cursor=write_cursor, history_events=[event])
+        importer.add_history_events(history_events=[event])
 
 
 class BinanceEarnProgram(BinanceSingleEntry):
@@ -469,7 +461,6 @@ class BinanceEarnProgram(BinanceSingleEntry):
 
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -540,7 +531,7 @@ class BinanceEarnProgram(BinanceSingleEntry):
         if staking_event is None:
             log.error(f'Could not process Binance CSV entry {data}')
             return
-        importer.add_history_events(write_cursor=write_cursor, history_events=[staking_event])
+        importer.add_history_events(history_events=[staking_event])
 
 
 class BinanceUSDMProgram(BinanceSingleEntry):
@@ -589,7 +580,6 @@ class BinanceUSDMProgram(BinanceSingleEntry):
 
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -601,7 +591,7 @@ class BinanceUSDMProgram(BinanceSingleEntry):
         - DeserializationError: if the event is malformed when being stored in the db
         """
         history_event = self._get_event(timestamp, data)
-        importer.add_history_events(write_cursor=write_cursor, history_events=[history_event])
+        importer.add_history_events(history_events=[history_event])
 
 
 class BinancePOSEntry(BinanceSingleEntry):
@@ -615,7 +605,6 @@ class BinancePOSEntry(BinanceSingleEntry):
 
     def process_entry(
             self,
-            write_cursor: DBCursor,
             importer: BaseExchangeImporter,
             timestamp: Timestamp,
             data: BinanceCsvRow,
@@ -638,7 +627,7 @@ class BinancePOSEntry(BinanceSingleEntry):
             asset=data['Coin'],
             notes=f'Imported from binance CSV file. Binance operation: {data["Operation"]}',
         )
-        importer.add_history_events(write_cursor=write_cursor, history_events=[event])
+        importer.add_history_events(history_events=[event])
 
 
 SINGLE_BINANCE_ENTRIES: list[BinanceSingleEntry] = [
@@ -687,7 +676,6 @@ class BinanceImporter(BaseExchangeImporter):
 
     def _process_single_binance_entries(
             self,
-            write_cursor: DBCursor,
             timestamp: Timestamp,
             rows: list[BinanceCsvRow],
     ) -> tuple[dict[BinanceSingleEntry, int], list[BinanceCsvRow]]:
@@ -707,7 +695,6 @@ class BinanceImporter(BaseExchangeImporter):
                         change=row['Change'],
                     ):
                         single_entry_class.process_entry(
-                            write_cursor=write_cursor,
                             importer=self,
                             timestamp=timestamp,
                             data=row,
@@ -726,7 +713,6 @@ class BinanceImporter(BaseExchangeImporter):
 
     def _process_multiple_binance_entries(
             self,
-            write_cursor: DBCursor,
             timestamp: Timestamp,
             rows: list[BinanceCsvRow],
     ) -> tuple[Optional[BinanceEntry], int]:
@@ -736,7 +722,6 @@ class BinanceImporter(BaseExchangeImporter):
         for multiple_entry_class in MULTIPLE_BINANCE_ENTRIES:
             if multiple_entry_class.are_entries([row['Operation'] for row in rows]):
                 processed_count = multiple_entry_class.process_entries(
-                    write_cursor=write_cursor,
                     importer=self,
                     timestamp=timestamp,
                     data=rows,
@@ -746,14 +731,12 @@ class BinanceImporter(BaseExchangeImporter):
 
     def _process_binance_rows(
             self,
-            write_cursor: DBCursor,
             multi: dict[Timestamp, list[BinanceCsvRow]],
     ) -> None:
         stats: dict[BinanceEntry, int] = defaultdict(int)
         skipped_rows: list[Any] = []
         for timestamp, rows in multi.items():
             single_processed, rows_without_single = self._process_single_binance_entries(
-                write_cursor=write_cursor,
                 timestamp=timestamp,
                 rows=rows,
             )
@@ -761,7 +744,6 @@ class BinanceImporter(BaseExchangeImporter):
                 stats[entry_type] += amount
 
             multiple_type, multiple_count = self._process_multiple_binance_entries(
-                write_cursor=write_cursor,
                 timestamp=timestamp,
                 rows=rows_without_single,
             )
@@ -797,7 +779,7 @@ class BinanceImporter(BaseExchangeImporter):
                 f'Check logs for details',
             )
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """
         Group and process binance CSV entries. May raise:
         - InputError
@@ -809,4 +791,4 @@ class BinanceImporter(BaseExchangeImporter):
                 self.db.msg_aggregator.add_warning(
                     f'{skipped_count} Binance rows have bad format. Check logs for details.',
                 )
-            self._process_binance_rows(write_cursor=write_cursor, multi=multirows)
+            self._process_binance_rows(multi=multirows)
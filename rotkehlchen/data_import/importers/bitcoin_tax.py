@@ -9,7 +9,6 @@ from rotkehlchen.accounting.structures.types import HistoryEventSubType, History
 from rotkehlchen.assets.converters import LOCATION_TO_ASSET_MAPPING, asset_from_common_identifier
 from rotkehlchen.constants import ZERO
 from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry, hash_csv_row
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -53,7 +52,6 @@ def determine_csv_type(csv_data: csv.DictReader) -> CSVType:
 class BitcoinTaxImporter(BaseExchangeImporter):
     def _consume_trade_event(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             event_identifier: str,
             timestamp: TimestampMS,
@@ -108,7 +106,7 @@ class BitcoinTaxImporter(BaseExchangeImporter):
             event_type=HistoryEventType.TRADE,
             event_subtype=HistoryEventSubType.RECEIVE,
         )
-        self.add_history_events(write_cursor, [spend_event, receive_event])
+        self.add_history_events([spend_event, receive_event])
         if fee_asset_balance is not None:
             fee_event = HistoryEvent(
                 event_identifier=event_identifier,
@@ -121,11 +119,10 @@ class BitcoinTaxImporter(BaseExchangeImporter):
                 event_type=HistoryEventType.TRADE,
                 event_subtype=HistoryEventSubType.FEE,
             )
-            self.add_history_events(write_cursor, [fee_event])
+            self.add_history_events([fee_event])
 
     def _consume_income_spending_event(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             event_identifier: str,
             timestamp: TimestampMS,
@@ -158,7 +155,7 @@ class BitcoinTaxImporter(BaseExchangeImporter):
             event_type=event_type,
             event_subtype=event_subtype,
         )
-        self.add_history_events(write_cursor, [event])
+        self.add_history_events([event])
         if fee_asset_balance is not None:
             fee_event = HistoryEvent(
                 event_identifier=event_identifier,
@@ -171,11 +168,10 @@ class BitcoinTaxImporter(BaseExchangeImporter):
                 event_type=HistoryEventType.SPEND,
                 event_subtype=HistoryEventSubType.FEE,
             )
-            self.add_history_events(write_cursor, [fee_event])
+            self.add_history_events([fee_event])
 
     def _consume_event(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             csv_type: CSVType,
             timestamp_format: str = '%Y-%m-%d %H:%M:%S %z',
@@ -229,7 +225,6 @@ class BitcoinTaxImporter(BaseExchangeImporter):
             quote_asset_amount = deserialize_asset_amount(csv_row['Cost/Proceeds'])
             quote_asset_balance = AssetBalance(quote_asset, Balance(quote_asset_amount, ZERO))
             self._consume_trade_event(
-                write_cursor=write_cursor,
                 csv_row=csv_row,
                 event_identifier=event_identifier,
                 timestamp=timestamp,
@@ -243,7 +238,6 @@ class BitcoinTaxImporter(BaseExchangeImporter):
             return
         # else
         self._consume_income_spending_event(
-            write_cursor=write_cursor,
             csv_row=csv_row,
             event_identifier=event_identifier,
             timestamp=timestamp,
@@ -254,7 +248,7 @@ class BitcoinTaxImporter(BaseExchangeImporter):
             memo=memo,
         )
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """
         May raise:
         - InputError if one of the rows is malformed
@@ -262,9 +256,9 @@ class BitcoinTaxImporter(BaseExchangeImporter):
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.DictReader(csvfile)
             csv_type = determine_csv_type(data)
-            for _, row in enumerate(data):
+            for row in self._iterate_rows(data):
                 try:
-                    self._consume_event(write_cursor, row, csv_type, **kwargs)
+                    self._consume_event(row, csv_type, **kwargs)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During Bitcoin_Tax csv import found action with unknown '
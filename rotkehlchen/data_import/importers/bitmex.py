@@ -7,7 +7,6 @@ from rotkehlchen.accounting.structures.balance import AssetBalance, Balance
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_BTC, A_USD
 from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.exchanges.data_structures import AssetMovement, MarginPosition
@@ -103,7 +102,7 @@ class BitMEXImporter(BaseExchangeImporter):
             link=f'Imported from BitMEX CSV file. Transact Type: {transact_type}',
         )
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """
         Import deposits, withdrawals and realised pnl events from BitMEX.
         May raise:
@@ -112,15 +111,15 @@ class BitMEXImporter(BaseExchangeImporter):
         """
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.DictReader(csvfile)
-            for row in data:
+            for row in self._iterate_rows(data):
                 try:
                     if row['transactType'] == 'RealisedPNL':
                         margin_position = self._consume_realised_pnl(row, **kwargs)
-                        self.add_margin_trade(write_cursor, margin_position)
+                        self.add_margin_trade(margin_position)
                     elif row['transactType'] in ['Deposit', 'Withdrawal']:
                         if row['transactStatus'] == 'Completed':
                             self.add_asset_movement(
-                                write_cursor, self._consume_deposits_or_withdrawals(row, **kwargs),
+                                self._consume_deposits_or_withdrawals(row, **kwargs),
                             )
                     else:
                         raise UnsupportedCSVEntry(
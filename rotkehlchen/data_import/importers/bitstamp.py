@@ -1,7 +1,6 @@
 import csv
 from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.accounting.structures.base import HistoryEvent
@@ -9,8 +8,7 @@ from rotkehlchen.accounting.structures.types import HistoryEventSubType, History
 from rotkehlchen.assets.converters import asset_from_bitstamp
 from rotkehlchen.constants import ZERO
 from rotkehlchen.data_import.importers.constants import BITSTAMP_EVENT_PREFIX
-from rotkehlchen.data_import.utils import BaseExchangeImporter
-from rotkehlchen.db.drivers.gevent import DBCursor
+from rotkehlchen.data_import.utils import BaseExchangeImporter, hash_csv_row
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.serialization.deserialize import (
@@ -25,7 +23,6 @@ from rotkehlchen.utils.misc import ts_sec_to_ms
 class BitstampTransactionsImporter(BaseExchangeImporter):
     def _consume_bitstamp_transaction(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             timestamp_format: str = '%b. %d, %Y, %I:%M %p',
     ) -> None:
@@ -43,7 +40,7 @@ class BitstampTransactionsImporter(BaseExchangeImporter):
         ))
 
         amount, amount_symbol = csv_row['Amount'].split(' ')
-        event_identifier = f'{BITSTAMP_EVENT_PREFIX}_{uuid4().hex}'
+        event_identifier = f'{BITSTAMP_EVENT_PREFIX}_{hash_csv_row(csv_row, self._row_index)}'
 
         if csv_row['Type'] == 'Market':
             value_amount, value_symbol = csv_row['Value'].split(' ')
@@ -104,7 +101,7 @@ class BitstampTransactionsImporter(BaseExchangeImporter):
                 event_type=HistoryEventType.TRADE,
                 event_subtype=HistoryEventSubType.FEE,
             )
-            self.add_history_events(write_cursor, [
+            self.add_history_events([
                 spend_trade_event,
                 receive_trade_event,
                 fee_event,
@@ -133,17 +130,17 @@ class BitstampTransactionsImporter(BaseExchangeImporter):
                 event_type=event_type,
                 event_subtype=event_subtype,
             )
-            self.add_history_events(write_cursor, [movement_event])
+            self.add_history_events([movement_event])
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """
         Import trades from bitstamp.
         """
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.DictReader(csvfile)
-            for row in data:
+            for row in self._iterate_rows(data):
                 try:
-                    self._consume_bitstamp_transaction(write_cursor, row, **kwargs)
+                    self._consume_bitstamp_transaction(row, **kwargs)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During Bitstamp CSV import found action with unknown '
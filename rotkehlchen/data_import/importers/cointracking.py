@@ -3,7 +3,6 @@ import logging
 from itertools import count
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
-from uuid import uuid4
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.accounting.structures.base import HistoryEvent
@@ -13,8 +12,7 @@ from rotkehlchen.assets.utils import symbol_to_asset_or_token
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_USD
 from rotkehlchen.data_import.importers.constants import COINTRACKING_EVENT_PREFIX
-from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry
-from rotkehlchen.db.drivers.gevent import DBCursor
+from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry, hash_csv_row
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -94,7 +92,6 @@ class CointrackingImporter(BaseExchangeImporter):
 
     def _consume_cointracking_entry(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             timestamp_format: str = '%d.%m.%Y %H:%M:%S',
     ) -> None:
@@ -157,7 +154,7 @@ class CointrackingImporter(BaseExchangeImporter):
                 link='',
                 notes=notes,
             )
-            self.add_trade(write_cursor, trade)
+            self.add_trade(trade)
         elif row_type in ('Deposit', 'Withdrawal'):
             category = deserialize_asset_movement_category(row_type.lower())
             if category == AssetMovementCategory.DEPOSIT:
@@ -179,10 +176,10 @@ class CointrackingImporter(BaseExchangeImporter):
                 fee_asset=fee_currency,
                 link='',
             )
-            self.add_asset_movement(write_cursor, asset_movement)
+            self.add_asset_movement(asset_movement)
         elif row_type == 'Staking':  # TODO: Not like the way duplication is checked here
             # We probably need to work on standardizing this and improving performance
-            self.flush_all(write_cursor)  # flush so that the DB check later can work and not miss unwritten events  # noqa: E501
+            self.flush_all()  # flush so that the DB check later can work and not miss unwritten events  # noqa: E501
             amount = deserialize_asset_amount(csv_row['Buy'])
             asset = asset_resolver(csv_row['Cur.Buy'])
             timestamp_ms = ts_sec_to_ms(timestamp)
@@ -202,7 +199,7 @@ class CointrackingImporter(BaseExchangeImporter):
                     return
 
             event = HistoryEvent(
-                event_identifier=f'{COINTRACKING_EVENT_PREFIX}_{uuid4().hex}',
+                event_identifier=f'{COINTRACKING_EVENT_PREFIX}_{hash_csv_row(csv_row, self._row_index)}',  # noqa: E501
                 sequence_index=0,
                 timestamp=timestamp_ms,
                 location=location,
@@ -212,7 +209,7 @@ class CointrackingImporter(BaseExchangeImporter):
                 balance=Balance(amount, ZERO),
                 notes=f'Stake reward of {amount} {asset.symbol} in {location!s}',
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         else:
             raise UnsupportedCSVEntry(
                 f'Unknown entry type "{row_type}" encountered during cointracking '
@@ -221,7 +218,6 @@ class CointrackingImporter(BaseExchangeImporter):
 
     def _import_csv(
             self,
-            write_cursor: DBCursor,
             filepath: Path,
             **kwargs: Any,
     ) -> None:
@@ -231,9 +227,9 @@ class CointrackingImporter(BaseExchangeImporter):
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.reader(csvfile, delimiter=',', quotechar='"')
             header = remap_header(next(data))
-            for row in data:
+            for row in self._iterate_rows(data):
                 try:
-                    self._consume_cointracking_entry(write_cursor, dict(zip(header, row)), **kwargs)  # noqa: E501
+                    self._consume_cointracking_entry(dict(zip(header, row)), **kwargs)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During cointracking CSV import found action with unknown '
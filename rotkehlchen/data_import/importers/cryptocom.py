@@ -13,7 +13,6 @@ from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_USD
 from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry, hash_csv_row
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -45,7 +44,6 @@ CRYPTOCOM_PREFIX = 'CCM_'
 class CryptocomImporter(BaseExchangeImporter):
     def _consume_cryptocom_entry(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             timestamp_format: str = '%Y-%m-%d %H:%M:%S',
     ) -> None:
@@ -126,7 +124,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 link='',
                 notes=notes,
             )
-            self.add_trade(write_cursor, trade)
+            self.add_trade(trade)
 
         elif row_type in (
             'crypto_withdrawal',
@@ -154,7 +152,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 fee_asset=asset,
                 link='',
             )
-            self.add_asset_movement(write_cursor, asset_movement)
+            self.add_asset_movement(asset_movement)
         elif row_type in (
             'airdrop_to_exchange_transfer',
             'mco_stake_reward',
@@ -184,7 +182,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 asset=asset,
                 notes=notes,
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         elif row_type in ('crypto_payment', 'reimbursement_reverted', 'card_cashback_reverted'):
             asset = asset_from_cryptocom(csv_row['Currency'])
             amount = abs(deserialize_asset_amount(csv_row['Amount']))
@@ -199,7 +197,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 asset=asset,
                 notes=notes,
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         elif row_type == 'invest_deposit':
             asset = asset_from_cryptocom(csv_row['Currency'])
             amount = deserialize_asset_amount(csv_row['Amount'])
@@ -215,7 +213,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 fee_asset=fee_currency,
                 link='',
             )
-            self.add_asset_movement(write_cursor, asset_movement)
+            self.add_asset_movement(asset_movement)
         elif row_type == 'invest_withdrawal':
             asset = asset_from_cryptocom(csv_row['Currency'])
             amount = deserialize_asset_amount(csv_row['Amount'])
@@ -231,7 +229,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 fee_asset=fee_currency,
                 link='',
             )
-            self.add_asset_movement(write_cursor, asset_movement)
+            self.add_asset_movement(asset_movement)
         elif row_type == 'crypto_transfer':
             asset = asset_from_cryptocom(csv_row['Currency'])
             amount = deserialize_asset_amount(csv_row['Amount'])
@@ -252,7 +250,7 @@ class CryptocomImporter(BaseExchangeImporter):
                 asset=asset,
                 notes=notes,
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         elif row_type in (
             'crypto_earn_program_created',
             'crypto_earn_program_withdrawn',
@@ -292,7 +290,6 @@ class CryptocomImporter(BaseExchangeImporter):
 
     def _import_cryptocom_associated_entries(
             self,
-            write_cursor: DBCursor,
             data: Any,
             tx_kind: str,
             timestamp_format: str = '%Y-%m-%d %H:%M:%S',
@@ -440,7 +437,7 @@ class CryptocomImporter(BaseExchangeImporter):
                         link='',
                         notes=notes,
                     )
-                    self.add_trade(write_cursor, trade)
+                    self.add_trade(trade)
 
         # Compute investments profit
         if len(investments_withdrawals) != 0:
@@ -502,9 +499,9 @@ class CryptocomImporter(BaseExchangeImporter):
                             asset=asset_object,
                             notes=f'Staking profit for {asset}',
                         )
-                        self.add_history_events(write_cursor, [event])
+                        self.add_history_events([event])
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """May raise:
         - InputError if one of the rows is malformed
         """
@@ -514,7 +511,6 @@ class CryptocomImporter(BaseExchangeImporter):
                 #  Notice: Crypto.com csv export gathers all swapping entries (`lockup_swap_*`,
                 # `crypto_wallet_swap_*`, ...) into one entry named `dynamic_coin_swap_*`.
                 self._import_cryptocom_associated_entries(
-                    write_cursor=write_cursor,
                     data=data,
                     tx_kind='dynamic_coin_swap',
                     **kwargs,
@@ -525,7 +521,6 @@ class CryptocomImporter(BaseExchangeImporter):
                 next(data)
 
                 self._import_cryptocom_associated_entries(
-                    write_cursor=write_cursor,
                     data=data,
                     tx_kind='dust_conversion',
                     **kwargs,
@@ -533,11 +528,11 @@ class CryptocomImporter(BaseExchangeImporter):
                 csvfile.seek(0)
                 next(data)
 
-                self._import_cryptocom_associated_entries(write_cursor, data, 'interest_swap', **kwargs)  # noqa: E501
+                self._import_cryptocom_associated_entries(data, 'interest_swap', **kwargs)
                 csvfile.seek(0)
                 next(data)
 
-                self._import_cryptocom_associated_entries(write_cursor, data, 'invest', **kwargs)
+                self._import_cryptocom_associated_entries(data, 'invest', **kwargs)
                 csvfile.seek(0)
                 next(data)
             except KeyError as e:
@@ -547,7 +542,7 @@ class CryptocomImporter(BaseExchangeImporter):
 
             for row in data:
                 try:
-                    self._consume_cryptocom_entry(write_cursor, row, **kwargs)
+                    self._consume_cryptocom_entry(row, **kwargs)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During cryptocom CSV import found action with unknown '
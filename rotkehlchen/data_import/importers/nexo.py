@@ -10,7 +10,6 @@ from rotkehlchen.assets.converters import asset_from_nexo
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_USD
 from rotkehlchen.data_import.utils import BaseExchangeImporter, UnsupportedCSVEntry, hash_csv_row
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -34,7 +33,6 @@ NEXO_PREFIX = 'NEXO_'
 class NexoImporter(BaseExchangeImporter):
     def _consume_nexo(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             timestamp_format: str = '%Y-%m-%d %H:%M:%S',
     ) -> None:
@@ -89,7 +87,7 @@ class NexoImporter(BaseExchangeImporter):
                 fee_asset=A_USD,
                 link=transaction,
             )
-            self.add_asset_movement(write_cursor, asset_movement)
+            self.add_asset_movement(asset_movement)
         elif entry_type in ('Withdrawal', 'WithdrawExchanged'):
             asset_movement = AssetMovement(
                 location=Location.NEXO,
@@ -103,7 +101,7 @@ class NexoImporter(BaseExchangeImporter):
                 fee_asset=A_USD,
                 link=transaction,
             )
-            self.add_asset_movement(write_cursor, asset_movement)
+            self.add_asset_movement(asset_movement)
         elif entry_type == 'Withdrawal Fee':
             event = HistoryEvent(
                 event_identifier=f'{NEXO_PREFIX}{hash_csv_row(csv_row)}',
@@ -117,7 +115,7 @@ class NexoImporter(BaseExchangeImporter):
                 location_label=transaction,
                 notes=f'{entry_type} from Nexo',
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         elif entry_type in ('Interest', 'Bonus', 'Dividend', 'FixedTermInterest', 'Cashback', 'ReferralBonus'):  # noqa: E501
             # A user shared a CSV file where some entries marked as interest had negative amounts.
             # we couldn't find information about this since they seem internal transactions made
@@ -140,7 +138,7 @@ class NexoImporter(BaseExchangeImporter):
                 location_label=transaction,
                 notes=f'{entry_type} from Nexo',
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         elif entry_type == 'Liquidation':
             input_asset = asset_from_nexo(csv_row['Input Currency'])
             input_amount = deserialize_asset_amount_force_positive(csv_row['Input Amount'])
@@ -156,13 +154,13 @@ class NexoImporter(BaseExchangeImporter):
                 location_label=transaction,
                 notes=f'{entry_type} from Nexo',
             )
-            self.add_history_events(write_cursor, [event])
+            self.add_history_events([event])
         elif entry_type in ignored_entries:
             pass
         else:
             raise UnsupportedCSVEntry(f'Unsuported entry {entry_type}. Data: {csv_row}')
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """
         Information for the values that the columns can have has been obtained from
         https://github.com/BittyTax/BittyTax/blob/06794f51223398759852d6853bc7112ffb96129a/bittytax/conv/parsers/nexo.py
@@ -171,9 +169,9 @@ class NexoImporter(BaseExchangeImporter):
         """
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.DictReader(csvfile)
-            for row in data:
+            for row in self._iterate_rows(data):
                 try:
-                    self._consume_nexo(write_cursor, row, **kwargs)
+                    self._consume_nexo(row, **kwargs)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During Nexo CSV import found action with unknown '
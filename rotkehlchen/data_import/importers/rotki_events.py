@@ -1,7 +1,6 @@
 import csv
 from pathlib import Path
 from typing import Any
-from uuid import uuid4
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.accounting.structures.base import HistoryBaseEntry, HistoryEvent
@@ -10,9 +9,9 @@ from rotkehlchen.constants import ZERO
 from rotkehlchen.data_import.utils import (
     BaseExchangeImporter,
     UnsupportedCSVEntry,
+    hash_csv_row,
     process_rotki_generic_import_csv_fields,
 )
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -33,7 +32,6 @@ GENERIC_TYPE_TO_HISTORY_EVENT_TYPE_MAPPINGS = {
 class RotkiGenericEventsImporter(BaseExchangeImporter):
     def _consume_rotki_event(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
             sequence_index: int,
     ) -> None:
@@ -44,7 +42,7 @@ class RotkiGenericEventsImporter(BaseExchangeImporter):
         - UnknownAsset
         - KeyError
         """
-        identifier = f'{ROTKI_EVENT_PREFIX}_{uuid4().hex}'
+        identifier = f'{ROTKI_EVENT_PREFIX}_{hash_csv_row(csv_row, self._row_index)}'
         try:
             event_type, event_subtype = GENERIC_TYPE_TO_HISTORY_EVENT_TYPE_MAPPINGS[csv_row['Type']]  # noqa: E501
         except KeyError as e:
@@ -82,18 +80,19 @@ class RotkiGenericEventsImporter(BaseExchangeImporter):
                 notes=csv_row['Description'],
             )
             events.append(fee_event)
-        self.add_history_events(write_cursor, events)  # event assets are always resolved here
+        self.add_history_events(events)  # event assets are always resolved here
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """May raise:
         - InputError if one of the rows is malformed
         """
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.DictReader(csvfile)
-            for idx, row in enumerate(data):
+            # rows of an interrupted import are skipped so start counting after them
+            for idx, row in enumerate(self._iterate_rows(data), start=self._resumed_rows):
                 try:
                     kwargs['sequence_index'] = idx
-                    self._consume_rotki_event(write_cursor, row, **kwargs)
+                    self._consume_rotki_event(row, **kwargs)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During rotki generic events CSV import, found action with unknown '
@@ -9,7 +9,6 @@ from rotkehlchen.data_import.utils import (
     BaseExchangeImporter,
     process_rotki_generic_import_csv_fields,
 )
-from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.errors.serialization import DeserializationError
@@ -26,7 +25,6 @@ log = RotkehlchenLogsAdapter(logger)
 class RotkiGenericTradesImporter(BaseExchangeImporter):
     def _consume_rotki_trades(
             self,
-            write_cursor: DBCursor,
             csv_row: dict[str, Any],
     ) -> None:
         """Consume rotki generic trades import CSV file.
@@ -51,17 +49,17 @@ class RotkiGenericTradesImporter(BaseExchangeImporter):
             amount=amount_bought,
             notes=csv_row['Description'],
         )
-        self.add_trade(write_cursor, trade)
+        self.add_trade(trade)
 
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """May raise:
         - InputError if one of the rows is malformed
         """
         with open(filepath, encoding='utf-8-sig') as csvfile:
             data = csv.DictReader(csvfile)
-            for row in data:
+            for row in self._iterate_rows(data):
                 try:
-                    self._consume_rotki_trades(write_cursor, row)
+                    self._consume_rotki_trades(row)
                 except UnknownAsset as e:
                     self.db.msg_aggregator.add_warning(
                         f'During rotki generic trades CSV import, found action with unknown '
@@ -80,8 +80,12 @@ class CSVDataImporter:
             **kwargs: Any,
     ) -> tuple[bool, str]:
         """Imports csv data from `filepath`.`source` determines the format of the file.
-        Returns (True, '') if imported successfully and (False, message) otherwise."""
+        Returns (True, '') if imported successfully and (False, message) otherwise.
+
+        The entries are saved in batches so an import that fails midway keeps the entries
+        saved until then. Importing the same file again continues after them if possible.
+        """
         importer_type = source.get_importer_type()
         importer = importer_type(db=self.db)
-        success, msg = importer.import_csv(filepath=filepath, **kwargs)
+        success, msg = importer.import_csv(filepath=filepath, source=source.serialize(), **kwargs)
         return success, msg
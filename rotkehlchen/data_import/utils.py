@@ -1,10 +1,14 @@
 import hashlib
+import logging
 from abc import ABCMeta, abstractmethod
-from collections.abc import Mapping
+from collections.abc import Iterable, Iterator, Mapping
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, Optional, TypeVar
+
+import gevent
 
 from rotkehlchen.accounting.structures.base import HistoryBaseEntry
+from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.asset import Asset, AssetWithOracles
 from rotkehlchen.assets.converters import LOCATION_TO_ASSET_MAPPING, asset_from_common_identifier
 from rotkehlchen.db.dbhandler import DBHandler
@@ -12,13 +16,32 @@ from rotkehlchen.db.drivers.gevent import DBCursor
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.exchanges.data_structures import AssetMovement, MarginPosition, Trade
+from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_asset_amount, deserialize_timestamp
 from rotkehlchen.types import Fee, Location, TimestampMS
 
+T = TypeVar('T')
+
 ITEMS_PER_DB_WRITE = 400
+CSV_HASH_CHUNK_SIZE = 2 ** 16
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
 
 
 class BaseExchangeImporter(metaclass=ABCMeta):
+    """Imports the entries of a CSV file to the DB
+
+    The entries are written in batches of ITEMS_PER_DB_WRITE, each one in its own
+    transaction, so that other writers are not blocked for the whole import. Importers that
+    consume the file in a single pass iterate its rows with `_iterate_rows`. Then the number
+    of rows consumed is saved along with each batch, so that an interrupted import of the
+    same file continues after the last saved row, and it's reported to the frontend.
+
+    The batches saved by an import that failed stay in the DB. So the entries should have
+    deterministic identifiers, for example with `hash_csv_row` of the row and its
+    `_row_index`, so that importing the file again after fixing it does not duplicate them.
+    """
     def __init__(self, db: DBHandler) -> None:
         self.db = db
         self.history_db = DBHistoryEvents(self.db)
@@ -26,45 +49,109 @@ class BaseExchangeImporter(metaclass=ABCMeta):
         self._margin_trades: list[MarginPosition] = []
         self._asset_movements: list[AssetMovement] = []
         self._history_events: list[HistoryBaseEntry] = []
-
-    def import_csv(self, filepath: Path, **kwargs: Any) -> tuple[bool, str]:
+        self._source = ''
+        self._importer = type(self).__name__
+        self._import_key = ''
+        self._total_rows = 0
+        self._resumed_rows = 0
+        self._consumed_rows: Optional[int] = None  # None if the rows are not tracked
+        self._row_index = 0  # index in the file of the row consumed by _iterate_rows
+
+    def import_csv(self, filepath: Path, source: str, **kwargs: Any) -> tuple[bool, str]:
+        self._source = source
+        self._import_key, self._total_rows = csv_import_key(
+            filepath=filepath,
+            importer=self._importer,
+            arguments=kwargs,
+        )
+        with self.db.conn.read_ctx() as cursor:
+            result = cursor.execute(
+                'SELECT consumed_rows FROM csv_import_checkpoints '
+                'WHERE importer=? AND import_key=?',
+                (self._importer, self._import_key),
+            ).fetchone()
+        if result is not None:
+            self._resumed_rows = result[0]
+            log.info(f'Resuming {source} CSV import of {filepath} after row {result[0]}')
+
+        self._notify_progress()
         try:
-            with self.db.user_write() as write_cursor:
-                self._import_csv(write_cursor, filepath=filepath, **kwargs)
-                self.flush_all(write_cursor)
+            self._import_csv(filepath=filepath, **kwargs)
         except InputError as e:
             return False, str(e)
-        else:
-            return True, ''
+
+        with self.db.user_write() as write_cursor:
+            self._write_pending(write_cursor)
+            write_cursor.execute(  # also the one of another file that this one replaced
+                'DELETE FROM csv_import_checkpoints WHERE importer=?',
+                (self._importer,),
+            )
+        self._notify_progress(finished=True)
+        return True, ''
 
     @abstractmethod
-    def _import_csv(self, write_cursor: DBCursor, filepath: Path, **kwargs: Any) -> None:
+    def _import_csv(self, filepath: Path, **kwargs: Any) -> None:
         """The method that processes csv. Should be implemented by subclasses.
         May raise:
         - InputError if one of the rows is malformed
         """
 
-    def add_trade(self, write_cursor: DBCursor, trade: Trade) -> None:
+    def _iterate_rows(self, rows: Iterable[T]) -> Iterator[T]:
+        """Iterate the rows of a file that is consumed in a single pass
+
+        Skips the rows saved by an interrupted import of the same file. The pending
+        entries are only flushed between rows so that a batch never has part of a row.
+        """
+        self._consumed_rows = self._resumed_rows
+        for idx, row in enumerate(rows):
+            if idx < self._resumed_rows:
+                continue
+
+            self._row_index = idx
+            yield row
+            self._consumed_rows = idx + 1
+            if self._pending_items() >= ITEMS_PER_DB_WRITE:
+                self.flush_all()
+
+    def add_trade(self, trade: Trade) -> None:
         self._trades.append(trade)
-        self.maybe_flush_all(write_cursor)
+        self.maybe_flush_all()
 
-    def add_margin_trade(self, write_cursor: DBCursor, margin_trade: MarginPosition) -> None:
+    def add_margin_trade(self, margin_trade: MarginPosition) -> None:
         self._margin_trades.append(margin_trade)
-        self.maybe_flush_all(write_cursor)
+        self.maybe_flush_all()
 
-    def add_asset_movement(self, write_cursor: DBCursor, asset_movement: AssetMovement) -> None:
+    def add_asset_movement(self, asset_movement: AssetMovement) -> None:
         self._asset_movements.append(asset_movement)
-        self.maybe_flush_all(write_cursor)
+        self.maybe_flush_all()
 
-    def add_history_events(self, write_cursor: DBCursor, history_events: list[HistoryBaseEntry]) -> None:  # noqa: E501
+    def add_history_events(self, history_events: list[HistoryBaseEntry]) -> None:
         self._history_events.extend(history_events)
-        self.maybe_flush_all(write_cursor)
-
-    def maybe_flush_all(self, cursor: DBCursor) -> None:
-        if len(self._trades) + len(self._margin_trades) + len(self._asset_movements) + len(self._history_events) >= ITEMS_PER_DB_WRITE:  # noqa: E501
-            self.flush_all(cursor)
-
-    def flush_all(self, write_cursor: DBCursor) -> None:
+        self.maybe_flush_all()
+
+    def _pending_items(self) -> int:
+        return len(self._trades) + len(self._margin_trades) + len(self._asset_movements) + len(self._history_events)  # noqa: E501
+
+    def maybe_flush_all(self) -> None:
+        if self._consumed_rows is None and self._pending_items() >= ITEMS_PER_DB_WRITE:
+            self.flush_all()
+
+    def flush_all(self) -> None:
+        """Write the pending entries in their own transaction. If the rows are tracked the
+        number of rows consumed is saved with them."""
+        with self.db.user_write() as write_cursor:
+            self._write_pending(write_cursor)
+            if self._consumed_rows is not None:
+                write_cursor.execute(
+                    'INSERT OR REPLACE INTO csv_import_checkpoints(importer, import_key, '
+                    'consumed_rows) VALUES(?, ?, ?)',
+                    (self._importer, self._import_key, self._consumed_rows),
+                )
+
+        self._notify_progress()
+        gevent.sleep(0)  # let the writers that waited for the transaction go
+
+    def _write_pending(self, write_cursor: DBCursor) -> None:
         self.db.add_trades(write_cursor, trades=self._trades)
         self.db.add_margin_positions(write_cursor, margin_positions=self._margin_trades)
         self.db.add_asset_movements(write_cursor, asset_movements=self._asset_movements)
@@ -74,6 +161,22 @@ class BaseExchangeImporter(metaclass=ABCMeta):
         self._asset_movements = []
         self._history_events = []
 
+    def _notify_progress(self, finished: bool = False) -> None:
+        processed_rows = self._consumed_rows
+        if finished is True and processed_rows is None:
+            processed_rows = self._total_rows
+
+        self.db.msg_aggregator.add_message(
+            message_type=WSMessageType.CSV_IMPORT_STATUS,
+            data={
+                'source': self._source,
+                'status': 'finished' if finished else 'in_progress',
+                'total_rows': self._total_rows,
+                'processed_rows': processed_rows,
+                'resumed_rows': self._resumed_rows,
+            },
+        )
+
 
 class UnsupportedCSVEntry(Exception):
     """Thrown for external exchange exported entries we can't import"""
@@ -98,7 +201,32 @@ def process_rotki_generic_import_csv_fields(
     return asset, fee, fee_currency, location, timestamp
 
 
-def hash_csv_row(csv_row: Mapping[str, Any]) -> str:
-    """Convert the row to string and encode it to a hex string to get a unique hash"""
-    row_str = str(csv_row).encode()
-    return hashlib.sha256(row_str).hexdigest()
+def csv_import_key(
+        filepath: Path,
+        importer: str,
+        arguments: dict[str, Any],
+) -> tuple[str, int]:
+    """Hash that identifies the import of the file's contents with the given importer and
+    arguments, along with the number of lines after the header of the file. The lines are
+    the number of rows unless some values span multiple lines."""
+    digest = hashlib.sha256(f'{importer}{sorted(arguments.items())}'.encode())
+    lines, last_byte = 0, b''
+    with open(filepath, 'rb') as csvfile:
+        while len(chunk := csvfile.read(CSV_HASH_CHUNK_SIZE)) != 0:
+            digest.update(chunk)
+            lines += chunk.count(b'\n')
+            last_byte = chunk[-1:]
+
+    if last_byte not in (b'', b'\n'):
+        lines += 1  # the last line has no line break
+    return digest.hexdigest(), max(lines - 1, 0)
+
+
+def hash_csv_row(csv_row: Mapping[str, Any], row_index: Optional[int] = None) -> str:
+    """Convert the row to string and encode it to a hex string to get a unique hash
+
+    If the index of the row in the file is given it's also hashed, so that identical rows
+    of a file get different hashes.
+    """
+    row_str = str(csv_row) if row_index is None else f'{row_index}:{csv_row}'
+    return hashlib.sha256(row_str.encode()).hexdigest()
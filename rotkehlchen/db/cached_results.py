@@ -0,0 +1,51 @@
+from typing import TYPE_CHECKING, Optional
+
+from rotkehlchen.types import Timestamp
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.dbhandler import DBHandler
+
+
+class DBCachedResults:
+    """Results of cached functions that are kept in the transient DB between restarts
+
+    The transient DB is encrypted with the user's password, same as the user DB. The
+    results are kept as JSON serialized by the objects whose functions are cached.
+    Each object whose results are kept has its own owner name and each call of a
+    function its own signature.
+    """
+
+    def __init__(self, database: 'DBHandler') -> None:
+        self.db = database
+
+    def get(self, owner: str, signature: str) -> Optional[tuple[Timestamp, str]]:
+        """Get the timestamp and the serialized result of the given call. None if not kept"""
+        with self.db.conn_transient.read_ctx() as cursor:
+            entry = cursor.execute(
+                'SELECT timestamp, result FROM cached_results WHERE owner=? AND signature=?',
+                (owner, signature),
+            ).fetchone()
+
+        if entry is None:
+            return None
+
+        return Timestamp(entry[0]), entry[1]
+
+    def set(self, owner: str, signature: str, timestamp: Timestamp, result: str) -> None:
+        """Keep the serialized result of the given call"""
+        with self.db.conn_transient.write_ctx() as write_cursor:
+            write_cursor.execute(
+                'INSERT OR REPLACE INTO cached_results(owner, signature, timestamp, result) '
+                'VALUES(?, ?, ?, ?)',
+                (owner, signature, timestamp, result),
+            )
+
+    def delete(self, owner: str, signature: Optional[str] = None) -> None:
+        """Delete the kept result of the given call or all results of the owner"""
+        querystr, bindings = 'DELETE FROM cached_results WHERE owner=?', [owner]
+        if signature is not None:
+            querystr += ' AND signature=?'
+            bindings.append(signature)
+
+        with self.db.conn_transient.write_ctx() as write_cursor:
+            write_cursor.execute(querystr, bindings)
@@ -1,5 +1,6 @@
 import logging
 import re
+from collections.abc import Collection
 from typing import TYPE_CHECKING, Any
 
 from rotkehlchen.errors.misc import DBSchemaError
@@ -39,8 +40,11 @@ def sanity_check_impl(
         cursor: 'DBCursor',
         db_name: str,
         minimized_schema: dict[str, str],
+        triggers: Collection[str] = (),
 ) -> None:
-    """The implementation of the DB sanity check. Out of DBConnection to keep things cleaner"""
+    """The implementation of the DB sanity check. Out of DBConnection to keep things cleaner
+
+    triggers are the names of the triggers that the database should have."""
     cursor.execute('SELECT name, sql FROM sqlite_master WHERE type="table"')
     tables_data_from_db: dict[str, tuple[str, str]] = {}
     for (name, raw_script) in cursor:
@@ -53,9 +57,11 @@ def sanity_check_impl(
         tables_data_from_db[name] = (table_properties, raw_script)
 
     # Check that there are no extra structures such as views
-    extra_db_structures = cursor.execute(
-        'SELECT type, name, sql FROM sqlite_master WHERE type NOT IN ("table", "index")',
-    ).fetchall()
+    extra_db_structures = [
+        (structure_type, name, sql) for structure_type, name, sql in cursor.execute(
+            'SELECT type, name, sql FROM sqlite_master WHERE type NOT IN ("table", "index")',
+        ) if structure_type != 'trigger' or name not in triggers
+    ]
     if len(extra_db_structures) > 0:
         logger.critical(
             f'Unexpected structures in {db_name} database: {extra_db_structures}',
@@ -73,6 +79,15 @@ def sanity_check_impl(
             f'database. ' + DEFAULT_SANITY_CHECK_MESSAGE,
         )
 
+    # Check what triggers are missing from the db
+    cursor.execute('SELECT name FROM sqlite_master WHERE type="trigger"')
+    missing_triggers = set(triggers) - {x[0] for x in cursor}
+    if len(missing_triggers) > 0:
+        raise DBSchemaError(
+            f'Triggers {missing_triggers} are missing from your {db_name} '
+            f'database. ' + DEFAULT_SANITY_CHECK_MESSAGE,
+        )
+
     # Check what extra tables are in the db
     extra_tables = tables_data_from_db.keys() - minimized_schema.keys()
     if len(extra_tables) > 0:
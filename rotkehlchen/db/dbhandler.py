@@ -3,7 +3,6 @@ import logging
 import os
 import re
 import shutil
-import tempfile
 from collections import defaultdict
 from collections.abc import Iterator, Sequence
 from contextlib import contextmanager, suppress
@@ -25,6 +24,7 @@ from rotkehlchen.chain.accounts import (
 )
 from rotkehlchen.chain.bitcoin.hdkey import HDKey
 from rotkehlchen.chain.bitcoin.xpub import (
+    DerivedAddressesCache,
     XpubData,
     XpubDerivedAddressData,
     deserialize_derivation_path_for_db,
@@ -71,6 +71,7 @@ from rotkehlchen.db.settings import (
     ModifiableDBSettings,
     db_settings_from_dict,
 )
+from rotkehlchen.db.shadow_columns import execute_shadow_sums, from_shadow_sum, shadow_sum
 from rotkehlchen.db.upgrade_manager import DBUpgradeManager
 from rotkehlchen.db.utils import (
     DBAssetBalance,
@@ -110,6 +111,7 @@ from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import PremiumCredentials
 from rotkehlchen.serialization.deserialize import deserialize_hex_color_code, deserialize_timestamp
+from rotkehlchen.tasks.scheduler import TaskBacklogs
 from rotkehlchen.types import (
     EVM_CHAINS_WITH_TRANSACTIONS,
     SPAM_PROTOCOL,
@@ -199,6 +201,11 @@ class DBHandler:
         self.conn_transient: DBConnection = None  # type: ignore
         # Lock to make sure that 2 callers of get_or_create_evm_token do not go in at the same time
         self.get_or_create_evm_token_lock = Semaphore()
+        # Estimates of the work pending for the background tasks. Updated as work is added.
+        self.task_backlogs = TaskBacklogs()
+        # Assets ever owned, remembered by get_owned_assets until the tables they are
+        # taken from change
+        self._owned_assets: Optional[set[Asset]] = None
         self.password = password
         self._connect()
         self._check_unfinished_upgrades(resume_from_backup=resume_from_backup)
@@ -439,6 +446,9 @@ class DBHandler:
             ) from e
 
         setattr(self, conn_attribute, conn)
+        if conn_attribute == 'conn':  # the estimates may not match the pending work of this DB
+            self.task_backlogs.clear()
+            self.forget_owned_assets()
 
     def _change_password(
             self,
@@ -499,8 +509,8 @@ class DBHandler:
                 'DETACH DATABASE plaintext;',
             )
 
-    def import_unencrypted(self, unencrypted_db_data: bytes) -> None:
-        """Imports an unencrypted DB from raw data
+    def import_unencrypted(self, unencrypted_db_path: Path) -> None:
+        """Imports an unencrypted DB from the plaintext DB file at the given path
 
         May raise:
         - DBUpgradeError if the rotki DB version is newer than the software or
@@ -517,25 +527,19 @@ class DBHandler:
         )
         rdbpath.unlink()
 
-        # dump the unencrypted data into a temporary file
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            tempdbpath = os.path.join(tmpdirname, 'temp.db')
-            with open(tempdbpath, 'wb') as f:
-                f.write(unencrypted_db_data)
-
-            # Now attach to the unencrypted DB and copy it to our DB and encrypt it
-            self.conn = DBConnection(
-                path=tempdbpath,
-                connection_type=DBConnectionType.USER,
-                sql_vm_instructions_cb=self.sql_vm_instructions_cb,
-            )
-            password_for_sqlcipher = protect_password_sqlcipher(self.password)
-            script = f'ATTACH DATABASE "{rdbpath}" AS encrypted KEY "{password_for_sqlcipher}";'
-            if self.sqlcipher_version == 3:
-                script += f'PRAGMA encrypted.kdf_iter={KDF_ITER};'
-            script += 'SELECT sqlcipher_export("encrypted");DETACH DATABASE encrypted;'
-            self.conn.executescript(script)
-            self.disconnect()
+        # Now attach to the unencrypted DB and copy it to our DB and encrypt it
+        self.conn = DBConnection(
+            path=unencrypted_db_path,
+            connection_type=DBConnectionType.USER,
+            sql_vm_instructions_cb=self.sql_vm_instructions_cb,
+        )
+        password_for_sqlcipher = protect_password_sqlcipher(self.password)
+        script = f'ATTACH DATABASE "{rdbpath}" AS encrypted KEY "{password_for_sqlcipher}";'
+        if self.sqlcipher_version == 3:
+            script += f'PRAGMA encrypted.kdf_iter={KDF_ITER};'
+        script += 'SELECT sqlcipher_export("encrypted");DETACH DATABASE encrypted;'
+        self.conn.executescript(script)
+        self.disconnect()
 
         try:
             self._connect()
@@ -736,11 +740,12 @@ class DBHandler:
 
     def add_multiple_balances(self, write_cursor: 'DBCursor', balances: list[DBAssetBalance]) -> None:  # noqa: E501
         """Execute addition of multiple balances in the DB"""
+        self.forget_owned_assets()
         serialized_balances = [balance.serialize_for_db() for balance in balances]
         try:
             write_cursor.executemany(
-                'INSERT INTO timed_balances(category, timestamp, currency, amount, usd_value) '
-                'VALUES(?, ?, ?, ?, ?)',
+                'INSERT INTO timed_balances(category, timestamp, currency, amount, usd_value, '
+                'amount_scaled, usd_value_scaled) VALUES(?, ?, ?, ?, ?, ?, ?)',
                 serialized_balances,
             )
         except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
@@ -751,6 +756,7 @@ class DBHandler:
 
     def delete_balancer_events_data(self, write_cursor: 'DBCursor') -> None:
         """Delete all historical Balancer events data"""
+        self.forget_owned_assets()
         write_cursor.execute('DELETE FROM balancer_events;')
         write_cursor.execute(
             'DELETE FROM used_query_ranges WHERE name LIKE ?',
@@ -789,6 +795,7 @@ class DBHandler:
 
     def delete_yearn_vaults_data(self, write_cursor: 'DBCursor', version: int) -> None:
         """Delete all historical yearn vault events data"""
+        self.forget_owned_assets()
         if version not in (1, 2):
             log.error(f'Called delete yearn vault data with non valid version {version}')
             return None
@@ -829,16 +836,26 @@ class DBHandler:
             location: Location,
             exchange_name: Optional[str] = None,
     ) -> None:
-        """Delete the query ranges for the given exchange name"""
-        names_to_delete = f'{location!s}\\_%'
-        if exchange_name is not None:
-            names_to_delete += f'\\_{exchange_name}'
+        """Delete the query ranges for the given exchange name along with the
+        progress of the exchange's queries that depends on them"""
+        name_suffix = '' if exchange_name is None else f'\\_{exchange_name}'
         write_cursor.execute(
             'DELETE FROM used_query_ranges WHERE name LIKE ? ESCAPE ?;',
-            (names_to_delete, '\\'),
+            (f'{location!s}\\_%{name_suffix}', '\\'),
+        )
+        write_cursor.execute(
+            'DELETE FROM multisettings WHERE name LIKE ? ESCAPE ?;',
+            (f'{location!s}\\_last\\_trade\\_id\\_%{name_suffix}', '\\'),
         )
+        checkpoints_query = 'DELETE FROM exchange_pagination_checkpoints WHERE location=?'
+        bindings = [location.serialize_for_db()]
+        if exchange_name is not None:
+            checkpoints_query += ' AND exchange_name=?'
+            bindings.append(exchange_name)
+        write_cursor.execute(checkpoints_query, bindings)
 
     def purge_exchange_data(self, write_cursor: 'DBCursor', location: Location) -> None:
+        self.forget_owned_assets()
         self.delete_used_query_range_for_exchange(write_cursor=write_cursor, location=location)
         serialized_location = location.serialize_for_db()
         for table in ('trades', 'asset_movements', 'history_events'):
@@ -1168,6 +1185,7 @@ class DBHandler:
         May raise:
         - InputError if one of the given balance entries already exist in the DB
         """
+        self.forget_owned_assets()
         # Insert the manually tracked balances in the DB
         try:
             for entry in data:
@@ -1198,6 +1216,7 @@ class DBHandler:
         - InputError if any of the manually tracked balance labels to edit do not
         exist in the DB
         """
+        self.forget_owned_assets()
         # Update the manually tracked balance entries in the DB
         tuples = [(
             entry.asset.identifier,
@@ -1225,6 +1244,7 @@ class DBHandler:
         - InputError if any of the given manually tracked balance labels
         to delete did not exist
         """
+        self.forget_owned_assets()
         tuples = [(x,) for x in ids]
         write_cursor.executemany(
             'DELETE FROM tag_mappings WHERE object_reference = ?;', tuples,
@@ -1413,6 +1433,16 @@ class DBHandler:
                     for entry_type in entry_types
                 ],
             )
+            write_cursor.execute(
+                'UPDATE exchange_pagination_checkpoints SET exchange_name=? '
+                'WHERE location=? AND exchange_name=?',
+                (new_name, location.serialize_for_db(), name),
+            )
+            write_cursor.execute(  # and the binance per market last queried trade ids
+                'UPDATE multisettings SET name=substr(name, 1, length(name) - ?) || ? '
+                'WHERE name LIKE ? ESCAPE ?',
+                (len(name), new_name, f'{location!s}\\_last\\_trade\\_id\\_%\\_{name}', '\\'),
+            )
 
             # also update the name of the events related to this exchange
             write_cursor.execute(
@@ -1590,6 +1620,7 @@ class DBHandler:
             )
 
     def add_margin_positions(self, write_cursor: 'DBCursor', margin_positions: list[MarginPosition]) -> None:  # noqa: E501
+        self.forget_owned_assets()
         margin_tuples: list[tuple[Any, ...]] = []
         for margin in margin_positions:
             open_time = 0 if margin.open_time is None else margin.open_time
@@ -1660,6 +1691,7 @@ class DBHandler:
         return margin_positions
 
     def add_asset_movements(self, write_cursor: 'DBCursor', asset_movements: list[AssetMovement]) -> None:  # noqa: E501
+        self.forget_owned_assets()
         movement_tuples = [(
             movement.identifier,
             movement.location.serialize_for_db(),
@@ -1758,6 +1790,7 @@ class DBHandler:
                 'user_notes',
                 'assets',
                 'history_events',
+                'history_events_groups',
                 'accounting_rules',
             ],
             op: Literal['OR', 'AND'] = 'OR',
@@ -1787,6 +1820,7 @@ class DBHandler:
             blockchain: SUPPORTED_EVM_CHAINS,
     ) -> None:
         """Deletes all evm related data from the DB for a single evm address"""
+        self.forget_owned_assets()
         if blockchain == SupportedBlockchain.ETHEREUM:  # mainnet only behaviour
             write_cursor.execute('DELETE FROM used_query_ranges WHERE name = ?', (f'aave_events_{address}',))  # noqa: E501
             write_cursor.execute(
@@ -1810,6 +1844,7 @@ class DBHandler:
         dbtx.delete_transactions(write_cursor=write_cursor, address=address, chain=blockchain)
 
     def add_trades(self, write_cursor: 'DBCursor', trades: list[Trade]) -> None:
+        self.forget_owned_assets()
         trade_tuples = [(
             trade.identifier,
             trade.timestamp,
@@ -1848,6 +1883,7 @@ class DBHandler:
             old_trade_id: str,
             trade: Trade,
     ) -> tuple[bool, str]:
+        self.forget_owned_assets()
         write_cursor.execute(
             'UPDATE trades SET '
             '  id=?, '
@@ -1936,6 +1972,7 @@ class DBHandler:
         May raise:
         - InputError if any of the `trade_id` are non-existent.
         """
+        self.forget_owned_assets()
         write_cursor.executemany(
             'DELETE FROM trades WHERE id=?',
             [(trade_id,) for trade_id in trades_ids],
@@ -2006,12 +2043,19 @@ class DBHandler:
             )
             if not include_nfts:
                 with self.conn.read_ctx() as nft_cursor:
-                    nft_cursor.execute(
-                        'SELECT timestamp, SUM(usd_value) FROM timed_balances WHERE '
-                        'timestamp >= ? AND currency LIKE ? GROUP BY timestamp',
-                        (from_ts, f'{NFT_DIRECTIVE}%'),
+                    execute_shadow_sums(
+                        cursor=nft_cursor,
+                        query=lambda as_integer: (
+                            f'SELECT timestamp, {shadow_sum("usd_value", as_integer=as_integer)} '
+                            'FROM timed_balances WHERE timestamp >= ? AND currency LIKE ? '
+                            'GROUP BY timestamp'
+                        ),
+                        bindings=(from_ts, f'{NFT_DIRECTIVE}%'),
                     )
-                    nft_values = dict(nft_cursor)
+                    nft_values = {
+                        timestamp: from_shadow_sum('usd_value', scaled_sum, unscaled_total)
+                        for timestamp, scaled_sum, unscaled_total in nft_cursor
+                    }
 
             data = []
             times_int = []
@@ -2020,7 +2064,7 @@ class DBHandler:
                 if include_nfts:
                     total = entry[1]
                 else:
-                    total = str(FVal(entry[1]) - FVal(nft_values.get(entry[0], 0)))
+                    total = str(FVal(entry[1]) - nft_values.get(entry[0], ZERO))
                 data.append(total)
         return times_int, data
 
@@ -2279,6 +2323,18 @@ class DBHandler:
 
         return list(results)
 
+    def get_owned_assets(self, cursor: 'DBCursor') -> set[Asset]:
+        """The assets of query_owned_assets. Since querying them is slow they are
+        remembered until forget_owned_assets is called, so it's meant for periodic checks."""
+        if self._owned_assets is None:
+            self._owned_assets = set(self.query_owned_assets(cursor))
+        return self._owned_assets
+
+    def forget_owned_assets(self) -> None:
+        """Forget the assets remembered by get_owned_assets. Needs to be called whenever
+        the tables of TABLES_WITH_ASSETS are modified."""
+        self._owned_assets = None
+
     def update_owned_assets_in_globaldb(self, cursor: 'DBCursor') -> None:
         """Makes sure all owned assets of the user are in the Global DB"""
         assets = self.query_owned_assets(cursor)
@@ -2688,6 +2744,15 @@ class DBHandler:
                 xpub_data.blockchain.value,
             ),
         )
+        with self.conn_transient.write_ctx() as transient_write_cursor:
+            transient_write_cursor.execute(
+                'DELETE FROM xpub_derived_addresses WHERE xpub=? AND derivation_path=? AND blockchain=?;',  # noqa: E501
+                (
+                    xpub_data.xpub.xpub,
+                    xpub_data.serialize_derivation_path_for_db(),
+                    xpub_data.blockchain.value,
+                ),
+            )
 
     def edit_bitcoin_xpub(self, write_cursor: 'DBCursor', xpub_data: XpubData) -> None:
         """Edit the xpub tags and label
@@ -2800,6 +2865,47 @@ class DBHandler:
 
         return tuple(returned_indices)  # type: ignore
 
+    def get_xpub_derived_addresses_cache(self, xpub_data: XpubData) -> DerivedAddressesCache:
+        """Get all addresses derived so far from the given xpub, with or without activity.
+
+        They are kept in the transient DB so that they are not derived again each time
+        we check the xpub for new addresses.
+        """
+        with self.conn_transient.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT account_index, derived_index, address FROM xpub_derived_addresses '
+                'WHERE xpub=? AND derivation_path=? AND blockchain=?;',
+                (
+                    xpub_data.xpub.xpub,
+                    xpub_data.serialize_derivation_path_for_db(),
+                    xpub_data.blockchain.value,
+                ),
+            )
+            return {(entry[0], entry[1]): BTCAddress(entry[2]) for entry in cursor}
+
+    def add_xpub_derived_addresses_cache(
+            self,
+            xpub_data: XpubData,
+            derived_cache: DerivedAddressesCache,
+    ) -> None:
+        """Save newly derived addresses of the given xpub in the transient DB"""
+        if len(derived_cache) == 0:
+            return
+
+        with self.conn_transient.write_ctx() as write_cursor:
+            write_cursor.executemany(
+                'INSERT OR IGNORE INTO xpub_derived_addresses(xpub, derivation_path, '
+                'blockchain, account_index, derived_index, address) VALUES(?, ?, ?, ?, ?, ?)',
+                [(
+                    xpub_data.xpub.xpub,
+                    xpub_data.serialize_derivation_path_for_db(),
+                    xpub_data.blockchain.value,
+                    account_index,
+                    derived_index,
+                    address,
+                ) for (account_index, derived_index), address in derived_cache.items()],
+            )
+
     def get_addresses_to_xpub_mapping(
             self,
             cursor: 'DBCursor',
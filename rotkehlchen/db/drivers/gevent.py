@@ -16,7 +16,7 @@ import gevent
 from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.db.checks import sanity_check_impl
-from rotkehlchen.db.minimized_schema import MINIMIZED_USER_DB_SCHEMA
+from rotkehlchen.db.minimized_schema import MINIMIZED_USER_DB_SCHEMA, MINIMIZED_USER_DB_TRIGGERS
 from rotkehlchen.globaldb.minimized_schema import MINIMIZED_GLOBAL_DB_SCHEMA
 from rotkehlchen.greenlets.utils import get_greenlet_name
 from rotkehlchen.utils.misc import ts_now
@@ -267,8 +267,10 @@ class DBConnection:
             )
         self._set_progress_handler()
         self.minimized_schema = None
+        self.minimized_triggers: tuple[str, ...] = ()
         if connection_type == DBConnectionType.USER:
             self.minimized_schema = MINIMIZED_USER_DB_SCHEMA
+            self.minimized_triggers = MINIMIZED_USER_DB_TRIGGERS
         elif connection_type == DBConnectionType.GLOBAL:
             self.minimized_schema = MINIMIZED_GLOBAL_DB_SCHEMA
 
@@ -516,4 +518,5 @@ class DBConnection:
                 cursor=cursor,
                 db_name=self.connection_type.name.lower(),
                 minimized_schema=self.minimized_schema,
+                triggers=self.minimized_triggers,
             )
@@ -8,6 +8,7 @@ from rotkehlchen.chain.ethereum.modules.eth2.structures import Eth2Validator, Va
 from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.timing import DAY_IN_SECONDS
 from rotkehlchen.db.filtering import ETH_STAKING_EVENT_JOIN, EthStakingEventFilterQuery
+from rotkehlchen.db.shadow_columns import execute_shadow_sums, from_shadow_sum, shadow_sum
 from rotkehlchen.errors.misc import InputError
 from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -107,20 +108,26 @@ class DBEth2:
         return result
 
     def add_validator_daily_stats(self, stats: list[ValidatorDailyStats]) -> None:
-        """Adds given daily stats for validator in the DB. If an entry exists it's skipped"""
-        for entry in stats:  # not doing executemany to just ignore existing entry
-            try:
-                with self.db.user_write() as write_cursor:
-                    write_cursor.execute(
-                        'INSERT INTO eth2_daily_staking_details(validator_index, timestamp, pnl) '
-                        'VALUES(?,?,?)',
-                        entry.to_db_tuple(),
+        """Adds given daily stats for validators in the DB in a single batch.
+        If an entry exists it's skipped"""
+        query = (
+            'INSERT OR IGNORE INTO eth2_daily_staking_details(validator_index, timestamp, pnl) '
+            'VALUES(?,?,?)'
+        )
+        try:
+            with self.db.user_write() as write_cursor:
+                write_cursor.executemany(query, [entry.to_db_tuple() for entry in stats])
+        except sqlcipher.IntegrityError:  # pylint: disable=no-member
+            # a validator was deleted in the meantime. Add one by one to skip only its stats
+            for entry in stats:
+                try:
+                    with self.db.user_write() as write_cursor:
+                        write_cursor.execute(query, entry.to_db_tuple())
+                except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
+                    log.debug(
+                        f'Cant insert Eth2 staking detail entry {entry!s} to the DB '
+                        f'due to {e!s}. Skipping ...',
                     )
-            except sqlcipher.IntegrityError as e:  # pylint: disable=no-member
-                log.debug(
-                    f'Cant insert Eth2 staking detail entry {entry!s} to the DB '
-                    f'due to {e!s}. Skipping ...',
-                )
 
     def get_validator_daily_stats_and_limit_info(
             self,
@@ -248,13 +255,13 @@ class DBEth2:
             filter_query: EthStakingEventFilterQuery,
     ) -> FVal:
         """Execute DB query and extract numerical value after using filter_query"""
-        base_query = 'SELECT SUM(CAST(amount AS REAL)) ' + ETH_STAKING_EVENT_JOIN
         query, bindings = filter_query.prepare(with_pagination=False)
-        cursor.execute(base_query + query, bindings)
-        if (amount := cursor.fetchone()[0]) is not None:
-            return FVal(amount)
-
-        return ZERO
+        execute_shadow_sums(
+            cursor=cursor,
+            query=lambda as_integer: f'SELECT {shadow_sum("amount", table="history_events", as_integer=as_integer)} ' + ETH_STAKING_EVENT_JOIN + query,  # noqa: E501
+            bindings=bindings,
+        )
+        return from_shadow_sum('amount', *cursor.fetchone())
 
     def get_validators_profit(
             self,
@@ -16,6 +16,7 @@ from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_evm_address, deserialize_timestamp
+from rotkehlchen.tasks.scheduler import BacklogType
 from rotkehlchen.types import (
     SUPPORTED_CHAIN_IDS,
     SUPPORTED_EVM_CHAINS,
@@ -95,6 +96,12 @@ class DBEvmTx:
             tuples=tx_tuples,
             relevant_address=relevant_address,
         )
+        if len(evm_transactions) != 0:  # upper bound since some may already be in the DB
+            self.db.task_backlogs.increase(
+                backlog_type=BacklogType.EVM_TX_RECEIPTS,
+                count=len(evm_transactions),
+                chain_id=evm_transactions[0].chain_id,
+            )
 
     def add_evm_internal_transactions(
             self,
@@ -368,6 +375,8 @@ class DBEvmTx:
                     topic_tuples,
                 )
 
+        self.db.task_backlogs.increase(BacklogType.EVM_TX_DECODING, 1, chain_id)
+
     def get_receipt(
             self,
             cursor: 'DBCursor',
@@ -502,6 +511,7 @@ class DBEvmTx:
             'DELETE FROM evm_tx_mappings WHERE tx_id=? AND value=?',
             [(x, HISTORY_MAPPING_STATE_DECODED) for x in tx_ids],
         )
+        self.db.task_backlogs.invalidate(BacklogType.EVM_TX_DECODING, chain_id)
 
     def get_queried_range(
             self,
@@ -1,8 +1,21 @@
+import base64
+import json
 import logging
 from abc import ABCMeta, abstractmethod
 from collections.abc import Collection
 from dataclasses import dataclass, field
-from typing import Any, Generic, Literal, NamedTuple, Optional, TypeVar, Union, cast
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    ClassVar,
+    Generic,
+    Literal,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from rotkehlchen.accounting.structures.base import HistoryBaseEntryType
 from rotkehlchen.accounting.structures.evm_event import EvmProduct
@@ -31,6 +44,9 @@ from rotkehlchen.types import (
 )
 from rotkehlchen.utils.misc import ts_now
 
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
@@ -50,22 +66,82 @@ class DBFilterOrder(NamedTuple):
     rules: list[tuple[str, bool]]
     case_sensitive: bool
 
-    def prepare(self) -> str:
+    def column_expression(self, attribute: str) -> str:
+        if attribute in ('amount', 'fee', 'rate'):
+            attribute = f'CAST({attribute} AS REAL)'
+        if self.case_sensitive is False:
+            return f'{attribute} COLLATE NOCASE'
+        return attribute
+
+    def prepare(self, key_column: Optional[str] = None) -> str:
+        """If key_column is given it is added as the last rule so that the order is total"""
         querystr = 'ORDER BY '
         for idx, (attribute, ascending) in enumerate(self.rules):
             if idx != 0:
                 querystr += ','
-            if attribute in ('amount', 'fee', 'rate'):
-                order_by = f'CAST({attribute} AS REAL)'
-            else:
-                order_by = attribute
+            querystr += f'{self.column_expression(attribute)} {"ASC" if ascending else "DESC"}'
+
+        if key_column is not None:
+            querystr += f',{key_column} ASC'
+        return querystr
 
-            if self.case_sensitive is False:
-                querystr += f'{order_by} COLLATE NOCASE {"ASC" if ascending else "DESC"}'
+    def prepare_keyset(
+            self,
+            keyset: 'DBFilterKeyset',
+            key_column: str,
+    ) -> tuple[str, list[Any]]:
+        """Prepare the condition that selects the rows ordered after the keyset's row
+
+        A row comes after it if it's equal in the first N ordered columns and after it in
+        the next one. NULLs are before any value in SQLite, so first in ascending order
+        and last in descending order.
+        """
+        columns = [(self.column_expression(attribute), ascending) for attribute, ascending in self.rules]  # noqa: E501
+        columns.append((key_column, True))
+        alternatives, bindings = [], []
+        for idx, ((expression, ascending), value) in enumerate(zip(columns, keyset.values)):
+            if value is None:
+                if ascending is False:
+                    continue  # nothing comes after NULL in descending order
+
+                after, after_bindings = f'{expression} IS NOT NULL', []
+            elif ascending is True:
+                after, after_bindings = f'{expression} > ?', [value]
             else:
-                querystr += f'{order_by} {"ASC" if ascending else "DESC"}'
+                after, after_bindings = f'({expression} < ? OR {expression} IS NULL)', [value]
+
+            conditions = [f'{previous} IS ?' for previous, _ in columns[:idx]]
+            alternatives.append(f'({" AND ".join([*conditions, after])})')
+            bindings.extend([*keyset.values[:idx], *after_bindings])
+
+        if len(alternatives) == 0:
+            return '0', []
+
+        return f'({" OR ".join(alternatives)})', bindings
 
-        return querystr
+
+class DBFilterKeyset(NamedTuple):
+    """Values of the ordered columns and of the key column of the last row of a page.
+    The next page continues after this row instead of skipping rows with an offset."""
+    values: list[Any]
+
+    def serialize(self) -> str:
+        return base64.urlsafe_b64encode(json.dumps(self.values).encode()).decode()
+
+    @classmethod
+    def deserialize(cls, cursor: str) -> 'DBFilterKeyset':
+        """May raise DeserializationError if the cursor is not one created by serialize"""
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (ValueError, UnicodeError) as e:
+            raise DeserializationError(f'Invalid pagination cursor {cursor}') from e
+
+        if not isinstance(values, list) or len(values) < 2 or not all(
+            isinstance(value, (int, float, str)) or value is None for value in values
+        ):
+            raise DeserializationError(f'Invalid pagination cursor {cursor}')
+
+        return cls(values=values)
 
 
 class DBFilterPagination(NamedTuple):
@@ -284,6 +360,10 @@ class DBFilterQuery:
     group_by: Optional[DBFilterGroupBy] = None
     order_by: Optional[DBFilterOrder] = None
     pagination: Optional[DBFilterPagination] = None
+    keyset: Optional[DBFilterKeyset] = None
+    # Unique column that orders rows with equal ordered columns. Queries with it can be
+    # paginated by keyset, continuing after the last row of the previous page.
+    keyset_column: ClassVar[Optional[str]] = None
 
     def prepare(
             self,
@@ -295,7 +375,9 @@ class DBFilterQuery:
         """Prepares a filter by converting the filters to a query string
 
         Can be configured to:
-        - with_pagination: Use or not the pagination filters
+        - with_pagination: Use or not the pagination filters. Paginated queries of rows,
+        not groups, continue after the keyset if there is one instead of using the offset.
+        A keyset that doesn't match the order of the query is ignored.
         - with_order: Use or not the order by filters
         - with_group_by: Use or not the group by filters
         - special_free_query: This is only for history events query and since we have quite
@@ -307,6 +389,21 @@ class DBFilterQuery:
         query_parts = []
         bindings: list[Any] = []
         filterstrings = []
+        keyset_column, keyset_query = None, None
+        keyset_bindings: list[Any] = []
+        if (
+                with_pagination and with_group_by is False and
+                self.pagination is not None and self.order_by is not None
+        ):
+            keyset_column = self.keyset_column
+            if (
+                    keyset_column is not None and self.keyset is not None and
+                    len(self.keyset.values) == len(self.order_by.rules) + 1
+            ):
+                keyset_query, keyset_bindings = self.order_by.prepare_keyset(
+                    keyset=self.keyset,
+                    key_column=keyset_column,
+                )
 
         if self.join_clause is not None:
             join_querystr, single_bindings = self.join_clause.prepare()
@@ -325,9 +422,14 @@ class DBFilterQuery:
             filterstrings.append(f'({operator.join(filters)})')
             bindings.extend(single_bindings)
 
-        if len(filterstrings) != 0:
-            operator = ' AND ' if self.and_op else ' OR '
-            filter_query = f'{"WHERE " if self.join_clause is None else "AND ("}{operator.join(filterstrings)}{"" if self.join_clause is None else ")"}'  # noqa: E501
+        operator = ' AND ' if self.and_op else ' OR '
+        conditions = operator.join(filterstrings)
+        if keyset_query is not None:
+            conditions = keyset_query if len(filterstrings) == 0 else f'({conditions}) AND {keyset_query}'  # noqa: E501
+            bindings.extend(keyset_bindings)
+
+        if len(conditions) != 0:
+            filter_query = f'{"WHERE " if self.join_clause is None else "AND ("}{conditions}{"" if self.join_clause is None else ")"}'  # noqa: E501
             query_parts.append(filter_query)
 
         if with_group_by and self.group_by is not None:
@@ -335,15 +437,43 @@ class DBFilterQuery:
             query_parts.append(groupby_query)
 
         if with_order and self.order_by is not None:
-            orderby_query = self.order_by.prepare()
+            orderby_query = self.order_by.prepare(key_column=keyset_column)
             query_parts.append(orderby_query)
 
         if with_pagination and self.pagination is not None:
-            pagination_query = self.pagination.prepare()
-            query_parts.append(pagination_query)
+            pagination = self.pagination
+            if keyset_query is not None:  # the keyset replaces the offset
+                pagination = DBFilterPagination(limit=pagination.limit, offset=0)
+            query_parts.append(pagination.prepare())
 
         return ' '.join(query_parts), bindings
 
+    def next_keyset(
+            self,
+            cursor: 'DBCursor',
+            table: str,
+            key: Any,
+            entries_num: int,
+    ) -> Optional[DBFilterKeyset]:
+        """Get the keyset to continue after the row with the given key column value, which
+        should be the last of a page with entries_num entries.
+
+        Returns None if the page is not full or the query can't be paginated by keyset.
+        """
+        if (
+                self.keyset_column is None or self.order_by is None or
+                self.pagination is None or entries_num < self.pagination.limit
+        ):
+            return None
+
+        expressions = [self.order_by.column_expression(attribute) for attribute, _ in self.order_by.rules]  # noqa: E501
+        row = cursor.execute(
+            f'SELECT {", ".join(expressions)}, {self.keyset_column} FROM {table} '
+            f'WHERE {self.keyset_column}=?',
+            (key,),
+        ).fetchone()
+        return None if row is None else DBFilterKeyset(values=list(row))
+
     @classmethod
     def create(
             cls,
@@ -417,6 +547,7 @@ class FilterWithLocation:
 
 @dataclass(init=True, repr=True, eq=True, order=False, unsafe_hash=False, frozen=False)
 class EvmTransactionsFilterQuery(DBFilterQuery, FilterWithTimestamp):
+    keyset_column = 'evm_transactions.identifier'
 
     @property
     def accounts(self) -> Optional[list[EvmAccount]]:
@@ -599,6 +730,7 @@ class DBOptionalChainAddressesFilter(DBFilter):
 
 
 class TradesFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWithLocation):
+    keyset_column = 'id'
 
     @classmethod
     def make(
@@ -675,6 +807,7 @@ class TradesFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWithLocation):
 
 
 class AssetMovementsFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWithLocation):
+    keyset_column = 'id'
 
     @classmethod
     def make(
@@ -843,6 +976,7 @@ T_HistoryFilterQuery = TypeVar('T_HistoryFilterQuery', bound='HistoryBaseEntryFi
 
 
 class HistoryBaseEntryFilterQuery(DBFilterQuery, FilterWithTimestamp, FilterWithLocation, metaclass=ABCMeta):  # noqa: E501
+    keyset_column = 'history_events.identifier'
 
     @classmethod
     def make(
@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Literal, Optional, Union, overload
 from pysqlcipher3 import dbapi2 as sqlcipher
 
 from rotkehlchen.accounting.structures.base import (
+    DBDeserializationCache,
     HistoryBaseEntry,
     HistoryBaseEntryType,
     HistoryEvent,
@@ -24,18 +25,25 @@ from rotkehlchen.db.filtering import (
     ALL_EVENTS_DATA_JOIN,
     EVM_EVENT_JOIN,
     DBEqualsFilter,
+    DBFilterKeyset,
+    DBFilterPagination,
     DBIgnoredAssetsFilter,
     DBIgnoreValuesFilter,
+    DBLocationFilter,
+    DBMultiStringFilter,
+    DBTimestampFilter,
     EthDepositEventFilterQuery,
     EvmEventFilterQuery,
     HistoryBaseEntryFilterQuery,
     HistoryEventFilterQuery,
 )
+from rotkehlchen.db.shadow_columns import execute_shadow_sums, from_shadow_sum, shadow_sum
 from rotkehlchen.errors.asset import UnknownAsset
 from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.fval import FVal
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_fval
+from rotkehlchen.tasks.scheduler import BacklogType
 from rotkehlchen.types import (
     EVM_CHAIN_IDS_WITH_TRANSACTIONS_TYPE,
     EVMTxHash,
@@ -103,6 +111,9 @@ class DBHistoryEvents:
                 [(identifier, k, v) for k, v in mapping_values.items()],
             )
 
+        if event.balance.usd_value == ZERO:
+            self.db.task_backlogs.increase(BacklogType.MISSING_PRICES, 1)
+
         return identifier
 
     def add_history_events(
@@ -149,6 +160,9 @@ class DBHistoryEvents:
                 (event.identifier, HISTORY_MAPPING_KEY_STATE, HISTORY_MAPPING_STATE_CUSTOMIZED),
             )
 
+        if event.balance.usd_value == ZERO:
+            self.db.task_backlogs.increase(BacklogType.MISSING_PRICES, 1)
+
         return True, ''
 
     def delete_history_events_by_identifier(
@@ -359,6 +373,13 @@ class DBHistoryEvents:
         TODO: To not query all columns with all joins for all cases, we perhaps can
         peek on the entry type of the filter and adjust the SELECT fields accordingly?
         """
+        if (
+                group_by_event_ids is True and has_premium is True and
+                filter_query.pagination is not None and
+                (page := self._get_grouped_events_page(cursor, filter_query)) is not None
+        ):
+            return page  # type: ignore  # the page has the same type as the grouped events
+
         free_query_group_by = ''
         free_query_count = ''
         base_prefix = 'SELECT '
@@ -387,12 +408,13 @@ class DBHistoryEvents:
         if has_premium is True:
             base_query = f'{base_prefix} {HISTORY_BASE_ENTRY_FIELDS}, {EVM_EVENT_FIELDS}, {ETH_STAKING_EVENT_FIELDS} {ALL_EVENTS_DATA_JOIN}'  # noqa: E501
         else:
-            base_query = f'{base_prefix} * FROM (SELECT {free_query_count} {HISTORY_BASE_ENTRY_FIELDS}, {EVM_EVENT_FIELDS}, {ETH_STAKING_EVENT_FIELDS} {ALL_EVENTS_DATA_JOIN} {free_query_group_by} ORDER BY timestamp DESC, sequence_index ASC LIMIT ?) '  # noqa: E501
+            base_query = f'{base_prefix} * FROM (SELECT {free_query_count} {HISTORY_BASE_ENTRY_FIELDS}, {EVM_EVENT_FIELDS}, {ETH_STAKING_EVENT_FIELDS} {ALL_EVENTS_DATA_JOIN} {free_query_group_by} ORDER BY timestamp DESC, sequence_index ASC LIMIT ?) AS history_events '  # noqa: E501
             bindings.insert(0, FREE_HISTORY_EVENTS_LIMIT)
 
         cursor.execute(base_query + prepared_query, bindings)
         output: Union[list[HistoryBaseEntry], list[tuple[int, HistoryBaseEntry]]] = []  # type: ignore
         data_start_idx = type_idx + 1
+        cache = DBDeserializationCache()
         for entry in cursor:
             entry_type = HistoryBaseEntryType(entry[type_idx])
             try:
@@ -403,7 +425,7 @@ class DBHistoryEvents:
                         entry[data_start_idx:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +
                         entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + 1]    # noqa: E501
                     )
-                    deserialized_event = EvmEvent.deserialize_from_db(data)
+                    deserialized_event = EvmEvent.deserialize_from_db(data, cache)
                 elif entry_type in (
                         HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT,
                         HistoryBaseEntryType.ETH_BLOCK_EVENT,
@@ -416,9 +438,9 @@ class DBHistoryEvents:
                         entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + ETH_STAKING_FIELD_LENGTH + 1]  # noqa: E501
                     )
                     if entry_type == HistoryBaseEntryType.ETH_WITHDRAWAL_EVENT:
-                        deserialized_event = EthWithdrawalEvent.deserialize_from_db(data)
+                        deserialized_event = EthWithdrawalEvent.deserialize_from_db(data, cache)
                     else:
-                        deserialized_event = EthBlockEvent.deserialize_from_db(data)
+                        deserialized_event = EthBlockEvent.deserialize_from_db(data, cache)
 
                 elif entry_type == HistoryBaseEntryType.ETH_DEPOSIT_EVENT:
                     data = (
@@ -428,11 +450,14 @@ class DBHistoryEvents:
                         entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + 1] +  # noqa: E501
                         entry[data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH:data_start_idx + HISTORY_BASE_ENTRY_LENGTH + EVM_FIELD_LENGTH + 1]  # noqa: E501
                     )
-                    deserialized_event = EthDepositEvent.deserialize_from_db(data)
+                    deserialized_event = EthDepositEvent.deserialize_from_db(data, cache)
 
                 else:
                     data = entry[data_start_idx:HISTORY_BASE_ENTRY_LENGTH + 1]
-                    deserialized_event = HistoryEvent.deserialize_from_db(entry[data_start_idx:])
+                    deserialized_event = HistoryEvent.deserialize_from_db(
+                        entry=entry[data_start_idx:],
+                        cache=cache,
+                    )
             except (DeserializationError, UnknownAsset) as e:
                 log.debug(f'Failed to deserialize history event {entry} due to {e!s}')
                 continue
@@ -444,6 +469,170 @@ class DBHistoryEvents:
 
         return output  # type: ignore # This is due to needing a generic HistoryBaseEntry return in this function, but the overloads would not work since HistoryEvent` is the same. Essentially the non-abstract version of HistoryBaseEntry
 
+    @staticmethod
+    def _get_groups_order(filter_query: HistoryBaseEntryFilterQuery) -> Optional[str]:
+        """Returns the direction in which the history_events_groups summary should be
+        ordered for the filter. None if its order can't be followed by the summary."""
+        order_rules = [] if filter_query.order_by is None else filter_query.order_by.rules
+        if (
+                len(order_rules) == 0 or order_rules[0][0] != 'timestamp' or
+                any(attribute not in ('timestamp', 'sequence_index') for attribute, _ in order_rules)  # noqa: E501
+        ):
+            return None
+
+        return 'ASC' if order_rules[0][1] is True else 'DESC'
+
+    def _get_grouped_events_page(
+            self,
+            cursor: 'DBCursor',
+            filter_query: Union[HistoryEventFilterQuery, EvmEventFilterQuery, EthDepositEventFilterQuery],  # noqa: E501
+    ) -> Optional[list[tuple[int, HistoryBaseEntry]]]:
+        """Get a page of grouped events by paginating the history_events_groups summary.
+        Only the events of the groups in the page are then grouped. A keyset of the
+        summary's timestamp and event identifier continues after that group.
+
+        Returns None if the filter or the order can't be answered from the summary.
+        """
+        if (
+                (order := self._get_groups_order(filter_query)) is None or
+                (groups_filter := self._prepare_groups_filter(filter_query)) is None
+        ):
+            return None
+
+        where_query, bindings = groups_filter
+        pagination = filter_query.pagination
+        assert pagination is not None, 'checked by the caller'
+        if filter_query.keyset is not None and len(filter_query.keyset.values) == 2:
+            keyset_condition = f'(timestamp, event_identifier) {">" if order == "ASC" else "<"} (?, ?)'  # noqa: E501
+            where_query = f'{where_query} AND {keyset_condition}' if where_query != '' else f'WHERE {keyset_condition}'  # noqa: E501
+            bindings.extend(filter_query.keyset.values)
+            pagination = DBFilterPagination(limit=pagination.limit, offset=0)
+
+        cursor.execute(
+            f'SELECT event_identifier FROM history_events_groups {where_query} '
+            f'ORDER BY timestamp {order}, event_identifier {order} {pagination.prepare()}',
+            bindings,
+        )
+        if len(event_identifiers := [x[0] for x in cursor]) == 0:
+            return []
+
+        page_query = copy.deepcopy(filter_query)
+        page_query.pagination = page_query.keyset = None
+        page_query.and_op = True  # at most one filter can be there if it was False
+        page_query.filters.append(DBMultiStringFilter(
+            and_op=True,
+            column='event_identifier',
+            values=event_identifiers,
+        ))
+        page = self.get_history_events(
+            cursor=cursor,
+            filter_query=page_query,
+            has_premium=True,
+            group_by_event_ids=True,
+        )
+        positions = {event_identifier: idx for idx, event_identifier in enumerate(event_identifiers)}  # noqa: E501
+        return sorted(page, key=lambda entry: positions[entry[1].event_identifier])
+
+    def get_next_keyset(
+            self,
+            cursor: 'DBCursor',
+            filter_query: HistoryBaseEntryFilterQuery,
+            events: Union[list[tuple[int, HistoryBaseEntry]], list[HistoryBaseEntry]],
+            has_premium: bool,
+            group_by_event_ids: bool = False,
+    ) -> Optional[DBFilterKeyset]:
+        """Get the keyset that continues after the given page of events of the filter.
+
+        Grouped events have a keyset only if the page came from the groups summary.
+        Returns None if there is no next page or it can't be reached by keyset.
+        """
+        if len(events) == 0:
+            return None
+
+        if group_by_event_ids is False:
+            return filter_query.next_keyset(
+                cursor=cursor,
+                table='history_events',
+                key=events[-1].identifier,  # type: ignore  # not grouped so these are events
+                entries_num=len(events),
+            )
+
+        if (
+                has_premium is False or filter_query.pagination is None or
+                len(events) < filter_query.pagination.limit or
+                self._get_groups_order(filter_query) is None or
+                self._prepare_groups_filter(filter_query) is None
+        ):
+            return None
+
+        row = cursor.execute(
+            'SELECT timestamp, event_identifier FROM history_events_groups '
+            'WHERE event_identifier=?',
+            (events[-1][1].event_identifier,),  # type: ignore  # grouped so these are tuples
+        ).fetchone()
+        return None if row is None else DBFilterKeyset(values=list(row))
+
+    @staticmethod
+    def _prepare_groups_filter(
+            filter_query: HistoryBaseEntryFilterQuery,
+    ) -> Optional[tuple[str, list[Any]]]:
+        """Prepare the WHERE clause that selects from history_events_groups the groups with
+        events matching the filter.
+
+        Only filters by timestamp, location and ignored assets can be answered from the
+        summary. For anything else None is returned and the events need to be grouped.
+        Groups whose events differ in timestamp or location are matched by their events.
+        """
+        if (
+                not isinstance(filter_query, HistoryEventFilterQuery) or
+                filter_query.join_clause is not None or
+                (filter_query.and_op is False and len(filter_query.filters) > 1)
+        ):
+            return None
+
+        conditions, bindings = [], []
+        event_conditions, event_bindings = [], []
+        for fil in filter_query.filters:
+            if isinstance(fil, DBIgnoredAssetsFilter) and fil.operator == 'NOT IN':
+                conditions.append('events_num > ignored_events_num')
+            elif isinstance(fil, (DBTimestampFilter, DBLocationFilter)):
+                filters, single_bindings = fil.prepare()
+                if len(filters) == 0:
+                    continue
+
+                event_conditions.append(f'({(" AND " if fil.and_op else " OR ").join(filters)})')
+                event_bindings.extend(single_bindings)
+                if isinstance(fil, DBTimestampFilter) and fil.to_ts is not None:
+                    # the timestamp of a group is the earliest of its events so this holds
+                    # for all groups and lets the timestamp index limit the scan
+                    filters, single_bindings = DBTimestampFilter(
+                        and_op=True,
+                        to_ts=fil.to_ts,
+                        scaling_factor=fil.scaling_factor,
+                        timestamp_field=fil.timestamp_field,
+                    ).prepare()
+                    conditions.extend(filters)
+                    bindings.extend(single_bindings)
+            else:
+                return None
+
+        if len(event_conditions) != 0:
+            events_query, events_bindings = filter_query.prepare(
+                with_pagination=False,
+                with_order=False,
+            )
+            conditions.append(
+                f'(mixed=0 AND {" AND ".join(event_conditions)} OR mixed=1 AND EXISTS '
+                f'(SELECT 1 FROM history_events {events_query} AND '
+                'history_events.event_identifier=history_events_groups.event_identifier))',
+            )
+            bindings.extend(event_bindings + events_bindings)
+
+        if len(conditions) == 0:
+            return '', bindings
+
+        return 'WHERE ' + ' AND '.join(conditions), bindings
+
     @overload
     def get_history_events_and_limit_info(
             self,
@@ -541,6 +730,7 @@ class DBHistoryEvents:
         query, bindings = filter_query.prepare()
         query = f'SELECT history_events.identifier, amount, asset, timestamp {ALL_EVENTS_DATA_JOIN}' + query  # noqa: E501
         result = []
+        cache = DBDeserializationCache()
         cursor = self.db.conn.cursor()
         cursor.execute(query, bindings)
         for identifier, amount_raw, asset_identifier, timestamp in cursor:
@@ -554,7 +744,7 @@ class DBHistoryEvents:
                     (
                         identifier,
                         amount,
-                        Asset(asset_identifier).check_existence(),
+                        cache.asset(asset_identifier),
                         ts_ms_to_sec(TimestampMS(timestamp)),
                     ),
                 )
@@ -602,7 +792,20 @@ class DBHistoryEvents:
         We return two integers. The first one being the number of events returned and the second
         the number of events if any limit is applied, otherwise the second value matches
         the first.
+
+        Grouped counts are taken from the history_events_groups summary when the filter allows.
         """
+        if (
+                group_by_event_ids is True and entries_limit is None and
+                (groups_filter := self._prepare_groups_filter(query_filter)) is not None
+        ):
+            where_query, groups_bindings = groups_filter
+            count = cursor.execute(
+                f'SELECT COUNT(*) FROM history_events_groups {where_query}',
+                groups_bindings,
+            ).fetchone()[0]
+            return count, count
+
         prepared_query, bindings = query_filter.prepare(with_pagination=False)
         # we need to select everything because any column could be used in the filter
         query = 'SELECT * ' + query_filter.get_join_query() + prepared_query
@@ -635,42 +838,26 @@ class DBHistoryEvents:
         TODO: At the moment this function is used by liquity and kraken. Change it to use a filter
         instead of query string and bindings when the refactor of the history events is made.
         """
-        usd_value = ZERO
-        try:
-            query = 'SELECT SUM(CAST(usd_value AS REAL)) FROM history_events ' + query_filters
-            result = cursor.execute(query, bindings).fetchone()[0]  # count(*) always returns
-            if result is not None:
-                usd_value = deserialize_fval(
-                    value=result,
-                    name='usd value in history events stats',
-                    location='get_value_stats',
-                )
-        except DeserializationError as e:
-            log.error(f'Didnt get correct valid usd_value for history_events query. {e!s}')
-
-        query = (
-            f'SELECT asset, SUM(CAST(amount AS REAL)), SUM(CAST(usd_value AS REAL)) '
-            f'FROM history_events {query_filters}'
-            f' GROUP BY asset;'
+        execute_shadow_sums(
+            cursor=cursor,
+            query=lambda as_integer: f'SELECT {shadow_sum("usd_value", as_integer=as_integer)} FROM history_events {query_filters}',  # noqa: E501
+            bindings=bindings,
         )
-        cursor.execute(query, bindings)
-        assets_amounts = []
-        for row in cursor:
-            try:
-                asset = row[0]  # existence is guaranteed due the foreign key relation
-                amount = deserialize_fval(
-                    value=row[1],
-                    name='total amount in history events stats',
-                    location='get_value_stats',
-                )
-                sum_of_usd_values = deserialize_fval(
-                    value=row[2],
-                    name='total usd value in history events stats',
-                    location='get_value_stats',
-                )
-                assets_amounts.append((asset, amount, sum_of_usd_values))
-            except DeserializationError as e:
-                log.debug(f'Failed to deserialize amount {row[1]}. {e!s}')
+        usd_value = from_shadow_sum('usd_value', *cursor.fetchone())  # sums always return a row
+        execute_shadow_sums(
+            cursor=cursor,
+            query=lambda as_integer: (
+                f'SELECT asset, {shadow_sum("amount", as_integer=as_integer)}, '
+                f'{shadow_sum("usd_value", as_integer=as_integer)} '
+                f'FROM history_events {query_filters} GROUP BY asset;'
+            ),
+            bindings=bindings,
+        )
+        assets_amounts = [(
+            row[0],  # existence is guaranteed due the foreign key relation
+            from_shadow_sum('amount', row[1], row[2]),
+            from_shadow_sum('usd_value', row[3], row[4]),
+        ) for row in cursor]
         return usd_value, assets_amounts
 
     def get_hidden_event_ids(self, cursor: 'DBCursor') -> list[int]:
@@ -6,7 +6,7 @@ MINIMIZED_USER_DB_SCHEMA = {
     "asset_movement_category": "categorychar(1)primarykeynotnull,seqintegerunique",
     "balance_category": "categorychar(1)primarykeynotnull,seqintegerunique",
     "assets": "identifiertextnotnullprimarykey",
-    "timed_balances": "categorychar(1)notnulldefault('a')referencesbalance_category(category),timestampinteger,currencytext,amounttext,usd_valuetext,foreignkey(currency)referencesassets(identifier)onupdatecascade,primarykey(timestamp,currency,category)",
+    "timed_balances": "categorychar(1)notnulldefault('a')referencesbalance_category(category),timestampinteger,currencytext,amounttext,usd_valuetext,amount_scaledinteger,usd_value_scaledinteger,foreignkey(currency)referencesassets(identifier)onupdatecascade,primarykey(timestamp,currency,category)",
     "timed_location_data": "timestampinteger,locationchar(1)notnulldefault('a')referenceslocation(location),usd_valuetext,primarykey(timestamp,location)",
     "user_credentials": "nametextnotnull,locationchar(1)notnulldefault('a')referenceslocation(location),api_keytext,api_secrettext,passphrasetext,primarykey(name,location)",
     "user_credentials_mappings": "credential_nametextnotnull,credential_locationchar(1)notnulldefault('a')referenceslocation(location),setting_nametextnotnull,setting_valuetextnotnull,foreignkey(credential_name,credential_location)referencesuser_credentials(name,location)ondeletecascadeonupdatecascade,primarykey(credential_name,credential_location,setting_name)",
@@ -35,7 +35,7 @@ MINIMIZED_USER_DB_SCHEMA = {
     "xpub_mappings": "addresstextnotnull,xpubtextnotnull,derivation_pathtextnotnull,account_indexinteger,derived_indexinteger,blockchaintextnotnull,foreignkey(blockchain,address)referencesblockchain_accounts(blockchain,account)ondeletecascadeforeignkey(xpub,derivation_path,blockchain)referencesxpubs(xpub,derivation_path,blockchain)ondeletecascadeprimarykey(address,xpub,derivation_path,blockchain)",
     "eth2_validators": "validator_indexintegernotnullprimarykey,public_keytextnotnullunique,ownership_proportiontextnotnull",
     "eth2_daily_staking_details": "validator_indexintegernotnull,timestampintegernotnull,pnltextnotnull,foreignkey(validator_index)referenceseth2_validators(validator_index)onupdatecascadeondeletecascade,primarykey(validator_index,timestamp)",
-    "history_events": "identifierintegernotnullprimarykey,entry_typeintegernotnull,event_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,usd_valuetextnotnull,notestext,typetextnotnull,subtypetextnotnull,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(event_identifier,sequence_index)",
+    "history_events": "identifierintegernotnullprimarykey,entry_typeintegernotnull,event_identifiertextnotnull,sequence_indexintegernotnull,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),location_labeltext,assettextnotnull,amounttextnotnull,usd_valuetextnotnull,notestext,typetextnotnull,subtypetextnotnull,amount_scaledinteger,usd_value_scaledinteger,foreignkey(asset)referencesassets(identifier)onupdatecascade,unique(event_identifier,sequence_index)",
     "evm_events_info": "identifierintegerprimarykey,tx_hashblobnotnull,counterpartytext,producttext,addresstext,extra_datatext,foreignkey(identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade",
     "eth_staking_events_info": "identifierintegerprimarykey,validator_indexintegernotnull,is_exit_or_blocknumberintegernotnull,foreignkey(identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade",
     "history_events_mappings": "parent_identifierintegernotnull,nametextnotnull,valueintegernotnull,foreignkey(parent_identifier)referenceshistory_events(identifier)onupdatecascadeondeletecascade,primarykey(parent_identifier,name,value)",
@@ -50,4 +50,14 @@ MINIMIZED_USER_DB_SCHEMA = {
     "skipped_external_events": "identifierintegernotnullprimarykey,datatextnotnull,locationchar(1)notnulldefault('a')referenceslocation(location),extra_datatext",
     "accounting_rules": "identifierintegernotnullprimarykey,typetextnotnull,subtypetextnotnull,counterpartytextnotnull,taxableintegernotnullcheck(taxablein(0,1)),count_entire_amount_spendintegernotnullcheck(count_entire_amount_spendin(0,1)),count_cost_basis_pnlintegernotnullcheck(count_cost_basis_pnlin(0,1)),accounting_treatmenttext,unique(type,subtype,counterparty)",
     "linked_rules_properties": "identifierintegerprimarykeynotnull,accounting_ruleintegerreferencesaccounting_rules(identifier),property_nametextnotnull,setting_nametextnotnullreferencessettings(name)",
+    "exchange_pagination_checkpoints": "locationchar(1)notnulldefault('a')referenceslocation(location),exchange_nametextnotnull,querytextnotnull,start_tsintegernotnull,end_tsintegernotnull,pageintegernotnull,cursortextnotnull,datatextnotnull,primarykey(location,exchange_name,query,page)",
+    "csv_import_checkpoints": "importertextnotnullprimarykey,import_keytextnotnull,consumed_rowsintegernotnull",
+    "history_events_groups": "event_identifiertextnotnullprimarykey,timestampintegernotnull,locationchar(1)notnulldefault('a')referenceslocation(location),events_numintegernotnull,ignored_events_numintegernotnull,mixedintegernotnullcheck(mixedin(0,1))",
 }
+MINIMIZED_USER_DB_TRIGGERS = (
+    "history_events_groups_insert",
+    "history_events_groups_delete",
+    "history_events_groups_update",
+    "history_events_groups_ignore_asset",
+    "history_events_groups_unignore_asset",
+)
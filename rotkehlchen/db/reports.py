@@ -18,6 +18,7 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 if TYPE_CHECKING:
+    from rotkehlchen.accounting.metrics import ReportMetrics
     from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.db.filtering import ReportDataFilterQuery
 
@@ -111,8 +112,9 @@ class DBAccountingReports:
             processed_actions: int,
             total_actions: int,
             pnls: PnlTotals,
+            metrics: Optional['ReportMetrics'] = None,
     ) -> None:
-        """Inserts the report overview data
+        """Inserts the report overview data and the metrics of the report if given
 
         May raise:
         - InputError if the given report id does not exist
@@ -136,6 +138,17 @@ class DBAccountingReports:
                 'INSERT OR IGNORE INTO pnl_report_totals(report_id, name, taxable_value, free_value) VALUES(?, ?, ?, ?)',  # noqa: E501
                 tuples,
             )
+            if metrics is not None:
+                serialized_metrics = metrics.serialize()
+                cursor.executemany(
+                    'INSERT OR REPLACE INTO pnl_report_metrics(report_id, type, name, value) '
+                    'VALUES(?, ?, ?, ?)',
+                    [
+                        (report_id, metric_type, name, value)
+                        for metric_type in ('stages', 'counters')
+                        for name, value in serialized_metrics[metric_type].items()
+                    ],
+                )
 
     def get_reports(
             self,
@@ -175,6 +188,13 @@ class DBAccountingReports:
                             settings[x[0]] = x[2] == '1'
                         else:
                             settings[x[0]] = x[2]
+                    other_cursor.execute(
+                        'SELECT type, name, value FROM pnl_report_metrics WHERE report_id=?',
+                        (this_report_id,),
+                    )
+                    metrics: dict[str, dict[str, float]] = {'stages': {}, 'counters': {}}
+                    for metric_type, name, value in other_cursor:
+                        metrics[metric_type][name] = int(value) if metric_type == 'counters' and value.is_integer() else value  # noqa: E501
                     reports.append({
                         'identifier': this_report_id,
                         'timestamp': report[1],
@@ -186,6 +206,7 @@ class DBAccountingReports:
                         'total_actions': report[7],
                         'overview': overview,
                         'settings': settings,
+                        'metrics': metrics,
                     })
 
             if report_id is not None:
@@ -169,6 +169,8 @@ CREATE TABLE IF NOT EXISTS timed_balances (
     currency TEXT,
     amount TEXT,
     usd_value TEXT,
+    amount_scaled INTEGER,
+    usd_value_scaled INTEGER,
     FOREIGN KEY(currency) REFERENCES assets(identifier) ON UPDATE CASCADE,
     PRIMARY KEY (timestamp, currency, category)
 );
@@ -536,6 +538,8 @@ CREATE TABLE IF NOT EXISTS history_events (
     notes TEXT,
     type TEXT NOT NULL,
     subtype TEXT NOT NULL,
+    amount_scaled INTEGER,
+    usd_value_scaled INTEGER,
     FOREIGN KEY(asset) REFERENCES assets(identifier) ON UPDATE CASCADE,
     UNIQUE(event_identifier, sequence_index)
 );
@@ -686,6 +690,86 @@ CREATE TABLE IF NOT EXISTS linked_rules_properties(
 );
 """
 
+# Pages of an exchange query of a time range that got interrupted. Kept until the
+# range is saved so that the query can continue from the cursor of the last page.
+DB_CREATE_EXCHANGE_PAGINATION_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS exchange_pagination_checkpoints(
+    location CHAR(1) NOT NULL DEFAULT('A') REFERENCES location(location),
+    exchange_name TEXT NOT NULL,
+    query TEXT NOT NULL,
+    start_ts INTEGER NOT NULL,
+    end_ts INTEGER NOT NULL,
+    page INTEGER NOT NULL,
+    cursor TEXT NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY(location, exchange_name, query, page)
+);
+"""
+
+# Number of rows consumed by the last interrupted CSV import of each importer. Kept until
+# the import of the same file with the same arguments finishes, so it continues after them.
+# An import of another file with the importer replaces it.
+DB_CREATE_CSV_IMPORT_CHECKPOINTS = """
+CREATE TABLE IF NOT EXISTS csv_import_checkpoints(
+    importer TEXT NOT NULL PRIMARY KEY,
+    import_key TEXT NOT NULL,
+    consumed_rows INTEGER NOT NULL
+);
+"""
+
+# Summary of each group of history events, one row per event_identifier, that grouped
+# history events queries paginate and count so they don't need to group all the events.
+# The triggers keep it in sync with history_events and the ignored assets. timestamp is
+# the earliest one of the group and mixed is 1 if its events differ in timestamp or location.
+DB_CREATE_HISTORY_EVENTS_GROUPS = """
+CREATE TABLE IF NOT EXISTS history_events_groups(
+    event_identifier TEXT NOT NULL PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    location CHAR(1) NOT NULL DEFAULT('A') REFERENCES location(location),
+    events_num INTEGER NOT NULL,
+    ignored_events_num INTEGER NOT NULL,
+    mixed INTEGER NOT NULL CHECK (mixed IN (0, 1))
+);
+CREATE INDEX IF NOT EXISTS idx_history_events_groups_timestamp ON history_events_groups(timestamp, event_identifier);
+CREATE INDEX IF NOT EXISTS idx_history_events_asset ON history_events(asset);
+CREATE TRIGGER IF NOT EXISTS history_events_groups_insert AFTER INSERT ON history_events
+BEGIN
+    INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+    VALUES(NEW.event_identifier, NEW.timestamp, NEW.location, 1, NEW.asset IN (SELECT value FROM multisettings WHERE name='ignored_asset'), 0)
+    ON CONFLICT(event_identifier) DO UPDATE SET
+        timestamp=MIN(timestamp, excluded.timestamp),
+        events_num=events_num + 1,
+        ignored_events_num=ignored_events_num + excluded.ignored_events_num,
+        mixed=(mixed OR timestamp != excluded.timestamp OR location != excluded.location);
+END;
+CREATE TRIGGER IF NOT EXISTS history_events_groups_delete AFTER DELETE ON history_events
+BEGIN
+    DELETE FROM history_events_groups WHERE event_identifier=OLD.event_identifier;
+    INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+    SELECT event_identifier, MIN(timestamp), MIN(location), COUNT(*), SUM(asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')), MIN(timestamp) != MAX(timestamp) OR MIN(location) != MAX(location)
+    FROM history_events WHERE event_identifier=OLD.event_identifier GROUP BY event_identifier;
+END;
+CREATE TRIGGER IF NOT EXISTS history_events_groups_update AFTER UPDATE OF event_identifier, timestamp, location, asset ON history_events
+BEGIN
+    DELETE FROM history_events_groups WHERE event_identifier IN (OLD.event_identifier, NEW.event_identifier);
+    INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+    SELECT event_identifier, MIN(timestamp), MIN(location), COUNT(*), SUM(asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')), MIN(timestamp) != MAX(timestamp) OR MIN(location) != MAX(location)
+    FROM history_events WHERE event_identifier IN (OLD.event_identifier, NEW.event_identifier) GROUP BY event_identifier;
+END;
+CREATE TRIGGER IF NOT EXISTS history_events_groups_ignore_asset AFTER INSERT ON multisettings WHEN NEW.name='ignored_asset'
+BEGIN
+    UPDATE history_events_groups SET ignored_events_num=(
+        SELECT COUNT(*) FROM history_events WHERE history_events.event_identifier=history_events_groups.event_identifier AND asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')
+    ) WHERE event_identifier IN (SELECT event_identifier FROM history_events WHERE asset=NEW.value);
+END;
+CREATE TRIGGER IF NOT EXISTS history_events_groups_unignore_asset AFTER DELETE ON multisettings WHEN OLD.name='ignored_asset'
+BEGIN
+    UPDATE history_events_groups SET ignored_events_num=(
+        SELECT COUNT(*) FROM history_events WHERE history_events.event_identifier=history_events_groups.event_identifier AND asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')
+    ) WHERE event_identifier IN (SELECT event_identifier FROM history_events WHERE asset=OLD.value);
+END;
+"""  # noqa: E501
+
 DB_SCRIPT_CREATE_TABLES = f"""
 PRAGMA foreign_keys=off;
 BEGIN TRANSACTION;
@@ -738,6 +822,9 @@ BEGIN TRANSACTION;
 {DB_CREATE_SKIPPED_EXTERNAL_EVENTS}
 {DB_CREATE_ACCOUNTING_RULE}
 {DB_CREATE_MAPPED_ACCOUNTING_RULES}
+{DB_CREATE_EXCHANGE_PAGINATION_CHECKPOINTS}
+{DB_CREATE_CSV_IMPORT_CHECKPOINTS}
+{DB_CREATE_HISTORY_EVENTS_GROUPS}
 COMMIT;
 PRAGMA foreign_keys=on;
 """
@@ -36,6 +36,18 @@ CREATE TABLE IF NOT EXISTS pnl_report_settings (
 );
 """
 
+# Time spent in each stage of a PnL report and counters of its work
+DB_CREATE_REPORT_METRICS = """
+CREATE TABLE IF NOT EXISTS pnl_report_metrics (
+    report_id INTEGER NOT NULL,
+    type TEXT NOT NULL,
+    name TEXT NOT NULL,
+    value REAL NOT NULL,
+    FOREIGN KEY (report_id) REFERENCES pnl_reports(identifier) ON DELETE CASCADE ON UPDATE CASCADE,
+    PRIMARY KEY(report_id, type, name)
+);
+"""
+
 # Many records for events related through foreign key to each PnL report.
 DB_CREATE_PNL_EVENTS = """
 CREATE TABLE IF NOT EXISTS pnl_events (
@@ -54,14 +66,55 @@ CREATE TABLE IF NOT EXISTS settings (
 );
 """
 
+# Cache of the addresses derived from xpubs so that they don't need to be derived again
+DB_CREATE_XPUB_DERIVED_ADDRESSES = """
+CREATE TABLE IF NOT EXISTS xpub_derived_addresses (
+    xpub TEXT NOT NULL,
+    derivation_path TEXT NOT NULL,
+    blockchain TEXT NOT NULL,
+    account_index INTEGER NOT NULL,
+    derived_index INTEGER NOT NULL,
+    address TEXT NOT NULL,
+    PRIMARY KEY (xpub, derivation_path, blockchain, account_index, derived_index)
+);
+"""
+
+# Results of functions cached with cache_response_timewise that are kept between restarts
+DB_CREATE_CACHED_RESULTS = """
+CREATE TABLE IF NOT EXISTS cached_results (
+    owner TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    result TEXT NOT NULL,
+    PRIMARY KEY (owner, signature)
+);
+"""
+
+# Cached current prices of the Inquirer that are kept between restarts
+DB_CREATE_CURRENT_PRICES_CACHE = """
+CREATE TABLE IF NOT EXISTS current_prices_cache (
+    from_asset TEXT NOT NULL,
+    to_asset TEXT NOT NULL,
+    price TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,
+    oracle TEXT NOT NULL,
+    used_main_currency INTEGER NOT NULL CHECK (used_main_currency IN (0, 1)),
+    PRIMARY KEY (from_asset, to_asset)
+);
+"""
+
 DB_SCRIPT_CREATE_TRANSIENT_TABLES = f"""
 PRAGMA foreign_keys=off;
 BEGIN TRANSACTION;
 {DB_CREATE_PNL_REPORT}
 {DB_CREATE_REPORT_SETTINGS}
 {DB_CREATE_REPORT_TOTALS}
+{DB_CREATE_REPORT_METRICS}
 {DB_CREATE_PNL_EVENTS}
 {DB_CREATE_SETTINGS}
+{DB_CREATE_XPUB_DERIVED_ADDRESSES}
+{DB_CREATE_CACHED_RESULTS}
+{DB_CREATE_CURRENT_PRICES_CACHE}
 COMMIT;
 PRAGMA foreign_keys=on;
 """
@@ -0,0 +1,96 @@
+"""Integer shadow columns of the amounts and values that are stored as TEXT.
+
+Amounts and USD values are stored as TEXT so that no precision is lost. Next to each one
+of them there is an INTEGER column with the value scaled by 10**exponent and rounded. SQLite
+sums these natively instead of parsing every TEXT value as a REAL. So the sums are fast and
+accurate to the exponent's decimal digits, but they are not exact. Each row is rounded, so
+token amounts with more decimals can be off in the last kept digits. Values that need
+exact precision should still be summed from their TEXT column. Values that don't fit in a
+signed 64 bit integer once scaled have a NULL shadow column and are summed from their TEXT
+column as REAL.
+"""
+import logging
+from collections.abc import Callable, Sequence
+from decimal import ROUND_HALF_EVEN, Decimal
+from typing import TYPE_CHECKING, Final, Literal, Optional, Union
+
+from pysqlcipher3 import dbapi2 as sqlcipher
+
+from rotkehlchen.constants import ZERO
+from rotkehlchen.fval import FVal
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+if TYPE_CHECKING:
+    from rotkehlchen.db.drivers.gevent import DBCursor
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+SHADOWED_COLUMN = Literal['amount', 'usd_value']
+# Decimal digits kept by the shadow column of each shadowed column
+SHADOW_COLUMN_EXPONENTS: Final[dict[SHADOWED_COLUMN, int]] = {'amount': 8, 'usd_value': 6}
+MAX_SHADOW_VALUE: Final = 2 ** 63 - 1
+
+
+def to_shadow_value(value: FVal, column: SHADOWED_COLUMN) -> Optional[int]:
+    """Scale the value of the given column to the integer stored in its shadow column
+
+    Returns None if the scaled value does not fit in the shadow column."""
+    if value.num.is_finite() is False:
+        return None
+
+    scaled = int(value.num.scaleb(SHADOW_COLUMN_EXPONENTS[column]).to_integral_value(rounding=ROUND_HALF_EVEN))  # noqa: E501
+    return scaled if -MAX_SHADOW_VALUE <= scaled <= MAX_SHADOW_VALUE else None
+
+
+def shadow_sum(
+        column: SHADOWED_COLUMN,
+        table: Optional[str] = None,
+        as_integer: bool = True,
+) -> str:
+    """The two SQL expressions that sum the given column using its shadow column
+
+    The first one sums the shadow column and the second one the values that don't fit in
+    it. Their results should be given to `from_shadow_sum`. If as_integer is False the
+    shadow column is summed as REAL, which can't overflow.
+    """
+    prefix = '' if table is None else f'{table}.'
+    return (
+        f'{"SUM" if as_integer else "TOTAL"}({prefix}{column}_scaled), '
+        f'TOTAL(CASE WHEN {prefix}{column}_scaled IS NULL THEN CAST({prefix}{column} AS REAL) END)'
+    )
+
+
+def from_shadow_sum(
+        column: SHADOWED_COLUMN,
+        scaled_sum: Optional[Union[int, float]],
+        unscaled_total: float,
+) -> FVal:
+    """Turn the results of the expressions of `shadow_sum` to the sum of the column"""
+    result = ZERO if unscaled_total == 0 else FVal(unscaled_total)
+    if scaled_sum is not None:
+        if isinstance(scaled_sum, float):
+            scaled_sum = int(scaled_sum)
+        result += FVal(Decimal(scaled_sum).scaleb(-SHADOW_COLUMN_EXPONENTS[column]))
+
+    return result
+
+
+def execute_shadow_sums(
+        cursor: 'DBCursor',
+        query: Callable[[bool], str],
+        bindings: Sequence,
+) -> 'DBCursor':
+    """Execute the query returned by `query`, which sums columns with `shadow_sum`
+
+    The query is called with as_integer as True. If the integer sum overflows it is
+    executed again with as_integer as False.
+    """
+    try:
+        return cursor.execute(query(True), bindings)
+    except sqlcipher.OperationalError as e:  # pylint: disable=no-member
+        if 'integer overflow' not in str(e):
+            raise
+
+        log.warning(f'Sum of shadow columns overflowed. Summing them as REAL instead. {e!s}')
+        return cursor.execute(query(False), bindings)
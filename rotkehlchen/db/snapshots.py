@@ -262,6 +262,7 @@ class DBSnapshot:
         May raise:
         - InputError
         """
+        self.db.forget_owned_assets()
         write_cursor.execute('DELETE FROM timed_balances WHERE timestamp=?', (timestamp,))
         if write_cursor.rowcount == 0:
             raise InputError('No snapshot found for the specified timestamp')
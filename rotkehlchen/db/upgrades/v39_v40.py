@@ -1,6 +1,7 @@
 import json
 import logging
-from typing import TYPE_CHECKING
+from decimal import ROUND_HALF_EVEN, Decimal, InvalidOperation
+from typing import TYPE_CHECKING, Optional
 from uuid import uuid4
 
 from pysqlcipher3 import dbapi2 as sqlcipher
@@ -25,6 +26,7 @@ log = RotkehlchenLogsAdapter(logger)
 
 PREFIX = 'RE_%'  # hard-coded since this is a migration and prefix may change in the future
 MIGRATION_PREFIX = 'MLA_'  # prefix to add to ledger actions migrated to history events id
+SHADOW_COLUMNS_BATCH_SIZE = 10000
 # TO TYPE, TO SUBTYPE, FROM TYPE, FROM SUBTYPE
 CHANGES: list[tuple[HistoryEventType, HistoryEventSubType, HistoryEventType, HistoryEventSubType]] = [  # noqa: E501
     (HistoryEventType.RECEIVE, HistoryEventSubType.NONE, HistoryEventType.RECEIVE, HistoryEventSubType.RECEIVE),  # noqa: E501
@@ -115,13 +117,84 @@ def _upgrade_rotki_events(write_cursor: 'DBCursor') -> None:
         notes TEXT,
         type TEXT NOT NULL,
         subtype TEXT NOT NULL,
+        amount_scaled INTEGER,
+        usd_value_scaled INTEGER,
         FOREIGN KEY(asset) REFERENCES assets(identifier) ON UPDATE CASCADE,
         UNIQUE(event_identifier, sequence_index)""",
+        insert_columns='identifier, entry_type, event_identifier, sequence_index, timestamp, location, location_label, asset, amount, usd_value, notes, type, subtype',  # noqa: E501
+        insert_order='(identifier, entry_type, event_identifier, sequence_index, timestamp, location, location_label, asset, amount, usd_value, notes, type, subtype)',  # noqa: E501
     )
     write_cursor.executescript('PRAGMA foreign_keys = ON;')
     log.debug('Exit _upgrade_rotki_events')
 
 
+def _upgrade_timed_balances(write_cursor: 'DBCursor') -> None:
+    """Add the integer shadow columns of amount and usd_value to the timed balances"""
+    log.debug('Enter _upgrade_timed_balances')
+    write_cursor.executescript('PRAGMA foreign_keys = OFF;')
+    update_table_schema(
+        write_cursor=write_cursor,
+        table_name='timed_balances',
+        schema="""category CHAR(1) NOT NULL DEFAULT('A') REFERENCES balance_category(category),
+        timestamp INTEGER,
+        currency TEXT,
+        amount TEXT,
+        usd_value TEXT,
+        amount_scaled INTEGER,
+        usd_value_scaled INTEGER,
+        FOREIGN KEY(currency) REFERENCES assets(identifier) ON UPDATE CASCADE,
+        PRIMARY KEY (timestamp, currency, category)""",
+        insert_columns='category, timestamp, currency, amount, usd_value',
+        insert_order='(category, timestamp, currency, amount, usd_value)',
+    )
+    write_cursor.executescript('PRAGMA foreign_keys = ON;')
+    log.debug('Exit _upgrade_timed_balances')
+
+
+def _to_shadow_value(value: str, exponent: int) -> Optional[int]:
+    """Scale a TEXT amount to the value of its shadow column. None if it does not fit.
+
+    Hard-coded since this is a migration and the shadow columns logic may change"""
+    try:
+        number = Decimal(value)
+    except (InvalidOperation, TypeError):
+        return None
+
+    if number.is_finite() is False:
+        return None
+
+    scaled = int(number.scaleb(exponent).to_integral_value(rounding=ROUND_HALF_EVEN))
+    return scaled if -(2 ** 63 - 1) <= scaled <= 2 ** 63 - 1 else None
+
+
+def _populate_shadow_columns(write_cursor: 'DBCursor') -> None:
+    """Populate the integer shadow columns of the existing history events and timed
+    balances. Rows are processed in batches to keep the memory bounded."""
+    log.debug('Enter _populate_shadow_columns')
+    for table, key in (('history_events', 'identifier'), ('timed_balances', 'rowid')):
+        last_key = -1
+        while True:
+            write_cursor.execute(
+                f'SELECT {key}, amount, usd_value FROM {table} WHERE {key} > ? '
+                f'ORDER BY {key} LIMIT ?',
+                (last_key, SHADOW_COLUMNS_BATCH_SIZE),
+            )
+            if len(rows := write_cursor.fetchall()) == 0:
+                break
+
+            write_cursor.executemany(
+                f'UPDATE {table} SET amount_scaled=?, usd_value_scaled=? WHERE {key}=?',
+                [(
+                    _to_shadow_value(amount, 8),
+                    _to_shadow_value(usd_value, 6),
+                    row_key,
+                ) for row_key, amount, usd_value in rows],
+            )
+            last_key = rows[-1][0]
+
+    log.debug('Exit _populate_shadow_columns')
+
+
 def _purge_kraken_events(write_cursor: 'DBCursor') -> None:
     """
     Purge kraken events, after the changes that allows for processing of new assets.
@@ -331,18 +404,111 @@ def _add_new_tables(write_cursor: 'DBCursor') -> None:
         setting_name TEXT NOT NULL references settings(name)
     );
     """)
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS exchange_pagination_checkpoints(
+        location CHAR(1) NOT NULL DEFAULT('A') REFERENCES location(location),
+        exchange_name TEXT NOT NULL,
+        query TEXT NOT NULL,
+        start_ts INTEGER NOT NULL,
+        end_ts INTEGER NOT NULL,
+        page INTEGER NOT NULL,
+        cursor TEXT NOT NULL,
+        data TEXT NOT NULL,
+        PRIMARY KEY(location, exchange_name, query, page)
+    );
+    """)
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS csv_import_checkpoints(
+        importer TEXT NOT NULL PRIMARY KEY,
+        import_key TEXT NOT NULL,
+        consumed_rows INTEGER NOT NULL
+    );
+    """)
     log.debug('Exit _add_new_tables')
 
 
+def _add_history_events_groups(write_cursor: 'DBCursor') -> None:
+    """Create the summary table of the history events groups, populate it from the
+    existing events and add the triggers that keep it in sync from now on"""
+    log.debug('Enter _add_history_events_groups')
+    write_cursor.execute("""
+    CREATE TABLE IF NOT EXISTS history_events_groups(
+        event_identifier TEXT NOT NULL PRIMARY KEY,
+        timestamp INTEGER NOT NULL,
+        location CHAR(1) NOT NULL DEFAULT('A') REFERENCES location(location),
+        events_num INTEGER NOT NULL,
+        ignored_events_num INTEGER NOT NULL,
+        mixed INTEGER NOT NULL CHECK (mixed IN (0, 1))
+    );
+    """)
+    write_cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_history_events_groups_timestamp '
+        'ON history_events_groups(timestamp, event_identifier);',
+    )
+    write_cursor.execute(
+        'CREATE INDEX IF NOT EXISTS idx_history_events_asset ON history_events(asset);',
+    )
+    write_cursor.execute("""
+    INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+    SELECT event_identifier, MIN(timestamp), MIN(location), COUNT(*), SUM(asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')), MIN(timestamp) != MAX(timestamp) OR MIN(location) != MAX(location)
+    FROM history_events GROUP BY event_identifier;
+    """)  # noqa: E501
+    write_cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS history_events_groups_insert AFTER INSERT ON history_events
+    BEGIN
+        INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+        VALUES(NEW.event_identifier, NEW.timestamp, NEW.location, 1, NEW.asset IN (SELECT value FROM multisettings WHERE name='ignored_asset'), 0)
+        ON CONFLICT(event_identifier) DO UPDATE SET
+            timestamp=MIN(timestamp, excluded.timestamp),
+            events_num=events_num + 1,
+            ignored_events_num=ignored_events_num + excluded.ignored_events_num,
+            mixed=(mixed OR timestamp != excluded.timestamp OR location != excluded.location);
+    END;
+    """)  # noqa: E501
+    write_cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS history_events_groups_delete AFTER DELETE ON history_events
+    BEGIN
+        DELETE FROM history_events_groups WHERE event_identifier=OLD.event_identifier;
+        INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+        SELECT event_identifier, MIN(timestamp), MIN(location), COUNT(*), SUM(asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')), MIN(timestamp) != MAX(timestamp) OR MIN(location) != MAX(location)
+        FROM history_events WHERE event_identifier=OLD.event_identifier GROUP BY event_identifier;
+    END;
+    """)  # noqa: E501
+    write_cursor.execute("""
+    CREATE TRIGGER IF NOT EXISTS history_events_groups_update AFTER UPDATE OF event_identifier, timestamp, location, asset ON history_events
+    BEGIN
+        DELETE FROM history_events_groups WHERE event_identifier IN (OLD.event_identifier, NEW.event_identifier);
+        INSERT INTO history_events_groups(event_identifier, timestamp, location, events_num, ignored_events_num, mixed)
+        SELECT event_identifier, MIN(timestamp), MIN(location), COUNT(*), SUM(asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')), MIN(timestamp) != MAX(timestamp) OR MIN(location) != MAX(location)
+        FROM history_events WHERE event_identifier IN (OLD.event_identifier, NEW.event_identifier) GROUP BY event_identifier;
+    END;
+    """)  # noqa: E501
+    for trigger_name, action, row in (
+            ('history_events_groups_ignore_asset', 'INSERT', 'NEW'),
+            ('history_events_groups_unignore_asset', 'DELETE', 'OLD'),
+    ):
+        write_cursor.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS {trigger_name} AFTER {action} ON multisettings WHEN {row}.name='ignored_asset'
+        BEGIN
+            UPDATE history_events_groups SET ignored_events_num=(
+                SELECT COUNT(*) FROM history_events WHERE history_events.event_identifier=history_events_groups.event_identifier AND asset IN (SELECT value FROM multisettings WHERE name='ignored_asset')
+            ) WHERE event_identifier IN (SELECT event_identifier FROM history_events WHERE asset={row}.value);
+        END;
+        """)  # noqa: E501
+    log.debug('Exit _add_history_events_groups')
+
+
 def upgrade_v39_to_v40(db: 'DBHandler', progress_handler: 'DBUpgradeProgressHandler') -> None:
     """Upgrades the DB from v39 to v40. This was in v1.31.0 release.
 
         - Migrate rotki events that were broken due to https://github.com/rotki/rotki/issues/6550
         - Purge kraken events
         - Create new tables
+        - Add and populate the integer shadow columns of the amounts and usd values
+        - Add the summary table of the history events groups and the triggers maintaining it
     """
     log.debug('Entered userdb v39->v40 upgrade')
-    progress_handler.set_total_steps(8)
+    progress_handler.set_total_steps(11)
     with db.user_write() as write_cursor:
         _add_new_tables(write_cursor)
         progress_handler.new_step()
@@ -358,6 +524,12 @@ def upgrade_v39_to_v40(db: 'DBHandler', progress_handler: 'DBUpgradeProgressHand
         progress_handler.new_step()
         _migrate_ledger_actions(write_cursor, db.conn)
         progress_handler.new_step()
+        _upgrade_timed_balances(write_cursor)
+        progress_handler.new_step()
+        _populate_shadow_columns(write_cursor)
+        progress_handler.new_step()
+        _add_history_events_groups(write_cursor)
+        progress_handler.new_step()
 
     db.conn.execute('VACUUM;')
     progress_handler.new_step()
@@ -22,6 +22,7 @@ from rotkehlchen.assets.asset import Asset, AssetWithOracles
 from rotkehlchen.chain.accounts import BlockchainAccountData
 from rotkehlchen.chain.substrate.utils import is_valid_substrate_address
 from rotkehlchen.db.drivers.gevent import DBCursor
+from rotkehlchen.db.shadow_columns import to_shadow_value
 from rotkehlchen.fval import FVal
 from rotkehlchen.types import (
     AssetMovementCategory,
@@ -155,9 +156,9 @@ class DBAssetBalance:
             'usd_value': str(self.usd_value),
         }
 
-    def serialize_for_db(self) -> tuple[str, int, str, str, str]:
+    def serialize_for_db(self) -> tuple[str, int, str, str, str, Optional[int], Optional[int]]:
         """Serializes a `DBAssetBalance` to be written into the DB.
-        (category, time, currency, amount, usd_value)
+        (category, time, currency, amount, usd_value, amount_scaled, usd_value_scaled)
         """
         return (
             self.category.serialize_for_db(),
@@ -165,6 +166,8 @@ class DBAssetBalance:
             self.asset.identifier,
             str(self.amount),
             str(self.usd_value),
+            to_shadow_value(self.amount, 'amount'),
+            to_shadow_value(self.usd_value, 'usd_value'),
         )
 
     @classmethod
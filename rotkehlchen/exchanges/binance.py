@@ -11,6 +11,7 @@ from uuid import uuid4
 
 import gevent
 import requests
+from gevent.pool import Pool
 
 from rotkehlchen.accounting.structures.balance import Balance
 from rotkehlchen.accounting.structures.base import HistoryEvent
@@ -97,6 +98,14 @@ V3_METHODS = (
 PUBLIC_METHODS = ('exchangeInfo', 'time')
 
 RETRY_AFTER_LIMIT = 60
+# The spot api allows 1200 request weight per minute per IP. Stay below it since
+# other clients of the same IP may also be using it.
+# https://binance-docs.github.io/apidocs/spot/en/#limits
+BINANCE_WEIGHT_BUDGET = 1000
+API_METHOD_WEIGHTS = {'account': 20, 'exchangeInfo': 20, 'myTrades': 20}
+BINANCE_TRADES_QUERY_CONCURRENCY = 5
+# Number of queried markets whose trades are saved together as query progress
+BINANCE_TRADES_CHECKPOINT_BATCH = 100
 # Binance api error codes we check for (all below apis seem to have the same)
 # https://binance-docs.github.io/apidocs/spot/en/#error-codes-2
 # https://binance-docs.github.io/apidocs/futures/en/#error-codes-2
@@ -227,6 +236,14 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         self.msg_aggregator = msg_aggregator
         self.offset_ms = 0
         self.selected_pairs = binance_selected_trade_pairs
+        # spot api weight of the current minute as reported by binance and the
+        # weight of the requests that are in flight and not yet accounted there
+        self.used_weight = 0
+        self.used_weight_minute = 0
+        self.pending_weight = 0
+        # per symbol trade id to start the next trades query from and the end of the
+        # time range the trades before it cover. Saved along with the queried trades.
+        self.pending_last_trade_ids: dict[str, tuple[int, Timestamp]] = {}
 
     def first_connection(self) -> None:
         if self.first_connection_made:
@@ -304,49 +321,61 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
          - BinancePermissionError
         """
         call_options = options.copy() if options else {}
+        weight = API_METHOD_WEIGHTS.get(method, 1) if api_type == 'api' else 0
 
         while True:
             if 'signature' in call_options:
                 del call_options['signature']
 
-            is_v3_api_method = api_type == 'api' and method in V3_METHODS
-            is_new_futures_api = api_type in ('fapi', 'dapi')
-            api_version = 3  # public methos are v3
-            if method not in PUBLIC_METHODS:  # api call needs signature
-                if api_type in ('sapi', 'dapi'):
-                    api_version = 1
-                elif api_type == 'fapi':
-                    api_version = 2
-                elif is_v3_api_method:
-                    api_version = 3
-                else:
-                    raise AssertionError(
-                        f'Should never get to signed binance api call for '
-                        f'api_type: {api_type} and method {method}',
-                    )
-
-                # Recommended recvWindows is 5000 but we get timeouts with it
-                call_options['recvWindow'] = 10000
-                call_options['timestamp'] = str(ts_now_in_ms() + self.offset_ms)
-                signature = hmac.new(
-                    self.secret,
-                    urlencode(call_options).encode('utf-8'),
-                    hashlib.sha256,
-                ).hexdigest()
-                call_options['signature'] = signature
-
-            api_subdomain = api_type if is_new_futures_api else 'api'
-            request_url = (
-                f'https://{api_subdomain}.{self.uri}{api_type}/v{api_version!s}/{method}?'
-            )
-            request_url += urlencode(call_options)
-            log.debug(f'{self.name} API request', request_url=request_url)
+            reserved_weight = 0
             try:
-                response = self.session.get(request_url, timeout=CachedSettings().get_timeout_tuple())  # noqa: E501
-            except requests.exceptions.RequestException as e:
-                raise RemoteError(
-                    f'{self.name} API request failed due to {e!s}',
-                ) from e
+                # reserve before signing so that waiting does not expire the request timestamp
+                self._reserve_weight(weight)
+                reserved_weight = weight
+
+                is_v3_api_method = api_type == 'api' and method in V3_METHODS
+                is_new_futures_api = api_type in ('fapi', 'dapi')
+                api_version = 3  # public methos are v3
+                if method not in PUBLIC_METHODS:  # api call needs signature
+                    if api_type in ('sapi', 'dapi'):
+                        api_version = 1
+                    elif api_type == 'fapi':
+                        api_version = 2
+                    elif is_v3_api_method:
+                        api_version = 3
+                    else:
+                        raise AssertionError(
+                            f'Should never get to signed binance api call for '
+                            f'api_type: {api_type} and method {method}',
+                        )
+
+                    # Recommended recvWindows is 5000 but we get timeouts with it
+                    call_options['recvWindow'] = 10000
+                    call_options['timestamp'] = str(ts_now_in_ms() + self.offset_ms)
+                    signature = hmac.new(
+                        self.secret,
+                        urlencode(call_options).encode('utf-8'),
+                        hashlib.sha256,
+                    ).hexdigest()
+                    call_options['signature'] = signature
+
+                api_subdomain = api_type if is_new_futures_api else 'api'
+                request_url = (
+                    f'https://{api_subdomain}.{self.uri}{api_type}/v{api_version!s}/{method}?'
+                )
+                request_url += urlencode(call_options)
+                log.debug(f'{self.name} API request', request_url=request_url)
+                try:
+                    response = self.session.get(request_url, timeout=CachedSettings().get_timeout_tuple())  # noqa: E501
+                except requests.exceptions.RequestException as e:
+                    raise RemoteError(
+                        f'{self.name} API request failed due to {e!s}',
+                    ) from e
+            finally:
+                self.pending_weight -= reserved_weight
+
+            if api_type == 'api':
+                self._update_used_weight(response.headers.get('x-mbx-used-weight-1m'))
 
             if response.status_code not in (200, 418, 429):
                 code = 'no code found'
@@ -418,6 +447,55 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
             ) from e
         return json_ret
 
+    def _current_weight_minute(self) -> int:
+        return (ts_now_in_ms() + self.offset_ms) // 60000
+
+    def _reserve_weight(self, weight: int) -> None:
+        """Waits until the spot api weight budget of the current minute allows a
+        request of the given weight and reserves it for the request.
+
+        The used weight is what binance reports in the response headers plus the
+        weight of the requests in flight, so concurrent queries share the budget.
+        """
+        if weight == 0:
+            return
+
+        while True:
+            minute = self._current_weight_minute()
+            if minute != self.used_weight_minute:  # binance resets the weight every minute
+                self.used_weight_minute = minute
+                self.used_weight = 0
+
+            if self.used_weight + self.pending_weight + weight <= BINANCE_WEIGHT_BUDGET:
+                self.pending_weight += weight
+                return
+
+            wait_secs = ((minute + 1) * 60000 - ts_now_in_ms() - self.offset_ms) / 1000
+            log.debug(
+                f'{self.name} used {self.used_weight} api weight with {self.pending_weight} '
+                f'pending this minute. Waiting for the next one',
+                seconds=wait_secs,
+            )
+            gevent.sleep(max(wait_secs, 0.1))
+
+    def _update_used_weight(self, used_weight_header: Optional[str]) -> None:
+        """Updates the used spot api weight of the minute from a response header"""
+        if used_weight_header is None:
+            return
+
+        try:
+            used_weight = int(used_weight_header)
+        except ValueError:
+            log.error(f'Got unexpected used weight header {used_weight_header} from {self.name}')
+            return
+
+        minute = self._current_weight_minute()
+        if minute != self.used_weight_minute:
+            self.used_weight_minute = minute
+            self.used_weight = used_weight
+        else:  # responses can arrive out of order
+            self.used_weight = max(self.used_weight, used_weight)
+
     def api_query_dict(
             self,
             api_type: BINANCE_API_TYPE,
@@ -937,7 +1015,7 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         return balances
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             self.first_connection()
@@ -987,40 +1065,66 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
         else:
             iter_markets = list(self._symbols_to_pair.keys())
 
+        saved_last_trade_ids = self._get_last_trade_ids()
+        self.pending_last_trade_ids = {}
         raw_data = []
-        # Limit of results to return. 1000 is max limit according to docs
-        limit = 1000
-        for symbol in iter_markets:
-            last_trade_id = 0
-            len_result = limit
-            while len_result == limit:
-                # We know that myTrades returns a list from the api docs
-                result = self.api_query_list(
-                    'api',
-                    'myTrades',
-                    options={
-                        'symbol': symbol,
-                        'fromId': last_trade_id,
-                        'limit': limit,
-                        # Not specifying them since binance does not seem to
-                        # respect them and always return all trades
-                    })
-                if result:
-                    try:
-                        last_trade_id = int(result[-1]['id']) + 1
-                    except (ValueError, KeyError, IndexError) as e:
-                        raise RemoteError(
-                            f'Could not parse id from Binance myTrades api query result: {result}',
-                        ) from e
+        queried_symbols = set()
+        # the trades of each market are saved as a page so an interrupted query skips them.
+        # The cursor is the market and the last trade id to save for it, if any.
+        if (checkpoint := self.get_pagination_checkpoint('trades', start_ts, end_ts)) is not None:
+            for page_cursor, symbol_trades in checkpoint.pages:
+                symbol, last_trade_id = json.loads(page_cursor)
+                queried_symbols.add(symbol)
+                raw_data.extend(symbol_trades)
+                if last_trade_id is not None:
+                    self.pending_last_trade_ids[symbol] = (
+                        last_trade_id[0],
+                        Timestamp(last_trade_id[1]),
+                    )
 
-                len_result = len(result)
-                log.debug(f'{self.name} myTrades query result', results_num=len_result)
-                for r in result:
-                    r['symbol'] = symbol
-                raw_data.extend(result)
+        def query_symbol(symbol: str) -> tuple[str, list[dict[str, Any]]]:
+            return symbol, self._query_symbol_trades(
+                symbol=symbol,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                saved_last_trade_id=saved_last_trade_ids.get(symbol),
+            )
 
-            raw_data.sort(key=lambda x: x['time'])
+        pages: list[tuple[str, list[Any]]] = []
 
+        def save_pages() -> None:
+            self.save_pagination_pages(
+                query='trades',
+                start_ts=start_ts,
+                end_ts=end_ts,
+                pages=pages,
+            )
+            pages.clear()
+
+        pool = Pool(size=BINANCE_TRADES_QUERY_CONCURRENCY)
+        try:
+            for symbol, symbol_trades in pool.imap_unordered(
+                query_symbol,
+                [x for x in self._prioritize_symbols(iter_markets) if x not in queried_symbols],
+            ):
+                raw_data.extend(symbol_trades)
+                pages.append((
+                    json.dumps([symbol, self.pending_last_trade_ids.get(symbol)]),
+                    symbol_trades,
+                ))
+                if len(pages) >= BINANCE_TRADES_CHECKPOINT_BATCH:
+                    save_pages()
+        except BaseException:  # keep the markets queried until the failure
+            try:
+                save_pages()
+            except Exception as e:  # pylint: disable=broad-except  # don't hide the original error
+                log.error(f'Failed to save the {self.name} trades query progress due to {e!s}')
+            raise
+        finally:
+            pool.kill()
+
+        self.delete_pagination_checkpoint('trades')
+        raw_data.sort(key=lambda x: x['time'])
         trades = []
         for raw_trade in raw_data:
             try:
@@ -1072,6 +1176,138 @@ class Binance(ExchangeInterface, ExchangeWithExtras):
 
         return trades, (start_ts, end_ts)
 
+    def _query_symbol_trades(
+            self,
+            symbol: str,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+            saved_last_trade_id: Optional[tuple[int, Timestamp]],
+    ) -> list[dict[str, Any]]:
+        """Queries the trades of a symbol. Starts from the saved last trade id if the
+        trades before it cover everything up to the start of the query, otherwise
+        from the first trade since binance does not respect the given time range.
+
+        Keeps the id to start the next query from in pending_last_trade_ids if all
+        the trades before it are returned by this query or were returned before.
+
+        May raise due to api query and unexpected id:
+        - RemoteError
+        - BinancePermissionError
+        """
+        from_id, covered_end_ts = 0, None
+        if saved_last_trade_id is not None and start_ts <= saved_last_trade_id[1] + 1:
+            from_id, covered_end_ts = saved_last_trade_id
+
+        raw_data = []
+        last_trade_id = from_id
+        # Limit of results to return. 1000 is max limit according to docs
+        limit = 1000
+        len_result = limit
+        while len_result == limit:
+            # We know that myTrades returns a list from the api docs
+            result = self.api_query_list(
+                'api',
+                'myTrades',
+                options={
+                    'symbol': symbol,
+                    'fromId': last_trade_id,
+                    'limit': limit,
+                    # Not specifying them since binance does not seem to
+                    # respect them and always return all trades
+                })
+            if result:
+                try:
+                    last_trade_id = int(result[-1]['id']) + 1
+                except (ValueError, KeyError, IndexError) as e:
+                    raise RemoteError(
+                        f'Could not parse id from Binance myTrades api query result: {result}',
+                    ) from e
+
+            len_result = len(result)
+            log.debug(f'{self.name} myTrades query result', symbol=symbol, results_num=len_result)
+            for r in result:
+                r['symbol'] = symbol
+            raw_data.extend(result)
+
+        if covered_end_ts is None and start_ts > BINANCE_LAUNCH_TS:
+            return raw_data  # trades before the start of the query are not saved
+
+        # the next query starts from the first trade after the end of this one
+        next_trade_id = last_trade_id
+        try:
+            for raw_trade in raw_data:
+                if int(raw_trade['time']) > end_ts * 1000:
+                    next_trade_id = int(raw_trade['id'])
+                    break
+        except (ValueError, KeyError) as e:
+            log.error(f'Could not find the last {self.name} {symbol} trade id due to {e!s}')
+            return raw_data
+
+        self.pending_last_trade_ids[symbol] = (
+            next_trade_id,
+            end_ts if covered_end_ts is None else max(end_ts, covered_end_ts),
+        )
+        return raw_data
+
+    def _prioritize_symbols(self, symbols: list[str]) -> list[str]:
+        """Sorts the symbols so that the ones with assets the user has traded,
+        moved or held come first since they are the most likely to have trades"""
+        with self.db.conn.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT asset FROM asset_movements WHERE location=? UNION '
+                'SELECT base_asset FROM trades WHERE location=? UNION '
+                'SELECT quote_asset FROM trades WHERE location=? UNION '
+                'SELECT currency FROM timed_balances WHERE '
+                'timestamp=(SELECT MAX(timestamp) FROM timed_balances);',
+                (self.location.serialize_for_db(),) * 3,
+            )
+            user_assets = {row[0] for row in cursor}
+
+        def user_assets_num(symbol: str) -> int:
+            pair = self._symbols_to_pair[symbol]
+            return (pair.base_asset.identifier in user_assets) + (pair.quote_asset.identifier in user_assets)  # noqa: E501
+
+        return sorted(symbols, key=user_assets_num, reverse=True)
+
+    def _last_trade_id_setting_prefix(self) -> str:
+        return f'{self.location!s}_last_trade_id_'
+
+    def _get_last_trade_ids(self) -> dict[str, tuple[int, Timestamp]]:
+        """Returns the saved last trade id of each symbol along with the end of the
+        time range that the trades before it cover"""
+        prefix, suffix = self._last_trade_id_setting_prefix(), f'_{self.name}'
+        last_trade_ids = {}
+        with self.db.conn.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT name, value FROM multisettings WHERE name LIKE ? ESCAPE ?;',
+                (prefix.replace('_', '\\_') + '%' + suffix.replace('_', '\\_'), '\\'),
+            )
+            for name, value in cursor:
+                trade_id, covered_end_ts = value.split(',')
+                last_trade_ids[name[len(prefix):-len(suffix)]] = (
+                    int(trade_id),
+                    Timestamp(int(covered_end_ts)),
+                )
+
+        return last_trade_ids
+
+    def save_online_trade_history_progress(self, write_cursor: 'DBCursor') -> None:
+        """Saves the last trade ids of the symbols so the next query starts from them.
+        They are deleted along with the used query ranges of the exchange."""
+        settings = [
+            (f'{self._last_trade_id_setting_prefix()}{symbol}_{self.name}', f'{trade_id},{covered_end_ts}')  # noqa: E501
+            for symbol, (trade_id, covered_end_ts) in self.pending_last_trade_ids.items()
+        ]
+        write_cursor.executemany(
+            'DELETE FROM multisettings WHERE name=?;',
+            [(name,) for name, _ in settings],
+        )
+        write_cursor.executemany(
+            'INSERT INTO multisettings(name, value) VALUES(?, ?);',
+            settings,
+        )
+        self.pending_last_trade_ids = {}
+
     def _query_online_fiat_payments(self, start_ts: Timestamp, end_ts: Timestamp) -> list[Trade]:
         if self.location == Location.BINANCEUS:
             return []  # dont exist for Binance US: https://github.com/rotki/rotki/issues/3664
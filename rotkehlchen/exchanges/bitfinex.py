@@ -270,6 +270,31 @@ class Bitfinex(ExchangeInterface):
         limit = options['limit']
         results: Union[list[Trade], list[AssetMovement], list] = []
         processed_result_ids: set[int] = set()
+
+        def add_page_results(raw_results: list[list[Any]]) -> None:
+            nonlocal processed_result_ids
+            results_ = self._deserialize_api_query_paginated_results(
+                case=case_,
+                options=call_options,
+                raw_results=raw_results,
+                processed_result_ids=processed_result_ids,
+            )
+            results.extend(cast(Iterable, results_))
+            # NB: Copying the set before updating it prevents losing the call args values
+            processed_result_ids = processed_result_ids.copy()
+            # type ignore is due to always having a trade link for bitfinex trades
+            processed_result_ids.update({int(result.link) for result in results_})  # type: ignore
+
+        # continue from the last saved page if a query of the same range got interrupted
+        start_ts, end_ts = Timestamp(options['start'] // 1000), Timestamp(options['end'] // 1000)
+        has_saved_pages = False
+        if (checkpoint := self.get_pagination_checkpoint(case, start_ts, end_ts)) is not None:
+            has_saved_pages = True
+            for _, raw_results in checkpoint.pages:
+                add_page_results(raw_results)
+            call_options = call_options.copy()
+            call_options.update({'start': int(checkpoint.pages[-1][0])})
+
         retries_left = API_REQUEST_RETRY_TIMES
         while retries_left >= 0:
             response = self._api_query(
@@ -333,18 +358,7 @@ class Bitfinex(ExchangeInterface):
                 )
                 return []
 
-            results_ = self._deserialize_api_query_paginated_results(
-                case=case_,
-                options=call_options,
-                raw_results=response_list,
-                processed_result_ids=processed_result_ids,
-            )
-            results.extend(cast(Iterable, results_))
-            # NB: Copying the set before updating it prevents losing the call args values
-            processed_result_ids = processed_result_ids.copy()
-            # type ignore is due to always having a trade link for bitfinex trades
-            processed_result_ids.update({int(result.link) for result in results_})  # type: ignore
-
+            add_page_results(response_list)
             if len(response_list) < limit:
                 break
             # Update pagination params per endpoint
@@ -353,6 +367,17 @@ class Bitfinex(ExchangeInterface):
             call_options.update({
                 'start': results[-1].timestamp * 1000,
             })
+            self.save_pagination_page(
+                query=case,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                cursor=str(call_options['start']),
+                rows=response_list,
+            )
+            has_saved_pages = True
+
+        if has_saved_pages:
+            self.delete_pagination_checkpoint(case)
 
         return results
 
@@ -856,7 +881,7 @@ class Bitfinex(ExchangeInterface):
         self.first_connection_made = True
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         """Return the account exchange balances on Bitfinex
 
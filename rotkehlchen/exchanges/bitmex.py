@@ -241,7 +241,7 @@ class Bitmex(ExchangeInterface):
         return result
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         returned_balances: dict[AssetWithOracles, Balance] = {}
         try:
@@ -464,7 +464,7 @@ class Bitpanda(ExchangeInterface):
 
     # ---- General exchanges interface ----
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             wallets, _, _ = self._api_query('wallets')
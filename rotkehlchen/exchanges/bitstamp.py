@@ -143,7 +143,7 @@ class Bitstamp(ExchangeInterface):
         return changed
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         """Return the account balances on Bistamp
 
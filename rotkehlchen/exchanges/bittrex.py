@@ -293,7 +293,7 @@ class Bittrex(ExchangeInterface):
         return result
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             resp = self.api_query('balances')
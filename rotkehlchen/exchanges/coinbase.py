@@ -1,5 +1,6 @@
 import hashlib
 import hmac
+import json
 import logging
 import time
 from collections import defaultdict
@@ -193,6 +194,8 @@ class CoinbasePermissionError(Exception):
 
 
 class Coinbase(ExchangeInterface):
+    # the transactions are queried along with the trades to find conversions
+    trades_paginated_queries = ('trades', 'transactions')
 
     def __init__(
             self,
@@ -341,6 +344,65 @@ class Coinbase(ExchangeInterface):
 
         return account_ids
 
+    def _api_query_page(self, endpoint: str, uri: str) -> tuple[list[Any], Optional[str]]:
+        """Performs a coinbase API Query of a page of an endpoint
+
+        Returns the page's results and the uri of the next page or None if there is none.
+        """
+        request_verb = 'GET'
+        timestamp = str(int(time.time()))
+        message = timestamp + request_verb + uri
+
+        signature = hmac.new(
+            self.secret,
+            message.encode(),
+            hashlib.sha256,
+        ).hexdigest()
+        log.debug('Coinbase API query', request_url=uri)
+
+        self.session.headers.update({
+            'CB-ACCESS-SIGN': signature,
+            'CB-ACCESS-TIMESTAMP': timestamp,
+            # This is needed to guarantee the up to the given date
+            # API version response.
+            'CB-VERSION': '2019-08-25',
+        })
+
+        full_url = self.base_uri + uri
+        try:
+            response = self.session.get(full_url, timeout=CachedSettings().get_timeout_tuple())
+        except requests.exceptions.RequestException as e:
+            raise RemoteError(f'Coinbase API request failed due to {e!s}') from e
+
+        if response.status_code == 403:
+            raise CoinbasePermissionError(f'API key does not have permission for {endpoint}')
+
+        if response.status_code != 200:
+            raise RemoteError(
+                f'Coinbase query {full_url} responded with error status code: '
+                f'{response.status_code} and text: {response.text}',
+            )
+
+        try:
+            json_ret = jsonloads_dict(response.text)
+        except JSONDecodeError as e:
+            raise RemoteError(
+                f'Coinbase returned invalid JSON response: {response.text}',
+            ) from e
+
+        if 'data' not in json_ret:
+            raise RemoteError(f'Coinbase json response does not contain data: {response.text}')
+
+        if 'pagination' not in json_ret:
+            return json_ret['data'], None
+
+        if 'next_uri' not in json_ret['pagination']:
+            raise RemoteError('Coinbase json response contained no "next_uri" key')
+
+        # As per the docs: https://developers.coinbase.com/api/v2?python#pagination
+        # once we get an empty next_uri we are done
+        return json_ret['data'], json_ret['pagination']['next_uri'] or None
+
     def _api_query(
             self,
             endpoint: str,
@@ -353,76 +415,69 @@ class Coinbase(ExchangeInterface):
         If you want just the first results then set ignore_pagination to True.
         """
         all_items: list[Any] = []
-        request_verb = 'GET'
-        # initialize next_uri before loop
-        next_uri = f'/{self.apiversion}/{endpoint}'
+        uri = f'/{self.apiversion}/{endpoint}'
         if options:
-            next_uri += urlencode(options)
-        while True:
-            timestamp = str(int(time.time()))
-            message = timestamp + request_verb + next_uri
-
-            signature = hmac.new(
-                self.secret,
-                message.encode(),
-                hashlib.sha256,
-            ).hexdigest()
-            log.debug('Coinbase API query', request_url=next_uri)
-
-            self.session.headers.update({
-                'CB-ACCESS-SIGN': signature,
-                'CB-ACCESS-TIMESTAMP': timestamp,
-                # This is needed to guarantee the up to the given date
-                # API version response.
-                'CB-VERSION': '2019-08-25',
-            })
-
-            full_url = self.base_uri + next_uri
-            try:
-                response = self.session.get(full_url, timeout=CachedSettings().get_timeout_tuple())
-            except requests.exceptions.RequestException as e:
-                raise RemoteError(f'Coinbase API request failed due to {e!s}') from e
-
-            if response.status_code == 403:
-                raise CoinbasePermissionError(f'API key does not have permission for {endpoint}')
-
-            if response.status_code != 200:
-                raise RemoteError(
-                    f'Coinbase query {full_url} responded with error status code: '
-                    f'{response.status_code} and text: {response.text}',
-                )
-
-            try:
-                json_ret = jsonloads_dict(response.text)
-            except JSONDecodeError as e:
-                raise RemoteError(
-                    f'Coinbase returned invalid JSON response: {response.text}',
-                ) from e
-
-            if 'data' not in json_ret:
-                raise RemoteError(f'Coinbase json response does not contain data: {response.text}')
-
-            # `data` attr is a list in itself
-            all_items.extend(json_ret['data'])
-            if ignore_pagination or 'pagination' not in json_ret:
-                # break out of the loop, no need to handle pagination
+            uri += urlencode(options)
+        # initialize next_uri before loop
+        next_uri: Optional[str] = uri
+        while next_uri is not None:
+            items, next_uri = self._api_query_page(endpoint=endpoint, uri=next_uri)
+            all_items.extend(items)
+            if ignore_pagination:
                 break
 
-            if 'next_uri' not in json_ret['pagination']:
-                raise RemoteError('Coinbase json response contained no "next_uri" key')
+        return all_items
 
-            # otherwise, let the loop run to gather subsequent queries
-            # this next_uri will be used in next iteration
-            next_uri = json_ret['pagination']['next_uri']
-            if not next_uri:
-                # As per the docs: https://developers.coinbase.com/api/v2?python#pagination
-                # once we get an empty next_uri we are done
-                break
+    def _api_query_paginated(
+            self,
+            query: str,
+            endpoints: list[str],
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+    ) -> list[Any]:
+        """Queries all the pages of the given endpoints one after the other. Each page
+        is saved as a checkpoint so that an interrupted query continues from the last one.
 
-        return all_items
+        The cursor keeps the endpoints already queried and the endpoint and uri to
+        continue from, since the endpoints depend on the accounts which can change
+        between queries.
+        """
+        if len(endpoints) == 0:
+            return []
+
+        def query_page(page_cursor: Optional[str]) -> tuple[list[Any], Optional[str]]:
+            queried_endpoints: list[str] = []
+            endpoint, uri = endpoints[0], None
+            if page_cursor is not None:
+                queried_endpoints, endpoint, uri = json.loads(page_cursor)
+                if endpoint not in endpoints:  # the account is gone. Move to the next one
+                    remaining = [x for x in endpoints if x not in queried_endpoints]
+                    if len(remaining) == 0:
+                        return [], None
+                    endpoint, uri = remaining[0], None
+
+            items, next_uri = self._api_query_page(
+                endpoint=endpoint,
+                uri=f'/{self.apiversion}/{endpoint}' if uri is None else uri,
+            )
+            if next_uri is None:  # continue with the next endpoint
+                queried_endpoints = [*queried_endpoints, endpoint]
+                remaining = [x for x in endpoints if x not in queried_endpoints]
+                if len(remaining) == 0:
+                    return items, None
+                endpoint = remaining[0]
+
+            return items, json.dumps([queried_endpoints, endpoint, next_uri])
+
+        return self.query_paginated(
+            query=query,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            query_page=query_page,
+        )
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             resp = self._api_query('accounts')
@@ -504,10 +559,15 @@ class Coinbase(ExchangeInterface):
         # consitutes something that Rotkehlchen would need to return in query_trade_history
         account_ids = self._get_account_ids(account_data)
 
-        raw_data = []
-        for account_id in account_ids:
-            raw_data.extend(self._api_query(f'accounts/{account_id}/buys'))
-            raw_data.extend(self._api_query(f'accounts/{account_id}/sells'))
+        raw_data = self._api_query_paginated(
+            query='trades',
+            endpoints=[
+                f'accounts/{account_id}/{trade_type}'
+                for account_id in account_ids for trade_type in ('buys', 'sells')
+            ],
+            start_ts=start_ts,
+            end_ts=end_ts,
+        )
         log.debug('coinbase buys/sells history result', results_num=len(raw_data))
 
         trades = []
@@ -547,9 +607,12 @@ class Coinbase(ExchangeInterface):
                 trades.append(trade)
 
         # Analyze conversions of coins. We address them as sells
-        raw_transactions = []
-        for account_id in account_ids:
-            raw_transactions.extend(self._api_query(f'accounts/{account_id}/transactions'))
+        raw_transactions = self._api_query_paginated(
+            query='transactions',
+            endpoints=[f'accounts/{account_id}/transactions' for account_id in account_ids],
+            start_ts=start_ts,
+            end_ts=end_ts,
+        )
         # Maps every trade id to their two transactions
         trade_pairs = defaultdict(list)
         for transaction in raw_transactions:
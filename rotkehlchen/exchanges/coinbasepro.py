@@ -316,7 +316,7 @@ class Coinbasepro(ExchangeInterface):
         return self.account_to_currency
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             accounts, _ = self._api_query('accounts')
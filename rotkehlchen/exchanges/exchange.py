@@ -1,11 +1,15 @@
+import json
 import logging
 from abc import abstractmethod
-from typing import TYPE_CHECKING, Any, Callable, Optional
+from collections.abc import Sequence
+from json.decoder import JSONDecodeError
+from typing import TYPE_CHECKING, Any, Callable, ClassVar, NamedTuple, Optional
 
 import requests
 
 from rotkehlchen.accounting.structures.balance import Balance
-from rotkehlchen.assets.asset import AssetWithOracles
+from rotkehlchen.assets.asset import Asset, AssetWithOracles
+from rotkehlchen.db.cached_results import DBCachedResults
 from rotkehlchen.db.filtering import (
     AssetMovementsFilterQuery,
     HistoryEventFilterQuery,
@@ -13,9 +17,12 @@ from rotkehlchen.db.filtering import (
 )
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.ranges import DBQueryRanges
+from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.exchanges.data_structures import AssetMovement, MarginPosition, Trade
 from rotkehlchen.logging import RotkehlchenLogsAdapter
+from rotkehlchen.serialization.deserialize import deserialize_asset_amount, deserialize_fval
 from rotkehlchen.types import (
     ApiKey,
     ApiSecret,
@@ -29,10 +36,12 @@ from rotkehlchen.types import (
 from rotkehlchen.utils.misc import set_user_agent
 from rotkehlchen.utils.mixins.cacheable import CacheableMixIn
 from rotkehlchen.utils.mixins.lockable import LockableQueryMixIn, protect_with_lock
+from rotkehlchen.utils.serialization import jsonloads_dict
 
 if TYPE_CHECKING:
     from rotkehlchen.accounting.structures.base import HistoryEvent
     from rotkehlchen.db.dbhandler import DBHandler
+    from rotkehlchen.db.drivers.gevent import DBCursor
 
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
@@ -42,6 +51,16 @@ ExchangeQueryBalances = tuple[Optional[dict[AssetWithOracles, Balance]], str]
 
 ExchangeHistoryFailCallback = Callable[[str], None]
 ExchangeHistoryNewStepCallback = Callable[[str], None]
+# Gets the cursor of the page to query (None for the first) and returns the page's
+# rows and the cursor of the next page or None if it was the last one
+PaginatedQueryPage = Callable[[Optional[str]], tuple[list[Any], Optional[str]]]
+
+
+class PaginationCheckpoint(NamedTuple):
+    """The saved pages of an interrupted paginated query of a time range"""
+    start_ts: Timestamp
+    end_ts: Timestamp
+    pages: list[tuple[str, list[Any]]]  # cursor to continue from after each page and its rows
 
 
 class ExchangeWithExtras:
@@ -66,6 +85,10 @@ class ExchangeWithExtras:
 
 
 class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
+    # Names of the paginated queries of the trades and of the asset movements
+    # ranges, whose interrupted pages are checkpointed
+    trades_paginated_queries: ClassVar[tuple[str, ...]] = ('trades',)
+    asset_movements_paginated_queries: ClassVar[tuple[str, ...]] = ('asset_movements',)
 
     def __init__(
             self,
@@ -85,6 +108,7 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
         self.name = name
         self.location = location
         self.db = database
+        self.cached_results_db = DBCachedResults(database)
         self.api_key = api_key
         self.secret = secret
         self.first_connection_made = False
@@ -107,6 +131,38 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
             passphrase=credentials.passphrase,
         ))
 
+    def cached_results_owner(self) -> str:
+        return f'{self.location!s}_{self.name}'
+
+    def serialize_cached_result(self, name: str, result: ExchangeQueryBalances) -> Optional[str]:  # pylint: disable=unused-argument
+        """Only query_balances results are kept, and only if the query succeeded"""
+        if (balances := result[0]) is None:
+            return None
+
+        return json.dumps({
+            asset.identifier: balance.serialize() for asset, balance in balances.items()
+        })
+
+    def deserialize_cached_result(self, name: str, data: str) -> ExchangeQueryBalances:  # pylint: disable=unused-argument
+        """May raise:
+        - DeserializationError if the data is not in the expected format
+        """
+        try:
+            balances = {
+                Asset(identifier).resolve_to_asset_with_oracles(): Balance(
+                    amount=deserialize_asset_amount(balance['amount']),
+                    usd_value=deserialize_fval(balance['usd_value'], 'usd_value', 'cached balances'),  # noqa: E501
+                ) for identifier, balance in jsonloads_dict(data).items()
+            }
+        except (JSONDecodeError, KeyError, TypeError, UnknownAsset, WrongAssetType) as e:
+            msg = f'missing key {e!s}' if isinstance(e, KeyError) else str(e)
+            raise DeserializationError(f'Invalid {self.name} kept balances: {msg}') from e
+
+        return balances, ''
+
+    def refreshed_result_error(self, name: str, result: ExchangeQueryBalances) -> Optional[str]:  # pylint: disable=unused-argument
+        return result[1] if result[0] is None else None
+
     def location_id(self) -> ExchangeLocationID:
         """Returns unique location identifier for this exchange object (name + location)"""
         return ExchangeLocationID(name=self.name, location=self.location)
@@ -187,6 +243,186 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
             'query_online_trade_history() should only be implemented by subclasses',
         )
 
+    def get_pagination_checkpoint(
+            self,
+            query: str,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+    ) -> Optional[PaginationCheckpoint]:
+        """Returns the saved pages of the given query if it got interrupted while
+        querying exactly the given range. Cursors can depend on the queried range so
+        the pages of any other range can't be continued."""
+        with self.db.conn.read_ctx() as cursor:
+            pages = cursor.execute(
+                'SELECT start_ts, end_ts, cursor, data FROM exchange_pagination_checkpoints '
+                'WHERE location=? AND exchange_name=? AND query=? ORDER BY page',
+                (self.location.serialize_for_db(), self.name, query),
+            ).fetchall()
+
+        if len(pages) == 0 or (pages[0][0], pages[0][1]) != (start_ts, end_ts):
+            return None
+
+        return PaginationCheckpoint(
+            start_ts=start_ts,
+            end_ts=end_ts,
+            pages=[(page_cursor, json.loads(data)) for _, _, page_cursor, data in pages],
+        )
+
+    def save_pagination_page(
+            self,
+            query: str,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+            cursor: str,
+            rows: list[Any],
+    ) -> None:
+        """Saves the rows of a page of a paginated query of a time range along with
+        the cursor to continue from. Replaces any pages the query saved for another range."""
+        self.save_pagination_pages(
+            query=query,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            pages=[(cursor, rows)],
+        )
+
+    def save_pagination_pages(
+            self,
+            query: str,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+            pages: list[tuple[str, list[Any]]],
+    ) -> None:
+        """Saves the given pages, each with the cursor to continue from after it, of a
+        paginated query of a time range in a single write transaction. Replaces any
+        pages the query saved for another range."""
+        if len(pages) == 0:
+            return
+
+        serialized_location = self.location.serialize_for_db()
+        with self.db.user_write() as write_cursor:
+            write_cursor.execute(
+                'DELETE FROM exchange_pagination_checkpoints WHERE location=? AND '
+                'exchange_name=? AND query=? AND (start_ts != ? OR end_ts != ?)',
+                (serialized_location, self.name, query, start_ts, end_ts),
+            )
+            write_cursor.executemany(
+                'INSERT INTO exchange_pagination_checkpoints(location, exchange_name, query, '
+                'start_ts, end_ts, page, cursor, data) SELECT ?, ?, ?, ?, ?, COUNT(*), ?, ? '
+                'FROM exchange_pagination_checkpoints WHERE location=? AND exchange_name=? '
+                'AND query=?',
+                [(
+                    serialized_location, self.name, query, start_ts, end_ts, page_cursor,
+                    json.dumps(rows, separators=(',', ':')),
+                    serialized_location, self.name, query,
+                ) for page_cursor, rows in pages],
+            )
+
+    def delete_pagination_checkpoint(self, query: str) -> None:
+        """Deletes the saved pages of the given query once all of its pages are queried"""
+        with self.db.user_write() as write_cursor:
+            write_cursor.execute(
+                'DELETE FROM exchange_pagination_checkpoints WHERE location=? AND '
+                'exchange_name=? AND query=?',
+                (self.location.serialize_for_db(), self.name, query),
+            )
+
+    def delete_pagination_checkpoints(
+            self,
+            write_cursor: 'DBCursor',
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+    ) -> None:
+        """Deletes the saved pages of the queries of ranges within the given one.
+        Should be called along with saving the results of the range, since any pages
+        left by a failed query of it can't be continued after that."""
+        write_cursor.execute(
+            'DELETE FROM exchange_pagination_checkpoints WHERE location=? AND '
+            'exchange_name=? AND start_ts >= ? AND end_ts <= ?',
+            (self.location.serialize_for_db(), self.name, start_ts, end_ts),
+        )
+
+    def split_ranges_at_pagination_checkpoints(
+            self,
+            cursor: 'DBCursor',
+            queries: Sequence[str],
+            ranges: list[tuple[Timestamp, Timestamp]],
+    ) -> list[tuple[Timestamp, Timestamp]]:
+        """Splits the ranges to query at the end of the range of any interrupted
+        query of the given paginated queries that starts with them so that it can
+        continue from its saved pages"""
+        checkpoint_ends = dict(cursor.execute(
+            f'SELECT start_ts, MIN(end_ts) FROM exchange_pagination_checkpoints '
+            f'WHERE location=? AND exchange_name=? AND query IN ({",".join("?" * len(queries))}) '
+            f'GROUP BY start_ts',
+            (self.location.serialize_for_db(), self.name, *queries),
+        ))
+        split_ranges = []
+        for range_start, range_end in ranges:
+            checkpoint_end = checkpoint_ends.get(range_start)
+            if checkpoint_end is not None and checkpoint_end < range_end:
+                split_ranges.append((range_start, Timestamp(checkpoint_end)))
+                split_ranges.append((Timestamp(checkpoint_end + 1), range_end))
+            else:
+                split_ranges.append((range_start, range_end))
+
+        return split_ranges
+
+    def query_paginated(
+            self,
+            query: str,
+            start_ts: Timestamp,
+            end_ts: Timestamp,
+            query_page: PaginatedQueryPage,
+    ) -> list[Any]:
+        """Queries all the pages of a time range and returns their rows.
+
+        Each page except the last is saved with the cursor of the next one, so if the
+        query is interrupted the next query of the same range continues from there.
+        The saved pages are deleted once the last page is queried.
+
+        May raise any error query_page raises
+        """
+        rows: list[Any] = []
+        page_cursor = None
+        has_saved_pages = False
+        if (checkpoint := self.get_pagination_checkpoint(query, start_ts, end_ts)) is not None:
+            has_saved_pages = True
+            log.debug(
+                f'Continuing {self.name} {query} query from {start_ts} to {end_ts} '
+                f'after {len(checkpoint.pages)} saved pages',
+            )
+            rows = [row for _, page_rows in checkpoint.pages for row in page_rows]
+            page_cursor = checkpoint.pages[-1][0]
+
+        while True:
+            page_rows, page_cursor = query_page(page_cursor)
+            rows.extend(page_rows)
+            if page_cursor is None:
+                break
+
+            self.save_pagination_page(
+                query=query,
+                start_ts=start_ts,
+                end_ts=end_ts,
+                cursor=page_cursor,
+                rows=page_rows,
+            )
+            has_saved_pages = True
+
+        if has_saved_pages:
+            self.delete_pagination_checkpoint(query)
+
+        return rows
+
+    def save_online_trade_history_progress(self, write_cursor: 'DBCursor') -> None:
+        """Saves what the exchange needs to continue the next trade history query from
+        where the last query_online_trade_history call stopped.
+
+        Called in the same transaction that saves the queried trades. Should be
+        implemented by subclasses that keep such progress.
+        """
+        return None
+
     def query_online_margin_history(
             self,
             start_ts: Timestamp,
@@ -255,11 +491,15 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
             ranges = DBQueryRanges(self.db)
             location_string = f'{self.location!s}_trades_{self.name}'
             with self.db.conn.read_ctx() as cursor:
-                ranges_to_query = ranges.get_location_query_ranges(
+                ranges_to_query = self.split_ranges_at_pagination_checkpoints(
                     cursor=cursor,
-                    location_string=location_string,
-                    start_ts=start_ts,
-                    end_ts=end_ts,
+                    queries=self.trades_paginated_queries,
+                    ranges=ranges.get_location_query_ranges(
+                        cursor=cursor,
+                        location_string=location_string,
+                        start_ts=start_ts,
+                        end_ts=end_ts,
+                    ),
                 )
 
             for query_start_ts, query_end_ts in ranges_to_query:
@@ -278,6 +518,8 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
                 with self.db.user_write() as write_cursor:
                     if new_trades != []:
                         self.db.add_trades(write_cursor=write_cursor, trades=new_trades)
+                    self.save_online_trade_history_progress(write_cursor)
+                    self.delete_pagination_checkpoints(write_cursor, *queried_range)
 
                     # and also set the used queried timestamp range for the exchange
                     ranges.update_used_query_range(
@@ -381,11 +623,15 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
 
             ranges = DBQueryRanges(self.db)
             location_string = f'{self.location!s}_asset_movements_{self.name}'
-            ranges_to_query = ranges.get_location_query_ranges(
+            ranges_to_query = self.split_ranges_at_pagination_checkpoints(
                 cursor=cursor,
-                location_string=location_string,
-                start_ts=start_ts,
-                end_ts=end_ts,
+                queries=self.asset_movements_paginated_queries,
+                ranges=ranges.get_location_query_ranges(
+                    cursor=cursor,
+                    location_string=location_string,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                ),
             )
 
         for query_start_ts, query_end_ts in ranges_to_query:
@@ -401,6 +647,7 @@ class ExchangeInterface(CacheableMixIn, LockableQueryMixIn):
             with self.db.user_write() as write_cursor:
                 if len(new_movements) != 0:
                     self.db.add_asset_movements(write_cursor, new_movements)
+                self.delete_pagination_checkpoints(write_cursor, query_start_ts, query_end_ts)
                 ranges.update_used_query_range(
                     write_cursor=write_cursor,
                     location_string=location_string,
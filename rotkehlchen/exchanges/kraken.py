@@ -397,7 +397,7 @@ class Kraken(ExchangeInterface, ExchangeWithExtras):
 
     # ---- General exchanges interface ----
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             kraken_balances = self.api_query('Balance', req={})
@@ -476,74 +476,78 @@ class Kraken(ExchangeInterface, ExchangeWithExtras):
         """ Abstracting away the functionality of querying a kraken endpoint where
         you need to check the 'count' of the returned results and provide sufficient
         calls with enough offset to gather all the data of your query.
-        """
-        result: list = []
 
+        Each page is saved as a checkpoint so if a query fails it continues from
+        the last page the next time the same range is queried.
+
+        May raise:
+        - RemoteError if any of the queries fails
+        """
         with_errors = False
         log.debug(
             f'Querying Kraken {endpoint} from {start_ts} to '
             f'{end_ts} with extra_dict {extra_dict}',
         )
-        response = self._query_endpoint_for_period(
-            endpoint=endpoint,
-            start_ts=start_ts,
-            end_ts=end_ts,
-            extra_dict=extra_dict,
-        )
-        count = response['count']
-        offset = len(response[keyname])
-        result.extend(response[keyname].values())
 
-        log.debug(f'Kraken {endpoint} Query Response with count:{count}')
-
-        while offset < count:
-            log.debug(
-                f'Querying Kraken {endpoint} from {start_ts} to {end_ts} '
-                f'with offset {offset} and extra_dict {extra_dict}',
-            )
-            try:
+        def query_page(page_cursor: Optional[str]) -> tuple[list, Optional[str]]:
+            nonlocal with_errors
+            if page_cursor is None:
                 response = self._query_endpoint_for_period(
                     endpoint=endpoint,
                     start_ts=start_ts,
                     end_ts=end_ts,
-                    offset=offset,
                     extra_dict=extra_dict,
                 )
-            except RemoteError as e:
-                with_errors = True
-                log.error(
-                    f'One of krakens queries when querying endpoint for period failed '
-                    f'with {e!s}. Returning only results we have.',
-                )
-                break
-
-            if count != response['count']:
-                log.error(
-                    f'Kraken unexpected response while querying endpoint for period. '
-                    f'Original count was {count} and response returned {response["count"]}',
+                count = response['count']
+                offset = len(response[keyname])
+                log.debug(f'Kraken {endpoint} Query Response with count:{count}')
+            else:
+                offset, count = json.loads(page_cursor)
+                log.debug(
+                    f'Querying Kraken {endpoint} from {start_ts} to {end_ts} '
+                    f'with offset {offset} and extra_dict {extra_dict}',
                 )
-                with_errors = True
-                break
-
-            response_length = len(response[keyname])
-            offset += response_length
-            if response_length == 0 and offset != count:
-                # If we have provided specific filtering then this is a known
-                # issue documented below, so skip the warning logging
-                # https://github.com/rotki/rotki/issues/116
-                if extra_dict:
-                    break
-                # it is possible that kraken misbehaves and either does not
-                # send us enough results or thinks it has more than it really does
-                log.warning(
-                    f'Missing {count - offset} results when querying kraken '
-                    f'endpoint {endpoint}',
+                response = self._query_endpoint_for_period(
+                    endpoint=endpoint,
+                    start_ts=start_ts,
+                    end_ts=end_ts,
+                    offset=offset,
+                    extra_dict=extra_dict,
                 )
-                with_errors = True
-                break
+                if count != response['count']:
+                    log.error(
+                        f'Kraken unexpected response while querying endpoint for period. '
+                        f'Original count was {count} and response returned {response["count"]}',
+                    )
+                    with_errors = True
+                    return [], None
+
+                response_length = len(response[keyname])
+                offset += response_length
+                if response_length == 0 and offset != count:
+                    # If we have provided specific filtering then this is a known
+                    # issue documented below, so skip the warning logging
+                    # https://github.com/rotki/rotki/issues/116
+                    if extra_dict:
+                        return [], None
+                    # it is possible that kraken misbehaves and either does not
+                    # send us enough results or thinks it has more than it really does
+                    log.warning(
+                        f'Missing {count - offset} results when querying kraken '
+                        f'endpoint {endpoint}',
+                    )
+                    with_errors = True
+                    return [], None
 
-            result.extend(response[keyname].values())
+            next_cursor = json.dumps([offset, count]) if offset < count else None
+            return list(response[keyname].values()), next_cursor
 
+        result = self.query_paginated(
+            query=endpoint,
+            start_ts=start_ts,
+            end_ts=end_ts,
+            query_page=query_page,
+        )
         return result, with_errors
 
     def query_online_trade_history(
@@ -1010,11 +1014,15 @@ class Kraken(ExchangeInterface, ExchangeWithExtras):
         """
         ranges = DBQueryRanges(self.db)
         range_query_name = f'{self.location}_history_events_{self.name}'
-        ranges_to_query = ranges.get_location_query_ranges(
+        ranges_to_query = self.split_ranges_at_pagination_checkpoints(
             cursor=cursor,
-            location_string=range_query_name,
-            start_ts=start_ts,
-            end_ts=end_ts,
+            queries=('Ledgers',),
+            ranges=ranges.get_location_query_ranges(
+                cursor=cursor,
+                location_string=range_query_name,
+                start_ts=start_ts,
+                end_ts=end_ts,
+            ),
         )
         with_errors = False
         for query_start_ts, query_end_ts in ranges_to_query:
@@ -1050,8 +1058,9 @@ class Kraken(ExchangeInterface, ExchangeWithExtras):
                 events_source=f'{query_start_ts} to {query_end_ts}',
                 save_skipped_events=True,
             )
-            if len(new_events) != 0:
-                with self.db.user_write() as write_cursor:
+            with self.db.user_write() as write_cursor:
+                self.delete_pagination_checkpoints(write_cursor, query_start_ts, query_end_ts)
+                if len(new_events) != 0:
                     ranges.update_used_query_range(
                         write_cursor=write_cursor,
                         location_string=range_query_name,
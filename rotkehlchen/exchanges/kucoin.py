@@ -713,7 +713,7 @@ class Kucoin(ExchangeInterface):
         self.first_connection_made = True
 
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         """Return the account balances
 
@@ -135,6 +135,8 @@ class ExchangeManager:
                 exchangeobj.reset_to_db_extras()
             return False, f"Couldn't update exchange properties in the DB. {e!s}"
 
+        # The kept balances may be of other credentials or under the old name
+        exchangeobj.flush_all_caches()
         # Finally edit the name of the exchange object
         if new_name is not None:
             exchangeobj.name = new_name
@@ -146,7 +148,7 @@ class ExchangeManager:
         Deletes an exchange with the specified name + location from both connected_exchanges
         and the DB.
         """
-        if self.get_exchange(name=name, location=location) is None:
+        if (exchangeobj := self.get_exchange(name=name, location=location)) is None:
             return False, f'{location!s} exchange {name} is not registered'
 
         exchanges_list = self.connected_exchanges.get(location)
@@ -157,6 +159,7 @@ class ExchangeManager:
             self.connected_exchanges.pop(location)
         else:
             self.connected_exchanges[location] = [x for x in exchanges_list if x.name != name]
+        exchangeobj.flush_all_caches()
         with self.database.user_write() as write_cursor:  # Also remove it from the db
             self.database.remove_exchange(write_cursor=write_cursor, name=name, location=location)
             self.database.delete_used_query_range_for_exchange(
@@ -168,6 +171,9 @@ class ExchangeManager:
 
     def delete_all_exchanges(self) -> None:
         """Deletes all exchanges from the manager. Not from the DB"""
+        for exchanges in self.connected_exchanges.values():
+            for exchangeobj in exchanges:
+                exchangeobj.stop_cache_refreshes()
         self.connected_exchanges.clear()
 
     def get_connected_exchanges_info(self) -> list[dict[str, Any]]:
@@ -351,7 +351,7 @@ class Poloniex(ExchangeInterface):
 
     # ---- General exchanges interface ----
     @protect_with_lock()
-    @cache_response_timewise()
+    @cache_response_timewise(persist=True)
     def query_balances(self) -> ExchangeQueryBalances:
         try:
             resp = self.api_query_list('/accounts/balances')
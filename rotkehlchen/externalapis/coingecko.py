@@ -811,3 +811,64 @@ class Coingecko(HistoricalPriceOracleInterface, PenalizablePriceOracleMixin):
             price=price,
         )])
         return price
+
+    def query_and_store_historical_range(
+            self,
+            from_asset: AssetWithOracles,
+            to_asset: AssetWithOracles,
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> int:
+        """Get the prices between the two timestamps with a single market chart range
+        query and store them in the global DB. Coingecko returns hourly prices for
+        ranges of up to 90 days and daily prices for longer ones.
+
+        Returns the number of prices stored.
+
+        May raise:
+        - PriceQueryUnsupportedAsset if either from_asset or to_asset are not supported
+        - RemoteError if there is a problem querying coingecko
+        """
+        vs_currency = Coingecko.check_vs_currencies(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            location='historical price range',
+        )
+        if not vs_currency:
+            raise PriceQueryUnsupportedAsset(to_asset.identifier)
+
+        try:
+            from_coingecko_id = from_asset.to_coingecko()
+        except UnsupportedAsset as e:
+            raise PriceQueryUnsupportedAsset(from_asset.identifier) from e
+
+        result = self._query(
+            module='coins',
+            subpath=f'{from_coingecko_id}/market_chart/range',
+            options={
+                'vs_currency': vs_currency,
+                # one more hour at each side so that every timestamp has a close price
+                'from': str(from_timestamp - 3600),
+                'to': str(to_timestamp + 3600),
+            },
+        )
+        prices = []
+        try:
+            for timestamp_ms, price in result['prices']:
+                if (price := Price(FVal(price))) == ZERO_PRICE:
+                    continue  # don't write zero prices
+                prices.append(HistoricalPrice(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    source=HistoricalPriceOracle.COINGECKO,
+                    timestamp=Timestamp(int(timestamp_ms) // 1000),
+                    price=price,
+                ))
+        except (KeyError, ValueError, TypeError) as e:
+            raise RemoteError(
+                f'Unexpected format of coingecko market chart range response for '
+                f'{from_asset.identifier}. {e!s}',
+            ) from e
+
+        GlobalDBHandler().add_historical_prices(prices)
+        return len(prices)
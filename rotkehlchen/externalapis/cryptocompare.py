@@ -724,9 +724,70 @@ class Cryptocompare(ExternalServiceWithApiKey, HistoricalPriceOracleInterface, P
 
         # Let's always check for data sanity for the hourly prices.
         _check_hourly_data_sanity(calculated_history, from_asset, to_asset)
-        # Turn them into the format we will enter in the DB
+        GlobalDBHandler().add_historical_prices(self._histohour_to_historical_prices(
+            data=calculated_history,
+            from_asset=from_asset,
+            to_asset=to_asset,
+        ))
+        self.last_histohour_query_ts = ts_now()  # also save when last query finished
+
+    def query_and_store_historical_range(
+            self,
+            from_asset: AssetWithOracles,
+            to_asset: AssetWithOracles,
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> int:
+        """Get the hourly prices between the two timestamps with a single histohour
+        query and store them in the global DB. The range can span at most
+        CRYPTOCOMPARE_HOURQUERYLIMIT hours.
+
+        Returns the number of prices stored.
+
+        - May raise RemoteError if there is a problem reaching the cryptocompare server
+        or with reading the response returned by the server
+        - May raise PriceQueryUnsupportedAsset if from/to assets are not known to cryptocompare
+        """
+        # one more hour at each side so that every timestamp has a price within an hour
+        hours = min((to_timestamp - from_timestamp) // 3600 + 2, CRYPTOCOMPARE_HOURQUERYLIMIT)
+        log.debug(
+            'Querying cryptocompare for a range of hourly historical prices',
+            from_asset=from_asset,
+            to_asset=to_asset,
+            from_timestamp=from_timestamp,
+            to_timestamp=to_timestamp,
+        )
+        resp = self.query_endpoint_histohour(
+            from_asset=from_asset,
+            to_asset=to_asset,
+            limit=hours,
+            to_timestamp=Timestamp(to_timestamp + 3600),
+        )
+        try:
+            data = resp['Data']
+        except KeyError as e:
+            raise RemoteError(
+                'Unexpected format of cryptocompare histohour response. Missing Data key',
+            ) from e
+
+        _check_hourly_data_sanity(data, from_asset, to_asset)
+        prices = self._histohour_to_historical_prices(
+            data=data,
+            from_asset=from_asset,
+            to_asset=to_asset,
+        )
+        GlobalDBHandler().add_historical_prices(prices)
+        return len(prices)
+
+    @staticmethod
+    def _histohour_to_historical_prices(
+            data: list[dict[str, Any]],
+            from_asset: AssetWithOracles,
+            to_asset: AssetWithOracles,
+    ) -> list[HistoricalPrice]:
+        """Turn histohour entries into the format we will enter in the DB"""
         prices = []
-        for entry in calculated_history:
+        for entry in data:
             try:
                 price = Price((deserialize_price(entry['high']) + deserialize_price(entry['low'])) / 2)  # noqa: E501
                 if price == ZERO_PRICE:
@@ -748,8 +809,7 @@ class Cryptocompare(ExternalServiceWithApiKey, HistoricalPriceOracleInterface, P
                 )
                 continue
 
-        GlobalDBHandler().add_historical_prices(prices)
-        self.last_histohour_query_ts = ts_now()  # also save when last query finished
+        return prices
 
     def query_historical_price(
             self,
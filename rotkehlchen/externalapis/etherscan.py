@@ -26,6 +26,7 @@ from rotkehlchen.serialization.deserialize import (
     deserialize_int_from_str,
     deserialize_timestamp,
 )
+from rotkehlchen.tasks.scheduler import BacklogType
 from rotkehlchen.types import (
     SUPPORTED_EVM_CHAINS,
     ChecksumEvmAddress,
@@ -447,6 +448,11 @@ class Etherscan(ExternalServiceWithApiKey, metaclass=ABCMeta):
                                 'evm_transactions WHERE tx_hash=? AND chain_id=?) AND value=?',
                                 (GENESIS_HASH, self.chain.to_chain_id().serialize_for_db(), HISTORY_MAPPING_STATE_DECODED),  # noqa: E501
                             )
+                        self.db.task_backlogs.increase(
+                            backlog_type=BacklogType.EVM_TX_DECODING,
+                            count=1,
+                            chain_id=self.chain.to_chain_id(),
+                        )
                 except DeserializationError as e:
                     self.msg_aggregator.add_warning(f'{e!s}. Skipping transaction')
                     continue
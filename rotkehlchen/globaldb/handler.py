@@ -2,9 +2,9 @@ import logging
 import os
 import shutil
 import sqlite3
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
-from typing import TYPE_CHECKING, Any, Literal, Optional, Union, cast, overload
+from typing import TYPE_CHECKING, Any, ClassVar, Literal, Optional, Union, cast, overload
 
 from gevent.lock import Semaphore
 
@@ -37,7 +37,7 @@ from rotkehlchen.types import (
     Price,
     Timestamp,
 )
-from rotkehlchen.utils.misc import timestamp_to_date, ts_now
+from rotkehlchen.utils.misc import get_chunks, timestamp_to_date, ts_now
 from rotkehlchen.utils.serialization import (
     deserialize_asset_with_oracles_from_db,
     deserialize_generic_asset_from_db,
@@ -55,6 +55,21 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# Query of all the data of assets. condition is applied to the identifier in each subquery
+RESOLVE_ASSETS_QUERY = """
+SELECT A.identifier, A.type, B.address, B.decimals, A.name, C.symbol, C.started, null, C.swapped_for, C.coingecko, C.cryptocompare, B.protocol, B.chain, B.token_kind, null, null FROM assets as A JOIN evm_tokens as B
+ON B.identifier = A.identifier JOIN common_asset_details AS C ON C.identifier = B.identifier WHERE A.type = ? AND A.identifier {condition}
+UNION ALL
+SELECT A.identifier, A.type, null, null, A.name, B.symbol, B.started, B.forked, B.swapped_for, B.coingecko, B.cryptocompare, null, null, null, null, null from assets as A JOIN common_asset_details as B
+ON B.identifier = A.identifier WHERE A.type != ? AND A.type != ? AND A.identifier {condition}
+UNION ALL
+SELECT A.identifier, A.type, null, null, A.name, null, null, null, null, null, null, null, null, null, B.notes, B.type FROM assets AS A JOIN custom_assets AS B on A.identifier=B.identifier WHERE A.identifier {condition}
+"""  # noqa: E501
+# identifiers are used 3 times per query so this keeps it below sqlite's variables limit
+RESOLVE_ASSETS_CHUNK_SIZE = 300
+# asset and timestamp pairs use 2 variables each so this keeps it below sqlite's variables limit
+PRICES_AROUND_CHUNK_SIZE = 400
+
 
 _ALL_ASSETS_TABLES_JOINS = """
 FROM {dbprefix}assets LEFT JOIN {dbprefix}common_asset_details on {dbprefix}assets.identifier={dbprefix}common_asset_details.identifier
@@ -197,6 +212,8 @@ class GlobalDBHandler:
     conn: DBConnection
     used_backup: bool  # specifies if the global DB was restored from a backup
     packaged_db_lock: Semaphore
+    # hits and misses of the historical prices cached in the price_history table
+    price_cache_stats: ClassVar[Counter[str]] = Counter()
 
     def __new__(
             cls,
@@ -1218,8 +1235,10 @@ class GlobalDBHandler:
         with GlobalDBHandler().conn.read_ctx() as cursor:
             result = cursor.execute(querystr, tuple(querylist)).fetchone()
             if result[0] is None:
+                GlobalDBHandler.price_cache_stats['misses'] += 1
                 return None
 
+        GlobalDBHandler.price_cache_stats['hits'] += 1
         # The result tuple last entry MIN(ABS()) is disregarded in deserialize_from_db
         return HistoricalPrice.deserialize_from_db(result)
 
@@ -1255,6 +1274,52 @@ class GlobalDBHandler:
 
         return prices_results
 
+    @staticmethod
+    def get_historical_prices_around(
+            to_asset: 'Asset',
+            asset_timestamps: list[tuple['Asset', Timestamp]],
+            sources: list[HistoricalPriceOracle],
+            max_seconds_distance: int,
+    ) -> list[tuple[str, Timestamp, HistoricalPriceOracle, Timestamp, Price]]:
+        """Get in a single query per chunk of PRICES_AROUND_CHUNK_SIZE pairs all the prices
+        of the given sources in `to_asset` that are within `max_seconds_distance` of each
+        of the given asset and timestamp pairs.
+
+        Returns the asset identifier, the asked timestamp and the source, timestamp and
+        price of each price found.
+        """
+        results = []
+        serialized_sources = [x.serialize_for_db() for x in sources]
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            for chunk in get_chunks(asset_timestamps, n=PRICES_AROUND_CHUNK_SIZE):
+                cursor.execute(
+                    f'WITH asked(asset, timestamp) AS (VALUES {",".join(["(?, ?)"] * len(chunk))}) '  # noqa: E501
+                    'SELECT asked.asset, asked.timestamp, P.source_type, P.timestamp, P.price '
+                    'FROM asked INNER JOIN price_history P ON P.from_asset=asked.asset AND '
+                    f'P.to_asset=? AND P.source_type IN ({",".join(["?"] * len(sources))}) AND '
+                    'P.timestamp BETWEEN asked.timestamp - ? AND asked.timestamp + ?',
+                    (
+                        *[x for asset, timestamp in chunk for x in (asset.identifier, timestamp)],
+                        to_asset.identifier,
+                        *serialized_sources,
+                        max_seconds_distance,
+                        max_seconds_distance,
+                    ),
+                )
+                for identifier, timestamp, source, price_timestamp, price in cursor:
+                    try:
+                        results.append((
+                            identifier,
+                            Timestamp(timestamp),
+                            HistoricalPriceOracle.deserialize_from_db(source),
+                            Timestamp(price_timestamp),
+                            deserialize_price(price),
+                        ))
+                    except DeserializationError as e:
+                        log.error(f'Skipping price history entry of {identifier} due to {e!s}')
+
+        return results
+
     @staticmethod
     def add_historical_prices(entries: list['HistoricalPrice']) -> None:
         """Adds the given historical price entries in the DB
@@ -1778,19 +1843,10 @@ class GlobalDBHandler:
         """
         if identifier.startswith(NFT_DIRECTIVE):
             return Nft(identifier)
-        query = """
-        SELECT A.identifier, A.type, B.address, B.decimals, A.name, C.symbol, C.started, null, C.swapped_for, C.coingecko, C.cryptocompare, B.protocol, B.chain, B.token_kind, null, null FROM assets as A JOIN evm_tokens as B
-        ON B.identifier = A.identifier JOIN common_asset_details AS C ON C.identifier = B.identifier WHERE A.type = ? AND A.identifier = ?
-        UNION ALL
-        SELECT A.identifier, A.type, null, null, A.name, B.symbol, B.started, B.forked, B.swapped_for, B.coingecko, B.cryptocompare, null, null, null, null, null from assets as A JOIN common_asset_details as B
-        ON B.identifier = A.identifier WHERE A.type != ? AND A.type != ? AND A.identifier = ?
-        UNION ALL
-        SELECT A.identifier, A.type, null, null, A.name, null, null, null, null, null, null, null, null, null, B.notes, B.type FROM assets AS A JOIN custom_assets AS B on A.identifier=B.identifier WHERE A.identifier = ?
-        """  # noqa: E501
         connection = GlobalDBHandler().packaged_db_conn() if use_packaged_db is True else GlobalDBHandler().conn  # noqa: E501
         with connection.read_ctx() as cursor:
             cursor.execute(
-                query,
+                RESOLVE_ASSETS_QUERY.format(condition='= ?'),
                 (
                     AssetType.EVM_TOKEN.serialize_for_db(),
                     identifier,
@@ -1819,6 +1875,54 @@ class GlobalDBHandler:
                 underlying_tokens=underlying_tokens,
             )
 
+    @staticmethod
+    def resolve_assets(identifiers: list[str]) -> dict[str, AssetWithNameAndType]:
+        """Resolve many assets with one query to the database per chunk of identifiers
+
+        Returns a mapping of the lowercased identifier to the asset. Identifiers that
+        are not found in the database are not included in the mapping.
+        """
+        assets: dict[str, AssetWithNameAndType] = {}
+        db_identifiers = []
+        for identifier in identifiers:
+            if identifier.startswith(NFT_DIRECTIVE):
+                assets[identifier.lower()] = Nft(identifier)
+            else:
+                db_identifiers.append(identifier)
+
+        with GlobalDBHandler().conn.read_ctx() as cursor:
+            for chunk in get_chunks(db_identifiers, n=RESOLVE_ASSETS_CHUNK_SIZE):
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(
+                    RESOLVE_ASSETS_QUERY.format(condition=f'IN ({placeholders})'),
+                    (
+                        AssetType.EVM_TOKEN.serialize_for_db(), *chunk,
+                        AssetType.EVM_TOKEN.serialize_for_db(), AssetType.CUSTOM_ASSET.serialize_for_db(), *chunk,  # noqa: E501
+                        *chunk,
+                    ),
+                )
+                rows = cursor.fetchall()
+                token_ids = [row[0] for row in rows if row[1] == AssetType.EVM_TOKEN.serialize_for_db()]  # noqa: E501
+                underlying_tokens: defaultdict[str, list[UnderlyingToken]] = defaultdict(list)
+                if len(token_ids) != 0:
+                    cursor.execute(
+                        'SELECT A.parent_token_entry, B.address, B.token_kind, A.weight FROM '
+                        'underlying_tokens_list AS A JOIN evm_tokens as B ON A.identifier=B.identifier '  # noqa: E501
+                        f'WHERE A.parent_token_entry IN ({",".join("?" * len(token_ids))})',
+                        token_ids,
+                    )
+                    for parent_id, address, token_kind, weight in cursor:
+                        underlying_tokens[parent_id].append(UnderlyingToken.deserialize_from_db((address, token_kind, weight)))  # noqa: E501
+
+                for row in rows:
+                    assets[row[0].lower()] = deserialize_generic_asset_from_db(
+                        asset_type=AssetType.deserialize_from_db(row[1]),
+                        asset_data=row,
+                        underlying_tokens=underlying_tokens.get(row[0]),
+                    )
+
+        return assets
+
     def resolve_asset_from_packaged_and_store(self, identifier: str) -> AssetWithNameAndType:
         """
         Reads an asset from the packaged globaldb and adds it to the database if missing or edits
@@ -0,0 +1,64 @@
+import logging
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from rotkehlchen.logging import RotkehlchenLogsAdapter
+
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
+T = TypeVar('T')
+
+
+class ProcessPool:
+    """A pool of worker processes for CPU bound work.
+
+    rotki runs everything in a single gevent process, so pure CPU work like key
+    derivation or encryption of big payloads blocks every greenlet, including the
+    ones serving the API. Work given to the pool runs in another process and the
+    calling greenlet waits for it cooperatively, since with gevent's monkey patching
+    waiting on the result yields to the other greenlets.
+
+    Functions given to the pool, along with their arguments and results, need to be
+    picklable. So they should be module level functions operating on simple types.
+    Until the pool is initialized with workers the functions just run in the calling
+    greenlet.
+    """
+    executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def initialize(cls, max_workers: int) -> None:
+        """(Re)create the pool with the given number of workers. 0 disables it"""
+        cls.shutdown()
+        if max_workers != 0:
+            # spawn instead of fork so that children don't inherit the gevent hub state
+            cls.executor = ProcessPoolExecutor(
+                max_workers=max_workers,
+                mp_context=multiprocessing.get_context('spawn'),
+            )
+        log.debug(f'Initialized process pool with {max_workers} worker processes')
+
+    @classmethod
+    def run(cls, function: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run the function in a worker process and return its result.
+
+        Any exception raised by the function is raised here too.
+        """
+        if cls.executor is None:
+            return function(*args, **kwargs)
+
+        start = time.perf_counter()
+        result = cls.executor.submit(function, *args, **kwargs).result()
+        log.debug(
+            f'Worker process ran {function.__module__}.{function.__name__} '
+            f'in {time.perf_counter() - start:.3f} seconds',
+        )
+        return result
+
+    @classmethod
+    def shutdown(cls) -> None:
+        if cls.executor is not None:
+            cls.executor.shutdown(wait=False, cancel_futures=True)
+            cls.executor = None
@@ -2,6 +2,7 @@ import logging
 from pathlib import Path
 from typing import TYPE_CHECKING, Literal, Optional
 
+from rotkehlchen.accounting.metrics import ReportMetrics
 from rotkehlchen.accounting.structures.base import HistoryBaseEntry, HistoryEvent
 from rotkehlchen.constants import ZERO
 from rotkehlchen.db.filtering import (
@@ -282,11 +283,16 @@ class EventsHistorian:
             start_ts: Timestamp,
             end_ts: Timestamp,
             has_premium: bool,
+            metrics: Optional[ReportMetrics] = None,
     ) -> tuple[str, list['AccountingEventMixin']]:
         """
         Creates all events history from start_ts to end_ts. Returns it
         sorted by ascending timestamp.
+
+        The time spent in each step is added to the stages of the given metrics.
         """
+        if metrics is None:
+            metrics = ReportMetrics()
         self._reset_variables()
         step = 0
         total_steps = (
@@ -315,20 +321,21 @@ class EventsHistorian:
 
         for exchange in self.exchange_manager.iterate_exchanges():
             self.processing_state_name = f'Querying {exchange.name} exchange history'
-            exchange.query_history_with_callbacks(
-                # We need to have history of exchanges since before the range
-                start_ts=Timestamp(0),
-                end_ts=end_ts,
-                fail_callback=fail_history_cb,
-                new_step_data=(new_step_cb, exchange.name),
-            )
+            with metrics.stage(f'history.exchange.{exchange.name}'):
+                exchange.query_history_with_callbacks(
+                    # We need to have history of exchanges since before the range
+                    start_ts=Timestamp(0),
+                    end_ts=end_ts,
+                    fail_callback=fail_history_cb,
+                    new_step_data=(new_step_cb, exchange.name),
+                )
             # each exchange instance executes STEPS_PER_CEX steps out of the total_steps
             step = self._increase_progress(step, total_steps, step_by=STEPS_PER_CEX)
 
         # Query all trades, asset movements and margin positions from the DB for all
         # possible locations.
         self.processing_state_name = 'Reading trades, asset movements and margin positions from the DB'  # noqa: E501
-        with self.db.conn.read_ctx() as cursor:
+        with metrics.stage('history.db_read'), self.db.conn.read_ctx() as cursor:
             # Include all trades
             trades = self.db.get_trades(
                 cursor,
@@ -364,7 +371,8 @@ class EventsHistorian:
                 chain_id=blockchain.to_chain_id(),  # type: ignore[arg-type]
             )
             try:
-                evm_manager.transactions.query_chain(filter_query=tx_filter_query)
+                with metrics.stage(f'history.{str_blockchain}.transactions'):
+                    evm_manager.transactions.query_chain(filter_query=tx_filter_query)
             except RemoteError as e:
                 msg = str(e)
                 self.msg_aggregator.add_error(
@@ -375,35 +383,38 @@ class EventsHistorian:
 
             step = self._increase_progress(step, total_steps)
             self.processing_state_name = f'Querying {str_blockchain} transaction receipts'
-            evm_manager.transactions.get_receipts_for_transactions_missing_them()
+            with metrics.stage(f'history.{str_blockchain}.receipts'):
+                evm_manager.transactions.get_receipts_for_transactions_missing_them()
             step = self._increase_progress(step, total_steps)
 
             self.processing_state_name = f'Decoding {str_blockchain} raw transactions'
-            evm_manager.transactions_decoder.get_and_decode_undecoded_transactions(limit=None)
+            with metrics.stage(f'history.{str_blockchain}.decoding'):
+                evm_manager.transactions_decoder.get_and_decode_undecoded_transactions(limit=None)
             step = self._increase_progress(step, total_steps)
 
         # include eth2 staking events
         eth2 = self.chains_aggregator.get_module('eth2')
         if eth2 is not None and has_premium:
             self.processing_state_name = 'Querying ETH2 staking history'
-            try:
-                eth2_events = self.chains_aggregator.get_eth2_history_events(
-                    from_timestamp=Timestamp(0),
-                    to_timestamp=end_ts,
-                )
-                history.extend(eth2_events)
-            except RemoteError as e:
-                self.msg_aggregator.add_error(
-                    f'Eth2 events are not included in the PnL report due to {e!s}',
-                )
-            # make sure that eth2 events and history events are combined
-            eth2.combine_block_with_tx_events()
+            with metrics.stage('history.eth2'):
+                try:
+                    eth2_events = self.chains_aggregator.get_eth2_history_events(
+                        from_timestamp=Timestamp(0),
+                        to_timestamp=end_ts,
+                    )
+                    history.extend(eth2_events)
+                except RemoteError as e:
+                    self.msg_aggregator.add_error(
+                        f'Eth2 events are not included in the PnL report due to {e!s}',
+                    )
+                # make sure that eth2 events and history events are combined
+                eth2.combine_block_with_tx_events()
 
         step = self._increase_progress(step, total_steps)
         self.processing_state_name = 'Querying base history events'
         # Include all base history entries
         history_events_db = DBHistoryEvents(self.db)
-        with self.db.conn.read_ctx() as cursor:
+        with metrics.stage('history.base_events'), self.db.conn.read_ctx() as cursor:
             base_entries = history_events_db.get_history_events(
                 cursor=cursor,
                 filter_query=HistoryEventFilterQuery.make(
@@ -1,18 +1,23 @@
 import logging
-from collections.abc import Sequence
-from contextlib import suppress
+from collections import Counter, defaultdict
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager, suppress
 from http import HTTPStatus
 from pathlib import Path
-from typing import TYPE_CHECKING, Optional
+from typing import TYPE_CHECKING, ClassVar, Optional, Union
+
+import gevent
 
 from rotkehlchen.assets.asset import Asset
 from rotkehlchen.constants import ONE
 from rotkehlchen.constants.assets import A_KFEE, A_USD
 from rotkehlchen.constants.prices import ZERO_PRICE
+from rotkehlchen.constants.timing import DAY_IN_SECONDS, HOUR_IN_SECONDS
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp, PriceQueryUnsupportedAsset
 from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.globaldb.manual_price_oracles import ManualPriceOracle
 from rotkehlchen.inquirer import Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
@@ -29,6 +34,42 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
+# The longest time range for which the oracles return hourly prices with a single query.
+# Cryptocompare histohour returns at most 2000 hours and coingecko up to 90 days.
+PRICE_RANGE_MAX_SECONDS = 1998 * 3600
+# Prices of an asset in a time window needed to query the prices of the window at once
+MIN_ENTRIES_FOR_PRICE_RANGE = 3
+# The most prices a memoization scope remembers. The oldest are forgotten first.
+MAX_MEMOIZED_PRICES = 100000
+# Seconds from a timestamp within which each oracle uses a price it has stored for it
+ORACLE_STORED_PRICE_DISTANCE = {
+    HistoricalPriceOracle.MANUAL: HOUR_IN_SECONDS,
+    HistoricalPriceOracle.CRYPTOCOMPARE: HOUR_IN_SECONDS,
+    HistoricalPriceOracle.COINGECKO: DAY_IN_SECONDS,
+    HistoricalPriceOracle.DEFILLAMA: DAY_IN_SECONDS,
+}
+
+
+def group_timestamps_by_price_range(
+        timestamps_per_asset: dict[Asset, list[Timestamp]],
+) -> list[tuple[Asset, Timestamp, Timestamp, int]]:
+    """Group the timestamps of each asset in time windows that can be queried with a
+    single price range query. Returns the asset, the start and end timestamp and the
+    number of timestamps of each group."""
+    groups = []
+    for asset, timestamps in timestamps_per_asset.items():
+        timestamps.sort()
+        start_ts, end_ts, count = timestamps[0], timestamps[0], 0
+        for timestamp in timestamps:
+            if timestamp - start_ts > PRICE_RANGE_MAX_SECONDS:
+                groups.append((asset, start_ts, end_ts, count))
+                start_ts, count = timestamp, 0
+            end_ts = timestamp
+            count += 1
+        groups.append((asset, start_ts, end_ts, count))
+
+    return groups
+
 
 def query_usd_price_or_use_default(
         asset: Asset,
@@ -82,6 +123,11 @@ class PriceHistorian:
     _manual: ManualPriceOracle  # This is used when iterating through all oracles
     _oracles: Optional[Sequence[HistoricalPriceOracle]] = None
     _oracle_instances: Optional[list[HistoricalPriceOracleInstance]] = None
+    # counters of the historical price queries and of the oracles queried for them
+    stats: ClassVar[Counter[str]] = Counter()
+    # prices, or the error of not finding them, per from asset, to asset and timestamp
+    # for each greenlet, by id, that has an open memoization scope
+    _memoized_prices: ClassVar[dict[int, dict[tuple[str, str, Timestamp], Union[Price, NoPriceForGivenTimestamp]]]] = {}  # noqa: E501
 
     def __new__(
             cls,
@@ -153,6 +199,158 @@ class PriceHistorian:
             return Price(usd_price * price_mapping)
         return None
 
+    @staticmethod
+    @contextmanager
+    def memoized_prices() -> Iterator[None]:
+        """Remember the historical prices queried inside the context by the current greenlet
+
+        Used by processes like the PnL report that ask for the same price many times.
+        Prices found and prices that could not be found, unless it was due to rate
+        limiting, are returned from memory until the context exits. Other greenlets,
+        such as the API queries running at the same time, don't use the memory. Nested
+        scopes use the memory of the outermost one.
+        """
+        if (greenlet_id := id(gevent.getcurrent())) in PriceHistorian._memoized_prices:
+            yield
+            return
+
+        PriceHistorian._memoized_prices[greenlet_id] = {}
+        try:
+            yield
+        finally:
+            log.debug(
+                f'Closing historical prices memoization scope with '
+                f'{len(PriceHistorian._memoized_prices.pop(greenlet_id))} entries',
+            )
+
+    @staticmethod
+    def forget_memoized_prices(from_asset: Asset, to_asset: Asset) -> None:
+        """Forget the memoized prices of the pair, in both directions, in all the open
+        memoization scopes. Called when the manual historical prices of the pair change."""
+        pair = {from_asset.identifier, to_asset.identifier}
+        for memoized_prices in PriceHistorian._memoized_prices.values():
+            for key in [key for key in memoized_prices if {key[0], key[1]} == pair]:
+                del memoized_prices[key]
+
+    @staticmethod
+    def prefetch_historical_price_range(
+            from_asset: Asset,
+            to_asset: Asset,
+            from_timestamp: Timestamp,
+            to_timestamp: Timestamp,
+    ) -> bool:
+        """Store in the global DB the prices between the two timestamps with a single
+        range query to the first oracle, in the oracles order, that can do it.
+
+        This way querying many historical prices of the same pair in a short time window
+        hits the price cache instead of querying the oracles once per price. The range
+        should not exceed PRICE_RANGE_MAX_SECONDS.
+
+        Returns whether any prices were stored.
+        """
+        instance = PriceHistorian()
+        assert instance._oracles is not None, (
+            'PriceHistorian should never be called before setting the oracles'
+        )
+        try:
+            from_asset = from_asset.resolve_to_asset_with_oracles()
+            to_asset = to_asset.resolve_to_asset_with_oracles()
+        except (UnknownAsset, WrongAssetType):
+            return False
+
+        range_oracles: dict[HistoricalPriceOracle, Union['Cryptocompare', 'Coingecko']] = {
+            HistoricalPriceOracle.CRYPTOCOMPARE: instance._cryptocompare,
+            HistoricalPriceOracle.COINGECKO: instance._coingecko,
+        }
+        for oracle in instance._oracles:
+            if (range_oracle := range_oracles.get(oracle)) is None:
+                continue
+
+            can_query_history = range_oracle.can_query_history(
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=from_timestamp,
+            )
+            if can_query_history is False:
+                continue
+
+            PriceHistorian.stats['oracle_range_queries'] += 1
+            try:
+                stored = range_oracle.query_and_store_historical_range(
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    from_timestamp=from_timestamp,
+                    to_timestamp=to_timestamp,
+                )
+            except (PriceQueryUnsupportedAsset, RemoteError) as e:
+                log.debug(
+                    f'Could not query the historical price range of {from_asset} to '
+                    f'{to_asset} from {oracle}. {e!s}',
+                )
+                continue
+
+            if stored != 0:
+                log.debug(
+                    f'Historical price oracle {oracle} stored {stored} prices',
+                    from_asset=from_asset,
+                    to_asset=to_asset,
+                    from_timestamp=from_timestamp,
+                    to_timestamp=to_timestamp,
+                )
+                return True
+
+        return False
+
+    @staticmethod
+    def get_stored_historical_prices(
+            to_asset: Asset,
+            asset_timestamps: list[tuple[Asset, Timestamp]],
+    ) -> dict[tuple[str, Timestamp], Price]:
+        """Get the historical prices of the given asset and timestamp pairs in `to_asset`
+        that the oracles have already stored in the global DB, with a single DB query.
+
+        A stored price is only returned if query_historical_price would return it. So
+        the oracles are checked in order and the first one that has a stored price wins,
+        unless an oracle before it would query its remote for the price. Pairs that
+        have no such stored price are left out.
+        """
+        instance = PriceHistorian()
+        assert instance._oracles is not None and instance._oracle_instances is not None, (
+            'PriceHistorian should never be called before setting the oracles'
+        )
+        stored_prices: defaultdict[tuple[str, Timestamp], dict[HistoricalPriceOracle, tuple[int, Price]]] = defaultdict(dict)  # noqa: E501
+        for identifier, timestamp, source, price_timestamp, price in GlobalDBHandler.get_historical_prices_around(  # noqa: E501
+            to_asset=to_asset,
+            asset_timestamps=asset_timestamps,
+            sources=list(ORACLE_STORED_PRICE_DISTANCE),
+            max_seconds_distance=max(ORACLE_STORED_PRICE_DISTANCE.values()),
+        ):
+            if (
+                (distance := abs(price_timestamp - timestamp)) > ORACLE_STORED_PRICE_DISTANCE[source] or  # noqa: E501
+                (source == HistoricalPriceOracle.CRYPTOCOMPARE and price == ZERO_PRICE)
+            ):
+                continue
+            closest = stored_prices[(identifier, timestamp)].get(source)
+            if closest is None or distance < closest[0]:
+                stored_prices[(identifier, timestamp)][source] = (distance, price)
+
+        prices = {}
+        for asset, timestamp in asset_timestamps:
+            if (asset_prices := stored_prices.get((asset.identifier, timestamp))) is None:
+                continue
+            for oracle, oracle_instance in zip(instance._oracles, instance._oracle_instances):
+                if (stored_price := asset_prices.get(oracle)) is not None:
+                    prices[(asset.identifier, timestamp)] = stored_price[1]
+                    break
+                if oracle != HistoricalPriceOracle.MANUAL and oracle_instance.can_query_history(
+                    from_asset=asset,
+                    to_asset=to_asset,
+                    timestamp=timestamp,
+                ) is True:
+                    break  # the oracle would query its remote first
+
+        return prices
+
     @staticmethod
     def query_historical_price(
             from_asset: Asset,
@@ -183,6 +381,59 @@ class PriceHistorian:
         if from_asset == to_asset:
             return Price(ONE)
 
+        PriceHistorian.stats['queries'] += 1
+        if (memoized_prices := PriceHistorian._memoized_prices.get(id(gevent.getcurrent()))) is None:  # noqa: E501
+            return PriceHistorian._query_historical_price(
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+            )
+
+        key = (from_asset.identifier, to_asset.identifier, timestamp)
+        if (memoized := memoized_prices.get(key)) is not None:
+            PriceHistorian.stats['memo_hits'] += 1
+            if isinstance(memoized, NoPriceForGivenTimestamp):
+                raise memoized
+            return memoized
+
+        PriceHistorian.stats['memo_misses'] += 1
+        try:
+            price = PriceHistorian._query_historical_price(
+                from_asset=from_asset,
+                to_asset=to_asset,
+                timestamp=timestamp,
+            )
+        except NoPriceForGivenTimestamp as e:
+            if e.rate_limited is False:
+                PriceHistorian._memoize_price(memoized_prices, key, e)
+            raise
+
+        PriceHistorian._memoize_price(memoized_prices, key, price)
+        return price
+
+    @staticmethod
+    def _memoize_price(
+            memoized_prices: dict[tuple[str, str, Timestamp], Union[Price, NoPriceForGivenTimestamp]],  # noqa: E501
+            key: tuple[str, str, Timestamp],
+            value: Union[Price, NoPriceForGivenTimestamp],
+    ) -> None:
+        """Remember the value, forgetting the oldest one if the memory is full"""
+        if len(memoized_prices) >= MAX_MEMOIZED_PRICES:
+            del memoized_prices[next(iter(memoized_prices))]
+        memoized_prices[key] = value
+
+    @staticmethod
+    def _query_historical_price(
+            from_asset: Asset,
+            to_asset: Asset,
+            timestamp: Timestamp,
+    ) -> Price:
+        """Query the historical price without looking into the memoized prices
+
+        May raise:
+        - NoPriceForGivenTimestamp if we can't find a price for the asset in the given
+        timestamp from the external service.
+        """
         special_asset_price = PriceHistorian().get_price_for_special_asset(
             from_asset=from_asset,
             to_asset=to_asset,
@@ -221,6 +472,7 @@ class PriceHistorian:
             if can_query_history is False:
                 continue
 
+            PriceHistorian.stats['oracle_queries'] += 1
             try:
                 price = oracle_instance.query_historical_price(
                     from_asset=from_asset,
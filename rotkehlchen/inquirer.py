@@ -5,6 +5,8 @@ from contextlib import suppress
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NamedTuple, Optional, Union
 
+import gevent
+
 from rotkehlchen.assets.asset import Asset, EvmToken, FiatAsset, UnderlyingToken
 from rotkehlchen.assets.utils import TokenEncounterInfo, get_or_create_evm_token
 from rotkehlchen.chain.ethereum.defi.price import handle_defi_price_query
@@ -60,7 +62,7 @@ from rotkehlchen.constants.assets import (
 from rotkehlchen.constants.misc import CURRENCYCONVERTER_API_KEY
 from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.constants.resolver import ethaddress_to_identifier
-from rotkehlchen.constants.timing import DAY_IN_SECONDS, MONTH_IN_SECONDS
+from rotkehlchen.constants.timing import DAY_IN_SECONDS, HOUR_IN_SECONDS, MONTH_IN_SECONDS
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.errors.defi import DefiPoolError
 from rotkehlchen.errors.misc import (
@@ -95,6 +97,7 @@ from rotkehlchen.types import (
     ProtocolsWithPriceLogic,
     Timestamp,
 )
+from rotkehlchen.utils.data_structures import LRUCacheWithRemove
 from rotkehlchen.utils.misc import timestamp_to_daystart_timestamp, ts_now
 from rotkehlchen.utils.mixins.penalizable_oracle import PenalizablePriceOracleMixin
 from rotkehlchen.utils.network import request_get_dict
@@ -102,6 +105,7 @@ from rotkehlchen.utils.network import request_get_dict
 if TYPE_CHECKING:
     from rotkehlchen.chain.ethereum.oracles.uniswap import UniswapV2Oracle, UniswapV3Oracle
     from rotkehlchen.chain.evm.manager import EvmManager
+    from rotkehlchen.db.dbhandler import DBHandler
     from rotkehlchen.externalapis.coingecko import Coingecko
     from rotkehlchen.externalapis.cryptocompare import Cryptocompare
     from rotkehlchen.externalapis.defillama import Defillama
@@ -113,6 +117,12 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 CURRENT_PRICE_CACHE_SECS = 300  # 5 mins
+# Up to this age a cached current price is still returned to the callers that allow stale
+# prices while it's queried again in the background. Older prices are queried before returning.
+CURRENT_PRICE_STALE_SECS = HOUR_IN_SECONDS
+# Cached current prices that are refreshed in the background this many seconds before expiring
+CURRENT_PRICE_REFRESH_MARGIN_SECS = 60
+CURRENT_PRICE_CACHE_SIZE = 2048
 DEFAULT_RATE_LIMIT_WAITING_TIME = 60  # seconds
 BTC_PER_BSQ = FVal('0.00000100')
 
@@ -242,7 +252,9 @@ class CachedPriceEntry(NamedTuple):
 class Inquirer:
     __instance: Optional['Inquirer'] = None
     _cached_forex_data: dict
-    _cached_current_price: dict[tuple[Asset, Asset], CachedPriceEntry]
+    _cached_current_price: LRUCacheWithRemove[tuple[Asset, Asset], CachedPriceEntry]
+    # Greenlets refreshing cached current prices in the background per cache key
+    _current_price_refreshes: dict[tuple[Asset, Asset], gevent.Greenlet]
     _data_directory: Path
     _cryptocompare: 'Cryptocompare'
     _coingecko: 'Coingecko'
@@ -288,7 +300,8 @@ class Inquirer:
         Inquirer._coingecko = coingecko
         Inquirer._defillama = defillama
         Inquirer._manualcurrent = manualcurrent
-        Inquirer._cached_current_price = {}
+        Inquirer._cached_current_price = LRUCacheWithRemove(maxsize=CURRENT_PRICE_CACHE_SIZE)
+        Inquirer._current_price_refreshes = {}
         Inquirer._evm_managers = {}
         Inquirer._msg_aggregator = msg_aggregator
         Inquirer.special_tokens = {
@@ -356,12 +369,138 @@ class Inquirer:
     def get_cached_current_price_entry(
             cache_key: tuple[Asset, Asset],
             match_main_currency: bool,
+            allow_stale: bool = False,
     ) -> Optional[CachedPriceEntry]:
-        cache = Inquirer()._cached_current_price.get(cache_key, None)
-        if cache is None or ts_now() - cache.time > CURRENT_PRICE_CACHE_SECS or cache.used_main_currency != match_main_currency:  # noqa: E501
+        """Get the cached current price of the pair if it's not older than
+        CURRENT_PRICE_CACHE_SECS. If allow_stale is True a price up to
+        CURRENT_PRICE_STALE_SECS old is also returned and queried again in the background.
+        Only meant for prices that are displayed, never for ones that are saved as the
+        balance snapshots are."""
+        cache = Inquirer()._cached_current_price.get(cache_key)
+        if cache is None or cache.used_main_currency != match_main_currency:
             return None
 
-        return cache
+        if (cache_age := ts_now() - cache.time) <= CURRENT_PRICE_CACHE_SECS:
+            return cache
+
+        if allow_stale is True and cache_age <= CURRENT_PRICE_STALE_SECS:
+            Inquirer._spawn_current_price_refresh(cache_key, match_main_currency)
+            return cache
+
+        return None
+
+    @staticmethod
+    def _refresh_current_price(cache_key: tuple[Asset, Asset], match_main_currency: bool) -> None:
+        """Query again the current price of the pair, which caches it"""
+        try:
+            Inquirer()._find_price(
+                from_asset=cache_key[0],
+                to_asset=cache_key[1],
+                ignore_cache=True,
+                match_main_currency=match_main_currency,
+            )
+        except Exception as e:  # pylint: disable=broad-except
+            log.warning(f'Failed to refresh the current price of {cache_key[0]} in {cache_key[1]} due to {e!s}')  # noqa: E501
+        finally:
+            Inquirer._current_price_refreshes.pop(cache_key, None)
+
+    @staticmethod
+    def _spawn_current_price_refresh(
+            cache_key: tuple[Asset, Asset],
+            match_main_currency: bool,
+    ) -> None:
+        if cache_key not in Inquirer._current_price_refreshes:
+            Inquirer._current_price_refreshes[cache_key] = gevent.spawn(
+                Inquirer._refresh_current_price,
+                cache_key,
+                match_main_currency,
+            )
+
+    @staticmethod
+    def get_expiring_current_prices(assets: set[Asset]) -> list[tuple[Asset, Asset]]:
+        """Get the cache keys of the cached current prices of the given assets that expire
+        within CURRENT_PRICE_REFRESH_MARGIN_SECS and are not already being refreshed"""
+        min_time = ts_now() - CURRENT_PRICE_CACHE_SECS + CURRENT_PRICE_REFRESH_MARGIN_SECS
+        return [
+            cache_key for cache_key, entry in Inquirer()._cached_current_price.cache.items()
+            if cache_key[0] in assets and entry.time <= min_time and
+            cache_key not in Inquirer._current_price_refreshes
+        ]
+
+    @staticmethod
+    def refresh_current_prices(
+            cache_keys: list[tuple[Asset, Asset]],
+            database: 'DBHandler',
+    ) -> None:
+        """Query again the given cached current prices, one after the other so that the
+        oracles are not flooded, and then persist the cache"""
+        for cache_key in cache_keys:
+            if (
+                (entry := Inquirer()._cached_current_price.cache.get(cache_key)) is None or
+                cache_key in Inquirer._current_price_refreshes
+            ):
+                continue  # evicted or removed meanwhile, or already being refreshed
+
+            Inquirer._current_price_refreshes[cache_key] = gevent.getcurrent()
+            Inquirer._refresh_current_price(cache_key, entry.used_main_currency)
+
+        Inquirer.save_current_prices_cache(database)
+
+    @staticmethod
+    def load_current_prices_cache(database: 'DBHandler') -> None:
+        """Load the current prices persisted in the transient DB of the user that are
+        not older than CURRENT_PRICE_STALE_SECS"""
+        with database.conn_transient.read_ctx() as cursor:
+            cursor.execute(
+                'SELECT from_asset, to_asset, price, timestamp, oracle, used_main_currency '
+                'FROM current_prices_cache WHERE timestamp >= ? ORDER BY timestamp ASC',
+                (ts_now() - CURRENT_PRICE_STALE_SECS,),
+            )
+            for entry in cursor:
+                try:
+                    cache_entry = CachedPriceEntry(
+                        price=Price(FVal(entry[2])),
+                        time=Timestamp(entry[3]),
+                        oracle=CurrentPriceOracle.deserialize(entry[4]),
+                        used_main_currency=bool(entry[5]),
+                    )
+                except DeserializationError as e:
+                    log.warning(f'Skipping persisted current price {entry} due to {e!s}')
+                    continue
+
+                cache_key = (Asset(entry[0]), Asset(entry[1]))
+                cached = Inquirer()._cached_current_price.cache.get(cache_key)
+                if cached is None or cached.time < cache_entry.time:
+                    Inquirer()._cached_current_price.add(cache_key, cache_entry)
+
+    @staticmethod
+    def save_current_prices_cache(database: 'DBHandler') -> None:
+        """Persist the cached current prices in the transient DB of the user, so that they
+        are not queried again after a restart. Prices that were not found are not kept."""
+        min_time = ts_now() - CURRENT_PRICE_STALE_SECS
+        with database.conn_transient.write_ctx() as write_cursor:
+            write_cursor.execute('DELETE FROM current_prices_cache')
+            write_cursor.executemany(
+                'INSERT OR REPLACE INTO current_prices_cache(from_asset, to_asset, price, '
+                'timestamp, oracle, used_main_currency) VALUES(?, ?, ?, ?, ?, ?)',
+                [(
+                    from_asset.identifier,
+                    to_asset.identifier,
+                    str(entry.price),
+                    entry.time,
+                    entry.oracle.serialize(),
+                    entry.used_main_currency,
+                ) for (from_asset, to_asset), entry in Inquirer()._cached_current_price.cache.items()  # noqa: E501
+                    if entry.price != ZERO_PRICE and entry.time >= min_time],
+            )
+
+    @staticmethod
+    def clear_current_prices_cache() -> None:
+        """Forget all cached current prices. To be called at logout so that the cache of a
+        user is not kept for the next one"""
+        gevent.killall(list(Inquirer._current_price_refreshes.values()))
+        Inquirer._current_price_refreshes = {}
+        Inquirer()._cached_current_price.clear()
 
     @staticmethod
     def remove_cache_prices_for_asset(pairs_to_invalidate: list[tuple[Asset, Asset]]) -> None:
@@ -371,13 +510,13 @@ class Inquirer:
             assets_to_invalidate.add(asset_a)
             assets_to_invalidate.add(asset_b)
 
-        for asset_pair in list(Inquirer()._cached_current_price):
+        for asset_pair in list(Inquirer()._cached_current_price.cache):
             if asset_pair[0] in assets_to_invalidate or asset_pair[1] in assets_to_invalidate:
-                Inquirer()._cached_current_price.pop(asset_pair, None)
+                Inquirer()._cached_current_price.remove(asset_pair)
 
     @staticmethod
     def remove_cached_current_price_entry(cache_key: tuple[Asset, Asset]) -> None:
-        Inquirer()._cached_current_price.pop(cache_key, None)
+        Inquirer()._cached_current_price.remove(cache_key)
 
     @staticmethod
     def set_oracles_order(oracles: Sequence[CurrentPriceOracle]) -> None:
@@ -479,12 +618,12 @@ class Inquirer:
                 )
                 break
 
-        Inquirer._cached_current_price[cache_key] = CachedPriceEntry(
+        Inquirer._cached_current_price.add(cache_key, CachedPriceEntry(
             price=price,
             time=ts_now(),
             oracle=oracle_queried,
             used_main_currency=used_main_currency,
-        )
+        ))
         return price, oracle_queried, used_main_currency
 
     @staticmethod
@@ -495,6 +634,7 @@ class Inquirer:
             skip_onchain: bool = False,
             coming_from_latest_price: bool = False,
             match_main_currency: bool = False,
+            allow_stale: bool = False,
     ) -> tuple[Price, CurrentPriceOracle, bool]:
         """Returns:
         1. The current price of 'from_asset' in 'to_asset' valuation.
@@ -515,11 +655,12 @@ class Inquirer:
                 ignore_cache=ignore_cache,
                 coming_from_latest_price=coming_from_latest_price,
                 match_main_currency=match_main_currency,
+                allow_stale=allow_stale,
             )
             return price, oracle, used_main_currency
 
         if ignore_cache is False:
-            cache = instance.get_cached_current_price_entry(cache_key=(from_asset, to_asset), match_main_currency=match_main_currency)  # noqa: E501
+            cache = instance.get_cached_current_price_entry(cache_key=(from_asset, to_asset), match_main_currency=match_main_currency, allow_stale=allow_stale)  # noqa: E501
             if cache is not None:
                 return cache.price, cache.oracle, cache.used_main_currency
 
@@ -539,6 +680,7 @@ class Inquirer:
             ignore_cache: bool = False,
             skip_onchain: bool = False,
             coming_from_latest_price: bool = False,
+            allow_stale: bool = False,
     ) -> Price:
         """Wrapper around _find_price to ignore oracle queried when getting price"""
         price, _, _ = Inquirer()._find_price(
@@ -547,6 +689,7 @@ class Inquirer:
             ignore_cache=ignore_cache,
             skip_onchain=skip_onchain,
             coming_from_latest_price=coming_from_latest_price,
+            allow_stale=allow_stale,
         )
         return price
 
@@ -558,6 +701,7 @@ class Inquirer:
             skip_onchain: bool = False,
             coming_from_latest_price: bool = False,
             match_main_currency: bool = False,
+            allow_stale: bool = False,
     ) -> tuple[Price, CurrentPriceOracle, bool]:
         """
         Wrapper around _find_price to include oracle queried when getting price and
@@ -570,6 +714,7 @@ class Inquirer:
             skip_onchain=skip_onchain,
             coming_from_latest_price=coming_from_latest_price,
             match_main_currency=match_main_currency,
+            allow_stale=allow_stale,
         )
 
     @staticmethod
@@ -578,6 +723,7 @@ class Inquirer:
             ignore_cache: bool = False,
             skip_onchain: bool = False,
             coming_from_latest_price: bool = False,
+            allow_stale: bool = False,
     ) -> Price:
         """Wrapper around _find_usd_price to ignore oracle queried when getting usd price"""
         price, _, _ = Inquirer()._find_usd_price(
@@ -585,6 +731,7 @@ class Inquirer:
             ignore_cache=ignore_cache,
             skip_onchain=skip_onchain,
             coming_from_latest_price=coming_from_latest_price,
+            allow_stale=allow_stale,
         )
         return price
 
@@ -595,6 +742,7 @@ class Inquirer:
             skip_onchain: bool = False,
             coming_from_latest_price: bool = False,
             match_main_currency: bool = False,
+            allow_stale: bool = False,
     ) -> tuple[Price, CurrentPriceOracle, bool]:
         """
         Wrapper around _find_usd_price to include oracle queried when getting usd price and
@@ -606,6 +754,7 @@ class Inquirer:
             skip_onchain=skip_onchain,
             coming_from_latest_price=coming_from_latest_price,
             match_main_currency=match_main_currency,
+            allow_stale=allow_stale,
         )
 
     @staticmethod
@@ -615,6 +764,7 @@ class Inquirer:
             skip_onchain: bool = False,
             coming_from_latest_price: bool = False,
             match_main_currency: bool = False,
+            allow_stale: bool = False,
     ) -> tuple[Price, CurrentPriceOracle, bool]:
         """Returns the current price of the asset, oracle that was used and whether returned price
         is in main currency.
@@ -628,7 +778,7 @@ class Inquirer:
         instance = Inquirer()
         cache_key = (asset, A_USD)
         if ignore_cache is False:
-            cache = instance.get_cached_current_price_entry(cache_key=cache_key, match_main_currency=match_main_currency)  # noqa: E501
+            cache = instance.get_cached_current_price_entry(cache_key=cache_key, match_main_currency=match_main_currency, allow_stale=allow_stale)  # noqa: E501
             if cache is not None:
                 return cache.price, cache.oracle, cache.used_main_currency
 
@@ -664,19 +814,19 @@ class Inquirer:
                 )
                 price = ZERO_PRICE if usd_price is None else Price(usd_price)
 
-                Inquirer._cached_current_price[cache_key] = CachedPriceEntry(price=price, time=ts_now(), oracle=CurrentPriceOracle.BLOCKCHAIN, used_main_currency=False)  # noqa: E501
+                Inquirer._cached_current_price.add(cache_key, CachedPriceEntry(price=price, time=ts_now(), oracle=CurrentPriceOracle.BLOCKCHAIN, used_main_currency=False))  # noqa: E501
                 return price, oracle, False
 
             if is_known_protocol is True or underlying_tokens is not None:
                 result, oracle = get_underlying_asset_price(asset)
                 if result is not None:
                     usd_price = Price(result)
-                    Inquirer._cached_current_price[cache_key] = CachedPriceEntry(
+                    Inquirer._cached_current_price.add(cache_key, CachedPriceEntry(
                         price=usd_price,
                         time=ts_now(),
                         oracle=oracle,
                         used_main_currency=False,  # function is for usd only, so it doesn't matter
-                    )
+                    ))
                     return usd_price, oracle, False
                 # else known protocol on-chain query failed. Continue to external oracles
 
@@ -692,12 +842,12 @@ class Inquirer:
                 price_in_btc = get_bisq_market_price(bsq)
                 btc_price, oracle, _ = Inquirer().find_usd_price_and_oracle(A_BTC)
                 usd_price = Price(price_in_btc * btc_price)
-                Inquirer._cached_current_price[cache_key] = CachedPriceEntry(
+                Inquirer._cached_current_price.add(cache_key, CachedPriceEntry(
                     price=usd_price,
                     time=ts_now(),
                     oracle=oracle,
                     used_main_currency=False,  # this is for usd only, so it doesn't matter
-                )
+                ))
             except (RemoteError, DeserializationError) as e:
                 msg = f'Could not find price for BSQ. {e!s}'
                 instance._msg_aggregator.add_warning(msg)
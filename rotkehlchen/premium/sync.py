@@ -48,6 +48,9 @@ class PremiumSyncManager:
         self.data = data
         self.migration_manager = migration_manager
         self.premium: Optional[Premium] = None
+        # How many DB exports and plaintext DB bytes were skipped since the DB was unchanged
+        self.skipped_exports = 0
+        self.skipped_export_bytes = 0
 
     def _query_last_data_metadata(self) -> RemoteMetadata:
         """Query remote metadata and keep up to date the last remote data upload ts"""
@@ -194,6 +197,22 @@ class PremiumSyncManager:
             self.last_upload_attempt_ts = ts_now()
             return False, message
 
+        if force_upload is False and (last_export := self.data.unchanged_db_export()) is not None and last_export.data_hash == metadata.data_hash:  # noqa: E501
+            self.skipped_exports += 1
+            self.skipped_export_bytes += last_export.db_size
+            log.debug(
+                f'upload to server stopped -- DB unchanged since the last export that had '
+                f'the same hash as the remote. Skipped {self.skipped_exports} exports of '
+                f'{self.skipped_export_bytes} bytes in total',
+            )
+            message = 'Remote database is up to date'
+            self.data.msg_aggregator.add_message(
+                message_type=WSMessageType.DATABASE_UPLOAD_RESULT,
+                data={'uploaded': False, 'actionable': True, 'message': message},
+            )
+            self.last_upload_attempt_ts = ts_now()
+            return False, message
+
         data, our_hash = self.data.compress_and_encrypt_db()
         log.debug(
             'CAN_PUSH',
@@ -13,10 +13,12 @@ from typing import TYPE_CHECKING, Any, Literal, Optional, Union, cast, overload
 import gevent
 
 from rotkehlchen.accounting.accountant import Accountant
+from rotkehlchen.accounting.metrics import ReportMetrics
 from rotkehlchen.accounting.structures.balance import Balance, BalanceType
 from rotkehlchen.api.websockets.notifier import RotkiNotifier
 from rotkehlchen.api.websockets.typedefs import WSMessageType
 from rotkehlchen.assets.asset import Asset, AssetWithOracles, CryptoAsset
+from rotkehlchen.assets.resolver import AssetResolver
 from rotkehlchen.balances.manual import (
     account_for_manually_tracked_asset_balances,
     get_manually_tracked_balances,
@@ -72,6 +74,7 @@ from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.globaldb.manual_price_oracles import ManualCurrentOracle
 from rotkehlchen.globaldb.updates import AssetsUpdater
 from rotkehlchen.greenlets.manager import GreenletManager
+from rotkehlchen.greenlets.process_pool import ProcessPool
 from rotkehlchen.history.events import EventsHistorian
 from rotkehlchen.history.price import PriceHistorian
 from rotkehlchen.history.types import HistoricalPriceOracle
@@ -148,6 +151,7 @@ class Rotkehlchen:
         self.api_task_greenlets: list[gevent.Greenlet] = []
         self.msg_aggregator = MessagesAggregator()
         self.greenlet_manager = GreenletManager(msg_aggregator=self.msg_aggregator)
+        ProcessPool.initialize(max_workers=self.args.max_worker_processes)
         self.rotki_notifier = RotkiNotifier()
         self.msg_aggregator.rotki_notifier = self.rotki_notifier
         self.exchange_manager = ExchangeManager(msg_aggregator=self.msg_aggregator)
@@ -156,6 +160,7 @@ class Rotkehlchen:
             data_dir=self.data_dir,
             sql_vm_instructions_cb=self.args.sqlite_instructions,
         )
+        AssetResolver.set_cache_max_memory(self.args.max_size_in_mb_asset_cache * 1024 * 1024)
         if globaldb.used_backup is True:
             self.msg_aggregator.add_warning(
                 'Your global database was left in an half-upgraded state. '
@@ -304,6 +309,7 @@ class Rotkehlchen:
         # set the DB in the external services instances that need it
         self.cryptocompare.set_database(self.data.db)
         Inquirer()._manualcurrent.set_database(database=self.data.db)
+        Inquirer.load_current_prices_cache(database=self.data.db)
 
         # Initialize the cached settings singleton
         CachedSettings()
@@ -521,11 +527,14 @@ class Rotkehlchen:
         del self.events_historian
         del self.data_importer
 
+        Inquirer.save_current_prices_cache(database=self.data.db)
+        Inquirer.clear_current_prices_cache()
         self.data.logout()
         self.cryptocompare.unset_database()
         CachedSettings().reset()
 
         # Make sure no messages leak to other user sessions
+        self.rotki_notifier.flush()
         self.msg_aggregator.consume_errors()
         self.msg_aggregator.consume_warnings()
         self.task_manager = None
@@ -809,6 +818,7 @@ class Rotkehlchen:
                 stack.enter_context(evm_manager.transactions.wait_until_no_query_for(evm_addresses))
                 stack.enter_context(evm_manager.transactions.missing_receipts_lock)
                 stack.enter_context(evm_manager.transactions_decoder.undecoded_tx_query_lock)
+                stack.enter_context(evm_manager.transactions_decoder.decoding_lock)
             write_cursor = stack.enter_context(self.data.db.user_write())
             self.data.db.remove_single_blockchain_accounts(write_cursor, blockchain, accounts)
 
@@ -839,15 +849,18 @@ class Rotkehlchen:
             start_ts: Timestamp,
             end_ts: Timestamp,
     ) -> tuple[int, str]:
+        metrics = ReportMetrics()
         error_or_empty, events = self.events_historian.get_history(
             start_ts=start_ts,
             end_ts=end_ts,
             has_premium=self.premium is not None,
+            metrics=metrics,
         )
         report_id = self.accountant.process_history(
             start_ts=start_ts,
             end_ts=end_ts,
             events=events,
+            metrics=metrics,
         )
         return report_id, error_or_empty
 
@@ -1124,6 +1137,8 @@ class Rotkehlchen:
 
     def shutdown(self) -> None:
         self.logout()
+        self.rotki_notifier.flush()
+        ProcessPool.shutdown()
         self.shutdown_event.set()
 
     def create_oracle_cache(
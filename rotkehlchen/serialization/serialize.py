@@ -1,3 +1,5 @@
+import json
+from collections.abc import Callable, Iterator
 from typing import Any, Union
 
 from hexbytes import HexBytes
@@ -84,45 +86,83 @@ from rotkehlchen.types import (
 from rotkehlchen.utils.version_check import VersionCheckResult
 
 
-def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
-    if isinstance(entry, FVal):
-        return str(entry)
-    if isinstance(entry, list):
-        return [_process_entry(x) for x in entry]
-
-    if isinstance(entry, (dict, AttributeDict)):
-        new_dict = {}
-        for k, v in entry.items():
-            if isinstance(k, Asset) is True:
-                k = k.identifier  # noqa: PLW2901
-            elif isinstance(k, (HistoryEventType, HistoryEventSubType, EventCategory, Location, AccountingEventType)) is True:  # noqa: E501
-                k = _process_entry(k)  # noqa: PLW2901
-            new_dict[k] = _process_entry(v)
-        return new_dict
-    if isinstance(entry, HexBytes):
-        return entry.hex()
-    if isinstance(entry, LocationData):
-        return {
-            'time': entry.time,
-            'location': str(Location.deserialize_from_db(entry.location)),
-            'usd_value': entry.usd_value,
-        }
-    if isinstance(entry, SingleDBAssetBalance):
-        return {
-            'time': entry.time,
-            'category': str(entry.category),
-            'amount': str(entry.amount),
-            'usd_value': str(entry.usd_value),
-        }
-    if isinstance(entry, DBAssetBalance):
-        return {
-            'time': entry.time,
-            'category': str(entry.category),
-            'asset': entry.asset.identifier,
-            'amount': str(entry.amount),
-            'usd_value': str(entry.usd_value),
-        }
-    if isinstance(entry, (
+def _process_key(key: Any) -> Any:
+    if (key_type := type(key)) is str:
+        return key
+    if (key_handler := _KEY_HANDLERS.get(key_type)) is None:
+        key_handler = _KEY_HANDLERS[key_type] = _resolve_key_handler(key_type)
+    return key_handler(key)
+
+
+def _process_dict(entry: Union[dict, AttributeDict]) -> dict[Any, Any]:
+    return {_process_key(k): _process_entry(v) for k, v in entry.items()}
+
+
+def _identity(entry: Any) -> Any:
+    return entry
+
+
+def _resolve_key_handler(key_type: type) -> Callable[[Any], Any]:
+    if issubclass(key_type, Asset):
+        return _serialize_asset
+    if issubclass(key_type, (HistoryEventType, HistoryEventSubType, EventCategory, Location, AccountingEventType)):  # noqa: E501
+        return _process_entry
+    return _identity
+
+
+def _serialize_asset(entry: Asset) -> str:
+    return entry.identifier
+
+
+def _serialize_location_data(entry: LocationData) -> dict[str, Any]:
+    return {
+        'time': entry.time,
+        'location': str(Location.deserialize_from_db(entry.location)),
+        'usd_value': entry.usd_value,
+    }
+
+
+def _serialize_single_db_asset_balance(entry: SingleDBAssetBalance) -> dict[str, Any]:
+    return {
+        'time': entry.time,
+        'category': str(entry.category),
+        'amount': str(entry.amount),
+        'usd_value': str(entry.usd_value),
+    }
+
+
+def _serialize_db_asset_balance(entry: DBAssetBalance) -> dict[str, Any]:
+    return {
+        'time': entry.time,
+        'category': str(entry.category),
+        'asset': entry.asset.identifier,
+        'amount': str(entry.amount),
+        'usd_value': str(entry.usd_value),
+    }
+
+
+def _resolve_handler(entry_type: type) -> Callable[[Any], Any]:
+    """Find how entries of the given type are serialized.
+
+    The order of the checks matters since a type may fall into more than one group
+    (e.g. NamedTuples are also tuples). The result is cached per type by the caller
+    so the chain of checks runs only once per class.
+    """
+    if issubclass(entry_type, FVal):
+        return str
+    if issubclass(entry_type, list):
+        return lambda entry: [_process_entry(x) for x in entry]
+    if issubclass(entry_type, (dict, AttributeDict)):
+        return _process_dict
+    if issubclass(entry_type, HexBytes):
+        return lambda entry: entry.hex()
+    if issubclass(entry_type, LocationData):
+        return _serialize_location_data
+    if issubclass(entry_type, SingleDBAssetBalance):
+        return _serialize_single_db_asset_balance
+    if issubclass(entry_type, DBAssetBalance):
+        return _serialize_db_asset_balance
+    if issubclass(entry_type, (
             AddressbookEntry,
             AssetBalance,
             DefiProtocol,
@@ -130,7 +170,6 @@ def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
             XpubData,
             StakingEvent,
             NodeName,
-            NodeName,
             ChainID,
             SingleBlockchainAccountData,
             SupportedBlockchain,
@@ -142,12 +181,11 @@ def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
             DBSettings,
             TxAccountingTreatment,
     )):
-        return entry.serialize()
-    if isinstance(entry, (
+        return lambda entry: entry.serialize()
+    if issubclass(entry_type, (
             Trade,
             EvmTransaction,
             OptimismTransaction,
-            MakerdaoVault,
             DSRAccountReport,
             Balance,
             AaveLendingBalance,
@@ -170,8 +208,8 @@ def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
             ExchangeLocationID,
             WeightedNode,
     )):
-        return process_result(entry.serialize())
-    if isinstance(entry, (
+        return lambda entry: _process_entry(entry.serialize())
+    if issubclass(entry_type, (
             VersionCheckResult,
             DSRCurrentBalances,
             VaultEvent,
@@ -185,16 +223,15 @@ def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
             CounterpartyDetails,
             AaveStats,
     )):
-        return process_result(entry._asdict())
-    if isinstance(entry, tuple):
-        return list(entry)
-    if isinstance(entry, Asset):
-        return entry.identifier
-    if isinstance(entry, (
+        return lambda entry: _process_entry(entry._asdict())
+    if issubclass(entry_type, tuple):
+        return list
+    if issubclass(entry_type, Asset):
+        return _serialize_asset
+    if issubclass(entry_type, (
             TradeType,
             Location,
             KrakenAccountType,
-            Location,
             VaultEventType,
             AssetMovementCategory,
             CurrentPriceOracle,
@@ -206,10 +243,28 @@ def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
             EventCategory,
             AccountingEventType,
     )):
-        return str(entry)
+        return str
 
     # else
-    return entry
+    return _identity
+
+
+# Per type serialization handlers. Filled lazily by _process_entry via _resolve_handler
+_HANDLERS: dict[type, Callable[[Any], Any]] = {
+    str: _identity,
+    int: _identity,
+    bool: _identity,
+    float: _identity,
+    type(None): _identity,
+}
+_KEY_HANDLERS: dict[type, Callable[[Any], Any]] = {}
+
+
+def _process_entry(entry: Any) -> Union[str, list[Any], dict[str, Any], Any]:
+    entry_type = type(entry)
+    if (handler := _HANDLERS.get(entry_type)) is None:
+        handler = _HANDLERS[entry_type] = _resolve_handler(entry_type)
+    return handler(entry)
 
 
 def process_result(result: Any) -> dict[Any, Any]:
@@ -232,3 +287,54 @@ def process_result_list(result: list[Any]) -> list[Any]:
     processed_result = _process_entry(result)
     assert isinstance(processed_result, list)  # pylint: disable=isinstance-second-argument-not-valid-type
     return processed_result
+
+
+# Lists with at least this many elements are encoded incrementally by iter_json_chunks
+STREAMING_LIST_THRESHOLD = 1000
+# Number of list elements that are processed and encoded together per yielded chunk
+STREAMING_CHUNK_SIZE = 250
+_JSON_ENCODER = json.JSONEncoder()
+
+
+def _encode_key(key: Any) -> str:
+    """Encode a processed dict key the same way json.dumps does"""
+    if not isinstance(key, str):
+        key = _JSON_ENCODER.encode(key)  # ints, floats, bools and None become strings
+    return _JSON_ENCODER.encode(key)
+
+
+def _iter_json(entry: Any) -> Iterator[str]:
+    if isinstance(entry, dict):
+        if len(entry) == 0:
+            yield '{}'
+            return
+
+        yield '{'
+        for idx, (k, v) in enumerate(entry.items()):
+            yield f'{", " if idx != 0 else ""}{_encode_key(_process_key(k))}: '
+            yield from _iter_json(v)
+        yield '}'
+        return
+
+    if isinstance(entry, list) and len(entry) >= STREAMING_LIST_THRESHOLD:
+        yield '['
+        for idx in range(0, len(entry), STREAMING_CHUNK_SIZE):
+            chunk = ', '.join(
+                _JSON_ENCODER.encode(_process_entry(x))
+                for x in entry[idx:idx + STREAMING_CHUNK_SIZE]
+            )
+            yield chunk if idx == 0 else ', ' + chunk
+        yield ']'
+        return
+
+    yield _JSON_ENCODER.encode(_process_entry(entry))
+
+
+def iter_json_chunks(result: Any) -> Iterator[str]:
+    """Serialize a result to JSON incrementally, yielding string chunks.
+
+    The concatenated output is identical to json.dumps(process_result(result)) but big
+    lists are processed and encoded a chunk at a time so that the whole processed copy
+    of a large response never needs to exist in memory at once.
+    """
+    yield from _iter_json(result)
@@ -1,7 +1,7 @@
 import logging
 import random
 from collections import defaultdict
-from typing import TYPE_CHECKING, Callable, NamedTuple
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple
 
 import gevent
 
@@ -33,8 +33,10 @@ from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.types import HistoricalPriceOracle
+from rotkehlchen.inquirer import CURRENT_PRICE_REFRESH_MARGIN_SECS, Inquirer
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.premium.premium import Premium, premium_create_and_verify
+from rotkehlchen.tasks.scheduler import BacklogType, TaskPriority, TaskSchedule
 from rotkehlchen.tasks.utils import query_missing_prices_of_base_entries, should_run_periodic_task
 from rotkehlchen.types import (
     EVM_CHAINS_WITH_TRANSACTIONS,
@@ -45,6 +47,7 @@ from rotkehlchen.types import (
     Location,
     Optional,
     SupportedBlockchain,
+    Timestamp,
     get_args,
 )
 from rotkehlchen.utils.misc import ts_now
@@ -75,7 +78,37 @@ EXCHANGE_QUERY_FREQUENCY = 3600  # every hour
 PREMIUM_STATUS_CHECK = 3600  # every hour
 TX_RECEIPTS_QUERY_LIMIT = 500
 TX_DECODING_LIMIT = 500
+# Events whose prices are queried per run. Their prices are mostly queried in ranges
+MISSING_PRICES_BATCH_SIZE = 1000
 PREMIUM_CHECK_RETRY_LIMIT = 3
+TASK_CHECK_DELAY = 300  # 5 minutes
+SLOW_TASK_CHECK_DELAY = 600  # 10 minutes
+# Priority, seconds to wait before checking again if there was nothing to do and the backlog
+# consumed by each scheduling function. Tasks that decide with a DB query wait before
+# checking again. Tasks with a backlog only query the DB when it's not known to be empty.
+TASK_SCHEDULES: dict[str, tuple[TaskPriority, int, Optional[BacklogType]]] = {
+    '_maybe_check_premium_status': (TaskPriority.HIGH, 0, None),
+    '_maybe_schedule_db_upload': (TaskPriority.HIGH, TASK_CHECK_DELAY, None),
+    '_maybe_query_evm_transactions': (TaskPriority.HIGH, TASK_CHECK_DELAY, None),
+    '_maybe_schedule_evm_txreceipts': (TaskPriority.HIGH, 0, BacklogType.EVM_TX_RECEIPTS),
+    '_maybe_decode_evm_transactions': (TaskPriority.HIGH, 0, BacklogType.EVM_TX_DECODING),
+    '_maybe_query_missing_prices': (TaskPriority.NORMAL, 0, BacklogType.MISSING_PRICES),
+    '_maybe_schedule_exchange_history_query': (TaskPriority.NORMAL, TASK_CHECK_DELAY, None),
+    '_maybe_schedule_xpub_derivation': (TaskPriority.NORMAL, 0, None),
+    '_maybe_update_snapshot_balances': (TaskPriority.NORMAL, TASK_CHECK_DELAY, None),
+    '_maybe_query_produced_blocks': (TaskPriority.NORMAL, TASK_CHECK_DELAY, None),
+    '_maybe_query_withdrawals': (TaskPriority.NORMAL, TASK_CHECK_DELAY, None),
+    '_maybe_run_events_processing': (TaskPriority.NORMAL, TASK_CHECK_DELAY, None),
+    # check often enough that cached prices are refreshed before they expire
+    '_maybe_refresh_current_prices': (TaskPriority.NORMAL, CURRENT_PRICE_REFRESH_MARGIN_SECS // 2, None),  # noqa: E501
+    '_maybe_schedule_cryptocompare_query': (TaskPriority.LOW, 0, None),
+    '_maybe_check_data_updates': (TaskPriority.LOW, SLOW_TASK_CHECK_DELAY, None),
+    '_maybe_detect_evm_accounts': (TaskPriority.LOW, SLOW_TASK_CHECK_DELAY, None),
+    '_maybe_update_yearn_vaults': (TaskPriority.LOW, SLOW_TASK_CHECK_DELAY, None),
+    '_maybe_update_ilk_cache': (TaskPriority.LOW, SLOW_TASK_CHECK_DELAY, None),
+}
+# Schedule of the tasks missing from TASK_SCHEDULES
+DEFAULT_TASK_SCHEDULE: tuple[TaskPriority, int, Optional[BacklogType]] = (TaskPriority.NORMAL, 0, None)  # noqa: E501
 
 
 def exchange_fail_cb(error: str) -> None:
@@ -149,9 +182,18 @@ class TaskManager:
             self._maybe_query_produced_blocks,
             self._maybe_query_withdrawals,
             self._maybe_run_events_processing,
+            self._maybe_refresh_current_prices,
         ]
         if self.premium_sync_manager is not None:
             self.potential_tasks.append(self._maybe_schedule_db_upload)
+        self.task_schedules: dict[Callable, TaskSchedule] = {}
+        for task in self.potential_tasks:
+            priority, idle_delay, backlog_type = TASK_SCHEDULES.get(task.__name__, DEFAULT_TASK_SCHEDULE)  # noqa: E501
+            self.task_schedules[task] = TaskSchedule(
+                priority=priority,
+                idle_delay=idle_delay,
+                backlog_type=backlog_type,
+            )
         self.schedule_lock = gevent.lock.Semaphore()
 
     def _maybe_schedule_db_upload(self) -> Optional[list[gevent.Greenlet]]:
@@ -331,16 +373,25 @@ class TaskManager:
         lock acquired.
         """
         dbevmtx = DBEvmTx(self.database)
+        backlogs = self.database.task_backlogs
         shuffled_chains = list(EVM_CHAINS_WITH_TRANSACTIONS)
         random.shuffle(shuffled_chains)
         for blockchain in shuffled_chains:
-            hash_results = dbevmtx.get_transaction_hashes_no_receipt(
-                tx_filter_query=EvmTransactionsFilterQuery.make(chain_id=blockchain.to_chain_id()),  # type: ignore[arg-type]
-                limit=TX_RECEIPTS_QUERY_LIMIT,
-            )
-            if len(hash_results) == 0:
-                return None
+            chain_id = blockchain.to_chain_id()
+            if backlogs.get(BacklogType.EVM_TX_RECEIPTS, chain_id) == 0:
+                continue  # known that there is nothing to query
+
+            with backlogs.counting(BacklogType.EVM_TX_RECEIPTS, chain_id):
+                hash_results = dbevmtx.get_transaction_hashes_no_receipt(
+                    tx_filter_query=EvmTransactionsFilterQuery.make(chain_id=chain_id),  # type: ignore[arg-type]
+                    limit=TX_RECEIPTS_QUERY_LIMIT,
+                )
+                if len(hash_results) == 0:
+                    backlogs.set(BacklogType.EVM_TX_RECEIPTS, 0, chain_id)
+                    continue
 
+            # count again after the task runs since it may not query all of them
+            backlogs.invalidate(BacklogType.EVM_TX_RECEIPTS, chain_id)
             evm_inquirer = self.chains_aggregator.get_chain_manager(blockchain)
             task_name = f'Query {len(hash_results)} {blockchain!s} transactions receipts'
             log.debug(f'Scheduling task to {task_name}')
@@ -388,15 +439,22 @@ class TaskManager:
         )]
 
     def _maybe_query_missing_prices(self) -> Optional[list[gevent.Greenlet]]:
-        query_filter = HistoryEventFilterQuery.make(limit=100)
+        backlogs = self.database.task_backlogs
+        if backlogs.get(BacklogType.MISSING_PRICES) == 0:
+            return None  # known that there are no events missing prices
+
+        query_filter = HistoryEventFilterQuery.make(limit=MISSING_PRICES_BATCH_SIZE)
         db = DBHistoryEvents(self.database)
-        entries = db.get_base_entries_missing_prices(
-            query_filter=query_filter,
-            ignored_assets=list(self.base_entries_ignore_set),
-        )
-        if len(entries) == 0:
-            return None
+        with backlogs.counting(BacklogType.MISSING_PRICES):
+            entries = db.get_base_entries_missing_prices(
+                query_filter=query_filter,
+                ignored_assets=list(self.base_entries_ignore_set),
+            )
+            if len(entries) == 0:
+                backlogs.set(BacklogType.MISSING_PRICES, 0)
+                return None
 
+        backlogs.invalidate(BacklogType.MISSING_PRICES)  # count again after the task runs
         task_name = 'Periodically query history events prices'
         log.debug(f'Scheduling task to {task_name}')
         return [self.greenlet_manager.spawn_and_track(
@@ -417,16 +475,25 @@ class TaskManager:
         lock acquired.
         """
         dbevmtx = DBEvmTx(self.database)
+        backlogs = self.database.task_backlogs
         shuffled_chains = list(EVM_CHAINS_WITH_TRANSACTIONS)
         random.shuffle(shuffled_chains)
         for blockchain in shuffled_chains:
-            number_of_tx_to_decode = dbevmtx.count_hashes_not_decoded(
-                addresses=None,
-                chain_id=blockchain.to_chain_id(),
-            )
-            if number_of_tx_to_decode == 0:
-                return None
+            chain_id = blockchain.to_chain_id()
+            if backlogs.get(BacklogType.EVM_TX_DECODING, chain_id) == 0:
+                continue  # known that there is nothing to decode
+
+            with backlogs.counting(BacklogType.EVM_TX_DECODING, chain_id):
+                number_of_tx_to_decode = dbevmtx.count_hashes_not_decoded(
+                    addresses=None,
+                    chain_id=chain_id,
+                )
+                if number_of_tx_to_decode == 0:
+                    backlogs.set(BacklogType.EVM_TX_DECODING, 0, chain_id)
+                    continue
 
+            # count again after the task runs since it decodes at most TX_DECODING_LIMIT
+            backlogs.invalidate(BacklogType.EVM_TX_DECODING, chain_id)
             evm_inquirer = self.chains_aggregator.get_chain_manager(blockchain)
             task_name = f'decode {min(number_of_tx_to_decode, TX_DECODING_LIMIT)} {blockchain!s} transactions'  # noqa: E501
             log.debug(f'Scheduling periodic task to {task_name}')
@@ -526,6 +593,26 @@ class TaskManager:
                 )]
         return None
 
+    def _maybe_refresh_current_prices(self) -> Optional[list[gevent.Greenlet]]:
+        """Schedules the query of the cached current prices of the owned assets that are
+        about to expire, so that they don't need to be queried when requested"""
+        with self.database.conn.read_ctx() as cursor:
+            owned_assets = self.database.get_owned_assets(cursor)
+
+        if len(cache_keys := Inquirer.get_expiring_current_prices(owned_assets)) == 0:
+            return None
+
+        task_name = f'Refresh {len(cache_keys)} cached current prices'
+        log.debug(f'Scheduling task to {task_name}')
+        return [self.greenlet_manager.spawn_and_track(
+            after_seconds=None,
+            task_name=task_name,
+            exception_is_error=True,
+            method=Inquirer.refresh_current_prices,
+            cache_keys=cache_keys,
+            database=self.database,
+        )]
+
     def _maybe_query_produced_blocks(self) -> Optional[list[gevent.Greenlet]]:
         """Schedules the blocks production query if enough time has passed"""
         with self.database.conn.read_ctx() as cursor:
@@ -671,21 +758,63 @@ class TaskManager:
         if not_proceed:
             return  # too busy
 
-        random.shuffle(self.potential_tasks)
-        max_tasks = min(self.max_tasks_num - current_greenlets, len(self.potential_tasks))
+        now = ts_now()
+        due_tasks = [
+            scheduling_fn for scheduling_fn in self.potential_tasks
+            if scheduling_fn not in self.running_greenlets and  # not already running
+            self._get_task_schedule(scheduling_fn).next_run_ts <= now
+        ]
+        # shuffle so that tasks with the same priority and backlog take turns
+        random.shuffle(due_tasks)
+        due_tasks.sort(key=self._task_order, reverse=True)
+        max_tasks = self.max_tasks_num - current_greenlets
 
         spawned_new = 0
-        for scheduling_fn in self.potential_tasks:
+        for scheduling_fn in due_tasks:
             if spawned_new >= max_tasks:
                 break  # no more task slots left
-            if scheduling_fn in self.running_greenlets:
-                continue  # the specified task is already running
+            task_schedule = self._get_task_schedule(scheduling_fn)
             new_greenlets = scheduling_fn()
             if new_greenlets is None:
-                continue  # The scheduling function for the specific task decided to not schedule it  # noqa: E501
+                # The scheduling function for the specific task decided to not schedule it
+                task_schedule.next_run_ts = Timestamp(now + task_schedule.idle_delay)
+                continue
+            task_schedule.track_run(new_greenlets)
             self.running_greenlets[scheduling_fn] = new_greenlets
             spawned_new += 1
 
+    def _get_task_schedule(self, scheduling_fn: Callable) -> TaskSchedule:
+        return self.task_schedules.setdefault(scheduling_fn, TaskSchedule())
+
+    def _get_task_backlog(self, task_schedule: TaskSchedule) -> Optional[int]:
+        """The known estimate of the work pending for a task. None if it's not known"""
+        if task_schedule.backlog_type is None:
+            return None
+
+        return self.database.task_backlogs.total(task_schedule.backlog_type)
+
+    def _task_order(self, scheduling_fn: Callable) -> tuple[TaskPriority, int]:
+        """Tasks with higher priority and then with more pending work go first"""
+        task_schedule = self._get_task_schedule(scheduling_fn)
+        return task_schedule.priority, self._get_task_backlog(task_schedule) or 0
+
+    def get_scheduler_status(self) -> dict[str, Any]:
+        """Scheduling state, pending work and last run of each of the background tasks"""
+        tasks = []
+        for scheduling_fn in self.potential_tasks:
+            task_schedule = self._get_task_schedule(scheduling_fn)
+            tasks.append({
+                'name': scheduling_fn.__name__.removeprefix('_maybe_'),
+                'running': any(
+                    greenlet.dead is False
+                    for greenlet in self.running_greenlets.get(scheduling_fn, [])
+                ),
+                'backlog': self._get_task_backlog(task_schedule),
+                **task_schedule.serialize(),
+            })
+
+        return {'tasks': tasks, 'backlogs': self.database.task_backlogs.serialize()}
+
     def schedule(self) -> None:
         """Schedules background task while holding the scheduling lock
 
@@ -0,0 +1,156 @@
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from enum import IntEnum, auto
+from typing import Any, Optional
+
+import gevent
+
+from rotkehlchen.types import ChainID, Timestamp
+from rotkehlchen.utils.misc import ts_now
+from rotkehlchen.utils.mixins.enums import SerializableEnumNameMixin
+
+
+class TaskPriority(IntEnum):
+    """Order in which the due background tasks get the free task slots"""
+    LOW = 0
+    NORMAL = 1
+    HIGH = 2
+
+    def serialize(self) -> str:
+        return self.name.lower()
+
+
+class BacklogType(SerializableEnumNameMixin):
+    """Kinds of pending work that the background tasks consume"""
+    EVM_TX_RECEIPTS = auto()
+    EVM_TX_DECODING = auto()
+    MISSING_PRICES = auto()
+
+
+class TaskBacklogs:
+    """Estimates of the work pending for the background tasks
+
+    A missing estimate means that it's not known and that the task needs to check the DB.
+    The producers of work increase the estimates as they insert it and the tasks set them
+    once they count the work in the DB. This way an idle task does not need to query the
+    DB at every scheduling round just to find out that there is nothing to do.
+
+    The tasks count inside the counting context so that the work inserted while they
+    count, which the count may have missed, is added to the estimate they set.
+    """
+
+    def __init__(self) -> None:
+        self._estimates: dict[tuple[BacklogType, Optional[ChainID]], int] = {}
+        # work added to the backlogs that are being counted, since the count started
+        self._counting: dict[tuple[BacklogType, Optional[ChainID]], int] = {}
+
+    def get(self, backlog_type: BacklogType, chain_id: Optional[ChainID] = None) -> Optional[int]:
+        return self._estimates.get((backlog_type, chain_id))
+
+    def total(self, backlog_type: BacklogType) -> Optional[int]:
+        """Sum of the known estimates of the given type for all chains. None if none is known"""
+        counts = [
+            count for (entry_type, _), count in self._estimates.items()
+            if entry_type == backlog_type
+        ]
+        return sum(counts) if len(counts) != 0 else None
+
+    def set(
+            self,
+            backlog_type: BacklogType,
+            count: int,
+            chain_id: Optional[ChainID] = None,
+    ) -> None:
+        """Set the estimate to the counted work plus the work added since the count
+        started, if counted inside the counting context"""
+        key = (backlog_type, chain_id)
+        self._estimates[key] = count + self._counting.get(key, 0)
+        if key in self._counting:
+            self._counting[key] = 0
+
+    def increase(
+            self,
+            backlog_type: BacklogType,
+            count: int,
+            chain_id: Optional[ChainID] = None,
+    ) -> None:
+        """Increase a known estimate. An unknown one stays unknown since it will be counted,
+        but the increase is remembered if it's being counted right now."""
+        if count == 0:
+            return
+
+        key = (backlog_type, chain_id)
+        if key in self._estimates:
+            self._estimates[key] += count
+        if key in self._counting:
+            self._counting[key] += count
+
+    @contextmanager
+    def counting(
+            self,
+            backlog_type: BacklogType,
+            chain_id: Optional[ChainID] = None,
+    ) -> Iterator[None]:
+        """Context in which a task counts the work of a backlog in the DB and sets it"""
+        key = (backlog_type, chain_id)
+        self._counting[key] = 0
+        try:
+            yield
+        finally:
+            self._counting.pop(key, None)
+
+    def invalidate(self, backlog_type: BacklogType, chain_id: Optional[ChainID] = None) -> None:
+        """Forget the estimate so that the task counts the work in the DB again"""
+        self._estimates.pop((backlog_type, chain_id), None)
+
+    def clear(self) -> None:
+        """Forget all estimates, for example when the DB is replaced"""
+        self._estimates.clear()
+
+    def serialize(self) -> list[dict[str, Any]]:
+        return [{
+            'type': backlog_type.serialize(),
+            'chain': None if chain_id is None else chain_id.to_name(),
+            'estimate': count,
+        } for (backlog_type, chain_id), count in self._estimates.items()]
+
+
+@dataclass
+class TaskSchedule:
+    """Scheduling state of a background task
+
+    idle_delay is how many seconds to wait before checking again a task that decided
+    it had nothing to do. It is meant for tasks that need to query the DB to decide.
+    """
+    priority: TaskPriority = TaskPriority.NORMAL
+    idle_delay: int = 0
+    backlog_type: Optional[BacklogType] = None
+    next_run_ts: Timestamp = field(default=Timestamp(0))
+    last_run_ts: Optional[Timestamp] = None
+    last_run_duration: Optional[float] = None
+    runs: int = 0
+
+    def track_run(self, greenlets: list[gevent.Greenlet]) -> None:
+        """Record a run of the task that spawned the given greenlets. Its duration is
+        recorded once all of them finish."""
+        self.last_run_ts = ts_now()
+        self.runs += 1
+        start = time.monotonic()
+
+        def _finished(_: gevent.Greenlet) -> None:
+            if all(greenlet.dead for greenlet in greenlets):
+                self.last_run_duration = round(time.monotonic() - start, 3)
+
+        for greenlet in greenlets:
+            greenlet.link(_finished)
+
+    def serialize(self) -> dict[str, Any]:
+        return {
+            'priority': self.priority.serialize(),
+            'next_run_ts': self.next_run_ts,
+            'last_run_ts': self.last_run_ts,
+            'last_run_duration': self.last_run_duration,
+            'runs': self.runs,
+        }
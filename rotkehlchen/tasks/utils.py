@@ -1,10 +1,16 @@
 import logging
+from collections import defaultdict
 from typing import TYPE_CHECKING, Literal, Optional
 
 from rotkehlchen.constants.assets import A_USD
+from rotkehlchen.db.shadow_columns import to_shadow_value
 from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.errors.price import NoPriceForGivenTimestamp
-from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.history.price import (
+    MIN_ENTRIES_FOR_PRICE_RANGE,
+    PriceHistorian,
+    group_timestamps_by_price_range,
+)
 from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.serialization.deserialize import deserialize_timestamp
 from rotkehlchen.utils.misc import ts_now
@@ -47,10 +53,30 @@ def query_missing_prices_of_base_entries(
     """
     Queries missing prices for HistoryBaseEntry in database updating
     the price if it is found.
+
+    Entries of the same asset close in time first get their prices stored in the
+    price cache with a single range query per group, so that only the assets that
+    the range queries could not cover are queried one by one.
+
     If provided we keep a set of events that have been already queried in this session
     and we couldn't find a price for it now.
     """
     inquirer = PriceHistorian()
+    timestamps_per_asset: defaultdict['Asset', list['Timestamp']] = defaultdict(list)
+    for _, _, asset, timestamp in entries_missing_prices:
+        timestamps_per_asset[asset].append(timestamp)
+
+    for asset, start_ts, end_ts, count in group_timestamps_by_price_range(timestamps_per_asset):
+        if count < MIN_ENTRIES_FOR_PRICE_RANGE or asset.is_fiat():
+            continue  # a single price query is enough. Fiat rates are queried as forex
+
+        inquirer.prefetch_historical_price_range(
+            from_asset=asset,
+            to_asset=A_USD,
+            from_timestamp=start_ts,
+            to_timestamp=end_ts,
+        )
+
     updates = []
     for identifier, amount, asset, timestamp in entries_missing_prices:
         try:
@@ -69,8 +95,8 @@ def query_missing_prices_of_base_entries(
             continue
 
         usd_value = amount * price
-        updates.append((str(usd_value), identifier))
+        updates.append((str(usd_value), to_shadow_value(usd_value, 'usd_value'), identifier))
 
-    query = 'UPDATE history_events SET usd_value=? WHERE rowid=?'
+    query = 'UPDATE history_events SET usd_value=?, usd_value_scaled=? WHERE rowid=?'
     with database.user_write() as write_cursor:
         write_cursor.executemany(query, updates)
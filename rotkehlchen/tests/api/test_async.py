@@ -144,3 +144,21 @@ def test_query_async_task_that_died(rotkehlchen_api_server_with_exchanges):
     assert result['outcome']['result'] is None
     msg = 'The backend query task died unexpectedly: BOOM!'
     assert result['outcome']['message'] == msg
+
+
+def test_query_task_scheduler(rotkehlchen_api_server):
+    """Test that the state of the background task scheduler is returned"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    rotki.task_manager.potential_tasks = [rotki.task_manager._maybe_update_snapshot_balances]
+    rotki.task_manager.schedule()
+
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'taskschedulerresource'))
+    result = assert_proper_response_with_result(response)
+    assert result['backlogs'] == []
+    assert len(result['tasks']) == 1
+    task = result['tasks'][0]
+    assert task['name'] == 'update_snapshot_balances'
+    assert task['priority'] == 'normal'
+    assert task['backlog'] is None
+    assert task['runs'] == 1
+    assert task['last_run_ts'] is not None
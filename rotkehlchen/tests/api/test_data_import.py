@@ -3,11 +3,16 @@ import shutil
 from http import HTTPStatus
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 import pytest
 import requests
 
+from rotkehlchen.data_import.importers.rotki_events import RotkiGenericEventsImporter
+from rotkehlchen.data_import.manager import DataImportSource
+from rotkehlchen.data_import.utils import ITEMS_PER_DB_WRITE
 from rotkehlchen.db.filtering import AssetMovementsFilterQuery, TradesFilterQuery
+from rotkehlchen.errors.misc import InputError
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.api import (
     api_url_for,
@@ -623,3 +628,123 @@ def test_bitstamp_import(rotkehlchen_api_server):
     )
     assert assert_proper_response_with_result(response) is True
     assert_bitstamp_trades_import_results(rotki)
+
+
+def test_interrupted_import_resumes(rotkehlchen_api_server, tmpdir_factory):
+    """Test that an import that fails midway keeps the batches saved until then and that
+    importing the same file again continues after them without duplicating entries"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    filepath = Path(tmpdir_factory.mktemp('import')) / 'events.csv'
+    rows_num = ITEMS_PER_DB_WRITE * 2 + 50
+    with open(filepath, 'w', encoding='utf-8') as csvfile:
+        csvfile.write('Type,Location,Currency,Amount,Fee,Fee Currency,Description,Timestamp\n')
+        for idx in range(rows_num):
+            csvfile.write(f'Income,kraken,ETH,{idx + 1},,,Income {idx},{1658912400000 + idx}\n')
+
+    consume_rotki_event = RotkiGenericEventsImporter._consume_rotki_event
+
+    def consume_until_interrupted(self, csv_row, sequence_index):
+        if csv_row['Description'] == f'Income {ITEMS_PER_DB_WRITE + 10}':
+            raise InputError('Interrupted')
+        consume_rotki_event(self, csv_row, sequence_index)
+
+    database = rotki.data.db
+    with patch.object(
+        RotkiGenericEventsImporter,
+        '_consume_rotki_event',
+        new=consume_until_interrupted,
+    ):
+        assert rotki.data_importer.import_csv(
+            source=DataImportSource.ROTKI_EVENTS,
+            filepath=filepath,
+        ) == (False, 'Interrupted')
+
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == ITEMS_PER_DB_WRITE  # noqa: E501
+        assert cursor.execute(
+            'SELECT consumed_rows FROM csv_import_checkpoints',
+        ).fetchall() == [(ITEMS_PER_DB_WRITE,)]
+
+    assert rotki.data_importer.import_csv(
+        source=DataImportSource.ROTKI_EVENTS,
+        filepath=filepath,
+    ) == (True, '')
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT notes) FROM history_events',
+        ).fetchone() == (rows_num, rows_num)
+        assert cursor.execute(  # the rows after the resumed ones keep their index
+            'SELECT sequence_index FROM history_events WHERE notes=?',
+            (f'Income {rows_num - 1}',),
+        ).fetchone()[0] == rows_num - 1
+        assert cursor.execute('SELECT COUNT(*) FROM csv_import_checkpoints').fetchone()[0] == 0
+
+
+def test_fixed_import_does_not_duplicate_entries(rotkehlchen_api_server, tmpdir_factory):
+    """Test that importing a file again after fixing the row that made its import fail
+    does not duplicate the entries of the batches saved by the failed import, and that
+    the checkpoint of the failed import is not left behind"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    filepath = Path(tmpdir_factory.mktemp('import')) / 'events.csv'
+    rows_num = ITEMS_PER_DB_WRITE + 50
+    bad_row = ITEMS_PER_DB_WRITE + 10
+
+    def write_file(fixed: bool) -> None:
+        with open(filepath, 'w', encoding='utf-8') as csvfile:
+            csvfile.write('Type,Location,Currency,Amount,Fee,Fee Currency,Description,Timestamp\n')
+            for idx in range(rows_num):
+                if idx == bad_row and fixed is False:
+                    csvfile.write('Income,kraken,ETH\n')  # missing columns
+                else:
+                    csvfile.write(f'Income,kraken,ETH,{idx + 1},,,Income {idx},{1658912400000 + idx}\n')  # noqa: E501
+
+    consume_rotki_event = RotkiGenericEventsImporter._consume_rotki_event
+
+    def consume_complete_rows(self, csv_row, sequence_index):
+        if csv_row['Amount'] is None:
+            raise InputError('Missing columns')
+        consume_rotki_event(self, csv_row, sequence_index)
+
+    write_file(fixed=False)
+    database = rotki.data.db
+    with patch.object(
+        RotkiGenericEventsImporter,
+        '_consume_rotki_event',
+        new=consume_complete_rows,
+    ):
+        assert rotki.data_importer.import_csv(
+            source=DataImportSource.ROTKI_EVENTS,
+            filepath=filepath,
+        ) == (False, 'Missing columns')
+
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == ITEMS_PER_DB_WRITE  # noqa: E501
+        assert cursor.execute('SELECT COUNT(*) FROM csv_import_checkpoints').fetchone()[0] == 1
+
+    write_file(fixed=True)
+    assert rotki.data_importer.import_csv(
+        source=DataImportSource.ROTKI_EVENTS,
+        filepath=filepath,
+    ) == (True, '')
+    with database.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT COUNT(*), COUNT(DISTINCT notes) FROM history_events',
+        ).fetchone() == (rows_num, rows_num)
+        assert cursor.execute('SELECT COUNT(*) FROM csv_import_checkpoints').fetchone()[0] == 0
+
+
+def test_identical_rows_are_all_imported(rotkehlchen_api_server, tmpdir_factory):
+    """Test that identical rows of a file are not deduplicated as the same entry"""
+    rotki = rotkehlchen_api_server.rest_api.rotkehlchen
+    filepath = Path(tmpdir_factory.mktemp('import')) / 'events.csv'
+    with open(filepath, 'w', encoding='utf-8') as csvfile:
+        csvfile.write('Type,Location,Currency,Amount,Fee,Fee Currency,Description,Timestamp\n')
+        for _ in range(2):
+            csvfile.write('Income,kraken,ETH,1,,,Income,1658912400000\n')
+
+    assert rotki.data_importer.import_csv(
+        source=DataImportSource.ROTKI_EVENTS,
+        filepath=filepath,
+    ) == (True, '')
+    with rotki.data.db.conn.read_ctx() as cursor:
+        assert cursor.execute('SELECT COUNT(*) FROM history_events').fetchone()[0] == 2
@@ -86,7 +86,7 @@ def test_query_history(rotkehlchen_api_server_with_exchanges, start_ts, end_ts):
     assert report_result['entries_found'] == 1
     assert report_result['entries_limit'] == FREE_REPORTS_LOOKUP_LIMIT
     report = report_result['entries'][0]
-    assert len(report) == 10  # 10 entries in the report api endpoint
+    assert len(report) == 11  # 11 entries in the report api endpoint
     assert report['first_processed_timestamp'] == 1428994442
     assert report['last_processed_timestamp'] == end_ts if end_ts == 1539713238 else 1566572401
     assert report['identifier'] == report_id
@@ -119,6 +119,13 @@ def test_query_history(rotkehlchen_api_server_with_exchanges, start_ts, end_ts):
     assert settings['eth_staking_taxable_after_withdrawal_enabled'] is True
     assert settings['include_fees_in_cost_basis'] == fees_in_cost_basis
 
+    metrics = report['metrics']
+    assert len([x for x in metrics['stages'] if x.startswith('history.exchange.')]) == 5
+    for stage in ('history.db_read', 'history.base_events', 'accounting.processing', 'accounting.db_writes'):  # noqa: E501
+        assert metrics['stages'][stage] >= 0
+    assert metrics['counters']['events_processed'] == report['processed_actions']
+    assert metrics['counters']['events_total'] == report['total_actions']
+
     assert events_result['entries_limit'] == FREE_PNL_EVENTS_LIMIT
     entries_length = 43 if start_ts == 0 else 40
     assert events_result['entries_found'] == entries_length
@@ -12,7 +12,12 @@ from rotkehlchen.accounting.structures.evm_event import EvmProduct
 from rotkehlchen.chain.ethereum.constants import ETHEREUM_ETHERSCAN_NODE_NAME
 from rotkehlchen.chain.ethereum.modules.convex.constants import CPT_CONVEX
 from rotkehlchen.chain.ethereum.modules.curve.constants import CPT_CURVE
-from rotkehlchen.constants.misc import DEFAULT_MAX_LOG_BACKUP_FILES, DEFAULT_SQL_VM_INSTRUCTIONS_CB
+from rotkehlchen.constants.misc import (
+    DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
+    DEFAULT_MAX_LOG_BACKUP_FILES,
+    DEFAULT_MAX_WORKER_PROCESSES,
+    DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+)
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.api import (
     api_url_for,
@@ -44,6 +49,8 @@ def generate_expected_info(
             'max_logfiles_num': 3,
             'max_size_in_mb_all_logs': 300,
             'sqlite_instructions': 5000,
+            'max_worker_processes': 0,
+            'max_size_in_mb_asset_cache': 32,
         },
     }
     return result
@@ -414,6 +421,10 @@ def test_configuration(rotkehlchen_api_server):
     assert result['max_logfiles_num']['value'] == DEFAULT_MAX_LOG_BACKUP_FILES
     assert result['sqlite_instructions']['is_default'] is True
     assert result['sqlite_instructions']['value'] == DEFAULT_SQL_VM_INSTRUCTIONS_CB
+    assert result['max_worker_processes']['is_default'] is True
+    assert result['max_worker_processes']['value'] == DEFAULT_MAX_WORKER_PROCESSES
+    assert result['max_size_in_mb_asset_cache']['is_default'] is True
+    assert result['max_size_in_mb_asset_cache']['value'] == DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB
 
 
 def test_query_all_chain_ids(rotkehlchen_api_server):
@@ -11,10 +11,11 @@ import requests
 from rotkehlchen.accounting.structures.balance import BalanceType
 from rotkehlchen.api.server import APIServer
 from rotkehlchen.assets.asset import Asset, EvmToken
+from rotkehlchen.assets.resolver import AssetResolver
 from rotkehlchen.assets.types import ASSET_TYPES_EXCLUDED_FOR_USERS, AssetType
 from rotkehlchen.balances.manual import ManuallyTrackedBalance
 from rotkehlchen.constants.assets import A_BCH, A_BTC, A_DAI, A_DOT, A_EUR, A_USDC
-from rotkehlchen.constants.misc import ONE
+from rotkehlchen.constants.misc import DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB, ONE
 from rotkehlchen.constants.resolver import (
     ChainID,
     ethaddress_to_identifier,
@@ -580,6 +581,20 @@ def test_query_asset_types(rotkehlchen_api_server):
     assert all(isinstance(AssetType.deserialize(x), AssetType) for x in result)
 
 
+@pytest.mark.parametrize('start_with_logged_in_user', [False])
+def test_query_assets_cache_stats(rotkehlchen_api_server):
+    AssetResolver().clean_memory_cache()
+    A_DAI.resolve()
+    A_DAI.resolve()
+    response = requests.get(api_url_for(rotkehlchen_api_server, 'assetscacheresource'))
+    result = assert_proper_response_with_result(response)
+    assert result['assets']['size'] == 1
+    assert result['assets']['hits'] >= 1
+    assert result['assets']['memory'] > 0
+    assert result['assets']['max_memory'] == DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB * 1024 * 1024
+    assert set(result['types']) == set(result['assets'])
+
+
 @pytest.mark.parametrize('use_clean_caching_directory', [True])
 @pytest.mark.parametrize('start_with_logged_in_user', [True])
 @pytest.mark.parametrize('only_in_globaldb', [True, False])
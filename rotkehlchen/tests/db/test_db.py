@@ -148,6 +148,9 @@ TABLES_AT_INIT = [
     'skipped_external_events',
     'accounting_rules',
     'linked_rules_properties',
+    'exchange_pagination_checkpoints',
+    'csv_import_checkpoints',
+    'history_events_groups',
 ]
 
 
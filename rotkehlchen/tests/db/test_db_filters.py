@@ -4,6 +4,7 @@ from rotkehlchen.chain.evm.types import EvmAccount
 from rotkehlchen.constants.assets import A_BTC, A_ETH
 from rotkehlchen.db.filtering import (
     DBEvmTransactionJoinsFilter,
+    DBFilterKeyset,
     DBFilterOrder,
     DBFilterPagination,
     DBFilterQuery,
@@ -12,6 +13,7 @@ from rotkehlchen.db.filtering import (
     DBTimestampFilter,
     EvmTransactionsFilterQuery,
 )
+from rotkehlchen.errors.serialization import DeserializationError
 from rotkehlchen.tests.utils.database import clean_ignored_assets
 from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.types import Location, Timestamp
@@ -27,7 +29,7 @@ def test_ethereum_transaction_filter():
         to_ts=Timestamp(999),
     )
     query, bindings = filter_query.prepare()
-    assert query == ' INNER JOIN evmtx_address_mappings WHERE evm_transactions.identifier=evmtx_address_mappings.tx_id AND ((evmtx_address_mappings.address = ?))  AND ((timestamp >= ? AND timestamp <= ?)) ORDER BY timestamp ASC LIMIT 10 OFFSET 10'  # noqa: E501
+    assert query == ' INNER JOIN evmtx_address_mappings WHERE evm_transactions.identifier=evmtx_address_mappings.tx_id AND ((evmtx_address_mappings.address = ?))  AND ((timestamp >= ? AND timestamp <= ?)) ORDER BY timestamp ASC,evm_transactions.identifier ASC LIMIT 10 OFFSET 10'  # noqa: E501
     assert bindings == [
         address,
         filter_query.from_ts,
@@ -35,6 +37,32 @@ def test_ethereum_transaction_filter():
     ]
 
 
+def test_keyset_pagination():
+    """Test that a keyset continues after its entry instead of using the offset and that
+    a keyset which does not match the order of the query is ignored"""
+    filter_query = EvmTransactionsFilterQuery.make(
+        limit=10,
+        offset=10,
+        from_ts=Timestamp(1),
+        order_by_rules=[('timestamp', False)],
+    )
+    keyset = DBFilterKeyset.deserialize(DBFilterKeyset(values=[1500, 42]).serialize())
+    assert keyset.values == [1500, 42]
+    filter_query.keyset = keyset
+    query, bindings = filter_query.prepare()
+    assert query == 'WHERE ((timestamp >= ?)) AND (((timestamp < ? OR timestamp IS NULL)) OR (timestamp IS ? AND evm_transactions.identifier > ?)) ORDER BY timestamp DESC,evm_transactions.identifier ASC LIMIT 10 OFFSET 0'  # noqa: E501
+    assert bindings == [1, 1500, 1500, 42]
+
+    filter_query.keyset = DBFilterKeyset(values=[1500, 'ETH', 42])
+    query, bindings = filter_query.prepare()
+    assert query == 'WHERE (timestamp >= ?) ORDER BY timestamp DESC,evm_transactions.identifier ASC LIMIT 10 OFFSET 10'  # noqa: E501
+    assert bindings == [1]
+
+    for invalid_cursor in ('invalid', DBFilterKeyset(values=[1500]).serialize()):
+        with pytest.raises(DeserializationError):
+            DBFilterKeyset.deserialize(invalid_cursor)
+
+
 @pytest.mark.parametrize(('and_op', 'order_by', 'pagination'), [
     (True, True, True),
     (False, True, True),
@@ -15,6 +15,7 @@ from rotkehlchen.db.dbhandler import DBHandler
 from rotkehlchen.db.drivers.gevent import DBConnection, DBConnectionType
 from rotkehlchen.db.schema import DB_SCRIPT_CREATE_TABLES
 from rotkehlchen.db.settings import ROTKEHLCHEN_DB_VERSION
+from rotkehlchen.db.shadow_columns import to_shadow_value
 from rotkehlchen.db.upgrade_manager import (
     MIN_SUPPORTED_USER_DB_VERSION,
     UPGRADES_LIST,
@@ -24,6 +25,7 @@ from rotkehlchen.db.upgrades.v37_v38 import DEFAULT_POLYGON_NODES_AT_V38
 from rotkehlchen.db.upgrades.v39_v40 import PREFIX
 from rotkehlchen.db.utils import table_exists
 from rotkehlchen.errors.misc import DBUpgradeError
+from rotkehlchen.fval import FVal
 from rotkehlchen.oracles.structures import CurrentPriceOracle
 from rotkehlchen.tests.utils.database import (
     _use_prepared_db,
@@ -1909,6 +1911,25 @@ def test_upgrade_db_39_to_40(user_data_dir):  # pylint: disable=unused-argument
         (1696085745000, 'B', None, 'BTC', '1', 'Kraken gave me 1 BTC because I am a good boy. Migrated from a ledger action of gift type', 'receive', 'none'),  # noqa: E501
         (1695913006000, 'h', None, 'eip155:1/erc20:0x7D1AfA7B718fb893dB30A3aBc0Cfc608AaCfeBB0', '1000', 'Polygon paid us for something (as if). Migrated from a ledger action of grant type. https://polygonscan.com/tx/0xc0b96f46f7d2be3e5b68583b1223cab0d46526a6a37415a125698687c7cbd87d', 'receive', 'none'),  # noqa: E501
     ]
+    # check that the shadow columns of all the events and balances got populated
+    for table in ('history_events', 'timed_balances'):
+        for amount, usd_value, amount_scaled, usd_value_scaled in cursor.execute(
+            f'SELECT amount, usd_value, amount_scaled, usd_value_scaled FROM {table}',
+        ):
+            assert amount_scaled == to_shadow_value(FVal(amount), 'amount')
+            assert usd_value_scaled == to_shadow_value(FVal(usd_value), 'usd_value')
+    assert cursor.execute(
+        'SELECT amount_scaled FROM history_events WHERE event_identifier LIKE "MLA_%" '
+        'AND asset="ETH"',
+    ).fetchone()[0] == 50000000
+    # check that the summary of the history events groups got populated
+    assert cursor.execute(
+        'SELECT event_identifier, timestamp, events_num FROM history_events_groups '
+        'ORDER BY event_identifier',
+    ).fetchall() == cursor.execute(
+        'SELECT event_identifier, MIN(timestamp), COUNT(*) FROM history_events '
+        'GROUP BY event_identifier ORDER BY event_identifier',
+    ).fetchall()
     # Assert used query ranges got updated
     assert cursor.execute('SELECT * from used_query_ranges').fetchall() == [
         ('last_withdrawals_query_ts', 0, 1693141835),
@@ -1973,6 +1994,7 @@ def test_latest_upgrade_correctness(user_data_dir):
         cursor=cursor,
         db_name=db.conn.connection_type.name.lower(),
         minimized_schema=db.conn.minimized_schema,
+        triggers=db.conn.minimized_triggers,
     )
     result = cursor.execute('SELECT name FROM sqlite_master WHERE type="table"')
     tables_after_upgrade = {x[0] for x in result}
@@ -1998,6 +2020,9 @@ def test_latest_upgrade_correctness(user_data_dir):
         'skipped_external_events',
         'accounting_rules',
         'linked_rules_properties',
+        'exchange_pagination_checkpoints',
+        'csv_import_checkpoints',
+        'history_events_groups',
     }
     new_views = views_after_upgrade - views_before
     assert new_views == set()
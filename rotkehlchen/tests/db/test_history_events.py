@@ -1,14 +1,22 @@
+import pytest
+
 from rotkehlchen.accounting.structures.balance import Balance
-from rotkehlchen.accounting.structures.base import HistoryBaseEntryType, HistoryEvent
+from rotkehlchen.accounting.structures.base import (
+    DBDeserializationCache,
+    HistoryBaseEntryType,
+    HistoryEvent,
+)
 from rotkehlchen.accounting.structures.eth2 import EthWithdrawalEvent
 from rotkehlchen.accounting.structures.evm_event import EvmEvent, EvmProduct
 from rotkehlchen.accounting.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.api.v1.types import IncludeExcludeFilterData
 from rotkehlchen.constants import ONE
-from rotkehlchen.constants.assets import A_ETH
+from rotkehlchen.constants.assets import A_BTC, A_ETH, A_USDC
 from rotkehlchen.db.constants import HISTORY_MAPPING_KEY_STATE, HISTORY_MAPPING_STATE_CUSTOMIZED
 from rotkehlchen.db.filtering import EvmEventFilterQuery, HistoryEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.errors.asset import UnknownAsset
+from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.factories import (
     make_ethereum_event,
     make_evm_address,
@@ -179,6 +187,29 @@ def test_read_write_events_from_db(database):
                 assert event == expected_event
 
 
+def test_read_events_share_deserialized_values(database):
+    """Test that the events read in one query share their assets and amounts and have
+    no instance dict, while each unknown asset still raises"""
+    db = DBHistoryEvents(database)
+    add_history_events_to_db(db, {idx: (f'TEST{idx}', TimestampMS(idx), 1) for idx in range(3)})
+    with db.db.conn.read_ctx() as cursor:
+        events = db.get_history_events(cursor, HistoryEventFilterQuery.make(), True, False)
+
+    assert len(events) == 3
+    for event in events[1:]:
+        assert event.asset is events[0].asset
+        assert event.balance.amount is events[0].balance.amount
+        assert event.balance is not events[0].balance  # balances are mutable
+    assert not hasattr(events[0], '__dict__')
+    assert not hasattr(events[0].balance, '__dict__')
+    assert not hasattr(make_ethereum_event(index=1), '__dict__')
+
+    cache = DBDeserializationCache()
+    for _ in range(2):
+        with pytest.raises(UnknownAsset):
+            cache.asset('IDONTEXIST')
+
+
 def test_delete_last_event(database):
     """
     Test that if last event in a group is being deleted and it's not an EVM event,
@@ -212,3 +243,114 @@ def test_delete_last_event(database):
     assert 'was the last event of a transaction' in msg
     with db.db.conn.read_ctx() as cursor:
         assert len(db.get_history_events(cursor, HistoryEventFilterQuery.make(), True)) == 1, 'EVM event should be left'  # noqa: E501
+
+
+def test_get_value_stats(database):
+    """Test that the value stats are summed from the integer shadow columns, and
+    that values that don't fit in them or whose sum overflows are still summed"""
+    db = DBHistoryEvents(database)
+    amounts = [  # (asset, amount, usd_value)
+        (A_ETH, '0.1', '0.1'),
+        (A_ETH, '0.2', '0.2'),
+        (A_BTC, '50000000000', '1'),  # scaled sum of these two overflows a 64 bit integer
+        (A_BTC, '50000000000', '1'),
+        (A_USDC, '1000000000000', '2'),  # does not fit in the shadow column
+        (A_USDC, '0.5', '2'),
+    ]
+    with db.db.user_write() as write_cursor:
+        db.add_history_events(
+            write_cursor=write_cursor,
+            history=[HistoryEvent(
+                event_identifier=f'STATS{idx}',
+                sequence_index=0,
+                timestamp=TimestampMS(1),
+                location=Location.KRAKEN,
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                asset=asset,
+                balance=Balance(amount=FVal(amount), usd_value=FVal(usd_value)),
+            ) for idx, (asset, amount, usd_value) in enumerate(amounts)],
+        )
+        assert write_cursor.execute(
+            'SELECT amount_scaled, usd_value_scaled FROM history_events WHERE event_identifier=?',
+            ('STATS4',),
+        ).fetchone() == (None, 2000000)
+
+    with db.db.conn.read_ctx() as cursor:
+        usd_value, assets_amounts = db.get_value_stats(
+            cursor=cursor,
+            query_filters='WHERE location=?',
+            bindings=[Location.KRAKEN.serialize_for_db()],
+        )
+
+    assert usd_value == FVal('6.3')
+    assert sorted(assets_amounts) == sorted([
+        (A_BTC.identifier, FVal('100000000000'), FVal(2)),
+        (A_ETH.identifier, FVal('0.3'), FVal('0.3')),
+        (A_USDC.identifier, FVal('1000000000000.5'), FVal(4)),
+    ])
+
+
+def test_history_events_groups(database):
+    """Test that the summary of the history events groups follows the events and the
+    ignored assets, and that grouped pages and counts are read from it"""
+    db = DBHistoryEvents(database)
+    events = [  # (event_identifier, sequence_index, timestamp, asset)
+        ('GROUP1', 0, 1000, A_ETH),
+        ('GROUP1', 1, 1000, A_BTC),
+        ('GROUP2', 0, 2000, A_ETH),
+        ('GROUP2', 1, 5000, A_USDC),  # different timestamps in a group
+        ('GROUP3', 0, 3000, A_USDC),
+    ]
+    with db.db.user_write() as write_cursor:
+        db.add_history_events(
+            write_cursor=write_cursor,
+            history=[HistoryEvent(
+                event_identifier=event_identifier,
+                sequence_index=sequence_index,
+                timestamp=TimestampMS(timestamp),
+                location=Location.KRAKEN,
+                event_type=HistoryEventType.STAKING,
+                event_subtype=HistoryEventSubType.REWARD,
+                asset=asset,
+                balance=Balance(amount=ONE),
+            ) for event_identifier, sequence_index, timestamp, asset in events],
+        )
+        db.db.add_to_ignored_assets(write_cursor, A_USDC)
+
+    def get_groups(**kwargs):
+        filter_query = HistoryEventFilterQuery.make(
+            limit=10,
+            offset=0,
+            exclude_ignored_assets=True,
+            **kwargs,
+        )
+        with db.db.conn.read_ctx() as cursor:
+            groups = db.get_history_events(cursor, filter_query, True, True)
+            count, _ = db.get_history_events_count(cursor, filter_query, True)
+        assert count == len(groups)
+        return [(grouped_num, event.event_identifier) for grouped_num, event in groups]
+
+    with db.db.conn.read_ctx() as cursor:
+        assert cursor.execute(
+            'SELECT event_identifier, timestamp, events_num, ignored_events_num, mixed '
+            'FROM history_events_groups ORDER BY event_identifier',
+        ).fetchall() == [
+            ('GROUP1', 1000, 2, 0, 0),
+            ('GROUP2', 2000, 2, 1, 1),
+            ('GROUP3', 3000, 1, 1, 0),
+        ]
+    assert get_groups() == [(2, 'GROUP1'), (1, 'GROUP2')]
+    # only the ignored event of GROUP2 is in the range
+    assert get_groups(from_ts=4, to_ts=6) == []
+
+    with db.db.user_write() as write_cursor:
+        db.db.remove_from_ignored_assets(write_cursor, A_USDC)
+    assert get_groups() == [(2, 'GROUP1'), (2, 'GROUP2'), (1, 'GROUP3')]
+    assert get_groups(from_ts=4, to_ts=6) == [(1, 'GROUP2')]
+
+    with db.db.user_write() as write_cursor:
+        write_cursor.execute('DELETE FROM history_events WHERE event_identifier="GROUP1"')
+    assert get_groups() == [(2, 'GROUP2'), (1, 'GROUP3')]
+    with db.db.conn.read_ctx() as cursor:
+        assert db.db.get_entries_count(cursor, 'history_events_groups') == 2
@@ -1,3 +1,4 @@
+from rotkehlchen.accounting.metrics import ReportMetrics
 from rotkehlchen.accounting.pnl import PnlTotals
 from rotkehlchen.db.reports import DBAccountingReports
 from rotkehlchen.db.settings import DBSettings
@@ -55,3 +56,40 @@ def test_report_settings(database):
         else:
             value = getattr(settings, setting_name)
         assert returned_settings[x] == value
+
+
+def test_report_metrics(database):
+    dbreport = DBAccountingReports(database)
+    report_id = dbreport.add_report(
+        first_processed_timestamp=1,
+        start_ts=1,
+        end_ts=10,
+        settings=DBSettings(),
+    )
+    metrics = ReportMetrics()
+    metrics.stages['history.db_read'] = 0.5
+    metrics.stages['accounting.processing'] = 2
+    metrics.increase('events_processed', 5)
+    metrics.finish()
+    dbreport.add_report_overview(
+        report_id=report_id,
+        last_processed_timestamp=9,
+        processed_actions=5,
+        total_actions=5,
+        pnls=PnlTotals(),
+        metrics=metrics,
+    )
+    data, _ = dbreport.get_reports(report_id=report_id, with_limit=False)
+    assert data[0]['metrics'] == {
+        'stages': {'history.db_read': 0.5, 'accounting.processing': 2},
+        'counters': {
+            'events_processed': 5,
+            'events_per_second': 2.5,
+            'price_queries': 0,
+            'price_oracle_queries': 0,
+            'price_memo_hits': 0,
+            'price_memo_misses': 0,
+            'price_cache_hits': 0,
+            'price_cache_misses': 0,
+        },
+    }
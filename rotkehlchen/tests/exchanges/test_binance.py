@@ -897,3 +897,99 @@ def test_binance_query_trade_history_custom_markets(function_scope_binance):
         binance.query_trade_history(start_ts=0, end_ts=1564301134, only_cache=False)
 
     assert count == len(markets)
+
+
+def test_binance_query_trade_history_from_last_trade_ids(function_scope_binance):
+    """Test that the last queried trade id of each market is saved along with the
+    trades and later queries only ask for the trades after it"""
+    binance = function_scope_binance
+    binance.selected_pairs = ['BNBBTC', 'ETHBTC']
+    queried_from_ids = {}
+    p = re.compile(r'symbol=([A-Z]*)&fromId=(\d*)&')
+
+    def mock_my_trades(url, timeout):  # pylint: disable=unused-argument
+        text = '[]'
+        if '/fiat/payments' not in url:
+            market, from_id = p.search(url).groups()
+            queried_from_ids[market] = int(from_id)
+            if market == 'BNBBTC' and int(from_id) == 0:
+                text = BINANCE_MYTRADES_RESPONSE
+        return MockResponse(200, text, headers={'x-mbx-used-weight-1m': '42'})
+
+    with patch.object(binance.session, 'get', side_effect=mock_my_trades):
+        trades = binance.query_trade_history(start_ts=0, end_ts=1564301134, only_cache=False)
+        assert queried_from_ids == {'BNBBTC': 0, 'ETHBTC': 0}
+        assert len(trades) == 1
+        assert binance.used_weight == 42
+        assert binance.pending_weight == 0
+
+        trades = binance.query_trade_history(start_ts=0, end_ts=1600000000, only_cache=False)
+        assert queried_from_ids == {'BNBBTC': 28458, 'ETHBTC': 0}
+        assert len(trades) == 1
+
+    assert binance._get_last_trade_ids() == {
+        'BNBBTC': (28458, 1600000000),
+        'ETHBTC': (0, 1600000000),
+    }
+    with binance.db.user_write() as write_cursor:
+        binance.db.delete_used_query_range_for_exchange(
+            write_cursor=write_cursor,
+            location=binance.location,
+            exchange_name=binance.name,
+        )
+    assert binance._get_last_trade_ids() == {}
+
+
+def test_binance_query_trade_history_resumes_markets(function_scope_binance):
+    """Test that an interrupted trades query saves the queried markets along with their
+    last trade ids and that the next query of the range continues from them"""
+    binance = function_scope_binance
+    binance.selected_pairs = ['BNBBTC', 'ETHBTC']
+    end_ts = Timestamp(1564301134)
+    queried_symbols = []
+    p = re.compile(r'symbol=([A-Z]*)&')
+
+    def mock_my_trades(url, timeout, fail_market):  # pylint: disable=unused-argument
+        market = p.search(url).group(1)
+        queried_symbols.append(market)
+        if market == fail_market:
+            return MockResponse(500, '{"code": 1, "msg": "error"}')
+        text = BINANCE_MYTRADES_RESPONSE if market == 'BNBBTC' else '[]'
+        return MockResponse(200, text)
+
+    with (
+        patch('rotkehlchen.exchanges.binance.BINANCE_TRADES_QUERY_CONCURRENCY', new=1),
+        patch.object(binance, '_prioritize_symbols', return_value=['BNBBTC', 'ETHBTC']),
+        patch.object(binance, '_query_online_fiat_payments', return_value=[]),
+    ):
+        with (
+            patch.object(binance.session, 'get', side_effect=lambda url, timeout: mock_my_trades(url, timeout, 'ETHBTC')),  # noqa: E501
+            pytest.raises(RemoteError),
+        ):
+            binance.query_online_trade_history(start_ts=Timestamp(0), end_ts=end_ts)
+
+        checkpoint = binance.get_pagination_checkpoint('trades', Timestamp(0), end_ts)
+        assert checkpoint is not None
+        assert [page_cursor for page_cursor, _ in checkpoint.pages] == ['["BNBBTC", [28458, 1564301134]]']  # noqa: E501
+
+        queried_symbols.clear()
+        with patch.object(binance.session, 'get', side_effect=lambda url, timeout: mock_my_trades(url, timeout, None)):  # noqa: E501
+            trades, _ = binance.query_online_trade_history(start_ts=Timestamp(0), end_ts=end_ts)
+
+    assert queried_symbols == ['ETHBTC']
+    assert len(trades) == 1
+    assert binance.pending_last_trade_ids == {'BNBBTC': (28458, end_ts)}
+    assert binance.get_pagination_checkpoint('trades', Timestamp(0), end_ts) is None
+
+
+def test_binance_api_weight_released_on_error(function_scope_binance):
+    """Test that the api weight reserved for a request is released if the request
+    fails before being sent"""
+    binance = function_scope_binance
+    with (
+        patch('rotkehlchen.exchanges.binance.hmac.new', side_effect=ValueError('signing failed')),
+        pytest.raises(ValueError, match='signing failed'),
+    ):
+        binance.api_query('api', 'myTrades', options={'symbol': 'BNBBTC'})
+
+    assert binance.pending_weight == 0
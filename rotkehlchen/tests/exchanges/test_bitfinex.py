@@ -1,4 +1,5 @@
 import datetime
+import json
 import warnings as test_warnings
 from contextlib import ExitStack
 from http import HTTPStatus
@@ -17,6 +18,7 @@ from rotkehlchen.assets.utils import get_or_create_evm_token
 from rotkehlchen.constants.assets import A_BTC, A_ETH, A_EUR, A_GLM, A_LINK, A_USD, A_USDT, A_WBTC
 from rotkehlchen.constants.resolver import ethaddress_to_identifier
 from rotkehlchen.errors.asset import UnknownAsset, UnsupportedAsset
+from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.exchanges.bitfinex import (
     API_ERR_AUTH_NONCE_CODE,
     API_ERR_AUTH_NONCE_MESSAGE,
@@ -667,6 +669,48 @@ def test_query_online_trade_history_case_1(mock_bitfinex):
         assert trades == expected_trades
 
 
+@pytest.mark.freeze_time(datetime.datetime(2020, 12, 3, 12, 0, 0, tzinfo=datetime.timezone.utc))
+def test_query_online_trade_history_continues_from_checkpoint(mock_bitfinex):
+    """Test that when a trades query fails after some pages, querying the same range
+    again continues after the last saved page and returns the trades of all pages"""
+    mock_bitfinex.first_connection = MagicMock()
+    mock_bitfinex.currency_map = {
+        'UST': ethaddress_to_identifier('0xdAC17F958D2ee523a2206206994597C13D831ec7'),
+    }
+    mock_bitfinex.pair_bfx_symbols_map = {'ETHUST': ('ETH', 'UST')}
+    trade_1 = '[1, "tETH:UST", 1606899600000, 10, 0.26334268, 187.37, "LIMIT", null, -1, -0.09868591, "USD"]'  # noqa: E501
+    trade_2 = '[2, "tETH:UST", 1606901400000, 20, -0.26334268, 187.37, "LIMIT", null, -1, -0.09868591, "ETH"]'  # noqa: E501
+    end_ts = Timestamp(1606996800)
+    responses = iter([f'[{trade_1}]', RemoteError('boom'), f'[{trade_2}]', '[]'])
+
+    def mock_api_query_response(endpoint, options):  # pylint: disable=unused-argument
+        response = next(responses)
+        if isinstance(response, RemoteError):
+            raise response
+        return MockResponse(HTTPStatus.OK, response)
+
+    api_limit_patch = patch(target='rotkehlchen.exchanges.bitfinex.API_TRADES_MAX_LIMIT', new=1)
+    api_query_patch = patch.object(
+        target=mock_bitfinex,
+        attribute='_api_query',
+        side_effect=mock_api_query_response,
+    )
+    with ExitStack() as stack:
+        stack.enter_context(api_limit_patch)
+        api_query_mock = stack.enter_context(api_query_patch)
+        with pytest.raises(RemoteError):
+            mock_bitfinex.query_online_trade_history(start_ts=Timestamp(0), end_ts=end_ts)
+
+        checkpoint = mock_bitfinex.get_pagination_checkpoint('trades', Timestamp(0), end_ts)
+        assert checkpoint.pages == [('1606899600000', [json.loads(trade_1)])]
+        api_query_mock.reset_mock()
+        trades, _ = mock_bitfinex.query_online_trade_history(start_ts=Timestamp(0), end_ts=end_ts)
+
+    assert [call_args.kwargs['options']['start'] for call_args in api_query_mock.call_args_list] == [1606899600000, 1606901400000]  # noqa: E501
+    assert [trade.link for trade in trades] == ['1', '2']
+    assert mock_bitfinex.get_pagination_checkpoint('trades', Timestamp(0), end_ts) is None
+
+
 @pytest.mark.freeze_time(datetime.datetime(2020, 12, 3, 12, 0, 0, tzinfo=datetime.timezone.utc))
 def test_query_online_trade_history_case_2(mock_bitfinex):
     """Test pagination logic for trades works as expected when a request
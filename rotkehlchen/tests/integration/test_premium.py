@@ -167,6 +167,40 @@ def test_upload_data_to_server_same_hash(rotkehlchen_instance):
         assert not put_mock.called
 
 
+@pytest.mark.parametrize('start_with_valid_premium', [True])
+def test_upload_data_to_server_unchanged_db_skips_export(rotkehlchen_instance):
+    """Test that an unchanged DB with the same hash as the remote is not exported again"""
+    data = rotkehlchen_instance.data
+    sync_manager = rotkehlchen_instance.premium_sync_manager
+    with data.db.user_write() as write_cursor:
+        # Write anything in the DB to set a non-zero last_write_ts
+        data.db.set_settings(write_cursor, ModifiableDBSettings(main_currency=A_EUR))
+
+    _, our_hash = data.compress_and_encrypt_db()
+    patched_get = create_patched_requests_get_for_premium(
+        session=rotkehlchen_instance.premium.session,
+        metadata_last_modify_ts=0,
+        metadata_data_hash=our_hash,
+        metadata_data_size=2,
+        saved_data='foo',
+    )
+    patched_export = patch.object(data, 'compress_and_encrypt_db', wraps=data.compress_and_encrypt_db)  # noqa: E501
+    with patched_get, patched_export as export_mock:
+        assert sync_manager.maybe_upload_data_to_server() == (False, 'Remote database is up to date')  # noqa: E501
+        assert export_mock.call_count == 0
+        assert sync_manager.skipped_exports == 1
+        assert sync_manager.skipped_export_bytes == data.last_export.db_size > 0
+
+        # a write to the DB, even one that does not change last_write_ts, is detected
+        assert data.unchanged_db_export() == data.last_export
+        with data.db.conn.write_ctx() as write_cursor:
+            write_cursor.execute(
+                'INSERT OR REPLACE INTO settings(name, value) VALUES(?, ?)',
+                ('foo', 'bar'),
+            )
+        assert data.unchanged_db_export() is None
+
+
 @pytest.mark.parametrize('start_with_valid_premium', [True])
 def test_upload_data_to_server_smaller_db(rotkehlchen_instance):
     """Test that if the server has bigger DB size no upload happens"""
@@ -1,4 +1,6 @@
+from collections import Counter
 from typing import TYPE_CHECKING
+from unittest.mock import patch
 
 import pytest
 
@@ -11,6 +13,8 @@ from rotkehlchen.constants import ONE, ZERO
 from rotkehlchen.constants.assets import A_ETH, A_ETH2, A_EUR, A_KFEE, A_USD, A_USDT
 from rotkehlchen.exchanges.data_structures import Trade
 from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
 from rotkehlchen.tests.utils.accounting import accounting_history_process, check_pnls_and_csv
 from rotkehlchen.tests.utils.constants import A_GBP
 from rotkehlchen.tests.utils.history import prices
@@ -226,3 +230,124 @@ def test_main_currency_is_respected(
     assert len(warnings) == len(errors) == 0
     # Check that the price is correctly computed in GBP
     assert accountant.pots[0].processed_events[0].price == trade_rate * mocked_price_queries['USD']['GBP'][1609537953]  # noqa: E501
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_prices_are_prefetched_once(accountant, price_historian):
+    """Test that the prices of a report are prefetched and each one is queried only once"""
+    queried_prices: Counter[tuple[str, Timestamp]] = Counter()
+    original_query = price_historian.query_historical_price
+
+    def counting_query(from_asset, to_asset, timestamp):
+        queried_prices[(from_asset.identifier, timestamp)] += 1
+        return original_query(from_asset, to_asset, timestamp)
+
+    history = [
+        Trade(
+            timestamp=Timestamp(1609537953),
+            location=Location.KRAKEN,
+            base_asset=A_ETH,
+            quote_asset=A_EUR,
+            trade_type=TradeType.BUY,
+            amount=AssetAmount(ONE),
+            rate=Price(FVal('598.26')),
+            fee=Fee(ONE),
+            fee_currency=A_EUR,
+            link=None,
+        ), Trade(
+            timestamp=Timestamp(1624395186),
+            location=Location.KRAKEN,
+            base_asset=A_ETH,
+            quote_asset=A_EUR,
+            trade_type=TradeType.SELL,
+            amount=AssetAmount(FVal('0.5')),
+            rate=Price(FVal('1862.06')),
+            fee=Fee(FVal('0.5')),
+            fee_currency=A_ETH,
+            link=None,
+        ),
+    ]
+    with patch.object(price_historian, 'query_historical_price', side_effect=counting_query):
+        accounting_history_process(
+            accountant=accountant,
+            start_ts=Timestamp(1436979735),
+            end_ts=Timestamp(1625001466),
+            history_list=history,
+        )
+
+    assert (A_ETH.identifier, Timestamp(1609537953)) in queried_prices
+    assert (A_ETH.identifier, Timestamp(1624395186)) in queried_prices
+    assert set(queried_prices.values()) == {1}
+    assert accountant.pots[0].prefetched_prices == {}  # released after the report
+    expected_pnls = PnlTotals({
+        AccountingEventType.TRADE: PNL(taxable=FVal('-299.63'), free=ZERO),
+    })
+    check_pnls_and_csv(accountant, expected_pnls)
+
+
+@pytest.mark.parametrize('mocked_price_queries', [prices])
+def test_stored_prices_are_prefetched(accountant, price_historian):
+    """Test that the prices already stored in the global DB are prefetched with a single
+    query and that the oracles are not queried for them. Also that prices of events which
+    are not processed are not prefetched."""
+    GlobalDBHandler.add_historical_prices([HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+        timestamp=Timestamp(1609537900),  # less than an hour away from the trade
+        price=Price(FVal('598.26')),
+    ), HistoricalPrice(
+        from_asset=A_ETH,
+        to_asset=A_EUR,
+        source=HistoricalPriceOracle.MANUAL,
+        timestamp=Timestamp(1624395186),
+        price=Price(FVal('1862.06')),
+    )])
+    history = [
+        Trade(
+            timestamp=Timestamp(1609537953),
+            location=Location.KRAKEN,
+            base_asset=A_ETH,
+            quote_asset=A_EUR,
+            trade_type=TradeType.BUY,
+            amount=AssetAmount(ONE),
+            rate=Price(FVal('598.26')),
+            fee=Fee(ONE),
+            fee_currency=A_EUR,
+            link=None,
+        ), Trade(
+            timestamp=Timestamp(1624395186),
+            location=Location.KRAKEN,
+            base_asset=A_ETH,
+            quote_asset=A_EUR,
+            trade_type=TradeType.SELL,
+            amount=AssetAmount(FVal('0.5')),
+            rate=Price(FVal('1862.06')),
+            fee=Fee(FVal('0.5')),
+            fee_currency=A_ETH,
+            link=None,
+        ), Trade(  # after the end of the report, so never processed
+            timestamp=Timestamp(1625001467),
+            location=Location.KRAKEN,
+            base_asset=A_ETH,
+            quote_asset=A_EUR,
+            trade_type=TradeType.SELL,
+            amount=AssetAmount(FVal('0.5')),
+            rate=Price(FVal('1862.06')),
+            fee=Fee(ZERO),
+            fee_currency=A_EUR,
+            link=None,
+        ),
+    ]
+    pot = accountant.pots[0]
+    pot.reset(settings=pot.settings, start_ts=Timestamp(1436979735), end_ts=Timestamp(1625001466), report_id=1)  # noqa: E501
+    pot.prefetch_prices(events=history, ignored_ids_mapping={})
+
+    assert pot.prefetched_prices == {
+        (A_ETH.identifier, Timestamp(1609537953)): Price(FVal('598.26')),
+        (A_ETH.identifier, Timestamp(1624395186)): Price(FVal('1862.06')),
+    }
+    with patch.object(price_historian, 'query_historical_price') as query_mock:
+        assert pot.get_rate_in_profit_currency(A_ETH, Timestamp(1609537953)) == FVal('598.26')
+        assert pot.get_rate_in_profit_currency(A_ETH, Timestamp(1624395186)) == FVal('1862.06')
+    assert query_mock.call_count == 0
@@ -1,7 +1,11 @@
 import pytest
 
 from rotkehlchen.args import app_args
-from rotkehlchen.constants.misc import DEFAULT_SQL_VM_INSTRUCTIONS_CB
+from rotkehlchen.constants.misc import (
+    DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
+    DEFAULT_MAX_WORKER_PROCESSES,
+    DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+)
 
 
 @pytest.fixture(name='argparser')
@@ -28,3 +32,23 @@ def test_arg_sql_vm_instructions_cb(argparser):
     assert args.sqlite_instructions == 200
     args = argparser.parse_args(['--sqlite-instructions', '0'])
     assert args.sqlite_instructions == 0
+
+
+def test_arg_max_worker_processes(argparser):
+    with pytest.raises(SystemExit):
+        argparser.parse_args(['--max-worker-processes', '-1'])
+
+    args = argparser.parse_args(['--data-dir', 'foo'])
+    assert args.max_worker_processes == DEFAULT_MAX_WORKER_PROCESSES
+    args = argparser.parse_args(['--max-worker-processes', '4'])
+    assert args.max_worker_processes == 4
+
+
+def test_arg_max_size_in_mb_asset_cache(argparser):
+    with pytest.raises(SystemExit):
+        argparser.parse_args(['--max-size-in-mb-asset-cache', '-1'])
+
+    args = argparser.parse_args(['--data-dir', 'foo'])
+    assert args.max_size_in_mb_asset_cache == DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB
+    args = argparser.parse_args(['--max-size-in-mb-asset-cache', '128'])
+    assert args.max_size_in_mb_asset_cache == 128
@@ -10,9 +10,10 @@ import pytest
 from eth_utils import is_checksum_address
 
 from rotkehlchen.assets.asset import Asset, CryptoAsset, CustomAsset, EvmToken, FiatAsset, Nft
+from rotkehlchen.assets.resolver import AssetResolver
 from rotkehlchen.assets.types import AssetType
 from rotkehlchen.assets.utils import get_or_create_evm_token, symbol_to_evm_token
-from rotkehlchen.constants.assets import A_DAI, A_USDT
+from rotkehlchen.constants.assets import A_DAI, A_USDT, A_YV1_DAI
 from rotkehlchen.constants.resolver import evm_address_to_identifier, strethaddress_to_identifier
 from rotkehlchen.db.custom_assets import DBCustomAssets
 from rotkehlchen.errors.asset import UnknownAsset, WrongAssetType
@@ -739,6 +740,24 @@ def test_resolve_nft():
     )
 
 
+def test_resolve_assets(globaldb: GlobalDBHandler):
+    """Test that resolving many assets at once gives the same assets as resolving them
+    one by one and that the resolved assets are then served from the cache"""
+    AssetResolver().clean_memory_cache()
+    identifiers = ['ETH', A_DAI.identifier, A_USDT.identifier.lower(), A_YV1_DAI.identifier, '_nft_foo', 'i-dont-exist']  # noqa: E501
+    assets = AssetResolver().resolve_assets(identifiers)
+    assert list(assets) == identifiers[:-1]
+    for identifier, asset in assets.items():
+        assert vars(asset) == vars(globaldb.resolve_asset(identifier))
+
+    stats = AssetResolver().cache_stats()['assets']
+    assert stats['size'] == 5
+    assert stats['misses'] == 6
+    for identifier, asset in assets.items():
+        assert AssetResolver().resolve_asset(identifier) is asset
+    assert AssetResolver().cache_stats()['assets']['hits'] == stats['hits'] + 5
+
+
 def test_symbol_or_name(database):
     db_custom_assets = DBCustomAssets(database)
     db_custom_assets.add_custom_asset(CustomAsset.initialize(
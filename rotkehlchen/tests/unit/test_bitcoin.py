@@ -16,8 +16,9 @@ from rotkehlchen.chain.bitcoin.utils import (
     scriptpubkey_to_p2pkh_address,
     scriptpubkey_to_p2sh_address,
 )
-from rotkehlchen.chain.bitcoin.xpub import XpubData
+from rotkehlchen.chain.bitcoin.xpub import XpubData, _derive_addresses_from_xpub_data
 from rotkehlchen.chain.constants import NON_BITCOIN_CHAINS, SupportedBlockchain
+from rotkehlchen.constants import ONE
 from rotkehlchen.errors.misc import RemoteError, XPUBError
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.ens import ENS_BRUNO_BTC_ADDR, ENS_BRUNO_BTC_BYTES
@@ -535,3 +536,53 @@ def test_bitcoin_balance_api_resolver(network_mocking):
             # Third source fails - FATALITY!!!
             with patch('rotkehlchen.chain.bitcoin._query_mempool_space', MagicMock(side_effect=RemoteError('Fatality'))), pytest.raises(RemoteError):  # noqa: E501
                 get_bitcoin_addresses_balances(addresses)
+
+
+def test_derive_addresses_from_xpub_uses_cache():
+    """Test that addresses are derived for both chains and reused from the cache"""
+    xpub = 'xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk'  # noqa: E501
+    xpub_data = XpubData(xpub=HDKey.from_xpub(xpub=xpub, path='m'), blockchain=SupportedBlockchain.BITCOIN)  # noqa: E501
+    used_addresses = {
+        '1K3WM7WNiyZCkH31eMoEDwEcmnGNvQfZVA',
+        '16zNpyv8KxChtjXnE5nYcPqcXcrSQXX2JW',
+    }
+
+    def mock_have_transactions(accounts):
+        return {x: (x in used_addresses, FVal(1) if x in used_addresses else FVal(0)) for x in accounts}  # noqa: E501
+
+    derived_cache: dict = {}
+    have_transactions_patch = patch(
+        'rotkehlchen.chain.bitcoin.xpub.have_bitcoin_transactions',
+        side_effect=mock_have_transactions,
+    )
+    derive_patch = patch.object(
+        HDKey,
+        'derive_child',
+        autospec=True,
+        side_effect=HDKey.derive_child,
+    )
+    with have_transactions_patch, derive_patch as derive_mock:
+        addresses = _derive_addresses_from_xpub_data(
+            xpub_data=xpub_data,
+            start_receiving_index=0,
+            start_change_index=0,
+            gap_limit=5,
+            derived_cache=derived_cache,
+        )
+        # receiving: 2 queried batches + 1 derived while querying. Change: 1 + 1
+        assert len(derived_cache) == 25
+        first_run_derivations = derive_mock.call_count
+        assert {x.address for x in addresses if x.balance == ONE} == used_addresses
+        assert all(x.account_index == 0 for x in addresses)
+        assert derived_cache[(0, 0)] == '1K3WM7WNiyZCkH31eMoEDwEcmnGNvQfZVA'
+
+        derive_mock.reset_mock()
+        assert _derive_addresses_from_xpub_data(
+            xpub_data=xpub_data,
+            start_receiving_index=0,
+            start_change_index=0,
+            gap_limit=5,
+            derived_cache=derived_cache,
+        ) == addresses
+        assert derive_mock.call_count == 2  # only the receiving and change roots
+        assert first_run_derivations == 27
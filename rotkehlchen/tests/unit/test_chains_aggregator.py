@@ -1,6 +1,9 @@
+import time
 from contextlib import ExitStack
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Callable
+from unittest.mock import patch
 
+import gevent
 import pytest
 
 from rotkehlchen.assets.asset import Asset
@@ -9,6 +12,7 @@ from rotkehlchen.chain.accounts import BlockchainAccountData
 from rotkehlchen.chain.aggregator import ChainsAggregator, _module_name_to_class
 from rotkehlchen.chain.evm.types import NodeName, WeightedNode, string_to_evm_address
 from rotkehlchen.constants import ONE
+from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.tests.utils.blockchain import setup_evm_addresses_activity_mock
 from rotkehlchen.tests.utils.factories import make_evm_address
 from rotkehlchen.tests.utils.polygon_pos import ALCHEMY_RPC_ENDPOINT
@@ -252,3 +256,39 @@ def test_detect_evm_accounts_spam_tx(polygon_pos_manager: 'PolygonPOSManager') -
             db.add_to_ignored_assets(write_cursor=write_cursor, asset=asset)
 
     assert polygon_pos_manager.transactions.address_has_been_spammed(evm_address) is True
+
+
+@pytest.mark.parametrize('ethereum_accounts', [[]])
+def test_query_all_chains_balances_concurrently(blockchain: 'ChainsAggregator') -> None:
+    """Test that the balances of all chains are queried concurrently and that the error
+    of a failed chain is raised after all the other chains have been queried"""
+    queried_chains = []
+
+    def make_query(chain: SupportedBlockchain) -> Callable[..., None]:
+        def query(**kwargs: Any) -> None:  # pylint: disable=unused-argument
+            gevent.sleep(0.2)
+            queried_chains.append(chain)
+
+        return query
+
+    with ExitStack() as stack:
+        for chain in SupportedBlockchain:
+            stack.enter_context(patch.object(blockchain, f'query_{chain.get_key()}_balances', side_effect=make_query(chain)))  # noqa: E501
+        start = time.perf_counter()
+        blockchain.query_balances(ignore_cache=True)
+        assert time.perf_counter() - start < 0.2 * len(SupportedBlockchain) / 2
+
+    assert set(queried_chains) == set(SupportedBlockchain)
+    assert set(blockchain.balances_query_durations) == set(SupportedBlockchain)
+    assert all(x >= 0.2 for x in blockchain.balances_query_durations.values())
+
+    queried_chains.clear()
+    with ExitStack() as stack:
+        for chain in SupportedBlockchain:
+            stack.enter_context(patch.object(blockchain, f'query_{chain.get_key()}_balances', side_effect=make_query(chain)))  # noqa: E501
+        stack.enter_context(patch.object(blockchain, 'query_dot_balances', side_effect=RemoteError('dot failed')))  # noqa: E501
+        with pytest.raises(RemoteError, match='dot failed'):
+            blockchain.query_balances(ignore_cache=True)
+
+    assert set(queried_chains) == set(SupportedBlockchain) - {SupportedBlockchain.POLKADOT}
+    assert SupportedBlockchain.POLKADOT not in blockchain.balances_query_durations
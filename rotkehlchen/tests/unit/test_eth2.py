@@ -34,6 +34,7 @@ from rotkehlchen.db.eth2 import DBEth2
 from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import Eth2DailyStatsFilterQuery, HistoryEventFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
+from rotkehlchen.errors.misc import RemoteError
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.factories import make_evm_address, make_evm_tx_hash
 from rotkehlchen.tests.utils.mock import MockResponse
@@ -405,6 +406,53 @@ def test_validator_daily_stats_with_db_interaction(  # pylint: disable=unused-ar
         # TODO: The new sum_pnl here is not changing as ownership proportion is not taken into account here  # noqa: E501
 
 
+def test_validator_daily_stats_saved_before_scrape_error(database, eth2):
+    """Test that the stats of the validators scraped before a failing scrape are saved
+    in the DB, that no more validators are scraped after it and that the failure is
+    raised after saving"""
+    dbeth2 = DBEth2(database)
+    with database.user_write() as write_cursor:
+        dbeth2.add_validators(write_cursor, [
+            Eth2Validator(index=index, public_key=Eth2PubKey(f'0x{index:096x}'), ownership_proportion=ONE)  # noqa: E501
+            for index in (999, 1000, 33710)
+        ])
+
+    root_path = Path(__file__).resolve().parent.parent.parent
+    stats_dir = root_path / 'tests' / 'data' / 'mocks' / 'test_eth2' / 'validator_daily_stats'
+    scraped_validators = []
+
+    def mock_scrape(url, **kwargs):  # pylint: disable=unused-argument
+        match = DAILY_STATS_RE.search(url)
+        assert match is not None, f'Unexpected validator stats query in test: {url}'
+        scraped_validators.append(validator_index := int(match.group(1)))
+        if validator_index == 1000:
+            return MockResponse(500, 'Internal server error')
+
+        return MockResponse(200, (stats_dir / f'{validator_index}.html').read_text())
+
+    original_get_validators = DBEth2.get_validators_to_query_for_stats
+    with (
+        patch('rotkehlchen.chain.ethereum.modules.eth2.utils.requests.get', side_effect=mock_scrape),  # noqa: E501
+        # scrape one validator at a time in index order so that the failure is in the middle
+        patch('rotkehlchen.chain.ethereum.modules.eth2.eth2.BEACONCHAIN_SCRAPE_CONCURRENCY', 1),
+        patch.object(
+            DBEth2,
+            'get_validators_to_query_for_stats',
+            autospec=True,
+            side_effect=lambda self, up_to_ts: sorted(original_get_validators(self, up_to_ts)),
+        ),
+        pytest.raises(RemoteError),
+    ):
+        eth2._query_services_for_validator_daily_stats(to_ts=Timestamp(1672000000))
+
+    assert scraped_validators == [999, 1000]
+    with database.conn.read_ctx() as cursor:
+        saved_validators = {row[0] for row in cursor.execute(
+            'SELECT DISTINCT validator_index FROM eth2_daily_staking_details',
+        )}
+    assert saved_validators == {999}
+
+
 @pytest.mark.parametrize('default_mock_price_value', [FVal(1.55)])
 def test_validator_daily_stats_with_genesis_event(
         network_mocking: bool,
@@ -1,6 +1,7 @@
 from typing import TYPE_CHECKING
 from unittest.mock import patch
 
+import gevent
 import pytest
 
 from rotkehlchen.accounting.structures.balance import Balance
@@ -19,6 +20,7 @@ from rotkehlchen.db.evmtx import DBEvmTx
 from rotkehlchen.db.filtering import EvmEventFilterQuery, EvmTransactionsFilterQuery
 from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.optimismtx import DBOptimismTx
+from rotkehlchen.errors.misc import InputError, RemoteError
 from rotkehlchen.fval import FVal
 from rotkehlchen.tests.utils.ethereum import INFURA_ETH_NODE
 from rotkehlchen.types import (
@@ -175,6 +177,125 @@ def test_tx_decode(ethereum_transaction_decoder, database):
         assert decode_mock.call_count == len(transactions)
 
 
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_decode_transaction_hashes_batches_writes(ethereum_transaction_decoder, database):
+    """Test that decoding many transactions saves them in batches of write transactions"""
+    dbevmtx = DBEvmTx(database)
+    hashes = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=5, addresses=None)  # noqa: E501
+    assert len(hashes) > 2
+    decoder = ethereum_transaction_decoder
+    saved_batch_sizes = []
+    original_save = decoder._save_decoded_transactions
+
+    def save_decoded_transactions(decoded):
+        if len(decoded) != 0:
+            saved_batch_sizes.append(len(decoded))
+        original_save(decoded)
+
+    batch_patch = patch('rotkehlchen.chain.evm.decoding.decoder.DECODING_WRITE_BATCH_SIZE', new=2)
+    save_patch = patch.object(decoder, '_save_decoded_transactions', side_effect=save_decoded_transactions)  # noqa: E501
+    with batch_patch, save_patch:
+        events = decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=hashes)
+
+    assert sum(saved_batch_sizes) == len(hashes)
+    assert all(x == 2 for x in saved_batch_sizes[:-1])
+    not_decoded = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=None, addresses=None)  # noqa: E501
+    assert set(hashes).isdisjoint(not_decoded)
+    # decoding again pulls the saved events from the DB
+    with patch.object(decoder, '_decode_transaction_events') as decode_mock:
+        assert len(decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=hashes)) == len(events)  # noqa: E501
+    assert decode_mock.call_count == 0
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_decode_transaction_hashes_pending_writes(ethereum_transaction_decoder, database):
+    """Test that decoders can save the pending decoded events before reading the DB and
+    that a failure to save them does not hide the error that stopped the decoding"""
+    dbevmtx = DBEvmTx(database)
+    hashes = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=3, addresses=None)  # noqa: E501
+    assert len(hashes) == 3
+    decoder = ethereum_transaction_decoder
+    original_decode = decoder._decode_transaction_events
+    not_decoded_counts = []
+
+    def decode_reading_db(transaction, tx_receipt):
+        decoder.base.save_pending_events()  # as a decoder reading the DB would do
+        not_decoded_counts.append(len(dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=None, addresses=None)))  # noqa: E501
+        return original_decode(transaction=transaction, tx_receipt=tx_receipt)
+
+    with patch.object(decoder, '_decode_transaction_events', side_effect=decode_reading_db):
+        decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=hashes)
+    # each decoding sees the transactions decoded before it as saved
+    assert [not_decoded_counts[0] - x for x in not_decoded_counts] == [0, 1, 2]
+
+    def decode_failing_last(transaction, tx_receipt):
+        if transaction.tx_hash == hashes[-1]:
+            raise RemoteError('decoding failed')
+        return original_decode(transaction=transaction, tx_receipt=tx_receipt)
+
+    with (
+        patch.object(decoder, '_decode_transaction_events', side_effect=decode_failing_last),
+        patch.object(decoder, '_save_decoded_events', side_effect=InputError('saving failed')),
+        pytest.raises(RemoteError, match='decoding failed'),
+    ):
+        decoder.decode_transaction_hashes(ignore_cache=True, tx_hashes=hashes)
+    assert decoder.base.save_pending_events_fn is None
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_decode_transaction_hashes_failed_write_is_retried(ethereum_transaction_decoder, database):
+    """Test that the decoded transactions of a batch whose write failed are kept and
+    saved by the retry when the decoding stops"""
+    dbevmtx = DBEvmTx(database)
+    hashes = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=3, addresses=None)  # noqa: E501
+    assert len(hashes) == 3
+    decoder = ethereum_transaction_decoder
+    original_save = decoder._save_decoded_events
+    failed = []
+
+    def save_failing_once(write_cursor, transaction, events):
+        if len(failed) == 0:
+            failed.append(transaction.tx_hash)
+            raise InputError('saving failed')
+        original_save(write_cursor=write_cursor, transaction=transaction, events=events)
+
+    with (
+        patch('rotkehlchen.chain.evm.decoding.decoder.DECODING_WRITE_BATCH_SIZE', new=2),
+        patch.object(decoder, '_save_decoded_events', side_effect=save_failing_once),
+        pytest.raises(InputError, match='saving failed'),
+    ):
+        decoder.decode_transaction_hashes(ignore_cache=False, tx_hashes=hashes)
+
+    not_decoded = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=None, addresses=None)  # noqa: E501
+    assert set(hashes[:2]).isdisjoint(not_decoded)
+    assert hashes[2] in not_decoded
+
+
+@pytest.mark.parametrize('use_custom_database', ['ethtxs.db'])
+def test_concurrent_decode_transaction_hashes(ethereum_transaction_decoder, database):
+    """Test that concurrent calls decoding the same transactions don't decode them twice
+    and that each call saves only its own events"""
+    dbevmtx = DBEvmTx(database)
+    hashes = dbevmtx.get_transaction_hashes_not_decoded(chain_id=ChainID.ETHEREUM, limit=3, addresses=None)  # noqa: E501
+    assert len(hashes) == 3
+    decoder = ethereum_transaction_decoder
+    original_decode = decoder._decode_transaction_events
+
+    def decode_yielding(transaction, tx_receipt):
+        gevent.sleep(0)  # let the other greenlet run
+        return original_decode(transaction=transaction, tx_receipt=tx_receipt)
+
+    with patch.object(decoder, '_decode_transaction_events', side_effect=decode_yielding) as decode_mock:  # noqa: E501
+        greenlets = [
+            gevent.spawn(decoder.decode_transaction_hashes, ignore_cache=False, tx_hashes=hashes)
+            for _ in range(2)
+        ]
+        gevent.joinall(greenlets, raise_error=True)
+
+    assert decode_mock.call_count == len(hashes)
+    assert len(greenlets[0].value) == len(greenlets[1].value)
+
+
 @pytest.mark.parametrize('ethereum_accounts', [['0x9531C059098e3d194fF87FebB587aB07B30B1306', '0xc37b40ABdB939635068d3c5f13E7faF686F03B65']])  # noqa: E501
 @pytest.mark.parametrize('optimism_accounts', [['0x9531C059098e3d194fF87FebB587aB07B30B1306']])
 def test_query_and_decode_transactions_works_with_different_chains(
@@ -3,6 +3,7 @@ import os
 from http import HTTPStatus
 from unittest.mock import MagicMock, patch
 
+import gevent
 import pytest
 import requests
 from freezegun import freeze_time
@@ -37,7 +38,9 @@ from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
 from rotkehlchen.inquirer import (
     CURRENT_PRICE_CACHE_SECS,
+    CURRENT_PRICE_STALE_SECS,
     DEFAULT_RATE_LIMIT_WAITING_TIME,
+    CachedPriceEntry,
     CurrentPriceOracle,
     _query_currency_converterapi,
 )
@@ -201,7 +204,7 @@ def test_find_usd_price_cache(inquirer, freezer):  # pylint: disable=unused-argu
         nonlocal call_count
         if call_count == 0:
             price = Price(FVal('1'))
-        elif call_count in (1, 2):
+        elif call_count in (1, 2, 3, 4):
             price = Price(FVal('2'))
         else:
             raise AssertionError('Called too many times for this test')
@@ -226,11 +229,17 @@ def test_find_usd_price_cache(inquirer, freezer):  # pylint: disable=unused-argu
         assert cc.call_count == 1
         assert price == Price(FVal('1'))
 
-        # now move forward in time to invalidate the cache
+        # now move forward in time to expire the cache. The stale price is returned
+        # while the price is queried again in the background
         freezer.move_to(datetime.datetime.fromtimestamp(
             ts_now() + CURRENT_PRICE_CACHE_SECS + 1,
             tz=datetime.timezone.utc,
         ))
+        price = inquirer.find_usd_price(A_ETH, allow_stale=True)
+        assert price == Price(FVal('1'))
+        gevent.joinall(list(inquirer._current_price_refreshes.values()))
+        assert cc.call_count == 2
+        assert len(inquirer._current_price_refreshes) == 0
         price = inquirer.find_usd_price(A_ETH)
         assert cc.call_count == 2
         assert price == Price(FVal('2'))
@@ -243,6 +252,55 @@ def test_find_usd_price_cache(inquirer, freezer):  # pylint: disable=unused-argu
         assert cc.call_count == 3
         assert price == Price(FVal('2'))
 
+        # prices older than the stale period are queried before returning
+        freezer.move_to(datetime.datetime.fromtimestamp(
+            ts_now() + CURRENT_PRICE_STALE_SECS + 1,
+            tz=datetime.timezone.utc,
+        ))
+        price = inquirer.find_usd_price(A_ETH, allow_stale=True)
+        assert cc.call_count == 4
+        assert price == Price(FVal('2'))
+        assert len(inquirer._current_price_refreshes) == 0
+
+        # if stale prices are not allowed an expired price is queried before returning
+        freezer.move_to(datetime.datetime.fromtimestamp(
+            ts_now() + CURRENT_PRICE_CACHE_SECS + 1,
+            tz=datetime.timezone.utc,
+        ))
+        price = inquirer.find_usd_price(A_ETH)
+        assert cc.call_count == 5
+        assert price == Price(FVal('2'))
+        assert len(inquirer._current_price_refreshes) == 0
+
+
+def test_current_prices_cache_persistence(inquirer, database):
+    """Test that the cached current prices are kept in the transient DB and loaded back"""
+    inquirer._cached_current_price.add((A_ETH, A_USD), CachedPriceEntry(
+        price=Price(FVal('1500')),
+        time=ts_now(),
+        oracle=CurrentPriceOracle.COINGECKO,
+        used_main_currency=False,
+    ))
+    inquirer._cached_current_price.add((A_BTC, A_EUR), CachedPriceEntry(
+        price=Price(FVal('25000')),
+        time=Timestamp(ts_now() - CURRENT_PRICE_STALE_SECS - 1),  # too old to keep
+        oracle=CurrentPriceOracle.CRYPTOCOMPARE,
+        used_main_currency=True,
+    ))
+    inquirer._cached_current_price.add((A_DAI, A_USD), CachedPriceEntry(
+        price=ZERO_PRICE,  # not found prices are not kept
+        time=ts_now(),
+        oracle=CurrentPriceOracle.BLOCKCHAIN,
+        used_main_currency=False,
+    ))
+    inquirer.save_current_prices_cache(database)
+    eth_entry = inquirer._cached_current_price.get((A_ETH, A_USD))
+
+    inquirer.clear_current_prices_cache()
+    assert (A_ETH, A_USD) not in inquirer._cached_current_price
+    inquirer.load_current_prices_cache(database)
+    assert list(inquirer._cached_current_price.cache.items()) == [((A_ETH, A_USD), eth_entry)]
+
 
 def test_set_oracles_order(inquirer):
     inquirer.set_oracles_order([CurrentPriceOracle.COINGECKO])
@@ -2,6 +2,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Optional
 from unittest.mock import MagicMock, patch
 
+import gevent
 import pytest
 
 from rotkehlchen.constants.assets import A_BTC, A_USD
@@ -180,6 +181,79 @@ def test_token_to_fiat_via_second_oracle(fake_price_historian):
         assert oracle_instance.query_historical_price.call_count == 1
 
 
+def test_memoized_prices(fake_price_historian):
+    """Test that inside a memoization scope each price is queried from the oracles once,
+    including the prices that could not be found, and that the scope is cleared at exit.
+    """
+    price_historian = fake_price_historian
+    expected_price = Price(FVal('30000'))
+    oracle_instances = price_historian._oracle_instances
+    oracle_instances[1].query_historical_price.side_effect = PriceQueryUnsupportedAsset('bitcoin')
+    oracle_instances[2].query_historical_price.return_value = expected_price
+    found_ts, not_found_ts = Timestamp(1611595466), Timestamp(1611595467)
+
+    def query_not_found() -> None:
+        with pytest.raises(NoPriceForGivenTimestamp):
+            price_historian.query_historical_price(
+                from_asset=A_BTC,
+                to_asset=A_GBP,
+                timestamp=not_found_ts,
+            )
+
+    hits_before = PriceHistorian.stats['memo_hits']
+    with PriceHistorian.memoized_prices():
+        for _ in range(3):
+            assert price_historian.query_historical_price(
+                from_asset=A_BTC,
+                to_asset=A_USD,
+                timestamp=found_ts,
+            ) == expected_price
+        assert oracle_instances[2].query_historical_price.call_count == 1
+
+        oracle_instances[2].query_historical_price.side_effect = NoPriceForGivenTimestamp(
+            from_asset=A_BTC,
+            to_asset=A_GBP,
+            time=not_found_ts,
+        )
+        with PriceHistorian.memoized_prices():  # nested scopes share the memory
+            query_not_found()
+        query_not_found()
+        assert oracle_instances[2].query_historical_price.call_count == 2
+
+    assert PriceHistorian.stats['memo_hits'] - hits_before == 3
+    assert PriceHistorian._memoized_prices == {}
+    query_not_found()  # queried again outside of the scope
+    assert oracle_instances[2].query_historical_price.call_count == 3
+
+
+def test_memoized_prices_are_per_greenlet(fake_price_historian):
+    """Test that the prices memoized by a greenlet are not used by the other greenlets
+    and that they are forgotten when the manual prices of the pair change"""
+    price_historian = fake_price_historian
+    oracle_instances = price_historian._oracle_instances
+    oracle_instances[1].query_historical_price.side_effect = PriceQueryUnsupportedAsset('bitcoin')
+    oracle_instances[2].query_historical_price.return_value = Price(FVal('30000'))
+
+    def query_price() -> Price:
+        return price_historian.query_historical_price(
+            from_asset=A_BTC,
+            to_asset=A_USD,
+            timestamp=Timestamp(1611595466),
+        )
+
+    with PriceHistorian.memoized_prices():
+        query_price()
+        assert gevent.spawn(query_price).get() == Price(FVal('30000'))
+        assert oracle_instances[2].query_historical_price.call_count == 2
+        query_price()
+        assert oracle_instances[2].query_historical_price.call_count == 2
+
+        oracle_instances[2].query_historical_price.return_value = Price(FVal('31000'))
+        PriceHistorian.forget_memoized_prices(from_asset=A_USD, to_asset=A_BTC)
+        assert query_price() == Price(FVal('31000'))
+        assert oracle_instances[2].query_historical_price.call_count == 3
+
+
 def test_manual_oracle_correctly_returns_price(globaldb, fake_price_historian):
     """Test that the manual oracle correctly returns price for asset"""
     price_historian = fake_price_historian
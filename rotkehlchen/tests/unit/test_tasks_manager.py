@@ -4,26 +4,44 @@ from unittest.mock import MagicMock, patch
 import gevent
 import pytest
 
+from rotkehlchen.accounting.structures.balance import Balance, BalanceType
+from rotkehlchen.accounting.structures.base import HistoryEvent
+from rotkehlchen.accounting.structures.types import HistoryEventSubType, HistoryEventType
 from rotkehlchen.chain.bitcoin.hdkey import HDKey
 from rotkehlchen.chain.bitcoin.xpub import XpubData
+from rotkehlchen.constants import ONE
+from rotkehlchen.constants.assets import A_BTC
 from rotkehlchen.constants.timing import DATA_UPDATES_REFRESH
 from rotkehlchen.db.constants import LAST_DATA_UPDATES_KEY
 from rotkehlchen.db.evmtx import DBEvmTx
+from rotkehlchen.db.filtering import HistoryEventFilterQuery
+from rotkehlchen.db.history_events import DBHistoryEvents
 from rotkehlchen.db.settings import ModifiableDBSettings
 from rotkehlchen.db.updates import RotkiDataUpdater
+from rotkehlchen.db.utils import DBAssetBalance
 from rotkehlchen.errors.misc import RemoteError
+from rotkehlchen.fval import FVal
+from rotkehlchen.history.types import HistoricalPriceOracle
 from rotkehlchen.premium.premium import Premium, PremiumCredentials, SubscriptionStatus
 from rotkehlchen.tasks.manager import PREMIUM_STATUS_CHECK, TaskManager
-from rotkehlchen.tasks.utils import should_run_periodic_task
+from rotkehlchen.tasks.scheduler import BacklogType, TaskPriority, TaskSchedule
+from rotkehlchen.tasks.utils import query_missing_prices_of_base_entries, should_run_periodic_task
 from rotkehlchen.tests.utils.ethereum import (
     TEST_ADDR1,
     TEST_ADDR2,
     setup_ethereum_transactions_test,
 )
-from rotkehlchen.tests.utils.factories import make_evm_address
+from rotkehlchen.tests.utils.factories import make_evm_address, make_random_trades
 from rotkehlchen.tests.utils.mock import mock_evm_chains_with_transactions
 from rotkehlchen.tests.utils.premium import VALID_PREMIUM_KEY, VALID_PREMIUM_SECRET
-from rotkehlchen.types import ChainID, Location, SupportedBlockchain
+from rotkehlchen.types import (
+    EVM_CHAINS_WITH_TRANSACTIONS,
+    ChainID,
+    Location,
+    SupportedBlockchain,
+    Timestamp,
+    TimestampMS,
+)
 from rotkehlchen.utils.hexbytes import hexstring_to_bytes
 from rotkehlchen.utils.misc import ts_now
 
@@ -449,3 +467,179 @@ def test_maybe_kill_running_tx_query_tasks(rotkehlchen_api_server, ethereum_acco
         rotki.task_manager.potential_tasks = []
         rotki.task_manager.schedule()
         assert len(rotki.task_manager.running_greenlets) == 0
+
+
+def test_idle_backlog_task_does_not_query_db(task_manager):
+    """Test that a task whose backlog is known to be empty does not query the DB until
+    a producer adds work to its backlog or the DB is reconnected"""
+    task_manager.potential_tasks = [task_manager._maybe_decode_evm_transactions]
+    backlogs = task_manager.database.task_backlogs
+    count_patch = patch.object(DBEvmTx, 'count_hashes_not_decoded', return_value=0)
+    with count_patch as count_mock:
+        task_manager.schedule()
+        assert count_mock.call_count == len(EVM_CHAINS_WITH_TRANSACTIONS)
+        assert backlogs.get(BacklogType.EVM_TX_DECODING, ChainID.ETHEREUM) == 0
+
+        task_manager.schedule()
+        assert count_mock.call_count == len(EVM_CHAINS_WITH_TRANSACTIONS), 'should not query'
+
+        backlogs.increase(BacklogType.EVM_TX_DECODING, 2, ChainID.ETHEREUM)
+        task_manager.schedule()
+        assert count_mock.call_count == len(EVM_CHAINS_WITH_TRANSACTIONS) + 1
+        assert count_mock.call_args.kwargs['chain_id'] == ChainID.ETHEREUM
+
+        # a reconnection may replace the DB, so its backlogs have to be counted again
+        task_manager.database.disconnect()
+        task_manager.database._connect()
+        assert backlogs.get(BacklogType.EVM_TX_DECODING, ChainID.ETHEREUM) is None
+        task_manager.schedule()
+        assert count_mock.call_count == 2 * len(EVM_CHAINS_WITH_TRANSACTIONS) + 1
+
+
+def test_backlog_work_added_while_counting_is_kept(task_manager):
+    """Test that the work a producer adds while a task counts its backlog in the DB is
+    added to the estimate the task sets, so that the task does not stay idle"""
+    task_manager.potential_tasks = [task_manager._maybe_decode_evm_transactions]
+    backlogs = task_manager.database.task_backlogs
+
+    def count_while_producing(chain_id, **kwargs):  # pylint: disable=unused-argument
+        # the producer commits after the count has read the DB but before it's set
+        backlogs.increase(BacklogType.EVM_TX_DECODING, 1, chain_id)
+        return 0
+
+    count_patch = patch.object(
+        DBEvmTx,
+        'count_hashes_not_decoded',
+        side_effect=count_while_producing,
+    )
+    with count_patch as count_mock:
+        task_manager.schedule()
+        assert count_mock.call_count == len(EVM_CHAINS_WITH_TRANSACTIONS)
+        assert backlogs.get(BacklogType.EVM_TX_DECODING, ChainID.ETHEREUM) == 1
+
+        backlogs.increase(BacklogType.EVM_TX_DECODING, 1, ChainID.ETHEREUM)
+        assert backlogs.get(BacklogType.EVM_TX_DECODING, ChainID.ETHEREUM) == 2, 'counted once'
+
+
+@pytest.mark.parametrize('max_tasks_num', [1])
+def test_task_priorities_and_idle_delay(task_manager):
+    """Test that due tasks with higher priority are started first and that a task
+    which had nothing to do is not checked again before its idle delay passes"""
+    calls = []
+
+    def make_task(name):
+        def task():
+            calls.append(name)
+            if name == 'idle':
+                return None
+
+            return [task_manager.greenlet_manager.spawn_and_track(
+                method=lambda: gevent.sleep(0.1),
+                after_seconds=None,
+                task_name=name,
+                exception_is_error=True,
+            )]
+        return task
+
+    low_task, high_task, idle_task = make_task('low'), make_task('high'), make_task('idle')
+    task_manager.task_schedules = {
+        low_task: TaskSchedule(priority=TaskPriority.LOW),
+        high_task: TaskSchedule(priority=TaskPriority.HIGH),
+        idle_task: TaskSchedule(priority=TaskPriority.HIGH, idle_delay=100),
+    }
+    task_manager.potential_tasks = [low_task, high_task]
+    task_manager.schedule()
+    assert calls == ['high'], 'the only free slot should go to the high priority task'
+
+    gevent.wait(task_manager.running_greenlets[high_task])
+    gevent.sleep(0.01)  # let the link callbacks of the finished greenlet run
+    assert task_manager.task_schedules[high_task].last_run_duration is not None
+    task_manager.potential_tasks = [low_task, idle_task]
+    task_manager.schedule()
+    assert calls == ['high', 'idle', 'low']
+    assert task_manager.task_schedules[idle_task].next_run_ts >= ts_now() + 99
+
+    gevent.wait(task_manager.running_greenlets[low_task])
+    task_manager.schedule()
+    assert calls == ['high', 'idle', 'low', 'low'], 'idle task should not be checked again yet'
+
+
+@pytest.mark.parametrize('should_mock_price_queries', [False])
+@pytest.mark.parametrize('historical_price_oracles_order', [[HistoricalPriceOracle.CRYPTOCOMPARE]])
+def test_missing_prices_queried_in_ranges(database, price_historian, cryptocompare):  # pylint: disable=unused-argument
+    """Test that the prices of events of the same asset close in time are queried
+    with a single range query and that all of the events get their usd value"""
+    start_ts = 1665334800  # an hour boundary
+    with database.user_write() as write_cursor:
+        DBHistoryEvents(database).add_history_events(write_cursor=write_cursor, history=[
+            HistoryEvent(
+                event_identifier=f'event{idx}',
+                sequence_index=0,
+                timestamp=TimestampMS((start_ts + idx * 1800) * 1000),
+                location=Location.EXTERNAL,
+                event_type=HistoryEventType.RECEIVE,
+                event_subtype=HistoryEventSubType.NONE,
+                balance=Balance(amount=FVal(2)),
+                asset=A_BTC,
+            ) for idx in range(6)
+        ])
+
+    histohour_data = [{
+        'time': start_ts - 3600 + hour * 3600,
+        'high': str(20000 + hour * 100),
+        'low': str(20000 + hour * 100),
+    } for hour in range(6)]
+    histohour_patch = patch.object(
+        cryptocompare,
+        'query_endpoint_histohour',
+        return_value={'Data': histohour_data},
+    )
+    pricehistorical_patch = patch.object(
+        cryptocompare,
+        'query_endpoint_pricehistorical',
+        side_effect=AssertionError('should not query prices one by one'),
+    )
+    db = DBHistoryEvents(database)
+    entries = db.get_base_entries_missing_prices(HistoryEventFilterQuery.make())
+    assert len(entries) == 6
+
+    with histohour_patch as histohour_mock, pricehistorical_patch:
+        query_missing_prices_of_base_entries(database=database, entries_missing_prices=entries)
+
+    assert histohour_mock.call_count == 1
+    assert db.get_base_entries_missing_prices(HistoryEventFilterQuery.make()) == []
+    with database.conn.read_ctx() as cursor:
+        usd_values = [FVal(usd_value) for usd_value, in cursor.execute(
+            'SELECT usd_value FROM history_events ORDER BY timestamp',
+        )]
+    # each event gets the price of the closest hour times its amount
+    assert usd_values[0] == FVal(2 * 20100)
+    assert usd_values[2] == FVal(2 * 20200)
+    assert usd_values[4] == FVal(2 * 20300)
+    assert len(usd_values) == 6 and all(usd_value > FVal(40000) for usd_value in usd_values)
+
+
+def test_refresh_current_prices_remembers_owned_assets(task_manager):
+    """Test that checking the cached current prices to refresh does not query the owned
+    assets every time, but only again after the tables they are taken from change"""
+    database = task_manager.database
+    with patch.object(database, 'query_owned_assets', return_value=[A_BTC]) as owned_mock:
+        for _ in range(2):
+            task_manager._maybe_refresh_current_prices()
+        assert owned_mock.call_count == 1
+
+        with database.user_write() as write_cursor:
+            database.add_multiple_balances(write_cursor, [DBAssetBalance(
+                category=BalanceType.ASSET,
+                time=Timestamp(1),
+                asset=A_BTC,
+                amount=ONE,
+                usd_value=ONE,
+            )])
+        task_manager._maybe_refresh_current_prices()
+        assert owned_mock.call_count == 2
+
+        with database.user_write() as write_cursor:
+            database.add_trades(write_cursor, make_random_trades(1))
+        task_manager._maybe_refresh_current_prices()
+        assert owned_mock.call_count == 3
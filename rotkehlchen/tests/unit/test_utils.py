@@ -3,18 +3,28 @@ from datetime import datetime, timezone
 from json.decoder import JSONDecodeError
 from unittest.mock import patch
 
+import gevent
 import pytest
 from eth_typing import HexAddress, HexStr
 from eth_utils import to_checksum_address
 from hexbytes import HexBytes
 
 from rotkehlchen.chain.ethereum.utils import generate_address_via_create2
+from rotkehlchen.constants.assets import A_BTC, A_ETH
+from rotkehlchen.crypto import decrypt, decrypt_stream, encrypt, encrypt_stream
+from rotkehlchen.db.cached_results import DBCachedResults
+from rotkehlchen.errors.misc import UnableToDecryptRemoteData
 from rotkehlchen.errors.serialization import ConversionError
 from rotkehlchen.externalapis.github import Github
 from rotkehlchen.fval import FVal
 from rotkehlchen.serialization.deserialize import deserialize_timestamp_from_date
-from rotkehlchen.serialization.serialize import process_result
+from rotkehlchen.serialization.serialize import (
+    STREAMING_LIST_THRESHOLD,
+    iter_json_chunks,
+    process_result,
+)
 from rotkehlchen.tests.utils.mock import MockResponse
+from rotkehlchen.types import Location
 from rotkehlchen.utils.misc import (
     combine_dicts,
     combine_stat_dicts,
@@ -23,8 +33,13 @@ from rotkehlchen.utils.misc import (
     pairwise,
     pairwise_longest,
     timestamp_to_date,
+    ts_now,
+)
+from rotkehlchen.utils.mixins.cacheable import (
+    CACHE_RESPONSE_FOR_SECS,
+    CacheableMixIn,
+    cache_response_timewise,
 )
-from rotkehlchen.utils.mixins.cacheable import CacheableMixIn, cache_response_timewise
 from rotkehlchen.utils.serialization import jsonloads_dict, jsonloads_list
 from rotkehlchen.utils.version_check import get_current_version
 
@@ -56,6 +71,46 @@ def test_hexbytes_in_process_result():
     assert json.dumps(process_result(d)) == expected_str
 
 
+def test_iter_json_chunks():
+    """Test that the streamed serialization produces the same output as process_result"""
+    d = {
+        'result': {
+            'entries': [{
+                'amount': FVal(idx),
+                'asset': A_ETH,
+                'location': Location.KRAKEN,
+                'tx_hash': HexBytes(b'\xd4\xe5'),
+                A_BTC: (1, 2),
+                5: None,
+            } for idx in range(STREAMING_LIST_THRESHOLD + 5)],
+            'small': [FVal(1), A_BTC],
+            'empty': {},
+        },
+        'message': '',
+    }
+    chunks = list(iter_json_chunks(d))
+    assert len(chunks) > 1
+    assert ''.join(chunks) == json.dumps(process_result(d))
+
+
+def test_encrypt_decrypt_stream():
+    """Test that the streaming encryption is interchangeable with the one shot functions"""
+    key = b'password'
+    data = bytes(range(256)) * 100 + b'a'
+    chunks = [data[i:i + 1000] for i in range(0, len(data), 1000)]
+    encrypted = b''.join(encrypt_stream(key, chunks))
+    assert len(encrypted) == 16 + len(data) + 16 - len(data) % 16
+    assert decrypt(key, encrypted) == data
+    encrypted = encrypt(key, data)
+    assert b''.join(decrypt_stream(key, [encrypted[i:i + 7] for i in range(0, len(encrypted), 7)])) == data  # noqa: E501
+    assert decrypt(key, encrypt(key, b'')) == b''
+
+    with pytest.raises(UnableToDecryptRemoteData):
+        decrypt(key, encrypted[:-1])
+    with pytest.raises(UnableToDecryptRemoteData):
+        decrypt(key, encrypted[:10])
+
+
 def test_iso8601ts_to_timestamp():
     assert iso8601ts_to_timestamp('2018-09-09T12:00:00.000Z') == 1536494400
     assert iso8601ts_to_timestamp('2011-01-01T04:13:22.220Z') == 1293855202
@@ -241,6 +296,104 @@ def test_cache_response_timewise_with_arguments_matter_false():
     assert instance.do_something_arguments_dont_matter_count == 2
 
 
+class PersistedFoo(CacheableMixIn):
+    def __init__(self, database):
+        super().__init__()
+        self.cached_results_db = DBCachedResults(database)
+        self.do_sum_call_count = 0
+        self.fail = False
+        self.delay = 0
+
+    def serialize_cached_result(self, name, result):  # pylint: disable=unused-argument
+        return None if 'error' in result else json.dumps(result)
+
+    def deserialize_cached_result(self, name, data):  # pylint: disable=unused-argument
+        return jsonloads_dict(data)
+
+    def refreshed_result_error(self, name, result):  # pylint: disable=unused-argument
+        return result.get('error')
+
+    @cache_response_timewise(persist=True)
+    def do_sum(self, arg1, arg2, **kwargs):  # pylint: disable=unused-argument
+        self.do_sum_call_count += 1
+        gevent.sleep(self.delay)
+        if self.fail is True:
+            return {'error': 'sum failed'}
+        return {'sum': arg1 + arg2}
+
+
+def test_cache_response_timewise_persisted(database):
+    """Test that persisted results survive a restart and that a stale persisted result
+    is returned while it's refreshed in the background only if stale results are allowed"""
+    instance = PersistedFoo(database)
+    assert instance.do_sum(1, 2) == {'sum': 3}
+    assert instance.do_sum_call_count == 1
+
+    restarted_instance = PersistedFoo(database)
+    assert restarted_instance.do_sum(1, 2) == {'sum': 3}
+    assert restarted_instance.do_sum_call_count == 0
+
+    stale_ts = ts_now() + CACHE_RESPONSE_FOR_SECS + 1
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', return_value=stale_ts):
+        strict_instance = PersistedFoo(database)
+        assert strict_instance.do_sum(1, 2) == {'sum': 3}
+        assert strict_instance.do_sum_call_count == 1  # stale result not returned
+        assert len(strict_instance.cache_refreshes) == 0
+
+    stale_ts += CACHE_RESPONSE_FOR_SECS + 1
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', return_value=stale_ts):
+        stale_instance = PersistedFoo(database)
+        assert stale_instance.do_sum(1, 2, allow_stale=True) == {'sum': 3}
+        assert stale_instance.do_sum_call_count == 0
+        gevent.joinall(list(stale_instance.cache_refreshes.values()))
+        assert stale_instance.do_sum_call_count == 1
+
+    assert DBCachedResults(database).get(owner='PersistedFoo', signature='do_sum12') == (stale_ts, '{"sum": 3}')  # noqa: E501
+    stale_instance.flush_cache('do_sum', 1, 2)
+    assert DBCachedResults(database).get(owner='PersistedFoo', signature='do_sum12') is None
+
+
+def test_cache_response_timewise_persisted_refresh_error(database):
+    """Test that if refreshing a stale persisted result fails the user is notified and
+    that the error is not kept"""
+    PersistedFoo(database).do_sum(1, 2)
+    database.msg_aggregator.consume_errors()
+    stale_ts = ts_now() + CACHE_RESPONSE_FOR_SECS + 1
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', return_value=stale_ts):
+        instance = PersistedFoo(database)
+        instance.fail = True
+        assert instance.do_sum(1, 2, allow_stale=True) == {'sum': 3}
+        gevent.joinall(list(instance.cache_refreshes.values()))
+
+    assert instance.do_sum_call_count == 1
+    assert database.msg_aggregator.consume_errors() == [
+        'Failed to refresh the PersistedFoo results kept from a previous run due to sum failed',
+    ]
+    assert DBCachedResults(database).get(owner='PersistedFoo', signature='do_sum12') is None
+
+
+def test_cache_response_timewise_persisted_flush_stops_refresh(database):
+    """Test that flushing the caches stops the refresh of a stale persisted result and
+    that the results of calls running during the flush are not kept"""
+    PersistedFoo(database).do_sum(1, 2)
+    stale_ts = ts_now() + CACHE_RESPONSE_FOR_SECS + 1
+    with patch('rotkehlchen.utils.mixins.cacheable.ts_now', return_value=stale_ts):
+        instance = PersistedFoo(database)
+        instance.delay = 1
+        assert instance.do_sum(1, 2, allow_stale=True) == {'sum': 3}
+        refresh = next(iter(instance.cache_refreshes.values()))
+        running_call = gevent.spawn(instance.do_sum, 1, 3)
+        gevent.sleep(0)  # let both calls start
+        instance.flush_all_caches()
+        assert refresh.dead is True
+        assert len(instance.cache_refreshes) == 0
+        assert running_call.get() == {'sum': 4}
+
+    assert instance.results_cache == {}
+    assert DBCachedResults(database).get(owner='PersistedFoo', signature='do_sum12') is None
+    assert DBCachedResults(database).get(owner='PersistedFoo', signature='do_sum13') is None
+
+
 def test_convert_to_int():
     assert convert_to_int('5') == 5
     assert convert_to_int('37451082560000003241000000000003221111111111') == 37451082560000003241000000000003221111111111  # noqa: E501
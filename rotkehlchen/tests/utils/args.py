@@ -1,8 +1,10 @@
 from typing import NamedTuple, Optional
 
 from rotkehlchen.constants.misc import (
+    DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
     DEFAULT_MAX_LOG_BACKUP_FILES,
     DEFAULT_MAX_LOG_SIZE_IN_MB,
+    DEFAULT_MAX_WORKER_PROCESSES,
     DEFAULT_SQL_VM_INSTRUCTIONS_CB,
 )
 
@@ -17,6 +19,8 @@ class ConfigurationArgs(NamedTuple):
     max_size_in_mb_all_logs: int = DEFAULT_MAX_LOG_SIZE_IN_MB
     max_logfiles_num: int = DEFAULT_MAX_LOG_BACKUP_FILES
     sqlite_instructions: int = DEFAULT_SQL_VM_INSTRUCTIONS_CB
+    max_worker_processes: int = DEFAULT_MAX_WORKER_PROCESSES
+    max_size_in_mb_asset_cache: int = DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB
 
 
 def default_args(
@@ -33,6 +37,8 @@ def default_args(
         max_size_in_mb_all_logs=max_size_in_mb_all_logs,
         max_logfiles_num=DEFAULT_MAX_LOG_BACKUP_FILES,
         sqlite_instructions=DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+        max_worker_processes=DEFAULT_MAX_WORKER_PROCESSES,
+        max_size_in_mb_asset_cache=DEFAULT_MAX_ASSET_CACHE_SIZE_IN_MB,
         logfile=None,
         logtarget=None,
     )
@@ -1,8 +1,12 @@
+import json
 import platform
 
 import gevent
 import pytest
 
+from rotkehlchen.api.websockets.notifier import RotkiNotifier
+from rotkehlchen.api.websockets.typedefs import WSMessageType
+
 
 def _send_stuff(msg_aggregator, websocket_connection, string_len):
     for _ in range(10):
@@ -36,3 +40,67 @@ def test_websockets_concurrent_use(rotkehlchen_api_server, websocket_connection)
             isinstance(x.exception, gevent.exceptions.ConcurrentObjectUseError) is False
             for x in [g1, g2] + rotki.greenlet_manager.greenlets
         ), 'At least one ConcurrentObjectUseError exception happened'
+
+
+class MockWebsocket:
+    def __init__(self) -> None:
+        self.closed = False
+        self.sent: list[dict] = []
+
+    def send(self, message: str) -> None:
+        self.sent.append(json.loads(message))
+
+
+def test_notifier_coalesces_status_messages():
+    """Test that status messages of the same progress are merged and others batched"""
+    notifier = RotkiNotifier(coalesce_interval=10)
+    websocket = MockWebsocket()
+    notifier.subscribe(websocket)
+    notifier.broadcast(message_type=WSMessageType.LEGACY, to_send_data={'value': 'first'})
+    assert len(websocket.sent) == 1, 'first message after a flush should be sent immediately'
+
+    for address in ('0xA', '0xB'):
+        for period_end in range(1, 6):
+            notifier.broadcast(
+                message_type=WSMessageType.EVM_TRANSACTION_STATUS,
+                to_send_data={
+                    'address': address,
+                    'evm_chain': 'ethereum',
+                    'period': [0, period_end],
+                    'status': 'querying_transactions',
+                },
+            )
+    notifier.broadcast(message_type=WSMessageType.LEGACY, to_send_data={'value': 'a'})
+    notifier.broadcast(message_type=WSMessageType.LEGACY, to_send_data={'value': 'b'})
+    assert len(websocket.sent) == 1
+    notifier.flush()
+
+    assert websocket.sent[1:] == [
+        {'type': 'evm_transaction_status', 'data': {'address': '0xA', 'evm_chain': 'ethereum', 'period': [0, 5], 'status': 'querying_transactions'}},  # noqa: E501
+        {'type': 'evm_transaction_status', 'data': {'address': '0xB', 'evm_chain': 'ethereum', 'period': [0, 5], 'status': 'querying_transactions'}},  # noqa: E501
+        {'type': 'legacy', 'data': {'value': 'a'}},
+        {'type': 'legacy', 'data': {'value': 'b'}},
+    ]
+    assert notifier.counters.serialize() == {'sent': 5, 'merged': 8, 'dropped': 0}
+
+
+def test_notifier_merged_message_keeps_its_position():
+    """Test that a merged status message is sent at the position of the first message
+    it replaced, so that it's not sent after messages broadcast after that one"""
+    notifier = RotkiNotifier(coalesce_interval=10)
+    websocket = MockWebsocket()
+    notifier.subscribe(websocket)
+    notifier.broadcast(message_type=WSMessageType.LEGACY, to_send_data={'value': 'first'})
+    for step in (1, 2):
+        notifier.broadcast(
+            message_type=WSMessageType.DB_UPGRADE_STATUS,
+            to_send_data={'current_upgrade': step},
+        )
+        notifier.broadcast(message_type=WSMessageType.LEGACY, to_send_data={'value': step})
+    notifier.flush()
+
+    assert websocket.sent[1:] == [
+        {'type': 'db_upgrade_status', 'data': {'current_upgrade': 2}},
+        {'type': 'legacy', 'data': {'value': 1}},
+        {'type': 'legacy', 'data': {'value': 2}},
+    ]
@@ -1,5 +1,6 @@
 import collections
 from collections import OrderedDict
+from collections.abc import Callable
 from typing import Generic, Optional, TypeVar
 
 KT = TypeVar('KT')  # key type
@@ -7,22 +8,37 @@ VT = TypeVar('VT')  # value type
 
 
 class LRUCacheWithRemove(Generic[KT, VT]):
-    """Create a LRU cache with the option to remove keys from the cache"""
+    """Create a LRU cache with the option to remove keys from the cache
+
+    Hits, misses and evictions are counted so that the cache size can be evaluated"""
 
     def __init__(self, maxsize: int = 512):
         self.cache: OrderedDict[KT, VT] = collections.OrderedDict()
         self.maxsize: int = maxsize
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __contains__(self, key: KT) -> bool:
+        return key in self.cache
 
     def get(self, key: KT) -> Optional[VT]:
         if key in self.cache:
+            self.hits += 1
             self.cache.move_to_end(key)
             return self.cache[key]
+        self.misses += 1
         return None
 
     def add(self, key: KT, value: VT) -> None:
         self.cache[key] = value
         if len(self.cache) > self.maxsize:
-            self.cache.popitem(last=False)
+            self._evict()
+
+    def _evict(self) -> None:
+        """Remove the least recently used entry"""
+        self.cache.popitem(last=False)
+        self.evictions += 1
 
     def remove(self, key: KT) -> None:
         if key in self.cache:
@@ -32,6 +48,21 @@ class LRUCacheWithRemove(Generic[KT, VT]):
         """Delete all entries in the cache"""
         self.cache.clear()
 
+    def resize(self, maxsize: int) -> None:
+        """Change the maximum number of entries, evicting the least recently used if needed"""
+        self.maxsize = maxsize
+        while len(self.cache) > self.maxsize:
+            self._evict()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            'size': len(self.cache),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+        }
+
 
 class LRUCacheLowerKey(LRUCacheWithRemove[str, VT]):
     """Create an LRU cache with string key which is always considered as lowercase"""
@@ -45,6 +76,64 @@ class LRUCacheLowerKey(LRUCacheWithRemove[str, VT]):
         super().remove(key.lower())
 
 
+class AdaptiveLRUCacheLowerKey(LRUCacheLowerKey[VT]):
+    """LRU cache with lowercase string keys that is bounded by memory
+
+    The memory of each entry is estimated with `sizeof` when it is added. The cache starts
+    with `maxsize` entries and doubles it when an entry would be evicted while the memory
+    of the doubled cache is still estimated to fit in `max_memory`. So a working set that
+    is larger than the initial size stops being evicted over and over again.
+    """
+
+    def __init__(
+            self,
+            maxsize: int,
+            max_memory: int,
+            sizeof: Callable[[str, VT], int],
+    ):
+        super().__init__(maxsize=maxsize)
+        self.max_memory = max_memory
+        self.sizeof = sizeof
+        self.memory = 0
+        self.entry_sizes: dict[str, int] = {}
+
+    def add(self, key: str, value: VT) -> None:
+        key = key.lower()
+        self.memory -= self.entry_sizes.pop(key, 0)
+        self.entry_sizes[key] = size = self.sizeof(key, value)
+        self.memory += size
+        self.cache[key] = value
+        if len(self.cache) > self.maxsize and self.memory * 2 <= self.max_memory:
+            self.maxsize *= 2
+
+        while len(self.cache) > self.maxsize or self.memory > self.max_memory:
+            self._evict()
+
+    def set_max_memory(self, max_memory: int) -> None:
+        self.max_memory = max_memory
+        while self.memory > self.max_memory:
+            self._evict()
+
+    def _evict(self) -> None:
+        key, _ = self.cache.popitem(last=False)
+        self.memory -= self.entry_sizes.pop(key)
+        self.evictions += 1
+
+    def remove(self, key: str) -> None:
+        key = key.lower()
+        if key in self.cache:
+            self.cache.pop(key)
+            self.memory -= self.entry_sizes.pop(key)
+
+    def clear(self) -> None:
+        super().clear()
+        self.entry_sizes.clear()
+        self.memory = 0
+
+    def stats(self) -> dict[str, int]:
+        return super().stats() | {'memory': self.memory, 'max_memory': self.max_memory}
+
+
 class LRUSetCache(Generic[VT]):
     """
     LRU cache that works like a set.
@@ -1,32 +1,47 @@
+import logging
 from copy import deepcopy
 from functools import wraps
-from typing import TYPE_CHECKING, Any, Callable, NamedTuple
+from typing import TYPE_CHECKING, Any, Callable, NamedTuple, Optional
 
+import gevent
+
+from rotkehlchen.constants.timing import DAY_IN_SECONDS
+from rotkehlchen.errors.serialization import DeserializationError
+from rotkehlchen.logging import RotkehlchenLogsAdapter
 from rotkehlchen.utils.misc import ts_now
 
-from .common import function_sig_key
+from .common import function_sig
 
 if TYPE_CHECKING:
+    from rotkehlchen.db.cached_results import DBCachedResults
     from rotkehlchen.types import Timestamp
 
+logger = logging.getLogger(__name__)
+log = RotkehlchenLogsAdapter(logger)
+
 
 class ResultCache(NamedTuple):
     """Represents a time-cached result of some API query"""
-    result: dict
+    result: Any
     timestamp: 'Timestamp'
 
 
 # Seconds for which cached api queries will be cached
-# By default 10 minutes.
-# TODO: Make configurable!
+# By default 10 minutes. Can be changed per function with ttl_secs.
 CACHE_RESPONSE_FOR_SECS = 600
+# Seconds after expiring for which a persisted result is still returned to the callers
+# that allow stale results while the function is called again in the background
+PERSISTED_RESULT_STALE_SECS = DAY_IN_SECONDS
 
 
 class CacheableMixIn:
     """Interface for objects that can use timewise caches
 
     Any object that adheres to this MixIn's interface can have its functions
-    use the @cache_response_timewise decorator
+    use the @cache_response_timewise decorator. If the object sets
+    cached_results_db then the results of the functions cached with persist=True
+    are also kept there, under the name returned by cached_results_owner. Then the
+    object also needs to implement serialize_cached_result and deserialize_cached_result.
     """
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
@@ -34,16 +49,132 @@ class CacheableMixIn:
         self.results_cache: dict[int, ResultCache] = {}
         # Can also be 0 which means cache is disabled.
         self.cache_ttl_secs = CACHE_RESPONSE_FOR_SECS
+        self.cached_results_db: Optional['DBCachedResults'] = None
+        # Greenlets refreshing stale results per cache key
+        self.cache_refreshes: dict[int, gevent.Greenlet] = {}
+        # Times flush_all_caches was called. Results of calls that started before are not kept
+        self.cache_flushes = 0
+
+    def cached_results_owner(self) -> str:
+        """Name under which the persisted results of the object are kept.
+        Should be unique among the objects that persist their results."""
+        return self.__class__.__name__
+
+    def serialize_cached_result(self, name: str, result: Any) -> Optional[str]:
+        """Serialize the result of the persisted function with the given name to JSON.
+        Returns None if the result should not be kept, for example if it's an error."""
+        raise NotImplementedError(f'{self.__class__.__name__} does not persist results')
+
+    def deserialize_cached_result(self, name: str, data: str) -> Any:
+        """Deserialize a result serialized by serialize_cached_result
+
+        May raise:
+        - DeserializationError if the data is not in the expected format
+        """
+        raise NotImplementedError(f'{self.__class__.__name__} does not persist results')
+
+    def refreshed_result_error(self, name: str, result: Any) -> Optional[str]:
+        """The error of a result of the function with the given name that was called again
+        in the background because its stale result was returned. None if it succeeded."""
+        return None
 
     def flush_cache(self, name: str, *args: Any, **kwargs: Any) -> None:
-        cache_key = function_sig_key(
+        signature = function_sig(
             name,
             True,  # arguments_matter
             True,  # skip_ignore_cache
             *args,
             **kwargs,
         )
-        self.results_cache.pop(cache_key, None)
+        self.results_cache.pop(hash(signature), None)
+        if self.cached_results_db is not None:
+            self.cached_results_db.delete(owner=self.cached_results_owner(), signature=signature)
+
+    def flush_all_caches(self) -> None:
+        """Forget all the cached results of the object, including the persisted ones.
+        Results of the calls that are running at the moment are not kept either."""
+        self.stop_cache_refreshes()
+        self.cache_flushes += 1
+        self.results_cache = {}
+        if self.cached_results_db is not None:
+            self.cached_results_db.delete(owner=self.cached_results_owner())
+
+    def stop_cache_refreshes(self) -> None:
+        """Kill the greenlets refreshing stale results, for example when the object
+        is no longer used"""
+        gevent.killall(list(self.cache_refreshes.values()))
+        self.cache_refreshes.clear()
+
+
+def _call_and_cache(
+        wrappingobj: CacheableMixIn,
+        f: Callable,
+        signature: str,
+        persist: bool,
+        *args: Any,
+        **kwargs: Any,
+) -> ResultCache:
+    """Call the function and write its result in the cache, and if needed persist it.
+    If the result should not be kept then the persisted one is deleted. If the caches
+    of the object were flushed during the call its result is not kept at all."""
+    now, flushes = ts_now(), wrappingobj.cache_flushes
+    cached = ResultCache(f(wrappingobj, *args, **kwargs), now)
+    if wrappingobj.cache_flushes != flushes:
+        return cached  # flushed meanwhile, for example since the exchange got deleted
+
+    wrappingobj.results_cache[hash(signature)] = cached
+    if persist and wrappingobj.cached_results_db is not None:
+        owner = wrappingobj.cached_results_owner()
+        if (data := wrappingobj.serialize_cached_result(f.__name__, cached.result)) is None:
+            wrappingobj.cached_results_db.delete(owner=owner, signature=signature)
+        else:
+            wrappingobj.cached_results_db.set(
+                owner=owner,
+                signature=signature,
+                timestamp=now,
+                result=data,
+            )
+
+    return cached
+
+
+def _refresh_stale_result(
+        wrappingobj: CacheableMixIn,
+        f: Callable,
+        cache_key: int,
+        *args: Any,
+        **kwargs: Any,
+) -> None:
+    """Call again in the background the decorated function whose cached result is stale.
+
+    It's called through the object so that any other decorators of the function, such
+    as locks, still apply. Its cache lookup is skipped since it runs in the greenlet
+    registered in cache_refreshes. If it fails the user is notified, since they were
+    given the stale result.
+    """
+    if cache_key in wrappingobj.cache_refreshes:
+        return  # already being refreshed
+
+    def _refresh() -> None:
+        error = None
+        try:
+            result = getattr(wrappingobj, f.__name__)(*args, **kwargs)
+        except Exception as e:  # pylint: disable=broad-except
+            error = str(e)
+        else:
+            error = wrappingobj.refreshed_result_error(f.__name__, result)
+        finally:
+            wrappingobj.cache_refreshes.pop(cache_key, None)
+
+        if error is not None:
+            log.error(f'Failed to refresh the stale cached result of {f.__name__} due to {error}')
+            if wrappingobj.cached_results_db is not None:
+                wrappingobj.cached_results_db.db.msg_aggregator.add_error(
+                    f'Failed to refresh the {wrappingobj.cached_results_owner()} results '
+                    f'kept from a previous run due to {error}',
+                )
+
+    wrappingobj.cache_refreshes[cache_key] = gevent.spawn(_refresh)
 
 
 def _cache_response_timewise_base(
@@ -51,37 +182,74 @@ def _cache_response_timewise_base(
         f: Callable,
         arguments_matter: bool,
         forward_ignore_cache: bool,
+        persist: bool,
+        ttl_secs: Optional[int],
         *args: Any,
         **kwargs: Any,
-) -> tuple[bool, int, 'Timestamp', dict]:
-    """Base code used in the 2 cache_response_timewise decorators"""
+) -> ResultCache:
+    """Base code used in the 2 cache_response_timewise decorators
+
+    Returns the cached result if it's fresh. If the allow_stale argument is True a
+    persisted result that is stale is returned while it's refreshed in the background.
+    Otherwise calls the function.
+    """
     if forward_ignore_cache:
         ignore_cache = kwargs.get('ignore_cache', False)
     else:
         ignore_cache = kwargs.pop('ignore_cache', False)
-    cache_key = function_sig_key(
+    allow_stale = kwargs.pop('allow_stale', False)
+    signature = function_sig(
         f.__name__,        # name
         arguments_matter,  # arguments_matter
         True,              # skip_ignore_cache
         *args,
         **kwargs,
     )
-    now = ts_now()
-    if ignore_cache is False and cache_key in wrappingobj.results_cache:
-        # Check the cache
-        cache_life_secs = now - wrappingobj.results_cache[cache_key].timestamp
-
-    cache_miss = (
-        ignore_cache is True or
-        cache_key not in wrappingobj.results_cache or
-        cache_life_secs >= wrappingobj.cache_ttl_secs
-    )
-    return cache_miss, cache_key, now, kwargs
+    cache_key = hash(signature)
+    persist = persist and wrappingobj.cached_results_db is not None
+    if (
+            ignore_cache is True or wrappingobj.cache_ttl_secs == 0 or
+            wrappingobj.cache_refreshes.get(cache_key) is gevent.getcurrent()
+    ):
+        return _call_and_cache(wrappingobj, f, signature, persist, *args, **kwargs)
+
+    if (
+            (cached := wrappingobj.results_cache.get(cache_key)) is None and persist and
+            (entry := wrappingobj.cached_results_db.get(  # type: ignore[union-attr]  # checked in persist
+                owner=wrappingobj.cached_results_owner(),
+                signature=signature,
+            )) is not None
+    ):  # load the result persisted before a restart
+        try:
+            result = wrappingobj.deserialize_cached_result(f.__name__, entry[1])
+        except DeserializationError as e:
+            log.warning(f'Could not load the kept result of {f.__name__} due to {e!s}')
+            wrappingobj.cached_results_db.delete(  # type: ignore[union-attr]  # checked in persist
+                owner=wrappingobj.cached_results_owner(),
+                signature=signature,
+            )
+        else:
+            cached = wrappingobj.results_cache[cache_key] = ResultCache(result, entry[0])
+
+    if cached is None:
+        return _call_and_cache(wrappingobj, f, signature, persist, *args, **kwargs)
+
+    cache_life_secs = ts_now() - cached.timestamp
+    if cache_life_secs < (ttl := ttl_secs if ttl_secs is not None else wrappingobj.cache_ttl_secs):
+        return cached
+
+    if allow_stale is True and persist and cache_life_secs < ttl + PERSISTED_RESULT_STALE_SECS:
+        _refresh_stale_result(wrappingobj, f, cache_key, *args, **kwargs)
+        return cached
+
+    return _call_and_cache(wrappingobj, f, signature, persist, *args, **kwargs)
 
 
 def cache_response_timewise(
         arguments_matter: bool = True,
         forward_ignore_cache: bool = False,
+        persist: bool = False,
+        ttl_secs: Optional[int] = None,
 ) -> Callable:
     """ This is a decorator for caching results of functions of objects.
     The objects must adhere to the CachableOject interface.
@@ -105,26 +273,30 @@ def cache_response_timewise(
 
     if forward_ignore_cache is True then if the ignore_cache argument is given it's
     forward to the decorated function instead of being silently consumed.
+
+    If persist is True and the object has a cached_results_db then the results are
+    also kept in the DB so that they survive restarts. If the allow_stale argument is
+    given as True then for up to PERSISTED_RESULT_STALE_SECS after they expire they
+    are still returned while the function is called again in the background. Callers
+    that save the result, for example in a balances snapshot, should never allow it.
+    The allow_stale argument is always consumed and never forwarded.
+
+    ttl_secs is the seconds for which the results are cached. If not given the
+    cache_ttl_secs of the object is used.
     """
     def _cache_response_timewise(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(wrappingobj: CacheableMixIn, *args: Any, **kwargs: Any) -> Any:
-            cache_miss, cache_key, now, kwargs = _cache_response_timewise_base(
+            return _cache_response_timewise_base(
                 wrappingobj,
                 f,
                 arguments_matter,
                 forward_ignore_cache,
+                persist,
+                ttl_secs,
                 *args,
                 **kwargs,
-            )
-            if cache_miss:
-                # Call the function, write the result in cache and return it
-                result = f(wrappingobj, *args, **kwargs)
-                wrappingobj.results_cache[cache_key] = ResultCache(result, now)
-                return result
-
-            # else hit the cache and return it
-            return wrappingobj.results_cache[cache_key].result
+            ).result
 
         return wrapper
     return _cache_response_timewise
@@ -133,6 +305,8 @@ def cache_response_timewise(
 def cache_response_timewise_immutable(
         arguments_matter: bool = True,
         forward_ignore_cache: bool = False,
+        persist: bool = False,
+        ttl_secs: Optional[int] = None,
 ) -> Callable:
     """ Same as cache_response_timewise but resulting dict is a copy so, the cache
     itself can't be mutated.
@@ -140,21 +314,18 @@ def cache_response_timewise_immutable(
     def _cache_response_timewise_immutable(f: Callable) -> Callable:
         @wraps(f)
         def wrapper(wrappingobj: CacheableMixIn, *args: Any, **kwargs: Any) -> Any:
-            cache_miss, cache_key, now, kwargs = _cache_response_timewise_base(
+            cached = _cache_response_timewise_base(
                 wrappingobj,
                 f,
                 arguments_matter,
                 forward_ignore_cache,
+                persist,
+                ttl_secs,
                 *args,
                 **kwargs,
             )
-            if cache_miss:
-                # Call the function, and write the result in cache
-                result = f(wrappingobj, *args, **kwargs)
-                wrappingobj.results_cache[cache_key] = ResultCache(result, now)
-
             # in any case return a copy of the cache to avoid potential mutation
-            return deepcopy(wrappingobj.results_cache[cache_key].result)
+            return deepcopy(cached.result)
 
         return wrapper
     return _cache_response_timewise_immutable
@@ -0,0 +1,341 @@
+"""
+Benchmark of generating a PnL report for large synthetic accounts.
+
+Generates a history of exchange trades, asset movements, EVM swaps and deposits and ETH
+staking events, seeds manual historical prices of its assets for the whole period and runs
+Accountant.process_history on it without any network access. It reports the processing
+rate, the peak RSS and the DB rows written. Each size runs in its own process so that the
+memory of a run does not hide the peak of the next one.
+Run with: python -m tools.benchmarks.accounting --events 10000 100000 --output results.json
+"""
+from gevent import monkey  # isort:skip
+monkey.patch_all()  # isort:skip
+import argparse
+import json
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Any, cast
+
+from rotkehlchen.accounting.accountant import Accountant
+from rotkehlchen.accounting.metrics import ReportMetrics
+from rotkehlchen.accounting.mixins.event import AccountingEventMixin
+from rotkehlchen.accounting.structures.balance import Balance
+from rotkehlchen.accounting.structures.eth2 import EthBlockEvent, EthWithdrawalEvent
+from rotkehlchen.accounting.structures.evm_event import EvmEvent
+from rotkehlchen.accounting.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.chain.arbitrum_one.accountant import ArbitrumOneAccountingAggregator
+from rotkehlchen.chain.base.accountant import BaseAccountingAggregator
+from rotkehlchen.chain.ethereum.accountant import EthereumAccountingAggregator
+from rotkehlchen.chain.ethereum.modules.aave.constants import CPT_AAVE_V2
+from rotkehlchen.chain.ethereum.modules.uniswap.constants import CPT_UNISWAP_V2
+from rotkehlchen.chain.evm.decoding.constants import CPT_GAS
+from rotkehlchen.chain.evm.types import string_to_evm_address
+from rotkehlchen.chain.gnosis.accountant import GnosisAccountingAggregator
+from rotkehlchen.chain.optimism.accountant import OptimismAccountingAggregator
+from rotkehlchen.chain.polygon_pos.accountant import PolygonPOSAccountingAggregator
+from rotkehlchen.constants.assets import A_BTC, A_DAI, A_ETH, A_USD
+from rotkehlchen.constants.misc import DEFAULT_SQL_VM_INSTRUCTIONS_CB
+from rotkehlchen.constants.timing import HOUR_IN_SECONDS
+from rotkehlchen.db.dbhandler import DBHandler
+from rotkehlchen.exchanges.data_structures import AssetMovement, Trade
+from rotkehlchen.externalapis.coingecko import Coingecko
+from rotkehlchen.externalapis.cryptocompare import Cryptocompare
+from rotkehlchen.externalapis.defillama import Defillama
+from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.history.price import PriceHistorian
+from rotkehlchen.history.types import HistoricalPrice, HistoricalPriceOracle
+from rotkehlchen.types import (
+    AssetAmount,
+    AssetMovementCategory,
+    ChainID,
+    Fee,
+    Location,
+    Price,
+    Timestamp,
+    TradeType,
+    deserialize_evm_tx_hash,
+)
+from rotkehlchen.user_messages import MessagesAggregator
+from rotkehlchen.utils.misc import ts_sec_to_ms
+
+if TYPE_CHECKING:
+    from rotkehlchen.chain.aggregator import ChainsAggregator
+    from rotkehlchen.premium.premium import Premium
+
+START_TS = Timestamp(1609459200)
+EVENTS_INTERVAL = 60  # seconds between two consecutive generated events
+ADDRESS = string_to_evm_address('0x9531C059098e3d194fF87FebB587aB07B30B1306')
+STARTING_PRICES = {A_ETH: 2000, A_BTC: 30000, A_DAI: 1}
+EVM_ACCOUNTING_AGGREGATORS = {
+    ChainID.ETHEREUM: EthereumAccountingAggregator,
+    ChainID.OPTIMISM: OptimismAccountingAggregator,
+    ChainID.POLYGON_POS: PolygonPOSAccountingAggregator,
+    ChainID.ARBITRUM_ONE: ArbitrumOneAccountingAggregator,
+    ChainID.BASE: BaseAccountingAggregator,
+    ChainID.GNOSIS: GnosisAccountingAggregator,
+}
+
+
+class OfflineChainsAggregator:
+    """Gives the accountant the EVM accounting aggregators without connecting to any node"""
+
+    def __init__(self, msg_aggregator: MessagesAggregator) -> None:
+        self.managers = {
+            chain_id: SimpleNamespace(accounting_aggregator=aggregator(
+                node_inquirer=None,  # the module accountants don't query the chain
+                msg_aggregator=msg_aggregator,
+            ))
+            for chain_id, aggregator in EVM_ACCOUNTING_AGGREGATORS.items()
+        }
+
+    def get_evm_manager(self, chain_id: ChainID) -> SimpleNamespace:
+        return self.managers[chain_id]
+
+
+class ActivePremium:
+    """Lifts the events limit of free users so that the whole history is processed"""
+
+    def is_active(self) -> bool:
+        return True
+
+
+def _amount(rng: random.Random, low: float, high: float) -> FVal:
+    return FVal(round(rng.uniform(low, high), 6))
+
+
+def _evm_event(
+        tx_idx: int,
+        sequence_index: int,
+        timestamp: Timestamp,
+        event_type: HistoryEventType,
+        event_subtype: HistoryEventSubType,
+        asset: Asset,
+        amount: FVal,
+        counterparty: str,
+) -> EvmEvent:
+    return EvmEvent(
+        tx_hash=deserialize_evm_tx_hash(tx_idx.to_bytes(32, byteorder='big')),
+        sequence_index=sequence_index,
+        timestamp=ts_sec_to_ms(timestamp),
+        location=Location.ETHEREUM,
+        event_type=event_type,
+        event_subtype=event_subtype,
+        asset=asset,
+        balance=Balance(amount=amount),
+        location_label=ADDRESS,
+        counterparty=counterparty,
+    )
+
+
+def generate_history(events_num: int, rng: random.Random) -> list[AccountingEventMixin]:
+    """Generate a sorted history of the given number of events, mixing all the kinds of
+    events that a big account has. Acquisitions are bigger than spends so that most spends
+    find their cost basis."""
+    events: list[AccountingEventMixin] = []
+    idx = 0
+    while len(events) < events_num:
+        timestamp = Timestamp(START_TS + idx * EVENTS_INTERVAL)
+        kind = idx % 8
+        if kind in (0, 1, 2):  # exchange trades
+            base_asset = A_BTC if kind == 2 else A_ETH
+            events.append(Trade(
+                timestamp=timestamp,
+                location=Location.KRAKEN,
+                base_asset=base_asset,
+                quote_asset=A_USD,
+                trade_type=TradeType.SELL if kind == 1 else TradeType.BUY,
+                amount=AssetAmount(_amount(rng, 0.01, 0.1) if kind == 1 else _amount(rng, 0.1, 1)),
+                rate=Price(FVal(STARTING_PRICES[base_asset])),
+                fee=Fee(_amount(rng, 0.1, 2)),
+                fee_currency=A_USD,
+                link=f'trade_{idx}',
+            ))
+        elif kind == 3:
+            events.append(AssetMovement(
+                location=Location.KRAKEN,
+                category=AssetMovementCategory.WITHDRAWAL if idx % 16 == 3 else AssetMovementCategory.DEPOSIT,  # noqa: E501
+                address=ADDRESS,
+                transaction_id=None,
+                timestamp=timestamp,
+                asset=A_ETH,
+                amount=_amount(rng, 0.01, 0.5),
+                fee_asset=A_ETH,
+                fee=Fee(_amount(rng, 0.0001, 0.001)),
+                link=f'movement_{idx}',
+            ))
+        elif kind == 4:  # swap of ETH to DAI
+            events.extend((
+                _evm_event(idx, 0, timestamp, HistoryEventType.SPEND, HistoryEventSubType.FEE, A_ETH, _amount(rng, 0.001, 0.01), CPT_GAS),  # noqa: E501
+                _evm_event(idx, 1, timestamp, HistoryEventType.TRADE, HistoryEventSubType.SPEND, A_ETH, _amount(rng, 0.01, 0.1), CPT_UNISWAP_V2),  # noqa: E501
+                _evm_event(idx, 2, timestamp, HistoryEventType.TRADE, HistoryEventSubType.RECEIVE, A_DAI, _amount(rng, 20, 200), CPT_UNISWAP_V2),  # noqa: E501
+            ))
+        elif kind == 5:  # deposit of DAI in a lending protocol
+            events.extend((
+                _evm_event(idx, 0, timestamp, HistoryEventType.SPEND, HistoryEventSubType.FEE, A_ETH, _amount(rng, 0.001, 0.01), CPT_GAS),  # noqa: E501
+                _evm_event(idx, 1, timestamp, HistoryEventType.DEPOSIT, HistoryEventSubType.DEPOSIT_ASSET, A_DAI, _amount(rng, 1, 20), CPT_AAVE_V2),  # noqa: E501
+            ))
+        elif kind == 6:
+            events.append(EthBlockEvent(
+                validator_index=idx % 1000,
+                timestamp=ts_sec_to_ms(timestamp),
+                balance=Balance(amount=_amount(rng, 0.01, 0.1)),
+                fee_recipient=ADDRESS,
+                block_number=idx,
+                is_mev_reward=idx % 16 == 6,
+            ))
+        else:
+            events.append(EthWithdrawalEvent(
+                validator_index=idx % 1000,
+                timestamp=ts_sec_to_ms(timestamp),
+                balance=Balance(amount=_amount(rng, 0.01, 0.05)),
+                withdrawal_address=ADDRESS,
+                is_exit=False,
+            ))
+        idx += 1
+
+    return events[:events_num]
+
+
+def seed_prices(end_ts: Timestamp, rng: random.Random) -> int:
+    """Add hourly manual prices in USD of all generated assets until end_ts. The manual
+    oracle accepts prices up to an hour away so every event finds one in the DB."""
+    entries = []
+    for asset, starting_price in STARTING_PRICES.items():
+        price = FVal(starting_price)
+        for timestamp in range(START_TS - HOUR_IN_SECONDS, end_ts + 2 * HOUR_IN_SECONDS, HOUR_IN_SECONDS):  # noqa: E501
+            entries.append(HistoricalPrice(
+                from_asset=asset,
+                to_asset=A_USD,
+                source=HistoricalPriceOracle.MANUAL,
+                timestamp=Timestamp(timestamp),
+                price=Price(price),
+            ))
+            if asset != A_DAI:
+                price *= FVal(round(rng.uniform(0.99, 1.01), 4))
+
+    GlobalDBHandler.add_historical_prices(entries)
+    return len(entries)
+
+
+def run(events_num: int, seed: int) -> dict[str, Any]:
+    """Generate a PnL report for a synthetic history of events_num events in a fresh
+    temporary data directory and return its measurements"""
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as directory:
+        data_dir = Path(directory)
+        msg_aggregator = MessagesAggregator()
+        GlobalDBHandler(data_dir=data_dir, sql_vm_instructions_cb=DEFAULT_SQL_VM_INSTRUCTIONS_CB)
+        user_data_dir = data_dir / 'benchmark'
+        user_data_dir.mkdir()
+        database = DBHandler(
+            user_data_dir=user_data_dir,
+            password='benchmark',
+            msg_aggregator=msg_aggregator,
+            initial_settings=None,
+            sql_vm_instructions_cb=DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+            resume_from_backup=False,
+        )
+        PriceHistorian(
+            data_directory=data_dir,
+            cryptocompare=Cryptocompare(data_directory=data_dir, database=database),
+            coingecko=Coingecko(),
+            defillama=Defillama(),
+        )
+        PriceHistorian.set_oracles_order([HistoricalPriceOracle.MANUAL])
+
+        generation_start = time.perf_counter()
+        events = generate_history(events_num=events_num, rng=rng)
+        end_ts = events[-1].get_timestamp()
+        prices_num = seed_prices(end_ts=end_ts, rng=rng)
+        generation_seconds = time.perf_counter() - generation_start
+
+        accountant = Accountant(
+            db=database,
+            msg_aggregator=msg_aggregator,
+            chains_aggregator=cast('ChainsAggregator', OfflineChainsAggregator(msg_aggregator)),
+            premium=cast('Premium', ActivePremium()),
+        )
+        changes_before = database.conn.total_changes + database.conn_transient.total_changes
+        metrics = ReportMetrics()
+        start = time.perf_counter()
+        report_id = accountant.process_history(
+            start_ts=Timestamp(0),
+            end_ts=end_ts,
+            events=events,
+            metrics=metrics,
+        )
+        duration = time.perf_counter() - start
+        changes = database.conn.total_changes + database.conn_transient.total_changes - changes_before  # noqa: E501
+        with database.conn_transient.read_ctx() as cursor:
+            pnl_events_num = cursor.execute(
+                'SELECT COUNT(*) FROM pnl_events WHERE report_id=?', (report_id,),
+            ).fetchone()[0]
+
+        database.logout()
+        GlobalDBHandler().cleanup()
+
+    return {
+        'events': events_num,
+        'seed': seed,
+        'generation_seconds': round(generation_seconds, 3),
+        'seeded_prices': prices_num,
+        'processing_seconds': round(duration, 3),
+        'events_per_second': round(events_num / duration, 2),
+        'peak_rss_mb': round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        'db_rows_written': changes,
+        'pnl_events_written': pnl_events_num,
+        'errors': len(msg_aggregator.consume_errors()),
+        'metrics': metrics.serialize(),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the PnL report processing')
+    parser.add_argument(
+        '--events',
+        type=int,
+        nargs='+',
+        default=[10_000, 100_000, 1_000_000],
+        help='Number of events of each benchmarked history',
+    )
+    parser.add_argument('--seed', type=int, default=0, help='Seed of the generated histories')
+    parser.add_argument('--output', type=Path, help='File to write the results to as json')
+    args = parser.parse_args()
+
+    if len(args.events) == 1:
+        results = [run(events_num=args.events[0], seed=args.seed)]
+    else:  # run each size in its own process so the peak RSS is only of that size
+        results = []
+        for events_num in args.events:
+            output = subprocess.run(
+                [sys.executable, '-m', 'tools.benchmarks.accounting', '--events', str(events_num), '--seed', str(args.seed)],  # noqa: E501, S603
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout
+            results.append(json.loads(output.splitlines()[-1]))
+
+    if args.output is not None:
+        args.output.write_text(json.dumps(results, indent=2))
+
+    for result in results:
+        if len(args.events) == 1:  # last line is read by the parent process
+            print(json.dumps(result))
+            continue
+        print(
+            f'{result["events"]:>9} events  processing: {result["processing_seconds"]:>9.3f}s  '
+            f'{result["events_per_second"]:>10.2f} events/s  peak RSS: '
+            f'{result["peak_rss_mb"]:>8.1f}MB  DB rows written: {result["db_rows_written"]}',
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Benchmark of deserializing history events from DB rows.
+
+Deserializes synthetic rows, shaped like the ones get_history_events reads, once with a
+fresh DBDeserializationCache per row (how every row was deserialized before the cache) and
+once with a single cache for all of them. It reports the time and the memory retained by
+the resulting events.
+Run with: python -m tools.benchmarks.history_events --entries 100000
+"""
+import argparse
+import gc
+import tempfile
+import time
+import tracemalloc
+from collections.abc import Callable
+from pathlib import Path
+
+from rotkehlchen.accounting.structures.base import DBDeserializationCache, HistoryEvent
+from rotkehlchen.accounting.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.constants.misc import DEFAULT_SQL_VM_INSTRUCTIONS_CB
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+from rotkehlchen.types import Location
+
+ASSETS = ['ETH', 'BTC', 'eip155:1/erc20:0x6B175474E89094C44Da98b954EedeAC495271d0F']
+EVENT_TYPES = [
+    (HistoryEventType.TRADE, HistoryEventSubType.SPEND),
+    (HistoryEventType.TRADE, HistoryEventSubType.RECEIVE),
+    (HistoryEventType.SPEND, HistoryEventSubType.FEE),
+    (HistoryEventType.DEPOSIT, HistoryEventSubType.DEPOSIT_ASSET),
+]
+LOCATIONS = [Location.KRAKEN, Location.BINANCE, Location.ETHEREUM]
+
+
+def generate_rows(entries_num: int) -> list[tuple]:
+    rows: list[tuple] = []
+    for idx in range(entries_num):
+        event_type, event_subtype = EVENT_TYPES[idx % len(EVENT_TYPES)]
+        rows.append((
+            idx,
+            f'event_{idx // 3}',
+            idx % 3,
+            1600000000000 + idx * 1000,
+            LOCATIONS[idx % len(LOCATIONS)].serialize_for_db(),
+            '0x9531C059098e3d194fF87FebB587aB07B30B1306',
+            ASSETS[idx % len(ASSETS)],
+            str(idx % 50),
+            str(idx % 200),
+            f'Event {idx}',
+            event_type.serialize(),
+            event_subtype.serialize(),
+        ))
+    return rows
+
+
+def deserialize_with_cache(rows: list[tuple]) -> list[HistoryEvent]:
+    cache = DBDeserializationCache()
+    return [HistoryEvent.deserialize_from_db(row, cache) for row in rows]
+
+
+def measure(name: str, function: Callable[[], list[HistoryEvent]], rounds: int) -> None:
+    durations = []
+    retained = 0
+    for _ in range(rounds):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        events = function()
+        durations.append(time.perf_counter() - start)
+        retained, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del events
+
+    print(
+        f'{name:<16} best: {min(durations):.3f}s  mean: {sum(durations) / rounds:.3f}s  '
+        f'retained memory: {retained / 2 ** 20:.1f}MB',
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark history events deserialization')
+    parser.add_argument('--entries', type=int, default=50000, help='Number of DB rows')
+    parser.add_argument('--rounds', type=int, default=3, help='Rounds per measurement')
+    args = parser.parse_args()
+
+    rows = generate_rows(args.entries)
+    with tempfile.TemporaryDirectory() as directory:
+        GlobalDBHandler(
+            data_dir=Path(directory),
+            sql_vm_instructions_cb=DEFAULT_SQL_VM_INSTRUCTIONS_CB,
+        )
+        print(f'Deserializing {args.entries} history event rows, {args.rounds} rounds each')
+        measure(
+            name='cache per row',
+            function=lambda: [HistoryEvent.deserialize_from_db(row) for row in rows],
+            rounds=args.rounds,
+        )
+        measure(
+            name='shared cache',
+            function=lambda: deserialize_with_cache(rows),
+            rounds=args.rounds,
+        )
+        GlobalDBHandler().cleanup()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Benchmark of running CPU heavy work inline versus in the process pool.
+
+For xpub address derivation and encryption of a DB sized payload it measures the
+duration of the work and the worst delay a ticking greenlet observed meanwhile,
+which is what an API request would have to wait while the work is running.
+Run with: python -m tools.benchmarks.process_pool --workers 2 --addresses 500
+"""
+from gevent import monkey  # isort:skip
+monkey.patch_all()  # isort:skip
+import argparse
+import os
+import time
+from collections.abc import Callable
+from typing import Any
+
+import gevent
+
+from rotkehlchen.chain.bitcoin.hdkey import derive_children_addresses
+from rotkehlchen.crypto import encrypt
+from rotkehlchen.greenlets.process_pool import ProcessPool
+
+XPUB = 'xpub68V4ZQQ62mea7ZUKn2urQu47Bdn2Wr7SxrBxBDDwE3kjytj361YBGSKDT4WoBrE5htrSB8eAMe59NPnKrcAbiv2veN5GQUmfdjRddD1Hxrk'  # noqa: E501
+TICK_INTERVAL = 0.01
+
+
+def measure(name: str, function: Callable[..., Any], *args: Any, **kwargs: Any) -> None:
+    max_delay = 0.0
+    running = True
+
+    def ticker() -> None:
+        nonlocal max_delay
+        while running:
+            start = time.perf_counter()
+            gevent.sleep(TICK_INTERVAL)
+            max_delay = max(max_delay, time.perf_counter() - start - TICK_INTERVAL)
+
+    ticker_greenlet = gevent.spawn(ticker)
+    gevent.sleep(TICK_INTERVAL)  # let the ticker start
+    start = time.perf_counter()
+    ProcessPool.run(function, *args, **kwargs)
+    duration = time.perf_counter() - start
+    running = False
+    ticker_greenlet.join()
+    print(f'{name:<32} duration: {duration:.3f}s  max event loop delay: {max_delay:.3f}s')
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark the process pool offloading')
+    parser.add_argument('--workers', type=int, default=2, help='Number of worker processes')
+    parser.add_argument('--addresses', type=int, default=500, help='Addresses to derive')
+    parser.add_argument('--payload-mb', type=int, default=50, help='MBs of data to encrypt')
+    args = parser.parse_args()
+
+    indices = list(range(args.addresses))
+    payload = os.urandom(args.payload_mb * 2 ** 20)
+    for workers in (0, args.workers):
+        ProcessPool.initialize(max_workers=workers)
+        if workers != 0:  # warm up so that the worker start up is not measured
+            ProcessPool.run(derive_children_addresses, XPUB, None, [0])
+        label = 'inline' if workers == 0 else f'{workers} workers'
+        measure(f'xpub derivation ({label})', derive_children_addresses, XPUB, None, indices)
+        measure(f'encryption ({label})', encrypt, b'password', payload)
+    ProcessPool.shutdown()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Benchmark of the API result serialization on history event like payloads.
+
+Compares processing the whole result and then json encoding it (what api_response does)
+with the incremental encoding of iter_json_chunks (what streamed_api_response does).
+Run with: python -m tools.benchmarks.serialization --entries 50000
+"""
+
+import argparse
+import json
+import time
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from hexbytes import HexBytes
+
+from rotkehlchen.accounting.structures.balance import Balance
+from rotkehlchen.accounting.structures.types import HistoryEventSubType, HistoryEventType
+from rotkehlchen.assets.asset import Asset
+from rotkehlchen.fval import FVal
+from rotkehlchen.serialization.serialize import iter_json_chunks, process_result
+from rotkehlchen.types import Location
+
+ASSETS = [Asset('ETH'), Asset('BTC'), Asset('eip155:1/erc20:0x6B175474E89094C44Da98b954EedeAC495271d0F')]  # noqa: E501
+EVENT_TYPES = [
+    (HistoryEventType.TRADE, HistoryEventSubType.SPEND),
+    (HistoryEventType.TRADE, HistoryEventSubType.RECEIVE),
+    (HistoryEventType.SPEND, HistoryEventSubType.FEE),
+    (HistoryEventType.DEPOSIT, HistoryEventSubType.DEPOSIT_ASSET),
+]
+
+
+def generate_payload(entries_num: int) -> dict[str, Any]:
+    entries = []
+    for idx in range(entries_num):
+        event_type, event_subtype = EVENT_TYPES[idx % len(EVENT_TYPES)]
+        entries.append({
+            'entry': {
+                'identifier': idx,
+                'event_identifier': HexBytes(idx.to_bytes(32, byteorder='big')),
+                'sequence_index': idx % 7,
+                'timestamp': 1600000000000 + idx * 1000,
+                'location': Location.ETHEREUM,
+                'asset': ASSETS[idx % len(ASSETS)],
+                'balance': Balance(amount=FVal(idx) / 7, usd_value=FVal(idx) / 3),
+                'event_type': event_type,
+                'event_subtype': event_subtype,
+                'location_label': '0x9531C059098e3d194fF87FebB587aB07B30B1306',
+                'notes': f'Swap {idx} ETH in uniswap-v2',
+            },
+            'customized': False,
+            'ignored_in_accounting': idx % 10 == 0,
+            'has_ignored_assets': False,
+        })
+    return {'result': {'entries': entries, 'entries_found': entries_num}, 'message': ''}
+
+
+def measure(name: str, function: Callable[[], str], rounds: int) -> str:
+    output = ''
+    durations = []
+    for _ in range(rounds):
+        tracemalloc.start()
+        start = time.perf_counter()
+        output = function()
+        durations.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(
+        f'{name:<24} best: {min(durations):.3f}s  '
+        f'mean: {sum(durations) / rounds:.3f}s  peak memory: {peak / 2 ** 20:.1f}MB',
+    )
+    return output
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Benchmark API result serialization')
+    parser.add_argument('--entries', type=int, default=20000, help='Number of entries')
+    parser.add_argument('--rounds', type=int, default=5, help='Rounds per measurement')
+    args = parser.parse_args()
+
+    payload = generate_payload(args.entries)
+    print(f'Serializing {args.entries} history event entries, {args.rounds} rounds each')
+    full = measure(
+        name='process_result + dumps',
+        function=lambda: json.dumps(process_result(payload)),
+        rounds=args.rounds,
+    )
+    streamed = measure(
+        name='iter_json_chunks',
+        function=lambda: ''.join(iter_json_chunks(payload)),
+        rounds=args.rounds,
+    )
+    assert full == streamed, 'Streamed output differs from the full serialization'
+
+
+if __name__ == '__main__':
+    main()
@@ -56,6 +56,13 @@ for name, properties in regexp_result:
     lines.append(f'    "{name}": "{properties}",')
 lines.append('}')
 
+# The sanity check also makes sure that the triggers of the schema exist
+trigger_names = re.findall(pattern=r'CREATE TRIGGER IF NOT EXISTS (\w+)', string=db_script)
+if len(trigger_names) != 0:
+    lines.append(f'MINIMIZED_{db_name.upper()}_DB_TRIGGERS = (')
+    lines.extend(f'    "{name}",' for name in trigger_names)
+    lines.append(')')
+
 # Save to the file
 db_module = 'db' if db_name == 'user' else 'globaldb'
 with open(f'rotkehlchen/{db_module}/minimized_schema.py', 'w') as f: